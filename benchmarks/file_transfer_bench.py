@@ -0,0 +1,169 @@
+"""File transfer benchmark: the Modal and Runloop backends against fake clients.
+
+The fake clients answer each file request after `--latency` seconds (plus
+transfer time at `--bandwidth` MB/s), the cost of one API round trip. For each
+file count the benchmark times a serial loop, one request after another as the
+backends used to transfer, against the backends' concurrent `download_files`
+and `upload_files`. Correctness is covered by
+tests/unit_tests/test_file_transfer.py.
+
+Usage:
+    python benchmarks/file_transfer_bench.py --latency 0.05 --files 1 10 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Self
+
+import httpx
+from rich.table import Table
+from runloop_api_client import NotFoundError
+
+from stranger_code.config import COLORS, console
+from stranger_code.integrations.modal import ModalBackend
+from stranger_code.integrations.runloop import RunloopBackend
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class _FakeStore:
+    """Files of the fake sandbox, served with simulated request latency."""
+
+    def __init__(self, latency: float, bandwidth_mb: float) -> None:
+        self.files: dict[str, bytes] = {}
+        self.latency = latency
+        self.bandwidth = bandwidth_mb * 1024 * 1024
+
+    @contextmanager
+    def request(self, _path: str, size: int = 0) -> Iterator[None]:
+        time.sleep(self.latency + size / self.bandwidth)
+        yield
+
+
+class _FakeModalFile:
+    def __init__(self, store: _FakeStore, path: str, mode: str) -> None:
+        self._store, self._path, self._mode = store, path, mode
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        pass
+
+    def read(self) -> bytes:
+        with self._store.request(self._path):
+            if self._path not in self._store.files:
+                raise FileNotFoundError(self._path)
+            return self._store.files[self._path]
+
+    def write(self, content: bytes) -> None:
+        with self._store.request(self._path, len(content)):
+            self._store.files[self._path] = content
+
+
+class _FakeModalSandbox:
+    object_id = "sb-fake"
+
+    def __init__(self, store: _FakeStore) -> None:
+        self._store = store
+
+    def open(self, path: str, mode: str) -> _FakeModalFile:
+        return _FakeModalFile(self._store, path, mode)
+
+
+class _FakeRunloopDevboxes:
+    def __init__(self, store: _FakeStore) -> None:
+        self._store = store
+
+    def download_file(self, devbox_id: str, *, path: str) -> httpx.Response:
+        with self._store.request(path):
+            if path not in self._store.files:
+                msg = f"{path} not found"
+                request = httpx.Request("POST", f"https://fake/devboxes/{devbox_id}/download_file")
+                raise NotFoundError(msg, response=httpx.Response(404, request=request), body=None)
+            return httpx.Response(200, content=self._store.files[path])
+
+    def upload_file(self, devbox_id: str, *, path: str, file: bytes) -> None:  # noqa: ARG002
+        with self._store.request(path, len(file)):
+            self._store.files[path] = file
+
+
+class _FakeRunloopClient:
+    def __init__(self, store: _FakeStore) -> None:
+        self.devboxes = _FakeRunloopDevboxes(store)
+
+
+def _backends(store: _FakeStore) -> dict[str, ModalBackend | RunloopBackend]:
+    modal_sandbox = _FakeModalSandbox(store)
+    runloop_client = _FakeRunloopClient(store)
+    return {
+        "modal": ModalBackend(modal_sandbox),  # type: ignore[arg-type]
+        "runloop": RunloopBackend("dbx-fake", client=runloop_client),  # type: ignore[arg-type]
+    }
+
+
+def _timed(call: object) -> float:
+    start = time.perf_counter()
+    call()  # type: ignore[operator]
+    return time.perf_counter() - start
+
+
+def file_transfer_bench_command(
+    *, latency: float = 0.05, bandwidth_mb: float = 100, file_counts: list[int] | None = None
+) -> None:
+    """Print serial and concurrent transfer timings."""
+    file_counts = file_counts or [1, 10, 100]
+    timings = Table(
+        title=f"File transfer ({latency * 1000:.0f} ms per request, {bandwidth_mb:g} MB/s)",
+        show_header=True,
+        header_style=f"bold {COLORS['primary']}",
+    )
+    for column in ("Provider", "Files", "Direction"):
+        timings.add_column(column)
+    for column in ("Serial", "Concurrent", "Speed-up"):
+        timings.add_column(column, justify="right")
+    for name in ("modal", "runloop"):
+        for count in file_counts:
+            store = _FakeStore(latency, bandwidth_mb)
+            backend = _backends(store)[name]
+            files = [(f"/workspace/file{index}.py", b"x" * 4096) for index in range(count)]
+            paths = [path for path, _ in files]
+            # Serial baselines: one request after another through the same helpers
+            write, read = backend._write_file, backend._read_file
+            serial_up = _timed(lambda: [write(*item) for item in files])  # noqa: B023
+            serial_down = _timed(lambda: [read(path) for path in paths])  # noqa: B023
+            up = _timed(lambda: backend.upload_files(files))  # noqa: B023
+            down = _timed(lambda: backend.download_files(paths))  # noqa: B023
+            for direction, serial, concurrent in (
+                ("upload", serial_up, up),
+                ("download", serial_down, down),
+            ):
+                timings.add_row(
+                    name,
+                    str(count),
+                    direction,
+                    f"{serial:.2f}s",
+                    f"{concurrent:.2f}s",
+                    f"{serial / concurrent:.1f}x",
+                )
+
+    console.print()
+    console.print(timings)
+    console.print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time sandbox file transfer with fake clients")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per request")
+    parser.add_argument("--bandwidth", type=float, default=100, help="Fake MB/s per request")
+    parser.add_argument(
+        "--files", type=int, nargs="+", default=[1, 10, 100], help="Batch sizes to time"
+    )
+    args = parser.parse_args()
+    file_transfer_bench_command(
+        latency=args.latency, bandwidth_mb=args.bandwidth, file_counts=args.files
+    )
@@ -0,0 +1,85 @@
+"""Benchmark for streamed tool-call argument parsing.
+
+Streams `write_file` arguments of several sizes in random small chunks and
+compares re-joining plus `json.loads` on every chunk (what the adapter used to
+do) with `StreamingJSONParser`, and reports after which chunk `file_path` was
+available.
+
+Usage:
+    python benchmarks/json_stream_bench.py --sizes 100 200 500 --chunk 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from rich.table import Table
+
+from stranger_code.config import COLORS, console
+from stranger_code.json_stream import StreamingJSONParser
+
+
+def _benchmark(sizes_kb: list[int], *, chunk_chars: int = 16) -> None:
+    """Compare re-parsing the joined prefix per chunk against `StreamingJSONParser`."""
+    table = Table(
+        title=f"Streamed write_file arguments ({chunk_chars}-char chunks)",
+        show_header=True,
+        header_style=f"bold {COLORS['primary']}",
+    )
+    for column in ("Arguments", "Chunks", "Join + json.loads", "Incremental", "file_path after"):
+        table.add_column(column, justify="right")
+    rng = random.Random(11)
+    for size_kb in sizes_kb:
+        line = 'def handler(event):\n    return {"status": "ok", "path": "C:\\tmp"}\n'
+        content = "".join(line for _ in range(size_kb * 1024 // len(line) + 1))
+        raw = json.dumps({"file_path": "/src/app/handlers.py", "content": content})
+        chunks: list[str] = []
+        pos = 0
+        while pos < len(raw):
+            step = rng.randint(1, 2 * chunk_chars)
+            chunks.append(raw[pos : pos + step])
+            pos += step
+
+        start = time.perf_counter()
+        parts: list[str] = []
+        for chunk in chunks:
+            parts.append(chunk)
+            try:
+                json.loads("".join(parts))
+            except json.JSONDecodeError:
+                continue
+        naive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parser = StreamingJSONParser()
+        path_at = None
+        for index, chunk in enumerate(chunks):
+            parser.feed(chunk)
+            if path_at is None and "file_path" in parser.partial:
+                path_at = index + 1
+        incremental = time.perf_counter() - start
+        assert parser.value["content"] == content  # noqa: S101
+
+        table.add_row(
+            f"{len(raw) // 1024} KB",
+            str(len(chunks)),
+            f"{naive * 1000:.0f} ms",
+            f"{incremental * 1000:.1f} ms",
+            f"chunk {path_at}",
+        )
+    console.print()
+    console.print(table)
+    console.print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streamed tool-argument parsing")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 200, 500], help="Argument sizes in KB"
+    )
+    parser.add_argument("--chunk", type=int, default=16, help="Mean chunk size in characters")
+    args = parser.parse_args()
+    _benchmark(args.sizes, chunk_chars=args.chunk)
@@ -0,0 +1,146 @@
+"""Output capture benchmark: a runaway command through a local stand-in sandbox.
+
+The stand-in runs commands with a local subprocess and streams their output
+into the same `OutputCapture` the remote backends use. The benchmark runs a
+command that prints `--mb` MB and compares time and peak Python memory with
+reading the whole output first, as the backends used to. Correctness is
+covered by tests/unit_tests/test_output_capture.py.
+
+Usage:
+    python benchmarks/output_capture_bench.py --mb 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import subprocess
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from deepagents.backends.protocol import (
+    ExecuteResponse,
+    FileDownloadResponse,
+    FileUploadResponse,
+)
+from deepagents.backends.sandbox import BaseSandbox
+from rich.table import Table
+
+from stranger_code.config import COLORS, console
+from stranger_code.integrations.async_sandbox import AsyncSandboxMixin
+
+if TYPE_CHECKING:
+    from stranger_code.integrations.output_capture import OutputCapture
+
+_CHUNK = 64 * 1024
+
+
+class _LocalAsyncSandbox(AsyncSandboxMixin, BaseSandbox):
+    """Runs commands locally, streaming output as the remote backends do."""
+
+    def __init__(self) -> None:
+        self._timeout = 60
+
+    @property
+    def id(self) -> str:
+        return "local"
+
+    def execute(self, command: str) -> ExecuteResponse:
+        # The old way: wait, then hold the whole output
+        result = subprocess.run(  # noqa: S603
+            ["bash", "-c", command],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        output = result.stdout + ("\n" + result.stderr if result.stderr else "")
+        return ExecuteResponse(output=output, exit_code=result.returncode, truncated=False)
+
+    async def _arun(self, command: str, capture: OutputCapture) -> int | None:
+        process = await asyncio.create_subprocess_exec(
+            "bash",
+            "-c",
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            start_new_session=True,
+        )
+        try:
+            while chunk := await process.stdout.read(_CHUNK):
+                capture.write(chunk)
+            return await process.wait()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        raise NotImplementedError
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        raise NotImplementedError
+
+
+def _measured(call: object) -> tuple[object, float, float]:
+    """(result, seconds, peak MB of Python allocations) of `call()`."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = call()  # type: ignore[operator]
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def output_capture_bench_command(*, mb: int = 200) -> None:
+    """Print time and peak memory of reading a runaway command's output."""
+    sandbox = _LocalAsyncSandbox()
+    lines = mb * 1024 * 1024 // 64
+    runaway = f"seq -f 'log line %054.0f' 1 {lines}"
+    rows: list[tuple[str, str]] = []
+
+    whole, whole_s, whole_peak = _measured(lambda: sandbox.execute(runaway))
+    rows.append(
+        (
+            f"read whole output ({mb} MB)",
+            f"{whole_s:.2f}s, peak {whole_peak:.0f} MB, {len(whole.output) // 1024} KB kept",
+        )
+    )
+    del whole
+
+    chunks: list[int] = []
+    streamed, streamed_s, streamed_peak = _measured(
+        lambda: asyncio.run(
+            sandbox.aexecute(runaway, on_output=lambda text: chunks.append(len(text)))
+        )
+    )
+    rows.append(
+        (
+            f"streamed capture ({mb} MB)",
+            (
+                f"{streamed_s:.2f}s, peak {streamed_peak:.1f} MB, "
+                f"{len(streamed.output) // 1024} KB kept, {len(chunks)} live chunks"
+            ),
+        )
+    )
+
+    table = Table(
+        title="Output capture (local stand-in sandbox)",
+        show_header=True,
+        header_style=f"bold {COLORS['primary']}",
+    )
+    table.add_column("Run", style="bold")
+    table.add_column("Result")
+    for name, detail in rows:
+        table.add_row(name, detail)
+    console.print()
+    console.print(table)
+    console.print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure bounded output capture")
+    parser.add_argument("--mb", type=int, default=200, help="Output of the runaway command")
+    args = parser.parse_args()
+    output_capture_bench_command(mb=args.mb)
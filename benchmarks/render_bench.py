@@ -0,0 +1,182 @@
+"""Synthetic streaming benchmark for the assistant-message render pipeline.
+
+Streams a fake model reply token by token into an `AssistantMessage` inside a
+headless Textual app, once rendering every token and once through
+`RenderBatcher`, and reports frame time, CPU time and event-loop lag (how long
+a keypress would wait behind rendering).
+
+Usage:
+    python benchmarks/render_bench.py --tokens 20000 --fps 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+
+from rich.table import Table
+from textual.app import App
+from textual.containers import VerticalScroll
+
+from stranger_code.config import COLORS, console
+from stranger_code.textual_adapter import DEFAULT_RENDER_FPS, RenderBatcher
+from stranger_code.widgets.messages import AssistantMessage
+
+# Interval of the probe that stands in for input handling
+_PROBE_INTERVAL = 0.005
+
+_WORDS = (  # noqa: SIM905
+    "the gate opens when the lab runs the experiment again and the lights flicker "
+    "across hawkins while the party rides bikes down mirkwood at night"
+).split()
+
+
+@dataclass
+class RenderRun:
+    """Measurements from streaming one reply."""
+
+    label: str
+    tokens: int
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    frame_times_ms: list[float] = field(default_factory=list)
+    lag_ms: list[float] = field(default_factory=list)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def synthetic_tokens(count: int, *, seed: int = 11) -> list[str]:
+    """Markdown-ish token stream: prose, bullet lists and fenced code blocks."""
+    rng = random.Random(seed)
+    tokens: list[str] = []
+    while len(tokens) < count:
+        kind = rng.random()
+        if kind < 0.15:  # noqa: PLR2004
+            tokens += ["\n\n```python\n"]
+            lines = rng.randint(3, 8)
+            tokens += [f"x{i} = compute({rng.choice(_WORDS)!r})\n" for i in range(lines)]
+            tokens += ["```\n\n"]
+        elif kind < 0.3:  # noqa: PLR2004
+            tokens += [f"\n- {rng.choice(_WORDS)}" for _ in range(rng.randint(2, 5))]
+            tokens += ["\n\n"]
+        else:
+            tokens += [f" {rng.choice(_WORDS)}" for _ in range(rng.randint(20, 60))]
+            tokens += [".\n\n"]
+    return tokens[:count]
+
+
+class _BenchApp(App):
+    def compose(self):  # noqa: ANN202
+        yield VerticalScroll(id="chat")
+
+
+async def _probe_lag(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(_PROBE_INTERVAL)
+        lags.append(max(0.0, (time.perf_counter() - start - _PROBE_INTERVAL) * 1000))
+
+
+async def _stream(tokens: list[str], *, fps: float, rate: float, label: str) -> RenderRun:
+    run = RenderRun(label=label, tokens=len(tokens))
+    app = _BenchApp()
+    async with app.run_test(size=(120, 40)):
+        message = AssistantMessage()
+        await app.query_one("#chat").mount(message)
+        # A frame is one Markdown.append: parse the new text and reflow the tail
+        markdown = message._get_markdown()
+        append = markdown.append
+
+        async def timed_append(text: str) -> None:
+            start = time.perf_counter()
+            await append(text)
+            run.frame_times_ms.append((time.perf_counter() - start) * 1000)
+
+        markdown.append = timed_append
+        batcher = RenderBatcher(lambda _status: None, fps=fps)
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_lag(run.lag_ms, stop))
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for index, token in enumerate(tokens):
+            # Tokens arrive at `rate` per second; when rendering falls behind,
+            # they are delivered back to back as a real stream would be
+            delay = wall_start + index / rate - time.perf_counter()
+            await asyncio.sleep(max(0.0, delay))
+            await batcher.append((), message, token)
+        await batcher.aclose()
+        await message.stop_stream()
+        run.wall_seconds = time.perf_counter() - wall_start
+        run.cpu_seconds = time.process_time() - cpu_start
+
+        stop.set()
+        await probe
+    return run
+
+
+async def run_render_benchmark(
+    *, tokens: int = 20_000, fps: float = DEFAULT_RENDER_FPS, rate: float = 2_000
+) -> list[RenderRun]:
+    """Stream the same synthetic reply per token and batched at `fps`."""
+    stream = synthetic_tokens(tokens)
+    return [
+        await _stream(stream, fps=0, rate=rate, label="Every token"),
+        await _stream(stream, fps=fps, rate=rate, label=f"{fps:g} fps"),
+    ]
+
+
+def render_bench_command(
+    *, tokens: int = 20_000, fps: float = DEFAULT_RENDER_FPS, rate: float = 2_000
+) -> None:
+    """Print the benchmark results as a table."""
+    console.print(
+        f"[dim]Streaming {tokens} tokens at up to {rate:g} tokens/s into a headless app...[/dim]"
+    )
+    runs = asyncio.run(run_render_benchmark(tokens=tokens, fps=fps, rate=rate))
+
+    table = Table(
+        title="Assistant message rendering",
+        show_header=True,
+        header_style=f"bold {COLORS['primary']}",
+    )
+    table.add_column("Metric", style="bold")
+    for run in runs:
+        table.add_column(run.label, justify="right")
+    rows = [
+        ("Frames (Markdown appends)", lambda r: str(len(r.frame_times_ms))),
+        ("Frame time p50", lambda r: f"{_percentile(r.frame_times_ms, 50):.2f} ms"),
+        ("Frame time p99", lambda r: f"{_percentile(r.frame_times_ms, 99):.2f} ms"),
+        ("Total render time", lambda r: f"{sum(r.frame_times_ms) / 1000:.2f} s"),
+        ("Wall time", lambda r: f"{r.wall_seconds:.2f} s"),
+        ("CPU time", lambda r: f"{r.cpu_seconds:.2f} s"),
+        ("CPU use", lambda r: f"{r.cpu_seconds / max(r.wall_seconds, 1e-9):.0%}"),
+        ("Input lag p50", lambda r: f"{_percentile(r.lag_ms, 50):.1f} ms"),
+        ("Input lag p99", lambda r: f"{_percentile(r.lag_ms, 99):.1f} ms"),
+        ("Input lag max", lambda r: f"{max(r.lag_ms, default=0):.1f} ms"),
+        ("Input lag mean", lambda r: f"{statistics.fmean(r.lag_ms or [0]):.1f} ms"),
+    ]
+    for name, render in rows:
+        table.add_row(name, *(render(run) for run in runs))
+
+    console.print()
+    console.print(table)
+    console.print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streamed assistant rendering")
+    parser.add_argument("--tokens", type=int, default=20_000, help="Tokens to stream")
+    parser.add_argument("--fps", type=float, default=DEFAULT_RENDER_FPS, help="Batched frame rate")
+    parser.add_argument("--rate", type=float, default=2_000, help="Token arrival rate (per second)")
+    args = parser.parse_args()
+    render_bench_command(tokens=args.tokens, fps=args.fps, rate=args.rate)
@@ -0,0 +1,122 @@
+"""Workspace sync benchmark: a generated monorepo against a local stand-in sandbox.
+
+The "sandbox" is a scratch directory driven through the same backend calls a
+remote one gets (`execute` runs bash locally, uploads and downloads are file
+writes and reads). The benchmark times the first push of a git work tree with
+`--files` files, a no-op re-sync, a re-sync after a small edit, and a pull of
+changes made "by the agent". Correctness is covered by
+tests/unit_tests/test_workspace_sync.py.
+
+Usage:
+    python benchmarks/workspace_sync_bench.py --files 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+
+from deepagents.backends.protocol import (
+    ExecuteResponse,
+    FileDownloadResponse,
+    FileUploadResponse,
+)
+from deepagents.backends.sandbox import BaseSandbox
+from rich.table import Table
+
+from stranger_code.config import COLORS, console
+from stranger_code.integrations.workspace_sync import WorkspaceSync
+
+
+class _LocalSandbox(BaseSandbox):
+    """Runs sandbox calls against the local machine."""
+
+    @property
+    def id(self) -> str:
+        return "local"
+
+    def execute(self, command: str) -> ExecuteResponse:
+        result = subprocess.run(  # noqa: S603
+            ["bash", "-c", command],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        return ExecuteResponse(
+            output=result.stdout + result.stderr, exit_code=result.returncode, truncated=False
+        )
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        for path, content in files:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_bytes(content)
+        return [FileUploadResponse(path=path, error=None) for path, _ in files]
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        responses = []
+        for path in paths:
+            try:
+                responses.append(FileDownloadResponse(path, Path(path).read_bytes(), None))
+            except FileNotFoundError:
+                responses.append(FileDownloadResponse(path, None, "file_not_found"))
+        return responses
+
+
+def _make_tree(root: Path, files: int) -> None:
+    """A git work tree with `files` small files (100 per directory) and ignored build output."""
+    subprocess.run(["git", "init", "-q", str(root)], check=True)  # noqa: S603, S607
+    (root / ".gitignore").write_text("build/\n*.log\n")
+    for index in range(files):
+        directory = root / "pkg" / f"mod{index // 100:04d}"
+        if index % 100 == 0:
+            directory.mkdir(parents=True)
+        (directory / f"file{index}.py").write_text(f"VALUE = {index}\n" * 8)
+    (root / "build").mkdir()
+    (root / "build" / "artifact.bin").write_bytes(b"\0" * 4096)
+    (root / "debug.log").write_text("ignored\n")
+
+
+def workspace_sync_bench_command(*, files: int = 50_000) -> None:
+    """Print the duration and transfer size of each sync step."""
+    rows: list[tuple[str, str]] = []
+    with tempfile.TemporaryDirectory() as scratch:
+        local, remote = Path(scratch) / "local", Path(scratch) / "remote"
+        _make_tree(local, files)
+        sync = WorkspaceSync(_LocalSandbox(), local, str(remote))
+
+        rows.append((f"first push ({files} files)", sync.push().summary()))
+        rows.append(("re-sync, nothing changed", sync.push().summary()))
+
+        (local / "pkg/mod0000/file1.py").write_text("VALUE = 'edited'\n")
+        (local / "pkg/new_module.py").write_text("NEW = True\n")
+        (local / "pkg/mod0002/file200.py").unlink()
+        rows.append(("re-sync after a small edit", sync.push().summary()))
+
+        (remote / "pkg/mod0003/file300.py").write_text("VALUE = 'agent'\n")
+        (remote / "pkg/agent_notes.md").write_text("# Notes\n")
+        (remote / "pkg/mod0004/file400.py").unlink()
+        rows.append(("pull the agent's changes", sync.pull().summary()))
+        rows.append(("pull again, nothing changed", sync.pull().summary()))
+        sync._cache.path.unlink(missing_ok=True)
+
+    table = Table(
+        title="Workspace sync (local stand-in sandbox)",
+        show_header=True,
+        header_style=f"bold {COLORS['primary']}",
+    )
+    table.add_column("Step", style="bold")
+    table.add_column("Result")
+    for name, detail in rows:
+        table.add_row(name, detail)
+    console.print()
+    console.print(table)
+    console.print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time workspace sync on a generated monorepo")
+    parser.add_argument("--files", type=int, default=50_000, help="Files in the generated tree")
+    args = parser.parse_args()
+    workspace_sync_bench_command(files=args.files)
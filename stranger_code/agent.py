@@ -1,34 +1,31 @@
-"""Agent management and creation for the CLI."""
+"""Agent management and creation for the CLI.
+
+deepagents, LangChain and LangGraph are imported inside `create_cli_agent`, so
+commands that only manage agents (`list`, `reset`) start without them.
+"""
+
+from __future__ import annotations
 
 import os
 import shutil
 from pathlib import Path
-
-from deepagents import create_deep_agent
-from deepagents.backends import CompositeBackend
-from deepagents.backends.filesystem import FilesystemBackend
-from deepagents.backends.sandbox import SandboxBackendProtocol
-
-# Use deepagents-cli's middleware implementations
-from deepagents_cli.agent_memory import AgentMemoryMiddleware as MemoryMiddleware
-from deepagents_cli.skills import SkillsMiddleware
-from deepagents_cli.shell import ShellMiddleware
-
-from langchain.agents.middleware import (
-    InterruptOnConfig,
-)
-from langchain.agents.middleware.types import AgentState
-from langchain.messages import ToolCall
-from langchain.tools import BaseTool
-from langchain_core.language_models import BaseChatModel
-from langgraph.checkpoint.base import BaseCheckpointSaver
-from langgraph.checkpoint.memory import InMemorySaver
-from langgraph.pregel import Pregel
-from langgraph.runtime import Runtime
+from typing import TYPE_CHECKING
 
 from stranger_code.config import COLORS, config, console, get_default_coding_instructions, settings
 from stranger_code.integrations.sandbox_factory import get_default_working_dir
 
+if TYPE_CHECKING:
+    from deepagents.backends import CompositeBackend
+    from deepagents.backends.sandbox import SandboxBackendProtocol
+    from langchain.agents.middleware import InterruptOnConfig
+    from langchain.agents.middleware.types import AgentState
+    from langchain.messages import ToolCall
+    from langchain.tools import BaseTool
+    from langchain_core.language_models import BaseChatModel
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+    from langgraph.pregel import Pregel
+    from langgraph.runtime import Runtime
+
 
 def list_agents() -> None:
     """List all available agents."""
@@ -369,6 +366,18 @@ def create_cli_agent(
         - agent_graph: Configured LangGraph Pregel instance ready for execution
         - composite_backend: CompositeBackend for file operations
     """
+    from deepagents import create_deep_agent
+    from deepagents.backends import CompositeBackend
+    from deepagents.backends.filesystem import FilesystemBackend
+
+    # Use deepagents-cli's middleware implementations
+    from deepagents_cli.agent_memory import AgentMemoryMiddleware as MemoryMiddleware
+    from deepagents_cli.shell import ShellMiddleware
+    from deepagents_cli.skills import SkillsMiddleware
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    from stranger_code.integrations.async_sandbox import AsyncExecuteMiddleware, AsyncSandboxMixin
+
     tools = tools or []
 
     # Setup agent directory for persistent memory (if enabled)
@@ -432,6 +441,9 @@ def create_cli_agent(
         backend = sandbox  # Remote sandbox (ModalBackend, etc.)
         # Note: Shell middleware not used in sandbox mode
         # File operations and execute tool are provided by the sandbox backend
+        if isinstance(sandbox, AsyncSandboxMixin):
+            # Run execute calls on the event loop, concurrently and cancellably
+            agent_middleware.append(AsyncExecuteMiddleware(sandbox))
 
     # Get or use custom system prompt
     if system_prompt is None:
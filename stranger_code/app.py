@@ -17,6 +17,7 @@ from textual.events import MouseUp  # noqa: TC002 - used in type annotation
 from textual.widgets import Static  # noqa: TC002 - used at runtime
 
 from stranger_code.clipboard import copy_selection_to_clipboard
+from stranger_code.telemetry import PerfLog
 from stranger_code.textual_adapter import TextualUIAdapter, execute_task_textual
 from stranger_code.widgets.approval import ApprovalMenu
 from stranger_code.widgets.chat_input import ChatInput
@@ -29,7 +30,6 @@ from stranger_code.widgets.messages import (
     UserMessage,
 )
 from stranger_code.widgets.christmas import ChristmasLights
-from stranger_code.widgets.splash import SplashComplete, SplashOverlay
 from stranger_code.widgets.status import StatusBar
 from stranger_code.widgets.welcome import WelcomeBanner
 
@@ -38,6 +38,11 @@ if TYPE_CHECKING:
     from textual.app import ComposeResult
     from textual.worker import Worker
 
+    from stranger_code.bootstrap import AgentBootstrap
+    from stranger_code.sessions import SessionStore
+    from stranger_code.telemetry import TurnMetrics
+    from stranger_code.widgets.splash import SplashComplete
+
 
 class TextualTokenTracker:
     """Token tracker that updates the status bar."""
@@ -66,15 +71,18 @@ class TextualSessionState:
         *,
         auto_approve: bool = False,
         thread_id: str | None = None,
+        durability: str = "exit",
     ) -> None:
         """Initialize session state.
 
         Args:
             auto_approve: Whether to auto-approve tool calls
             thread_id: Optional thread ID (generates 8-char hex if not provided)
+            durability: Checkpoint durability mode ("exit", "async-batched", "sync")
         """
         self.auto_approve = auto_approve
         self.thread_id = thread_id if thread_id else uuid.uuid4().hex[:8]
+        self.durability = durability
 
     def reset_thread(self) -> str:
         """Reset to a new thread. Returns the new thread_id."""
@@ -126,6 +134,9 @@ class DeepAgentsApp(App):
         cwd: str | Path | None = None,
         thread_id: str | None = None,
         no_splash: bool = False,
+        durability: str = "exit",
+        store: SessionStore | None = None,
+        bootstrap: AgentBootstrap | None = None,
         **kwargs: Any,
     ) -> None:
         """Initialize the Stranger Code application.
@@ -138,6 +149,10 @@ class DeepAgentsApp(App):
             cwd: Current working directory to display
             thread_id: Optional thread ID for session persistence
             no_splash: Skip the Stranger Things intro sequence
+            durability: Checkpoint durability mode ("exit", "async-batched", "sync")
+            store: Open session store backing the agent's checkpointer
+            bootstrap: Builds the agent in the background when `agent` is not given;
+                messages sent before it is ready are queued
             **kwargs: Additional arguments passed to parent
         """
         super().__init__(**kwargs)
@@ -149,6 +164,11 @@ class DeepAgentsApp(App):
         # Avoid collision with App._thread_id
         self._lc_thread_id = thread_id
         self._no_splash = no_splash
+        self._durability = durability
+        self._store = store
+        self._bootstrap = bootstrap
+        # Messages submitted before the bootstrap finished, run in order once it has
+        self._queued_messages: list[str] = []
         self._splash_complete = False
         self._status_bar: StatusBar | None = None
         self._chat_input: ChatInput | None = None
@@ -162,6 +182,7 @@ class DeepAgentsApp(App):
         self._agent_running = False
         self._loading_widget: LoadingWidget | None = None
         self._token_tracker: TextualTokenTracker | None = None
+        self._perf_log: PerfLog | None = None
         # Christmas mode (Joyce's lights!)
         self._christmas_mode = False
         self._christmas_lights: ChristmasLights | None = None
@@ -187,8 +208,10 @@ class DeepAgentsApp(App):
         # Status bar at bottom
         yield StatusBar(cwd=self._cwd, id="status-bar")
 
-        # Splash screen overlay (if not skipped)
+        # Splash screen overlay (if not skipped); imported only when shown
         if not self._no_splash:
+            from stranger_code.widgets.splash import SplashOverlay
+
             yield SplashOverlay(id="splash-overlay")
 
     async def on_mount(self) -> None:
@@ -204,21 +227,19 @@ class DeepAgentsApp(App):
         self._session_state = TextualSessionState(
             auto_approve=self._auto_approve,
             thread_id=self._lc_thread_id,
+            durability=self._durability,
         )
 
         # Create token tracker that updates status bar
         self._token_tracker = TextualTokenTracker(self._update_tokens)
+        self._perf_log = PerfLog(self._update_perf)
 
-        # Create UI adapter if agent is provided
+        # Create UI adapter if agent is provided, otherwise build it in the background
         if self._agent:
-            self._ui_adapter = TextualUIAdapter(
-                mount_message=self._mount_message,
-                update_status=self._update_status,
-                request_approval=self._request_approval,
-                on_auto_approve_enabled=self._on_auto_approve_enabled,
-                scroll_to_bottom=self._scroll_chat_to_bottom,
-            )
-            self._ui_adapter.set_token_tracker(self._token_tracker)
+            self._attach_agent(self._agent, self._backend)
+        elif self._bootstrap:
+            self._on_bootstrap_progress(self._bootstrap)
+            self.run_worker(self._run_bootstrap(), exclusive=False)
 
         # Focus handling
         if self._no_splash:
@@ -233,6 +254,49 @@ class DeepAgentsApp(App):
             except NoMatches:
                 pass
 
+    def _attach_agent(self, agent: Pregel, backend: Any) -> None:  # noqa: ANN401
+        """Use `agent` for new messages and create the UI adapter that drives it."""
+        self._agent = agent
+        self._backend = backend
+        self._ui_adapter = TextualUIAdapter(
+            mount_message=self._mount_message,
+            update_status=self._update_status,
+            request_approval=self._request_approval,
+            on_auto_approve_enabled=self._on_auto_approve_enabled,
+            scroll_to_bottom=self._scroll_chat_to_bottom,
+        )
+        self._ui_adapter.set_token_tracker(self._token_tracker)
+        self._ui_adapter.set_perf_log(self._perf_log)
+
+    async def _run_bootstrap(self) -> None:
+        """Build the agent while the UI is usable, then run any queued messages."""
+        from stranger_code.bootstrap import BootstrapError
+
+        # Keeps the sandbox's elapsed time ticking between progress events
+        ticker = self.set_interval(1.0, lambda: self._on_bootstrap_progress(self._bootstrap))
+        try:
+            agent, backend = await self._bootstrap.run(self._on_bootstrap_progress)
+        except BootstrapError:
+            # The CLI prints the error (and the steps' output) once the terminal is back
+            self.exit(return_code=1)
+            return
+        finally:
+            ticker.stop()
+        self._attach_agent(agent, backend)
+        if self._status_bar:
+            self._status_bar.set_readiness("")
+        self._update_status("")
+        if self._queued_messages and not self._agent_running:
+            await self._start_agent_turn(self._queued_messages.pop(0))
+
+    def _on_bootstrap_progress(self, bootstrap: AgentBootstrap) -> None:
+        """Show start-up progress (and the latest step output) in the status bar."""
+        if not self._status_bar or bootstrap.ready:
+            return
+        self._status_bar.set_readiness(bootstrap.describe())
+        if bootstrap.log:
+            self._update_status(bootstrap.log[-1])
+
     def on_splash_complete(self, event: SplashComplete) -> None:
         """Handle splash screen completion - focus input and mark complete."""
         self._splash_complete = True
@@ -272,6 +336,11 @@ class DeepAgentsApp(App):
         if self._status_bar:
             self._status_bar.set_tokens(count)
 
+    def _update_perf(self, metrics: TurnMetrics) -> None:
+        """Show the latency summary of the last turn in the status bar."""
+        if self._status_bar:
+            self._status_bar.set_perf(metrics.summary())
+
     def _scroll_chat_to_bottom(self) -> None:
         """Scroll the chat area to the bottom.
 
@@ -445,7 +514,10 @@ class DeepAgentsApp(App):
         elif cmd == "/help":
             await self._mount_message(UserMessage(command))
             await self._mount_message(
-                SystemMessage("Commands: /quit, /clear, /tokens, /threads, /christmas, /help")
+                SystemMessage(
+                    "Commands: /quit, /clear, /tokens, /perf, /threads, /fork, /stats, "
+                    "/christmas, /help"
+                )
             )
         elif cmd == "/clear":
             await self._clear_messages()
@@ -461,6 +533,12 @@ class DeepAgentsApp(App):
                 )
             else:
                 await self._mount_message(SystemMessage("No active session"))
+        elif cmd == "/fork":
+            await self._mount_message(UserMessage(command))
+            await self._fork_session()
+        elif cmd == "/stats":
+            await self._mount_message(UserMessage(command))
+            await self._show_thread_stats()
         elif cmd == "/tokens":
             await self._mount_message(UserMessage(command))
             if self._token_tracker and self._token_tracker.current_context > 0:
@@ -472,12 +550,62 @@ class DeepAgentsApp(App):
                 await self._mount_message(SystemMessage(f"Current context: {formatted} tokens"))
             else:
                 await self._mount_message(SystemMessage("No token usage yet"))
+        elif cmd == "/perf":
+            await self._mount_message(UserMessage(command))
+            await self._show_perf()
         elif cmd == "/christmas":
             await self._toggle_christmas_mode()
         else:
             await self._mount_message(UserMessage(command))
             await self._mount_message(SystemMessage(f"Unknown command: {cmd}"))
 
+    async def _fork_session(self) -> None:
+        """Branch the current thread and continue the conversation on the branch."""
+        if not self._session_state or self._store is None:
+            await self._mount_message(SystemMessage("No active session"))
+            return
+        if self._agent_running:
+            await self._mount_message(SystemMessage("Wait for the agent to finish before forking"))
+            return
+        parent_id = self._session_state.thread_id
+        fork_id = await self._store.fork_thread(parent_id)
+        if fork_id is None:
+            await self._mount_message(SystemMessage("Nothing to fork yet - send a message first"))
+            return
+        self._session_state.thread_id = fork_id
+        await self._mount_message(
+            SystemMessage(f"Forked {parent_id} → {fork_id} (now on {fork_id})")
+        )
+
+    async def _show_perf(self) -> None:
+        """Show the latency breakdown of recent turns."""
+        if not self._perf_log or not self._perf_log.turns:
+            await self._mount_message(SystemMessage("No turns timed yet"))
+            return
+        turns = list(self._perf_log.turns)
+        lines = turns[-1].breakdown()
+        if len(turns) > 1:
+            lines.append("Earlier turns:")
+            lines.extend(f"  {turn.summary()}" for turn in reversed(turns[-6:-1]))
+        lines.append(f"Log: {self._perf_log.path}")
+        await self._mount_message(SystemMessage("\n".join(lines)))
+
+    async def _show_thread_stats(self) -> None:
+        """Show how much storage the current thread's checkpoints use."""
+        if not self._session_state or self._store is None:
+            await self._mount_message(SystemMessage("No active session"))
+            return
+        from stranger_code.sessions import describe_thread_stats
+
+        thread_id = self._session_state.thread_id
+        stats = await self._store.thread_stats([thread_id])
+        if thread_id not in stats:
+            await self._mount_message(SystemMessage("Nothing saved yet - send a message first"))
+            return
+        await self._mount_message(
+            SystemMessage(f"{thread_id}: {describe_thread_stats(stats[thread_id])}")
+        )
+
     async def _handle_user_message(self, message: str) -> None:
         """Handle a user message to send to the agent.
 
@@ -487,6 +615,19 @@ class DeepAgentsApp(App):
         # Mount the user message
         await self._mount_message(UserMessage(message))
 
+        # Hold the message until the background bootstrap has built the agent
+        if not self._agent and self._bootstrap is not None and self._bootstrap.error is None:
+            self._queued_messages.append(message)
+            waiting = ", ".join(self._bootstrap.waiting_for)
+            await self._mount_message(
+                SystemMessage(f"Queued until the agent is ready (waiting for {waiting})")
+            )
+            return
+
+        await self._start_agent_turn(message)
+
+    async def _start_agent_turn(self, message: str) -> None:
+        """Run `message` through the agent in a worker, or explain why it cannot run."""
         # Check if agent is available
         if self._agent and self._ui_adapter and self._session_state:
             # Show loading widget
@@ -544,6 +685,10 @@ class DeepAgentsApp(App):
         if self._chat_input:
             self._chat_input.set_cursor_active(active=True)
 
+        # Messages queued during start-up run one after another
+        if self._queued_messages and self._agent:
+            await self._start_agent_turn(self._queued_messages.pop(0))
+
     async def _mount_message(self, widget: Static) -> None:
         """Mount a message widget to the messages area.
 
@@ -629,6 +774,12 @@ class DeepAgentsApp(App):
         # If approval menu is active, reject it
         if self._pending_approval_widget:
             self._pending_approval_widget.action_select_reject()
+            return
+
+        # Drop messages still waiting for the agent to start
+        if self._queued_messages:
+            self._queued_messages.clear()
+            self.notify("Queued messages discarded", timeout=3)
 
     def action_quit_app(self) -> None:
         """Handle quit action (Ctrl+D)."""
@@ -718,7 +869,10 @@ async def run_textual_app(
     cwd: str | Path | None = None,
     thread_id: str | None = None,
     no_splash: bool = False,
-) -> None:
+    durability: str = "exit",
+    store: SessionStore | None = None,
+    bootstrap: AgentBootstrap | None = None,
+) -> int:
     """Run the Stranger Code Textual application.
 
     Args:
@@ -729,6 +883,12 @@ async def run_textual_app(
         cwd: Current working directory to display
         thread_id: Optional thread ID for session persistence
         no_splash: Skip the Stranger Things intro sequence
+        durability: Checkpoint durability mode ("exit", "async-batched", "sync")
+        store: Open session store backing the agent's checkpointer
+        bootstrap: Builds the agent in the background when `agent` is not given
+
+    Returns:
+        The app's return code (1 if the bootstrap failed)
     """
     app = DeepAgentsApp(
         agent=agent,
@@ -738,8 +898,12 @@ async def run_textual_app(
         cwd=cwd,
         thread_id=thread_id,
         no_splash=no_splash,
+        durability=durability,
+        store=store,
+        bootstrap=bootstrap,
     )
     await app.run_async()
+    return app.return_code or 0
 
 
 if __name__ == "__main__":
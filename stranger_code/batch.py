@@ -0,0 +1,386 @@
+"""Run many prompts concurrently through one agent: `stranger-code batch`.
+
+All tasks share one model client, one checkpointer connection and one agent
+graph; each runs as an asyncio job on its own thread_id through the headless
+adapter (see stranger_code.headless). A semaphore caps concurrency, each
+attempt has a timeout, and failed or timed-out tasks are retried on a fresh
+thread.
+
+The tasks file has one JSON object per line:
+    {"id": "fix-123", "prompt": "Fix the failing test in tests/test_api.py"}
+`id` defaults to the line number and `timeout` (seconds) overrides
+--timeout. A bare JSON string is accepted as the prompt.
+
+Each finished task is appended to the results file as it completes:
+    {"id", "thread_id", "status", "attempts", "latency_s", "ttft_ms",
+     "input_tokens", "output_tokens", "output", "error"}
+
+Usage:
+    stranger-code batch tasks.jsonl --concurrency 8 --approve all
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from rich.table import Table
+
+from stranger_code.config import COLORS, console
+from stranger_code.headless import JSONLWriter, run_exec
+from stranger_code.sessions import generate_thread_id
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 600.0
+DEFAULT_RETRIES = 1
+
+# Seconds before the first retry; doubled on each further attempt
+_RETRY_BACKOFF = 2.0
+
+
+@dataclass
+class BatchTask:
+    """One prompt from the tasks file."""
+
+    id: str
+    prompt: str
+    timeout: float | None = None
+
+
+@dataclass
+class TaskResult:
+    """Outcome of one task (the last attempt, if it was retried)."""
+
+    id: str
+    thread_id: str | None = None
+    status: str = "pending"
+    attempts: int = 0
+    latency_s: float = 0.0
+    ttft_ms: float | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    output: str = ""
+    error: str | None = None
+
+
+@dataclass
+class BatchReport:
+    """Aggregate results of a batch run."""
+
+    results: list[TaskResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        """Tasks that ran to completion (including ones whose tools were rejected)."""
+        return sum(result.status in ("completed", "rejected") for result in self.results)
+
+    @property
+    def tasks_per_minute(self) -> float:
+        """Finished tasks per minute of wall time."""
+        return self.succeeded / self.wall_seconds * 60 if self.wall_seconds else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Output tokens per second of wall time, across all tasks."""
+        tokens = sum(result.output_tokens for result in self.results)
+        return tokens / self.wall_seconds if self.wall_seconds else 0.0
+
+    def latency(self, pct: float) -> float:
+        """Task latency at the given percentile (0-100), in seconds."""
+        latencies = sorted(result.latency_s for result in self.results if result.attempts)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, round(pct / 100 * (len(latencies) - 1)))]
+
+
+class _TaskRecorder(JSONLWriter):
+    """Collects one attempt's output and usage, optionally forwarding its events."""
+
+    def __init__(self, task_id: str, events: JSONLWriter | None) -> None:
+        super().__init__()
+        self._task_id = task_id
+        self._events = events
+        self.text: list[str] = []
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.ttft_ms: float | None = None
+
+    def emit(self, event_type: str, **fields: Any) -> None:
+        if event_type == "text_delta":
+            self.text.append(fields["text"])
+        elif event_type == "usage":
+            self.input_tokens += fields["input_tokens"]
+            self.output_tokens += fields["output_tokens"]
+        elif event_type == "timing" and self.ttft_ms is None:
+            self.ttft_ms = fields["ttft_ms"]
+        if self._events:
+            self._events.emit(event_type, task=self._task_id, **fields)
+
+
+def load_tasks(path: Path) -> list[BatchTask]:
+    """Parse a tasks JSONL file.
+
+    Raises:
+        ValueError: A line is not valid JSON or has no prompt
+    """
+    tasks = []
+    for number, line in enumerate(path.read_text().splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as e:
+            msg = f"{path}:{number}: invalid JSON ({e.msg})"
+            raise ValueError(msg) from e
+        if isinstance(entry, str):
+            entry = {"prompt": entry}
+        if not isinstance(entry, dict) or not str(entry.get("prompt", "")).strip():
+            msg = f"{path}:{number}: expected an object with a non-empty 'prompt'"
+            raise ValueError(msg)
+        timeout = entry.get("timeout")
+        tasks.append(
+            BatchTask(
+                id=str(entry.get("id", number)),
+                prompt=str(entry["prompt"]),
+                timeout=float(timeout) if timeout is not None else None,
+            )
+        )
+    return tasks
+
+
+async def _run_task(
+    task: BatchTask,
+    *,
+    agent: Any,  # noqa: ANN401
+    assistant_id: str,
+    approve: str,
+    durability: str,
+    task_timeout: float,
+    retries: int,
+    backend: Any,  # noqa: ANN401
+    events: JSONLWriter | None,
+) -> TaskResult:
+    result = TaskResult(id=task.id)
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(_RETRY_BACKOFF * 2 ** (attempt - 1))
+        result.attempts = attempt + 1
+        result.thread_id = generate_thread_id()
+        recorder = _TaskRecorder(task.id, events)
+        start = time.perf_counter()
+        error = None
+        try:
+            async with asyncio.timeout(task.timeout or task_timeout) as deadline:
+                status = await run_exec(
+                    task.prompt,
+                    agent=agent,
+                    assistant_id=assistant_id,
+                    thread_id=result.thread_id,
+                    approve=approve,
+                    durability=durability,
+                    backend=backend,
+                    writer=recorder,
+                )
+            # execute_task_textual absorbs its own cancellation and reports an interrupt
+            if deadline.expired():
+                status = "timeout"
+        except TimeoutError:
+            status = "timeout"
+        except Exception as e:  # noqa: BLE001
+            status, error = "error", f"{type(e).__name__}: {e}"
+        if status == "timeout":
+            error = f"Timed out after {task.timeout or task_timeout:g}s"
+
+        result.status = status
+        result.error = error
+        result.latency_s = time.perf_counter() - start
+        result.ttft_ms = recorder.ttft_ms
+        result.input_tokens = recorder.input_tokens
+        result.output_tokens = recorder.output_tokens
+        result.output = "".join(recorder.text)
+        if status in ("completed", "rejected"):
+            break
+    return result
+
+
+async def run_batch(
+    tasks: list[BatchTask],
+    *,
+    agent: Any,  # noqa: ANN401
+    assistant_id: str,
+    approve: str = "none",
+    durability: str = "exit",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    task_timeout: float = DEFAULT_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    backend: Any = None,  # noqa: ANN401
+    results_file: IO[str] | None = None,
+    events: JSONLWriter | None = None,
+) -> BatchReport:
+    """Run `tasks` on one shared agent graph, at most `concurrency` at a time.
+
+    Args:
+        tasks: Prompts to run, each on a new thread
+        agent: Compiled agent graph shared by all tasks
+        assistant_id: Agent identifier
+        approve: Approval policy for gated tools (see headless.APPROVAL_POLICIES)
+        durability: Checkpoint durability mode of the agent's session store
+        concurrency: Maximum tasks in flight
+        task_timeout: Default per-attempt timeout in seconds
+        retries: Extra attempts for tasks that error or time out
+        backend: Backend from create_cli_agent (for diffs)
+        results_file: Stream receiving one JSON result per finished task
+        events: Writer receiving every task's events, tagged with the task id
+
+    Returns:
+        Per-task results in input order, with the batch wall time
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    report = BatchReport()
+
+    async def worker(task: BatchTask) -> TaskResult:
+        async with semaphore:
+            result = await _run_task(
+                task,
+                agent=agent,
+                assistant_id=assistant_id,
+                approve=approve,
+                durability=durability,
+                task_timeout=task_timeout,
+                retries=retries,
+                backend=backend,
+                events=events,
+            )
+        if results_file is not None:
+            results_file.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+            results_file.flush()
+        return result
+
+    start = time.perf_counter()
+    report.results = list(await asyncio.gather(*(worker(task) for task in tasks)))
+    report.wall_seconds = time.perf_counter() - start
+    return report
+
+
+def print_batch_report(report: BatchReport, *, concurrency: int) -> None:
+    """Print throughput and latency for a finished batch."""
+    table = Table(
+        title=f"Batch of {len(report.results)} tasks (concurrency {concurrency})",
+        show_header=True,
+        header_style=f"bold {COLORS['primary']}",
+    )
+    table.add_column("Metric", style="bold")
+    table.add_column("Value", justify="right")
+    statuses: dict[str, int] = {}
+    for result in report.results:
+        statuses[result.status] = statuses.get(result.status, 0) + 1
+    table.add_row("Status", ", ".join(f"{name} {n}" for name, n in sorted(statuses.items())))
+    table.add_row("Retried", str(sum(result.attempts > 1 for result in report.results)))
+    table.add_row("Wall time", f"{report.wall_seconds:.1f} s")
+    table.add_row("Throughput", f"{report.tasks_per_minute:.1f} tasks/min")
+    table.add_row("Output tokens", f"{report.tokens_per_second:.1f} tokens/s")
+    table.add_row(
+        "Task latency",
+        f"p50 {report.latency(50):.1f} s · p95 {report.latency(95):.1f} s · "
+        f"max {report.latency(100):.1f} s",
+    )
+    ttfts = [result.ttft_ms for result in report.results if result.ttft_ms is not None]
+    if ttfts:
+        table.add_row("Time to first token", f"median {statistics.median(ttfts):.0f} ms")
+
+    console.print()
+    console.print(table)
+    console.print()
+
+
+async def batch_command(
+    tasks_path: str,
+    *,
+    results_path: str | None = None,
+    events_path: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    task_timeout: float = DEFAULT_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    approve: str = "none",
+    assistant_id: str = "agent",
+    model_name: str | None = None,
+    durability: str = "exit",
+) -> int:
+    """CLI handler for: stranger-code batch.
+
+    Returns:
+        Process exit code: 0 if every task finished, 1 otherwise
+    """
+    from stranger_code.agent import create_cli_agent
+    from stranger_code.config import create_model, settings
+    from stranger_code.sessions import SessionRouter, get_checkpointer
+    from stranger_code.tools import fetch_url, http_request, web_search
+
+    path = Path(tasks_path)
+    try:
+        tasks = load_tasks(path)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]❌ {e}[/red]")
+        return 1
+    if not tasks:
+        console.print(f"[yellow]No tasks in {path}[/yellow]")
+        return 0
+    results = Path(results_path) if results_path else path.with_suffix(".results.jsonl")
+    event_log = Path(events_path) if events_path else None
+
+    model = create_model(model_name)
+    tools = [http_request, fetch_url]
+    if settings.has_tavily:
+        tools.append(web_search)
+
+    console.print(
+        f"[dim]Running {len(tasks)} tasks with concurrency {concurrency} (results: {results})[/dim]"
+    )
+    async with SessionRouter(durability=durability) as router:
+        store = await router.store_for(assistant_id)
+        async with get_checkpointer(store) as checkpointer:
+            agent, backend = create_cli_agent(
+                model=model,
+                assistant_id=assistant_id,
+                tools=tools,
+                auto_approve=approve == "all",
+                checkpointer=checkpointer,
+            )
+            with contextlib.ExitStack() as files:
+                results_file = files.enter_context(results.open("w", encoding="utf-8"))
+                events = None
+                if event_log is not None:
+                    events = JSONLWriter(files.enter_context(event_log.open("w", encoding="utf-8")))
+                report = await run_batch(
+                    tasks,
+                    agent=agent,
+                    assistant_id=assistant_id,
+                    approve=approve,
+                    durability=store.durability,
+                    concurrency=concurrency,
+                    task_timeout=task_timeout,
+                    retries=retries,
+                    backend=backend,
+                    results_file=results_file,
+                    events=events,
+                )
+
+    print_batch_report(report, concurrency=concurrency)
+    return 0 if report.succeeded == len(report.results) else 1
+
+
+__all__ = [
+    "BatchReport",
+    "BatchTask",
+    "TaskResult",
+    "batch_command",
+    "load_tasks",
+    "run_batch",
+]
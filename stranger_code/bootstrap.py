@@ -0,0 +1,264 @@
+"""Build the agent in the background while the UI starts.
+
+`AgentBootstrap` creates the model client, opens the checkpointer and
+provisions the sandbox concurrently, then compiles the agent once all three
+are ready. The Textual app runs it in a worker right after mounting, so the
+splash and the prompt render immediately; messages sent before the agent is
+ready are queued by the app, and the status bar shows each step's progress.
+
+Console output from these steps (e.g. sandbox provisioning notes) would be
+swallowed while Textual owns the terminal, so it is relayed to the status bar
+and kept in `log`, which the CLI prints if the bootstrap fails.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import time
+from typing import TYPE_CHECKING, Any
+
+from stranger_code.config import console, settings
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from pathlib import Path
+
+    from stranger_code.sessions import SessionStore
+
+STEP_PENDING = "pending"
+STEP_RUNNING = "running"
+STEP_READY = "ready"
+STEP_FAILED = "failed"
+
+_STEP_ICONS = {STEP_PENDING: "·", STEP_RUNNING: "…", STEP_READY: "✓", STEP_FAILED: "✗"}
+
+
+class BootstrapError(RuntimeError):
+    """A bootstrap step failed; the message is suitable for the terminal."""
+
+
+class _ConsoleRelay(io.TextIOBase):
+    """File-like console target that forwards each complete line to a callback."""
+
+    def __init__(self, on_line: Callable[[str], None]) -> None:
+        self._on_line = on_line
+        self._buffer = ""
+
+    def write(self, text: str) -> int:
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                self._on_line(line.rstrip())
+        return len(text)
+
+    def isatty(self) -> bool:
+        return False
+
+
+class AgentBootstrap:
+    """Builds the model, checkpointer, sandbox and agent for the TUI concurrently."""
+
+    def __init__(
+        self,
+        assistant_id: str,
+        *,
+        model_name: str | None = None,
+        auto_approve: bool = False,
+        sandbox_type: str = "none",
+        sandbox_id: str | None = None,
+        sandbox_setup: str | None = None,
+        sandbox_pool: int = 0,
+        sync_dir: Path | None = None,
+        store: SessionStore | None = None,
+    ) -> None:
+        """Initialize the bootstrap (nothing starts until `run`).
+
+        Args:
+            assistant_id: Agent identifier
+            model_name: Model override (None for the environment default)
+            auto_approve: Compile the agent without HITL interrupts
+            sandbox_type: Sandbox provider, or "none" for local execution
+            sandbox_id: Existing sandbox to reuse
+            sandbox_setup: Setup script to run in the sandbox
+            sandbox_pool: Warm sandboxes to keep in the shared pool (0 disables pooling)
+            sync_dir: Local project to mirror into the sandbox (changes pulled back on close)
+            store: Open session store for the checkpointer
+        """
+        self._assistant_id = assistant_id
+        self._model_name = model_name
+        self._auto_approve = auto_approve
+        self._sandbox_type = sandbox_type
+        self._sandbox_id = sandbox_id
+        self._sandbox_setup = sandbox_setup
+        self._sandbox_pool = sandbox_pool
+        self._sync_dir = sync_dir
+        self._store = store
+        self._stack = contextlib.AsyncExitStack()
+        self._on_progress: Callable[[AgentBootstrap], None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._started = 0.0
+        names = ["model", "sessions", *(["sandbox"] if sandbox_type != "none" else []), "agent"]
+        self.steps = dict.fromkeys(names, STEP_PENDING)
+        # Seconds from `run` until each step finished
+        self.timings: dict[str, float] = {}
+        self.log: list[str] = []
+        self.error: str | None = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the agent has been built."""
+        return self.steps["agent"] == STEP_READY
+
+    @property
+    def waiting_for(self) -> list[str]:
+        """Steps that have not finished yet."""
+        return [name for name, state in self.steps.items() if state != STEP_READY]
+
+    def describe(self) -> str:
+        """One-line progress summary, e.g. "model ✓ · sandbox 12s… · agent ·"."""
+        parts = []
+        for name, state in self.steps.items():
+            elapsed = ""
+            if state == STEP_RUNNING and name == "sandbox":
+                elapsed = f" {time.perf_counter() - self._started:.0f}s"
+            parts.append(f"{name}{elapsed} {_STEP_ICONS[state]}")
+        return " · ".join(parts)
+
+    async def run(self, on_progress: Callable[[AgentBootstrap], None] | None = None) -> tuple:
+        """Build everything; returns (agent, backend).
+
+        Args:
+            on_progress: Called on the event loop whenever a step changes state or
+                a step prints a line (latest line is the last entry of `log`)
+
+        Raises:
+            BootstrapError: A step failed (details in `error` and `log`)
+        """
+        from stranger_code.agent import create_cli_agent
+        from stranger_code.config import create_model
+        from stranger_code.sessions import get_checkpointer
+        from stranger_code.tools import fetch_url, http_request, web_search
+
+        self._on_progress = on_progress
+        self._loop = asyncio.get_running_loop()
+        self._started = time.perf_counter()
+        previous_file = console.file
+        console.file = _ConsoleRelay(self._relay)
+        try:
+            checkpointer_cm = get_checkpointer(self._store)
+            model, checkpointer, sandbox = await asyncio.gather(
+                self._step("model", self._create_model(create_model)),
+                self._step("sessions", self._stack.enter_async_context(checkpointer_cm)),
+                self._step("sandbox", self._create_sandbox()),
+            )
+            tools = [http_request, fetch_url]
+            if settings.has_tavily:
+                tools.append(web_search)
+            try:
+                agent, backend = await self._step(
+                    "agent",
+                    asyncio.to_thread(
+                        create_cli_agent,
+                        model=model,
+                        assistant_id=self._assistant_id,
+                        tools=tools,
+                        sandbox=sandbox,
+                        sandbox_type=self._sandbox_type if sandbox is not None else None,
+                        auto_approve=self._auto_approve,
+                        checkpointer=checkpointer,
+                    ),
+                )
+            except Exception as e:  # noqa: BLE001
+                self._fail(f"Failed to create agent: {e}")
+        finally:
+            console.file = previous_file
+        return agent, backend
+
+    async def aclose(self) -> None:
+        """Close the checkpointer and tear down the sandbox.
+
+        Waits for a sandbox that is still being provisioned, so that it is not
+        left running when the user quits early.
+        """
+        await self._stack.aclose()
+
+    async def _step(self, name: str, work: Awaitable[Any]) -> Any:  # noqa: ANN401
+        if name not in self.steps:
+            return await work
+        self._set(name, STEP_RUNNING)
+        try:
+            result = await work
+        except BaseException:
+            self._set(name, STEP_FAILED)
+            raise
+        self.timings[name] = time.perf_counter() - self._started
+        self._set(name, STEP_READY)
+        return result
+
+    async def _create_model(self, create_model: Callable[[str | None], Any]) -> Any:  # noqa: ANN401
+        try:
+            return await asyncio.to_thread(create_model, self._model_name)
+        except SystemExit:
+            # create_model has already explained the problem (relayed into `log`)
+            self._fail("No usable model configuration")
+
+    async def _create_sandbox(self) -> Any:  # noqa: ANN401
+        if self._sandbox_type == "none":
+            return None
+        from stranger_code.integrations.sandbox_factory import create_sandbox
+
+        sandbox_cm = create_sandbox(
+            self._sandbox_type,
+            sandbox_id=self._sandbox_id,
+            setup_script_path=self._sandbox_setup,
+            pool_size=self._sandbox_pool,
+            sync_dir=self._sync_dir,
+        )
+        enter = asyncio.ensure_future(asyncio.to_thread(sandbox_cm.__enter__))
+        # Registered before waiting: a sandbox that finishes provisioning after
+        # the user quit must still be torn down
+        self._stack.push_async_callback(_exit_sandbox, sandbox_cm, enter)
+        try:
+            return await asyncio.shield(enter)
+        except (ImportError, ValueError, RuntimeError, NotImplementedError) as e:
+            self._fail(f"Sandbox creation failed: {e}")
+
+    def _fail(self, message: str) -> None:
+        self.error = self.error or message
+        raise BootstrapError(message)
+
+    def _relay(self, line: str) -> None:
+        # Steps print from worker threads; progress callbacks run on the loop
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._log, line)
+
+    def _log(self, line: str) -> None:
+        self.log.append(line)
+        self._notify()
+
+    def _set(self, name: str, state: str) -> None:
+        self.steps[name] = state
+        self._notify()
+
+    def _notify(self) -> None:
+        if self._on_progress is not None:
+            self._on_progress(self)
+
+
+async def _exit_sandbox(sandbox_cm: Any, enter: asyncio.Future) -> None:  # noqa: ANN401
+    try:
+        await enter
+    except Exception:  # noqa: BLE001
+        return  # Never provisioned, nothing to tear down
+    with contextlib.suppress(Exception):
+        await asyncio.to_thread(sandbox_cm.__exit__, None, None, None)
+
+
+__all__ = [
+    "AgentBootstrap",
+    "BootstrapError",
+]
@@ -0,0 +1,184 @@
+"""Compressed checkpoint serialization for the sessions database.
+
+Checkpoints carry the full message list (tool outputs, embedded @file contents),
+so blobs are large and highly repetitive. `CompressedSerializer` wraps LangGraph's
+msgpack-based `JsonPlusSerializer` and zstd-compresses its output, optionally with
+a dictionary trained on the user's own checkpoints.
+
+The codec is recorded in the `type` column using LangGraph's `<type>+<codec>`
+convention (as `EncryptedSerializer` does), so rows written before compression
+was enabled - plain `msgpack`/`json` types - keep loading unchanged.
+"""
+
+from __future__ import annotations
+
+import threading
+import zlib
+from typing import Any
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - a declared dependency, but fall back to zlib
+    zstandard = None
+
+# Payloads smaller than this aren't worth a compression frame
+_MIN_COMPRESS_BYTES = 128
+
+# zstd level 3 is the library default: ~300 MB/s compression with a good ratio
+_ZSTD_LEVEL = 3
+_ZLIB_LEVEL = 6
+
+# Size of trained dictionaries (zstd's recommended default, 110 KB)
+DICTIONARY_SIZE = 112_640
+
+
+def split_type(type_: str) -> tuple[str, str | None]:
+    """Split a stored type into (serializer type, codec or None)."""
+    base, sep, codec = type_.partition("+")
+    return base, (codec if sep else None)
+
+
+class CompressedSerializer(SerializerProtocol):
+    """Serializer that compresses the output of another serializer.
+
+    Codecs written to the type column:
+        - `zstd`: plain zstd frame
+        - `zstd:<id>`: zstd frame using trained dictionary `<id>`
+        - `zlib`: fallback when the zstandard package is unavailable
+    """
+
+    def __init__(
+        self,
+        serde: SerializerProtocol | None = None,
+        *,
+        dictionaries: dict[int, bytes] | None = None,
+        active_dictionary: int | None = None,
+    ) -> None:
+        """Initialize the serializer.
+
+        Args:
+            serde: Serializer producing the uncompressed payload (JsonPlusSerializer)
+            dictionaries: Trained zstd dictionaries by id, needed to read older rows
+            active_dictionary: Dictionary id to compress new payloads with
+        """
+        self.serde = serde or JsonPlusSerializer()
+        self._dictionaries = dict(dictionaries or {})
+        self._active_dictionary = (
+            active_dictionary if active_dictionary in self._dictionaries else None
+        )
+        # zstd (de)compressor objects are not thread-safe; the sync saver API
+        # calls in from worker threads, so keep one set per thread.
+        self._local = threading.local()
+
+    def dumps(self, obj: Any) -> bytes:  # noqa: ANN401
+        """Serialize without compression (untyped API)."""
+        return self.serde.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:  # noqa: ANN401
+        """Deserialize uncompressed data (untyped API)."""
+        return self.serde.loads(data)
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:  # noqa: ANN401
+        """Serialize an object and compress the payload if it is large enough."""
+        return self.compress_typed(*self.serde.dumps_typed(obj))
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:  # noqa: ANN401
+        """Decompress (if needed) and deserialize a stored payload."""
+        return self.serde.loads_typed(self.decompress_typed(*data))
+
+    def compress_typed(self, type_: str, data: bytes) -> tuple[str, bytes]:
+        """Compress an already-serialized (type, bytes) pair if it is large enough."""
+        if len(data) < _MIN_COMPRESS_BYTES:
+            return type_, data
+        codec, compressed = self.compress(data)
+        return f"{type_}+{codec}", compressed
+
+    def decompress_typed(self, type_: str, data: bytes) -> tuple[str, bytes]:
+        """Undo `compress_typed`, returning the serializer's own (type, bytes)."""
+        base, codec = split_type(type_)
+        if codec is None:
+            return type_, data
+        return base, self.decompress(codec, data)
+
+    @property
+    def codec(self) -> str:
+        """Codec tag used for newly compressed payloads."""
+        if zstandard is None:
+            return "zlib"
+        return "zstd" if self._active_dictionary is None else f"zstd:{self._active_dictionary}"
+
+    def compress(self, data: bytes) -> tuple[str, bytes]:
+        """Compress raw bytes with the best available codec.
+
+        Returns:
+            (codec, compressed bytes)
+        """
+        if zstandard is None:
+            return "zlib", zlib.compress(data, _ZLIB_LEVEL)
+        return self.codec, self._compressor().compress(data)
+
+    def decompress(self, codec: str, data: bytes) -> bytes:
+        """Decompress bytes written with `codec`."""
+        if codec == "zlib":
+            return zlib.decompress(data)
+        name, _, dictionary_id = codec.partition(":")
+        if name != "zstd":
+            msg = f"Unknown checkpoint compression codec: {codec}"
+            raise NotImplementedError(msg)
+        if zstandard is None:
+            msg = "zstandard package is required to read compressed checkpoints"
+            raise ImportError(msg)
+        return self._decompressor(int(dictionary_id) if dictionary_id else None).decompress(data)
+
+    def _compressor(self) -> Any:  # noqa: ANN401
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            dictionary = self._zstd_dictionary(self._active_dictionary)
+            compressor = zstandard.ZstdCompressor(
+                level=_ZSTD_LEVEL, dict_data=dictionary, write_content_size=True
+            )
+            self._local.compressor = compressor
+        return compressor
+
+    def _decompressor(self, dictionary_id: int | None) -> Any:  # noqa: ANN401
+        decompressors = getattr(self._local, "decompressors", None)
+        if decompressors is None:
+            decompressors = self._local.decompressors = {}
+        if dictionary_id not in decompressors:
+            if dictionary_id is not None and dictionary_id not in self._dictionaries:
+                msg = f"Checkpoint compressed with unknown dictionary {dictionary_id}"
+                raise ValueError(msg)
+            decompressors[dictionary_id] = zstandard.ZstdDecompressor(
+                dict_data=self._zstd_dictionary(dictionary_id)
+            )
+        return decompressors[dictionary_id]
+
+    def _zstd_dictionary(self, dictionary_id: int | None) -> Any:  # noqa: ANN401
+        if dictionary_id is None:
+            return None
+        return zstandard.ZstdCompressionDict(self._dictionaries[dictionary_id])
+
+
+def train_dictionary(samples: list[bytes]) -> bytes | None:
+    """Train a zstd dictionary from uncompressed checkpoint payloads.
+
+    Returns:
+        Dictionary bytes, or None if zstandard is unavailable or there are too
+        few samples to train on.
+    """
+    if zstandard is None or len(samples) < 8:  # noqa: PLR2004
+        return None
+    try:
+        return zstandard.train_dictionary(DICTIONARY_SIZE, samples).as_bytes()
+    except zstandard.ZstdError:
+        return None
+
+
+__all__ = [
+    "CompressedSerializer",
+    "split_type",
+    "train_dictionary",
+]
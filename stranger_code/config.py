@@ -6,6 +6,7 @@ import sys
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import dotenv
 from rich.console import Console
@@ -23,8 +24,9 @@ if _deepagents_project:
     # Override LANGSMITH_PROJECT for agent traces
     os.environ["LANGSMITH_PROJECT"] = _deepagents_project
 
-# Now safe to import LangChain modules
-from langchain_core.language_models import BaseChatModel
+# LangChain is imported lazily (create_model, agent creation), always after this point
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
 
 # ============================================================================
 # STRANGER THINGS COLOR SCHEME
@@ -126,6 +128,12 @@ MAX_ARG_LENGTH = 150
 # Agent configuration
 config = {"recursion_limit": 1000}
 
+# Checkpoint durability modes exposed as --durability
+#   exit:          write once when the turn ends (LangGraph's "exit")
+#   async-batched: queue every step, flush grouped transactions in the background
+#   sync:          write every step before the next one starts
+DURABILITY_MODES = ("exit", "async-batched", "sync")
+
 # Rich console instance
 console = Console(highlight=False)
 
@@ -485,7 +493,7 @@ def _detect_provider(model_name: str) -> str | None:
     return None
 
 
-def create_model(model_name_override: str | None = None) -> BaseChatModel:
+def create_model(model_name_override: str | None = None) -> "BaseChatModel":
     """Create the appropriate model based on available API keys.
 
     Uses the global settings instance to determine which model to create.
@@ -0,0 +1,614 @@
+"""Warm background daemon for near-instant startup: `stranger-code --daemon`.
+
+Cold start imports the model provider SDKs, builds the model client, compiles
+the agent graph and opens sessions.db before the prompt appears. The daemon
+does that once and keeps it: model clients, one compiled graph per
+(agent, model, auto-approve) and an open SessionRouter. The TUI then attaches
+over a Unix socket through `RemoteAgent`, a stand-in for the compiled graph
+whose `astream` runs in the daemon and yields the same chunks locally, so
+rendering, approvals and telemetry stay in `execute_task_textual` unchanged.
+
+One daemon serves one working directory (the agent's filesystem and shell are
+rooted there); it is spawned on first use and exits after 30 idle minutes.
+Before each turn the daemon re-checks the agent's AGENTS.md files and skills
+and recompiles the graph if they changed. Clients compare a fingerprint of the
+model/API environment variables and the installed code with the daemon's and
+restart it on mismatch.
+
+Usage:
+    stranger-code --daemon               # Attach to (or spawn) the daemon
+    stranger-code daemon status|stop     # Inspect or stop it
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fcntl
+import functools
+import hashlib
+import json
+import os
+import select
+import subprocess
+import sys
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langgraph.types import Command, Interrupt
+
+from stranger_code.config import console, settings
+from stranger_code.server import HTTPError, json_response, read_request
+from stranger_code.sessions import SHARDING_ENV_VAR
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+DAEMON_DIR_NAME = "daemons"
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+# Seconds a client waits for a spawned daemon to accept connections
+_SPAWN_TIMEOUT = 30.0
+_IDLE_CHECK_INTERVAL = 30.0
+
+# Environment that shapes model clients, tools and tracing
+_ENV_KEYS = (
+    "OPENAI_API_KEY",
+    "ANTHROPIC_API_KEY",
+    "GOOGLE_API_KEY",
+    "TAVILY_API_KEY",
+    "OPENAI_MODEL",
+    "ANTHROPIC_MODEL",
+    "GOOGLE_MODEL",
+    "DEEPAGENTS_LANGSMITH_PROJECT",
+    "LANGSMITH_API_KEY",
+    "LANGSMITH_PROJECT",
+    "LANGSMITH_TRACING",
+    "LANGCHAIN_TRACING_V2",
+    SHARDING_ENV_VAR,
+)
+
+
+def daemon_paths(cwd: Path | None = None) -> tuple[Path, Path, Path]:
+    """Socket, log and lock file of the daemon serving `cwd`."""
+    cwd = (cwd or Path.cwd()).resolve()
+    key = hashlib.sha1(str(cwd).encode(), usedforsecurity=False).hexdigest()[:12]
+    base = settings.user_deepagents_dir / DAEMON_DIR_NAME / key
+    return base.with_suffix(".sock"), base.with_suffix(".log"), base.with_suffix(".lock")
+
+
+def env_fingerprint() -> str:
+    """Hash of the environment and code a daemon was started with."""
+    digest = hashlib.sha256()
+    for key in _ENV_KEYS:
+        digest.update(f"{key}={os.environ.get(key, '')}\0".encode())
+    package = Path(__file__).parent
+    for path in sorted(package.rglob("*.py")):
+        digest.update(f"{path.relative_to(package)}:{path.stat().st_mtime_ns}\0".encode())
+    return digest.hexdigest()[:16]
+
+
+def config_fingerprint(assistant_id: str) -> str:
+    """Hash of the memory and skill files the agent graph is built from."""
+    paths = [settings.get_user_agent_md_path(assistant_id)]
+    skill_dirs = [settings.get_user_skills_dir(assistant_id)]
+    if settings.project_root:
+        paths += [
+            settings.project_root / ".deepagents" / "AGENTS.md",
+            settings.project_root / "AGENTS.md",
+        ]
+        skill_dirs.append(settings.project_root / ".deepagents" / "skills")
+    for directory in skill_dirs:
+        if directory.is_dir():
+            paths += sorted(directory.rglob("*"))
+    digest = hashlib.sha256()
+    for path in paths:
+        with contextlib.suppress(OSError):
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}\0".encode())
+    return digest.hexdigest()[:16]
+
+
+def _encode_chunk(chunk: tuple) -> list | None:
+    """Wire form of an `astream` chunk, or None for updates the UI ignores."""
+    namespace, mode, data = chunk
+    if mode == "messages":
+        message, _metadata = data
+        return [list(namespace), mode, message_to_dict(message)]
+    if mode == "updates" and isinstance(data, dict) and "__interrupt__" in data:
+        interrupts = [{"id": item.id, "value": item.value} for item in data["__interrupt__"]]
+        return [list(namespace), mode, {"__interrupt__": interrupts}]
+    if mode == "custom" and isinstance(data, dict) and "execute_output" in data:
+        return [list(namespace), mode, {"execute_output": data["execute_output"]}]
+    return None
+
+
+def _decode_chunk(raw: list) -> tuple:
+    namespace, mode, data = raw
+    if mode == "messages":
+        return tuple(namespace), mode, (messages_from_dict([data])[0], {})
+    if mode == "custom":
+        return tuple(namespace), mode, data
+    interrupts = [Interrupt(value=item["value"], id=item["id"]) for item in data["__interrupt__"]]
+    return tuple(namespace), mode, {"__interrupt__": interrupts}
+
+
+def _http_request(method: str, path: str, payload: dict | None = None) -> bytes:
+    body = json.dumps(payload or {}, default=str).encode()
+    head = f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n"
+    return head.encode() + body
+
+
+async def _read_status(reader: asyncio.StreamReader) -> int:
+    """Read the response head; returns the status code."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1])
+
+
+async def _call(socket_path: Path, method: str, path: str, payload: dict | None = None) -> dict:
+    """One JSON request to the daemon.
+
+    Raises:
+        RuntimeError: The daemon answered with an error status
+    """
+    reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    try:
+        writer.write(_http_request(method, path, payload))
+        status = await _read_status(reader)
+        body = json.loads(await reader.read() or b"{}")
+    finally:
+        writer.close()
+    if status != HTTPStatus.OK:
+        msg = body.get("error", f"daemon returned HTTP {status}")
+        raise RuntimeError(msg)
+    return body
+
+
+class RemoteAgent:
+    """Stand-in for a compiled agent graph that runs in the daemon.
+
+    Implements the two graph methods `execute_task_textual` uses: `astream`
+    (chunks are re-created locally from their wire form) and `aupdate_state`.
+    """
+
+    checkpointer = None
+
+    def __init__(
+        self, socket_path: Path, *, assistant_id: str, model_name: str | None, auto_approve: bool
+    ) -> None:
+        """Initialize the proxy.
+
+        Args:
+            socket_path: Daemon socket
+            assistant_id: Agent whose graph to run
+            model_name: Model override (None for the environment default)
+            auto_approve: Whether the graph was compiled without HITL interrupts
+        """
+        self._socket_path = socket_path
+        self._agent = {
+            "agent": assistant_id,
+            "model": model_name,
+            "auto_approve": auto_approve,
+        }
+
+    async def astream(
+        self,
+        stream_input: dict | Command,
+        *,
+        config: dict,
+        **kwargs: Any,
+    ) -> AsyncIterator[tuple]:
+        """Run the graph in the daemon, yielding (namespace, mode, data) chunks.
+
+        Closing the generator (e.g. when the turn is interrupted) closes the
+        connection, which cancels the run in the daemon.
+        """
+        if isinstance(stream_input, Command):
+            wire_input = {"resume": stream_input.resume}
+        else:
+            wire_input = {"input": stream_input}
+        payload = {**self._agent, **wire_input, "config": config, "options": kwargs}
+        reader, writer = await asyncio.open_unix_connection(str(self._socket_path))
+        try:
+            writer.write(_http_request("POST", "/stream", payload))
+            if await _read_status(reader) != HTTPStatus.OK:
+                body = json.loads(await reader.read() or b"{}")
+                raise RuntimeError(body.get("error", "daemon stream failed"))
+            while line := await reader.readline():
+                raw = json.loads(line)
+                if raw[1] == "error":
+                    raise RuntimeError(raw[2])
+                yield _decode_chunk(raw)
+        finally:
+            writer.close()
+
+    async def aupdate_state(self, config: dict, values: dict) -> None:
+        """Apply a state update (e.g. the cancellation note) in the daemon."""
+        messages = [message_to_dict(message) for message in values.get("messages", [])]
+        await _call(
+            self._socket_path,
+            "POST",
+            "/state",
+            {**self._agent, "config": config, "messages": messages},
+        )
+
+
+class Daemon:
+    """Holds warm model clients and agent graphs and serves them over a socket."""
+
+    def __init__(
+        self,
+        router: Any,  # noqa: ANN401
+        *,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        """Initialize the daemon.
+
+        Args:
+            router: Open SessionRouter shared by every graph
+            idle_timeout: Seconds without requests before the daemon exits
+        """
+        self._router = router
+        self._idle_timeout = idle_timeout
+        self._models: dict[str | None, tuple[Any, str | None, str | None]] = {}
+        # (agent, model, auto_approve) -> (graph, config fingerprint)
+        self._agents: dict[tuple, tuple[Any, str]] = {}
+        self._build_lock = asyncio.Lock()
+        self._active = 0
+        self._last_used = time.monotonic()
+        self._started = time.monotonic()
+        self._stopped = asyncio.Event()
+        self.env = env_fingerprint()
+
+    def stop(self) -> None:
+        """Ask `serve` to return."""
+        self._stopped.set()
+
+    async def serve(self) -> None:
+        """Wait until stopped, exiting early once idle for `idle_timeout`."""
+        while not self._stopped.is_set():
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stopped.wait(), _IDLE_CHECK_INTERVAL)
+            idle = time.monotonic() - self._last_used
+            if self._active == 0 and idle > self._idle_timeout:
+                self.stop()
+
+    async def warm(
+        self,
+        assistant_id: str,
+        model_name: str | None,
+        auto_approve: bool,  # noqa: FBT001
+    ) -> dict:
+        """Build (or rebuild, if its AGENTS.md or skills changed) the graph for a client."""
+        from stranger_code.agent import create_cli_agent
+        from stranger_code.config import create_model
+        from stranger_code.tools import fetch_url, http_request, web_search
+
+        key = (assistant_id, model_name, auto_approve)
+        fingerprint = config_fingerprint(assistant_id)
+        async with self._build_lock:
+            cached = self._agents.get(key)
+            if cached is not None and cached[1] == fingerprint:
+                _model, name, provider = self._models[model_name]
+                return {"model": name, "provider": provider, "compile_ms": 0.0, "reloaded": False}
+
+            start = time.perf_counter()
+            if model_name not in self._models:
+                try:
+                    model = await asyncio.to_thread(create_model, model_name)
+                except SystemExit as e:
+                    msg = "No usable model configuration (see daemon log)"
+                    raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, msg) from e
+                self._models[model_name] = (model, settings.model_name, settings.model_provider)
+            model, name, provider = self._models[model_name]
+            tools = [http_request, fetch_url]
+            if settings.has_tavily:
+                tools.append(web_search)
+            store = await self._router.store_for(assistant_id)
+            graph, _backend = await asyncio.to_thread(
+                create_cli_agent,
+                model=model,
+                assistant_id=assistant_id,
+                tools=tools,
+                auto_approve=auto_approve,
+                checkpointer=store.checkpointer,
+            )
+            # Building creates missing AGENTS.md and skill dirs, so fingerprint afterwards
+            self._agents[key] = (graph, config_fingerprint(assistant_id))
+            compile_ms = (time.perf_counter() - start) * 1000
+            if cached is not None:
+                console.print(f"Reloaded {assistant_id}: AGENTS.md or skills changed")
+        return {
+            "model": name,
+            "provider": provider,
+            "compile_ms": round(compile_ms, 1),
+            "reloaded": cached is not None,
+        }
+
+    async def _graph(self, body: dict) -> Any:  # noqa: ANN401
+        await self.warm(body["agent"], body.get("model"), bool(body.get("auto_approve")))
+        return self._agents[(body["agent"], body.get("model"), bool(body.get("auto_approve")))][0]
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one request on a new connection."""
+        self._active += 1
+        try:
+            request = await read_request(reader)
+            if request is not None:
+                await self._dispatch(request.method, request.path, request.json(), reader, writer)
+        except HTTPError as e:
+            writer.write(json_response(e.status, {"error": str(e)}))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:  # noqa: BLE001
+            error = {"error": f"{type(e).__name__}: {e}"}
+            writer.write(json_response(HTTPStatus.INTERNAL_SERVER_ERROR, error))
+        finally:
+            self._active -= 1
+            self._last_used = time.monotonic()
+            with contextlib.suppress(ConnectionError):
+                await writer.drain()
+            writer.close()
+
+    async def _dispatch(
+        self,
+        method: str,
+        path: str,
+        body: dict,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        if (method, path) == ("GET", "/status"):
+            payload = {
+                "pid": os.getpid(),
+                "cwd": str(Path.cwd()),
+                "env": self.env,
+                "uptime_s": round(time.monotonic() - self._started, 1),
+                "agents": [list(key) for key in self._agents],
+                "active": self._active - 1,
+            }
+            writer.write(json_response(HTTPStatus.OK, payload))
+        elif (method, path) == ("POST", "/agents"):
+            info = await self.warm(body["agent"], body.get("model"), bool(body.get("auto_approve")))
+            writer.write(json_response(HTTPStatus.OK, info))
+        elif (method, path) == ("POST", "/stream"):
+            await self._stream(body, reader, writer)
+        elif (method, path) == ("POST", "/state"):
+            graph = await self._graph(body)
+            values = {"messages": messages_from_dict(body.get("messages", []))}
+            await graph.aupdate_state(body["config"], values)
+            writer.write(json_response(HTTPStatus.OK, {}))
+        elif (method, path) == ("POST", "/shutdown"):
+            writer.write(json_response(HTTPStatus.OK, {"pid": os.getpid()}))
+            self.stop()
+        else:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {method} {path}")
+
+    async def _stream(
+        self, body: dict, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        graph = await self._graph(body)
+        stream_input = Command(resume=body["resume"]) if "resume" in body else body["input"]
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nConnection: close\r\n\r\n"
+        )
+
+        async def pump() -> None:
+            try:
+                async for chunk in graph.astream(
+                    stream_input, config=body["config"], **body.get("options", {})
+                ):
+                    line = _encode_chunk(chunk)
+                    if line is not None:
+                        writer.write(json.dumps(line, default=str).encode() + b"\n")
+                        await writer.drain()
+            except Exception as e:  # noqa: BLE001
+                line = [[], "error", f"{type(e).__name__}: {e}"]
+                writer.write(json.dumps(line).encode() + b"\n")
+
+        run = asyncio.create_task(pump())
+        # The client sends nothing more; EOF means it stopped the turn
+        hangup = asyncio.create_task(reader.read())
+        try:
+            await asyncio.wait({run, hangup}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (run, hangup):
+                task.cancel()
+            await asyncio.gather(run, hangup, return_exceptions=True)
+
+
+async def run_daemon(
+    *,
+    durability: str = "exit",
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    preload_agent: str | None = "agent",
+) -> None:
+    """Run the daemon for the current directory until stopped or idle."""
+    from stranger_code.sessions import SessionRouter
+
+    socket_path, _log, lock_path = daemon_paths()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            console.print("Another daemon is already serving this directory")
+            return
+        socket_path.unlink(missing_ok=True)
+        async with SessionRouter(durability=durability) as router:
+            daemon = Daemon(router, idle_timeout=idle_timeout)
+            listener = await asyncio.start_unix_server(
+                daemon.handle_connection, path=str(socket_path)
+            )
+            socket_path.chmod(0o600)
+            console.print(f"Daemon {os.getpid()} serving {Path.cwd()} on {socket_path}")
+            try:
+                async with listener:
+                    if preload_agent:
+                        with contextlib.suppress(HTTPError):
+                            await daemon.warm(preload_agent, None, False)  # noqa: FBT003
+                    await daemon.serve()
+            finally:
+                socket_path.unlink(missing_ok=True)
+                console.print(f"Daemon {os.getpid()} stopped")
+
+
+async def _status(socket_path: Path) -> dict | None:
+    try:
+        return await _call(socket_path, "GET", "/status")
+    except (OSError, RuntimeError, asyncio.IncompleteReadError, ValueError):
+        return None
+
+
+def _spawn(durability: str) -> None:
+    _socket, log_path, _lock = daemon_paths()
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_path.open("a") as log:
+        subprocess.Popen(  # noqa: S603
+            [sys.executable, "-m", "stranger_code.daemon", "--durability", durability],
+            cwd=Path.cwd(),
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+
+async def _wait_for_exit(pid: int) -> None:
+    """Wait until process `pid` exits (it need not be our child).
+
+    Uses a pidfd on Linux and a kqueue process filter elsewhere; both become
+    readable when the process exits, so the event loop wakes exactly once.
+    """
+    try:
+        if hasattr(os, "pidfd_open"):
+            watch_fd = os.pidfd_open(pid)
+            close = functools.partial(os.close, watch_fd)
+        else:
+            kqueue = select.kqueue()
+            close = kqueue.close
+            exit_filter = select.kevent(
+                pid, select.KQ_FILTER_PROC, select.KQ_EV_ADD, select.KQ_NOTE_EXIT
+            )
+            try:
+                kqueue.control([exit_filter], 0)
+            except BaseException:
+                close()
+                raise
+            watch_fd = kqueue.fileno()
+    except ProcessLookupError:
+        return  # Already gone
+    loop = asyncio.get_running_loop()
+    exited = loop.create_future()
+    loop.add_reader(watch_fd, lambda: exited.done() or exited.set_result(None))
+    try:
+        await exited
+    finally:
+        loop.remove_reader(watch_fd)
+        close()
+
+
+async def _stop(socket_path: Path) -> bool:
+    """Ask the daemon to exit and wait until its process is gone.
+
+    The daemon holds its lock until it exits, so a replacement can only be
+    spawned once this returns.
+    """
+    try:
+        reply = await _call(socket_path, "POST", "/shutdown")
+    except (OSError, RuntimeError, asyncio.IncompleteReadError, ValueError):
+        return False
+    with contextlib.suppress(TimeoutError):
+        async with asyncio.timeout(_SPAWN_TIMEOUT):
+            await _wait_for_exit(reply["pid"])
+    return True
+
+
+async def attach_daemon(
+    assistant_id: str,
+    *,
+    model_name: str | None = None,
+    auto_approve: bool = False,
+    durability: str = "exit",
+) -> RemoteAgent:
+    """Connect to the daemon for this directory, spawning or restarting it as needed.
+
+    Raises:
+        RuntimeError: The daemon did not start, or could not build the agent
+    """
+    socket_path, log_path, _lock = daemon_paths()
+    status = await _status(socket_path)
+    if status is not None and status["env"] != env_fingerprint():
+        console.print("[dim]Environment or code changed; restarting daemon...[/dim]")
+        await _stop(socket_path)
+        status = None
+    if status is None:
+        console.print("[dim]Starting daemon...[/dim]")
+        _spawn(durability)
+        deadline = time.monotonic() + _SPAWN_TIMEOUT
+        while (status := await _status(socket_path)) is None:
+            if time.monotonic() > deadline:
+                msg = f"Daemon did not start; see {log_path}"
+                raise RuntimeError(msg)
+            await asyncio.sleep(0.05)
+
+    info = await _call(
+        socket_path,
+        "POST",
+        "/agents",
+        {"agent": assistant_id, "model": model_name, "auto_approve": auto_approve},
+    )
+    settings.model_name = info["model"]
+    settings.model_provider = info["provider"]
+    if info["reloaded"]:
+        console.print("[dim]AGENTS.md or skills changed; agent reloaded[/dim]")
+    return RemoteAgent(
+        socket_path, assistant_id=assistant_id, model_name=model_name, auto_approve=auto_approve
+    )
+
+
+async def daemon_command(action: str) -> None:
+    """CLI handler for: stranger-code daemon <status|stop>."""
+    socket_path, log_path, _lock = daemon_paths()
+    status = await _status(socket_path)
+    if action == "stop":
+        if status is None or not await _stop(socket_path):
+            console.print("[dim]No daemon is running for this directory[/dim]")
+        else:
+            console.print(f"[green]Stopped daemon {status['pid']}[/green]")
+        return
+    if status is None:
+        console.print("[dim]No daemon is running for this directory[/dim]")
+        return
+    stale = "" if status["env"] == env_fingerprint() else " [yellow](stale: will restart)[/yellow]"
+    console.print(f"Daemon {status['pid']} · up {status['uptime_s']:.0f}s{stale}")
+    console.print(f"  socket  {socket_path}")
+    console.print(f"  log     {log_path}")
+    for agent, model, auto_approve in status["agents"]:
+        mode = " (auto-approve)" if auto_approve else ""
+        console.print(f"  agent   {agent} · {model or 'default model'}{mode}")
+
+
+__all__ = [
+    "RemoteAgent",
+    "attach_daemon",
+    "daemon_command",
+    "run_daemon",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the warm agent daemon in the foreground")
+    parser.add_argument("--durability", default="exit", help="Checkpoint durability mode")
+    parser.add_argument(
+        "--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT, help="Idle seconds before exit"
+    )
+    args = parser.parse_args()
+    asyncio.run(run_daemon(durability=args.durability, idle_timeout=args.idle_timeout))
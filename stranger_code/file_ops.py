@@ -7,8 +7,6 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
 
-from deepagents.backends.utils import perform_string_replacement
-
 from stranger_code.config import settings
 
 if TYPE_CHECKING:
@@ -198,6 +196,9 @@ def build_approval_preview(
         old_string = str(args.get("old_string", ""))
         new_string = str(args.get("new_string", ""))
         replace_all = bool(args.get("replace_all", False))
+        # Importing deepagents loads LangChain; only edit previews need it
+        from deepagents.backends.utils import perform_string_replacement
+
         replacement = perform_string_replacement(before, old_string, new_string, replace_all)
         if isinstance(replacement, str):
             return ApprovalPreview(
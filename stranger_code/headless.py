@@ -0,0 +1,383 @@
+"""Headless agent runs for CI and batch pipelines: `stranger-code exec`.
+
+Reuses `execute_task_textual` through `JSONLAdapter`, whose message objects
+emit JSON events instead of rendering widgets, so Textual is never imported.
+Tool approvals are decided by a policy instead of a prompt.
+
+Events are written to stdout, one JSON object per line. Every event has a
+`type` and `t` (seconds since the run started):
+    start        thread_id, agent, model, approve
+    text_delta   text
+    tool_call    id, name, args
+    tool_output  id, text (live output of a running sandbox command)
+    tool_result  id, name, status (success|error|rejected), output
+    diff         path, diff
+    approval     tool, args, decision (approve|reject)
+    error        message
+    system       message
+    usage        input_tokens, output_tokens
+    timing       per-turn latency metrics (see stranger_code.telemetry)
+    end          status (completed|rejected|interrupted|error), elapsed
+
+Usage:
+    stranger-code exec "fix the failing test" --approve readonly
+    stranger-code exec -f task.md --approve all > events.jsonl
+    echo "summarize README.md" | stranger-code exec -
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from stranger_code.telemetry import PerfLog
+from stranger_code.textual_adapter import TextualUIAdapter, execute_task_textual
+
+if TYPE_CHECKING:
+    from stranger_code.telemetry import TurnMetrics
+
+APPROVAL_POLICIES = ("all", "none", "readonly")
+
+# Approval-gated tools that only read (subagent tool calls are gated separately)
+READONLY_TOOLS = frozenset({"web_search", "fetch_url", "task"})
+
+
+class JSONLWriter:
+    """Write events as JSON lines, flushing each so consumers see them immediately."""
+
+    def __init__(self, stream: IO[str] | None = None) -> None:
+        """Initialize the writer.
+
+        Args:
+            stream: Output stream (default: stdout)
+        """
+        self._stream = stream or sys.stdout
+        self._start = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the writer was created."""
+        return time.perf_counter() - self._start
+
+    def emit(self, event_type: str, **fields: Any) -> None:
+        """Write one event."""
+        event = {"type": event_type, "t": round(self.elapsed, 4), **fields}
+        self._stream.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+        self._stream.flush()
+
+    async def wait_writable(self) -> None:
+        """Wait until the consumer can take more events (writes here never queue)."""
+
+
+class _HeadlessMessage:
+    """Stand-in for a chat widget: emits its event when mounted."""
+
+    def __init__(self, writer: JSONLWriter, event_type: str | None = None, **fields: Any) -> None:
+        self._writer = writer
+        self._event_type = event_type
+        self._fields = fields
+
+    def mounted(self) -> None:
+        if self._event_type:
+            self._writer.emit(self._event_type, **self._fields)
+
+
+class _HeadlessAssistantMessage(_HeadlessMessage):
+    """Streams assistant text as `text_delta` events."""
+
+    def __init__(self, writer: JSONLWriter, content: str = "") -> None:
+        super().__init__(writer)
+        self._content = content
+
+    async def append_content(self, text: str) -> None:
+        if text:
+            self._writer.emit("text_delta", text=text)
+            await self._writer.wait_writable()
+
+    async def write_initial_content(self) -> None:
+        await self.append_content(self._content)
+
+    async def stop_stream(self) -> None:
+        pass
+
+
+class _HeadlessToolCall(_HeadlessMessage):
+    """Emits `tool_call` when mounted and `tool_result` when the tool finishes."""
+
+    def __init__(
+        self, writer: JSONLWriter, tool_name: str, args: dict, tool_call_id: str | None
+    ) -> None:
+        super().__init__(writer, "tool_call", id=tool_call_id, name=tool_name, args=args)
+        self._tool_name = tool_name
+        self._tool_call_id = tool_call_id
+
+    def _result(self, status: str, output: str) -> None:
+        self._writer.emit(
+            "tool_result", id=self._tool_call_id, name=self._tool_name, status=status, output=output
+        )
+
+    def append_output(self, text: str) -> None:
+        self._writer.emit("tool_output", id=self._tool_call_id, text=text)
+
+    def set_success(self, result: str = "") -> None:
+        self._result("success", result)
+
+    def set_error(self, error: str) -> None:
+        self._result("error", error)
+
+    def set_rejected(self) -> None:
+        self._result("rejected", "")
+
+
+class _UsageEmitter:
+    """Token tracker that reports each turn's usage as an event."""
+
+    def __init__(self, writer: JSONLWriter) -> None:
+        self._writer = writer
+
+    def add(self, input_tokens: int, output_tokens: int) -> None:
+        self._writer.emit("usage", input_tokens=input_tokens, output_tokens=output_tokens)
+
+
+class JSONLAdapter(TextualUIAdapter):
+    """Adapter that turns the agent stream into JSONL events.
+
+    Text is emitted as it arrives (no frame batching), and HITL interrupts are
+    answered by the approval policy instead of a prompt.
+    """
+
+    policies: tuple[str, ...] = APPROVAL_POLICIES
+
+    def __init__(self, writer: JSONLWriter, *, approve: str = "none") -> None:
+        """Initialize the adapter.
+
+        Args:
+            writer: Event writer
+            approve: Approval policy, one of `policies`
+        """
+        if approve not in self.policies:
+            msg = f"Unknown approval policy: {approve}"
+            raise ValueError(msg)
+        super().__init__(
+            mount_message=self._mount,
+            update_status=lambda _message: None,
+            request_approval=self._decide,
+            render_fps=0,
+        )
+        self._writer = writer
+        self._approve = approve
+        self.rejected = False
+        self.last_turn: TurnMetrics | None = None
+        self.set_token_tracker(_UsageEmitter(writer))
+        self.set_perf_log(PerfLog(self._on_turn))
+
+    def assistant_message(self, content: str = "") -> Any:  # noqa: ANN401
+        """Create a message that emits streamed text as `text_delta` events."""
+        return _HeadlessAssistantMessage(self._writer, content)
+
+    def tool_call_message(
+        self, tool_name: str, args: dict[str, Any], tool_call_id: str | None = None
+    ) -> Any:  # noqa: ANN401
+        """Create a message that emits `tool_call`, then `tool_result` when it finishes."""
+        return _HeadlessToolCall(self._writer, tool_name, args, tool_call_id)
+
+    def diff_message(self, diff: str, file_path: str) -> Any:  # noqa: ANN401
+        """Create a message that emits a `diff` event when mounted."""
+        return _HeadlessMessage(self._writer, "diff", path=file_path, diff=diff)
+
+    def error_message(self, error: str) -> Any:  # noqa: ANN401
+        """Create a message that emits an `error` event when mounted."""
+        return _HeadlessMessage(self._writer, "error", message=error)
+
+    def system_message(self, message: str) -> Any:  # noqa: ANN401
+        """Create a message that emits a `system` event when mounted."""
+        return _HeadlessMessage(self._writer, "system", message=message)
+
+    async def _mount(self, message: _HeadlessMessage) -> None:
+        message.mounted()
+        await self._writer.wait_writable()
+
+    async def _decide(self, action_request: dict, _assistant_id: str | None) -> asyncio.Future:
+        tool_name = action_request.get("name", "")
+        approved = self._approve == "all" or (
+            self._approve == "readonly" and tool_name in READONLY_TOOLS
+        )
+        decision = "approve" if approved else "reject"
+        self.rejected = self.rejected or not approved
+        self._writer.emit(
+            "approval", tool=tool_name, args=action_request.get("args", {}), decision=decision
+        )
+        future = asyncio.get_running_loop().create_future()
+        future.set_result({"type": decision})
+        return future
+
+    def _on_turn(self, metrics: TurnMetrics) -> None:
+        self.last_turn = metrics
+        self._writer.emit("timing", **asdict(metrics))
+
+
+@dataclass
+class ExecSessionState:
+    """Session state for a headless run (the attributes execute_task_textual reads)."""
+
+    thread_id: str
+    auto_approve: bool = False
+    durability: str = "exit"
+
+
+def read_prompt(prompt: str | None, prompt_file: str | None) -> str:
+    """Resolve the prompt from an argument, a file, or stdin (`-` or piped input).
+
+    Raises:
+        ValueError: No prompt was given
+    """
+    if prompt_file:
+        text = Path(prompt_file).read_text()
+    elif prompt and prompt != "-":
+        text = prompt
+    elif prompt == "-" or not sys.stdin.isatty():
+        text = sys.stdin.read()
+    else:
+        text = ""
+    if not text.strip():
+        msg = "No prompt given: pass it as an argument, with --file, or on stdin"
+        raise ValueError(msg)
+    return text
+
+
+async def run_exec(
+    prompt: str,
+    *,
+    agent: Any,  # noqa: ANN401
+    assistant_id: str,
+    thread_id: str,
+    approve: str,
+    durability: str = "exit",
+    backend: Any = None,  # noqa: ANN401
+    writer: JSONLWriter | None = None,
+    adapter: JSONLAdapter | None = None,
+) -> str:
+    """Run one prompt through the agent, emitting JSONL events.
+
+    Args:
+        prompt: User message
+        agent: Compiled agent graph
+        assistant_id: Agent identifier
+        thread_id: Thread to run on
+        approve: Approval policy for gated tools
+        durability: Checkpoint durability mode
+        backend: Backend from create_cli_agent (for diffs)
+        writer: Event writer (default: JSONL on stdout)
+        adapter: Adapter to use instead of a JSONLAdapter on `writer`
+
+    Returns:
+        Final status: "completed", "rejected" or "interrupted"
+    """
+    adapter = adapter or JSONLAdapter(writer or JSONLWriter(), approve=approve)
+    session_state = ExecSessionState(
+        thread_id=thread_id, auto_approve=approve == "all", durability=durability
+    )
+    await execute_task_textual(prompt, agent, assistant_id, session_state, adapter, backend=backend)
+    if adapter.last_turn is not None and adapter.last_turn.interrupted:
+        return "interrupted"
+    return "rejected" if adapter.rejected else "completed"
+
+
+async def exec_command(
+    *,
+    prompt: str | None,
+    prompt_file: str | None = None,
+    assistant_id: str = "agent",
+    approve: str = "none",
+    model_name: str | None = None,
+    thread_id: str | None = None,
+    sandbox_type: str = "none",
+    sandbox_id: str | None = None,
+    sandbox_setup: str | None = None,
+    sandbox_pool: int = 0,
+    sync_dir: Path | None = None,
+    durability: str = "exit",
+) -> int:
+    """CLI handler for: stranger-code exec.
+
+    Human-readable output (progress, errors from model or sandbox setup) goes to
+    stderr so stdout carries only events.
+
+    Returns:
+        Process exit code: 0 when the run finished (even if a tool was rejected),
+        1 on errors, 130 when interrupted.
+    """
+    from stranger_code.agent import create_cli_agent
+    from stranger_code.config import console, create_model, settings
+    from stranger_code.integrations.sandbox_factory import create_sandbox
+    from stranger_code.sessions import SessionRouter, generate_thread_id, get_checkpointer
+    from stranger_code.tools import fetch_url, http_request, web_search
+
+    console.file = sys.stderr
+    writer = JSONLWriter()
+    status = "error"
+    try:
+        text = read_prompt(prompt, prompt_file)
+        model = create_model(model_name)
+        tools = [http_request, fetch_url]
+        if settings.has_tavily:
+            tools.append(web_search)
+
+        async with SessionRouter(durability=durability) as router:
+            store = await router.find_store(thread_id) if thread_id else None
+            store = store or await router.store_for(assistant_id)
+            thread_id = thread_id or generate_thread_id()
+            writer.emit(
+                "start",
+                thread_id=thread_id,
+                agent=assistant_id,
+                model=settings.model_name,
+                approve=approve,
+            )
+            async with get_checkpointer(store) as checkpointer:
+                with contextlib.ExitStack() as stack:
+                    sandbox = None
+                    if sandbox_type != "none":
+                        sandbox = stack.enter_context(
+                            create_sandbox(
+                                sandbox_type,
+                                sandbox_id=sandbox_id,
+                                setup_script_path=sandbox_setup,
+                                pool_size=sandbox_pool,
+                                sync_dir=sync_dir,
+                            )
+                        )
+                    agent, backend = create_cli_agent(
+                        model=model,
+                        assistant_id=assistant_id,
+                        tools=tools,
+                        sandbox=sandbox,
+                        sandbox_type=sandbox_type if sandbox_type != "none" else None,
+                        auto_approve=approve == "all",
+                        checkpointer=checkpointer,
+                    )
+                    status = await run_exec(
+                        text,
+                        agent=agent,
+                        assistant_id=assistant_id,
+                        thread_id=thread_id,
+                        approve=approve,
+                        durability=durability,
+                        backend=backend,
+                        writer=writer,
+                    )
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        status = "interrupted"
+    except SystemExit as e:
+        # create_model reports configuration problems on stderr and exits
+        writer.emit("error", message=f"Startup failed (exit code {e.code})")
+    except Exception as e:  # noqa: BLE001
+        writer.emit("error", message=f"{type(e).__name__}: {e}")
+    writer.emit("end", status=status, elapsed=round(writer.elapsed, 4))
+    return {"completed": 0, "rejected": 0, "interrupted": 130}.get(status, 1)
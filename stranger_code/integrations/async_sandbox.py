@@ -0,0 +1,239 @@
+"""Async command execution shared by the sandbox backends.
+
+The sandbox backends' `execute` blocks a worker thread for the whole command
+(up to 30 minutes). `AsyncSandboxMixin` adds `aexecute`, `adownload_files` and
+`aupload_files` on top of each provider's native async API:
+
+- a per-sandbox semaphore caps how many commands run at once,
+- every call has a timeout (the backend's `_timeout` unless overridden),
+- cancelling the awaiting task (Esc in the TUI, a timeout) kills the remote
+  process instead of leaving it running in the sandbox,
+- output streams into a bounded `OutputCapture`, and can be observed live.
+
+`AsyncExecuteMiddleware` routes the agent's `execute` tool through
+`aexecute`, so independent tool calls from one model turn run concurrently
+against the sandbox instead of each holding a thread, and relays the output
+of running commands to the UI as `execute_output` custom stream events.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import shlex
+import weakref
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+from deepagents.backends.protocol import ExecuteResponse
+from langchain.agents.middleware.types import AgentMiddleware, AgentState
+from langchain_core.messages import ToolMessage
+from langgraph.config import get_stream_writer
+
+from stranger_code.integrations.output_capture import DEFAULT_MAX_OUTPUT_BYTES, OutputCapture
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from deepagents.backends.protocol import FileDownloadResponse, FileUploadResponse
+    from langgraph.prebuilt.tool_node import ToolCallRequest
+    from langgraph.types import Command, StreamWriter
+
+# Commands one sandbox runs at once; further calls wait for a slot
+DEFAULT_MAX_CONCURRENCY = 4
+# Exit code reported for a command that hit its timeout (as timeout(1) does)
+TIMEOUT_EXIT_CODE = 124
+# Seconds between live output events for one running command
+_OUTPUT_RELAY_INTERVAL = 0.1
+
+
+class AsyncSandboxMixin(ABC):
+    """Async execution for a `BaseSandbox` subclass.
+
+    Subclasses implement `_arun(command, capture)` with the provider's async
+    API: it writes the output into `capture` as it arrives, returns the exit
+    code, and must kill the remote process when it is cancelled.
+    """
+
+    _timeout: int
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES
+
+    async def aexecute(
+        self,
+        command: str,
+        *,
+        timeout: float | None = None,  # noqa: ASYNC109
+        on_output: Callable[[str], None] | None = None,
+    ) -> ExecuteResponse:
+        """Execute a command without blocking a thread.
+
+        Args:
+            command: Full shell command string to execute.
+            timeout: Seconds before the command is killed (default: the backend's timeout).
+            on_output: Called on the event loop with each chunk of output while
+                the command runs.
+
+        Returns:
+            ExecuteResponse with combined output (head and tail beyond
+            `max_output_bytes`) and exit code. A command that timed out is
+            killed and reported with its output so far and exit code 124.
+        """
+        timeout = timeout or self._timeout
+        capture = OutputCapture(self.max_output_bytes, on_output)
+        async with self._limiter():
+            try:
+                exit_code = await asyncio.wait_for(self._arun(command, capture), timeout)
+            except TimeoutError:
+                output = capture.text()
+                notice = f"Command timed out after {timeout:g} seconds and was killed"
+                return ExecuteResponse(
+                    output=f"{output}\n{notice}" if output else notice,
+                    exit_code=TIMEOUT_EXIT_CODE,
+                    truncated=capture.truncated,
+                )
+        return capture.response(exit_code)
+
+    async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Download files without blocking the event loop (response order matches `paths`)."""
+        return await asyncio.to_thread(self.download_files, paths)
+
+    async def aupload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Upload files without blocking the event loop (response order matches `files`)."""
+        return await asyncio.to_thread(self.upload_files, files)
+
+    @abstractmethod
+    async def _arun(self, command: str, capture: OutputCapture) -> int | None:
+        """Run `command`, writing its output into `capture`; returns the exit code."""
+
+    def _limiter(self) -> asyncio.Semaphore:
+        return self._per_loop("limiter", lambda: asyncio.Semaphore(self.max_concurrency))
+
+    def _per_loop(self, key: str, factory: Callable[[], Any]) -> Any:  # noqa: ANN401
+        """This event loop's instance of a loop-bound object (semaphore, async client).
+
+        exec, batch, the daemon and the TUI each run their own loop, and asyncio
+        primitives and HTTP connection pools cannot be shared between loops.
+        """
+        states = self.__dict__.setdefault("_loop_states", weakref.WeakKeyDictionary())
+        state = states.setdefault(asyncio.get_running_loop(), {})
+        if key not in state:
+            state[key] = factory()
+        return state[key]
+
+
+def killable_command(command: str, token: str) -> str:
+    """Wrap `command` so that `kill_command(token)` can stop it and its children.
+
+    The command runs in its own session (process group) whose id is written to
+    a pid file named after `token`, for providers without a native kill API.
+    """
+    pid_file = f"/tmp/.stranger-exec-{token}.pid"  # noqa: S108
+    script = f'echo $$ > {pid_file}; bash -c "$1"; status=$?; rm -f {pid_file}; exit $status'
+    return f"setsid -w bash -c {shlex.quote(script)} _ {shlex.quote(command)}"
+
+
+def kill_command(token: str) -> str:
+    """Shell command that kills the process group started by `killable_command(_, token)`."""
+    pid_file = f"/tmp/.stranger-exec-{token}.pid"  # noqa: S108
+    return f'[ -f {pid_file} ] && kill -TERM -- -"$(cat {pid_file})"; rm -f {pid_file}'
+
+
+def format_execute_result(result: ExecuteResponse) -> str:
+    """Render an ExecuteResponse for the model, as deepagents' execute tool does."""
+    parts = [result.output]
+    if result.exit_code is not None:
+        status = "succeeded" if result.exit_code == 0 else "failed"
+        parts.append(f"\n[Command {status} with exit code {result.exit_code}]")
+    if result.truncated:
+        parts.append("\n[Output was truncated due to size limits]")
+    return "".join(parts)
+
+
+class AsyncExecuteMiddleware(AgentMiddleware[AgentState, Any]):
+    """Run the `execute` tool through the sandbox's `aexecute`.
+
+    deepagents' execute tool is synchronous, so LangGraph runs it on a worker
+    thread for the whole command. Intercepting the call keeps it on the event
+    loop: parallel tool calls run concurrently (up to the sandbox's limit) and
+    interrupting the agent cancels, and kills, the remote commands.
+    """
+
+    def __init__(self, sandbox: AsyncSandboxMixin) -> None:
+        """Initialize the middleware.
+
+        Args:
+            sandbox: Sandbox backend with `aexecute`
+        """
+        super().__init__()
+        self._sandbox = sandbox
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        """Synchronous runs keep using the blocking execute tool."""
+        return handler(request)
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        """Execute `execute` calls natively; pass every other tool call through."""
+        call = request.tool_call
+        if call["name"] != "execute":
+            return await handler(request)
+        relay = _OutputRelay(get_stream_writer(), call["id"])
+        try:
+            result = await self._sandbox.aexecute(
+                call["args"].get("command", ""), on_output=relay.write
+            )
+        finally:
+            relay.close()
+        return ToolMessage(
+            content=format_execute_result(result),
+            name="execute",
+            tool_call_id=call["id"],
+        )
+
+
+class _OutputRelay:
+    """Forwards a running command's output as custom stream events, at most every 100 ms.
+
+    Events are `{"execute_output": {"tool_call_id": ..., "text": ...}}`; a
+    stream consumer that did not ask for the "custom" mode never sees them.
+    """
+
+    def __init__(self, writer: StreamWriter, tool_call_id: str) -> None:
+        self._writer = writer
+        self._tool_call_id = tool_call_id
+        self._pending: list[str] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def write(self, text: str) -> None:
+        self._pending.append(text)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                _OUTPUT_RELAY_INTERVAL, self._flush
+            )
+
+    def close(self) -> None:
+        # The tool result replaces the live output, so pending text is dropped
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        text, self._pending = "".join(self._pending), []
+        self._writer({"execute_output": {"tool_call_id": self._tool_call_id, "text": text}})
+
+
+__all__ = [
+    "DEFAULT_MAX_CONCURRENCY",
+    "AsyncExecuteMiddleware",
+    "AsyncSandboxMixin",
+    "format_execute_result",
+    "kill_command",
+    "killable_command",
+]
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import uuid
 from typing import TYPE_CHECKING
 
 from deepagents.backends.protocol import (
@@ -11,15 +14,27 @@ from deepagents.backends.protocol import (
 )
 from deepagents.backends.sandbox import BaseSandbox
 
+from stranger_code.integrations.async_sandbox import AsyncSandboxMixin
+from stranger_code.integrations.output_capture import OutputCapture
+
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from daytona import Sandbox
 
 
-class DaytonaBackend(BaseSandbox):
+# Status polling for async session commands backs off up to this many seconds
+_MAX_POLL_INTERVAL = 1.0
+
+
+class DaytonaBackend(AsyncSandboxMixin, BaseSandbox):
     """Daytona backend implementation conforming to SandboxBackendProtocol.
 
     This implementation inherits all file operation methods from BaseSandbox
-    and only implements the execute() method using Daytona's API.
+    and only implements the execute() method using Daytona's API. aexecute()
+    runs each command asynchronously in its own Daytona session, which is
+    deleted (killing the command) when it finishes or is cancelled, and
+    follows the session's log stream for live output.
     """
 
     def __init__(self, sandbox: Sandbox) -> None:
@@ -50,11 +65,56 @@ class DaytonaBackend(BaseSandbox):
         """
         result = self._sandbox.process.exec(command, timeout=self._timeout)
 
-        return ExecuteResponse(
-            output=result.result,  # Daytona combines stdout/stderr
-            exit_code=result.exit_code,
-            truncated=False,
-        )
+        capture = OutputCapture(self.max_output_bytes)
+        capture.write(result.result)  # Daytona combines stdout/stderr
+        return capture.response(result.exit_code)
+
+    async def _arun(self, command: str, capture: OutputCapture) -> int | None:
+        from daytona import SessionExecuteRequest
+
+        process = self._sandbox.process
+        session_id = f"stranger-exec-{uuid.uuid4().hex}"
+        live: asyncio.Task | None = None
+        # The sync SDK's calls are short requests; only the polling waits
+        await asyncio.to_thread(process.create_session, session_id)
+        try:
+            request = SessionExecuteRequest(command=command, run_async=True)
+            started = await asyncio.to_thread(process.execute_session_command, session_id, request)
+            # The logs come back with the result; the log stream only feeds
+            # live output while the command runs
+            on_output, capture.on_output = capture.on_output, None
+            if on_output is not None:
+                live = asyncio.create_task(
+                    self._stream_output(session_id, started.cmd_id, on_output)
+                )
+            interval = 0.1
+            while True:
+                status = await asyncio.to_thread(
+                    process.get_session_command, session_id, started.cmd_id
+                )
+                if status.exit_code is not None:
+                    break
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, _MAX_POLL_INTERVAL)
+            logs = await asyncio.to_thread(
+                process.get_session_command_logs, session_id, started.cmd_id
+            )
+        finally:
+            if live is not None:
+                live.cancel()
+            # Deleting the session kills the command if it is still running
+            await asyncio.shield(asyncio.to_thread(process.delete_session, session_id))
+        capture.write(logs.output or "")  # Daytona combines stdout/stderr
+        return status.exit_code
+
+    async def _stream_output(
+        self, session_id: str, cmd_id: str, on_output: Callable[[str], None]
+    ) -> None:
+        # Live output is best effort: the logs are fetched in full when the command ends
+        with contextlib.suppress(Exception):
+            await self._sandbox.process.get_session_command_logs_async(
+                session_id, cmd_id, on_output, on_output
+            )
 
     def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """Download multiple files from the Daytona sandbox.
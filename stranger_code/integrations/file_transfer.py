@@ -0,0 +1,295 @@
+"""Concurrent multi-file transfer for the sandbox backends.
+
+The Modal and Runloop file APIs move one file per request. The helpers here
+fan a batch out over a bounded thread pool (or the event loop, for the async
+variants) instead of paying one round trip after another:
+
+- responses keep the input order, and a file that cannot be transferred gets
+  a standardized `FileOperationError` instead of aborting the whole batch,
+- transient failures (dropped connections, overloaded API) are retried with
+  jittered exponential backoff,
+- the largest uploads start first and the bytes in flight are capped, so a
+  batch with a few big files neither waits on them at the end nor holds every
+  one of them on the wire at once.
+
+Failures that are not about one file (bad credentials, a terminated sandbox,
+a transient error that outlasts the retries) are raised: every other file in
+the batch would fail the same way.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from deepagents.backends.protocol import FileDownloadResponse, FileUploadResponse
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Sequence
+
+    from deepagents.backends.protocol import FileOperationError
+
+T = TypeVar("T")
+
+# Files transferred at once per batch
+DEFAULT_MAX_WORKERS = 8
+# Upload bytes in flight per batch; a single larger file still goes on its own
+MAX_BYTES_IN_FLIGHT = 64 * 1024 * 1024
+# Retries of a transient failure, and the backoff between them (seconds)
+DEFAULT_RETRIES = 3
+_BACKOFF_BASE = 0.25
+_BACKOFF_CAP = 4.0
+
+
+@dataclass(frozen=True)
+class TransferPolicy:
+    """How a provider's exceptions are handled during a transfer.
+
+    Attributes:
+        file_error: Maps an exception about one file to its standardized error
+            code, or returns None when the exception is not file-specific
+        is_transient: Whether an exception that is not file-specific is worth
+            retrying
+        retries: Retries of a transient failure before it is raised (0 when
+            the provider's client already retries)
+        max_workers: Files transferred at once
+    """
+
+    file_error: Callable[[Exception], FileOperationError | None]
+    is_transient: Callable[[Exception], bool]
+    retries: int = DEFAULT_RETRIES
+    max_workers: int = DEFAULT_MAX_WORKERS
+
+
+@dataclass(frozen=True)
+class _Outcome(Generic[T]):
+    value: T | None = None
+    error: FileOperationError | None = None
+
+
+def download_files_concurrently(
+    paths: list[str], read: Callable[[str], bytes], policy: TransferPolicy
+) -> list[FileDownloadResponse]:
+    """Download `paths` with `read(path)`, a few at a time.
+
+    Args:
+        paths: Sandbox paths to download
+        read: Downloads one file and returns its content
+        policy: Error handling and concurrency for the provider
+
+    Returns:
+        One FileDownloadResponse per path, in the order of `paths`.
+    """
+    outcomes = _run([(0, lambda path=path: read(path)) for path in paths], policy)
+    return [
+        FileDownloadResponse(path=path, content=outcome.value, error=outcome.error)
+        for path, outcome in zip(paths, outcomes, strict=True)
+    ]
+
+
+def upload_files_concurrently(
+    files: list[tuple[str, bytes]],
+    write: Callable[[str, bytes], None],
+    policy: TransferPolicy,
+) -> list[FileUploadResponse]:
+    """Upload `files` with `write(path, content)`, a few at a time, largest first.
+
+    Args:
+        files: (path, content) pairs to upload
+        write: Uploads one file
+        policy: Error handling and concurrency for the provider
+
+    Returns:
+        One FileUploadResponse per file, in the order of `files`.
+    """
+    jobs = [
+        (len(content), lambda path=path, content=content: write(path, content))
+        for path, content in files
+    ]
+    outcomes = _run(jobs, policy)
+    return [
+        FileUploadResponse(path=path, error=outcome.error)
+        for (path, _), outcome in zip(files, outcomes, strict=True)
+    ]
+
+
+async def adownload_files_concurrently(
+    paths: list[str], read: Callable[[str], Awaitable[bytes]], policy: TransferPolicy
+) -> list[FileDownloadResponse]:
+    """Async variant of `download_files_concurrently` for providers with an async client."""
+    outcomes = await _arun([(0, lambda path=path: read(path)) for path in paths], policy)
+    return [
+        FileDownloadResponse(path=path, content=outcome.value, error=outcome.error)
+        for path, outcome in zip(paths, outcomes, strict=True)
+    ]
+
+
+async def aupload_files_concurrently(
+    files: list[tuple[str, bytes]],
+    write: Callable[[str, bytes], Awaitable[None]],
+    policy: TransferPolicy,
+) -> list[FileUploadResponse]:
+    """Async variant of `upload_files_concurrently` for providers with an async client."""
+    jobs = [
+        (len(content), lambda path=path, content=content: write(path, content))
+        for path, content in files
+    ]
+    outcomes = await _arun(jobs, policy)
+    return [
+        FileUploadResponse(path=path, error=outcome.error)
+        for (path, _), outcome in zip(files, outcomes, strict=True)
+    ]
+
+
+def _schedule(jobs: Sequence[tuple[int, object]]) -> list[int]:
+    """Job indexes, largest first (the order is otherwise kept)."""
+    return sorted(range(len(jobs)), key=lambda index: -jobs[index][0])
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt))  # noqa: S311
+
+
+def _run(jobs: list[tuple[int, Callable[[], T]]], policy: TransferPolicy) -> list[_Outcome[T]]:
+    outcomes: list[_Outcome[T]] = [_Outcome() for _ in jobs]
+    budget = _ByteBudget(MAX_BYTES_IN_FLIGHT)
+
+    def run(index: int) -> None:
+        size, transfer = jobs[index]
+        with budget.hold(size):
+            outcomes[index] = _attempt(transfer, policy)
+
+    workers = min(policy.max_workers, len(jobs))
+    if workers <= 1:
+        for index in _schedule(jobs):
+            run(index)
+        return outcomes
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-transfer") as pool:
+        futures = [pool.submit(run, index) for index in _schedule(jobs)]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            # Don't start the rest of a batch that is failing as a whole
+            for future in futures:
+                future.cancel()
+            raise
+    return outcomes
+
+
+def _attempt(transfer: Callable[[], T], policy: TransferPolicy) -> _Outcome[T]:
+    for attempt in range(policy.retries + 1):
+        try:
+            return _Outcome(value=transfer())
+        except Exception as e:
+            error = policy.file_error(e)
+            if error is not None:
+                return _Outcome(error=error)
+            if attempt == policy.retries or not policy.is_transient(e):
+                raise
+        time.sleep(_backoff(attempt))
+    raise AssertionError  # unreachable: the last attempt returns or raises
+
+
+async def _arun(
+    jobs: list[tuple[int, Callable[[], Awaitable[T]]]], policy: TransferPolicy
+) -> list[_Outcome[T]]:
+    slots = asyncio.Semaphore(policy.max_workers)
+    budget = _AsyncByteBudget(MAX_BYTES_IN_FLIGHT)
+    order = _schedule(jobs)
+
+    async def run(index: int) -> _Outcome[T]:
+        size, transfer = jobs[index]
+        async with slots, budget.hold(size):
+            return await _aattempt(transfer, policy)
+
+    tasks = {index: asyncio.ensure_future(run(index)) for index in order}
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        # Don't finish the rest of a batch that is failing as a whole
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    return [tasks[index].result() for index in range(len(jobs))]
+
+
+async def _aattempt(transfer: Callable[[], Awaitable[T]], policy: TransferPolicy) -> _Outcome[T]:
+    for attempt in range(policy.retries + 1):
+        try:
+            return _Outcome(value=await transfer())
+        except Exception as e:
+            error = policy.file_error(e)
+            if error is not None:
+                return _Outcome(error=error)
+            if attempt == policy.retries or not policy.is_transient(e):
+                raise
+        await asyncio.sleep(_backoff(attempt))
+    raise AssertionError  # unreachable: the last attempt returns or raises
+
+
+class _ByteBudget:
+    """Caps the bytes held by in-flight transfers (a transfer larger than the cap runs alone)."""
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._in_flight = 0
+        self._changed = threading.Condition()
+
+    @contextmanager
+    def hold(self, size: int) -> Iterator[None]:
+        with self._changed:
+            self._changed.wait_for(lambda: self._fits(size))
+            self._in_flight += size
+        try:
+            yield
+        finally:
+            with self._changed:
+                self._in_flight -= size
+                self._changed.notify_all()
+
+    def _fits(self, size: int) -> bool:
+        return self._in_flight == 0 or self._in_flight + size <= self._limit
+
+
+class _AsyncByteBudget:
+    """`_ByteBudget` for transfers running on one event loop."""
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._in_flight = 0
+        self._changed = asyncio.Condition()
+
+    @asynccontextmanager
+    async def hold(self, size: int) -> AsyncIterator[None]:
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._fits(size))
+            self._in_flight += size
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._in_flight -= size
+                self._changed.notify_all()
+
+    def _fits(self, size: int) -> bool:
+        return self._in_flight == 0 or self._in_flight + size <= self._limit
+
+
+__all__ = [
+    "DEFAULT_MAX_WORKERS",
+    "DEFAULT_RETRIES",
+    "MAX_BYTES_IN_FLIGHT",
+    "TransferPolicy",
+    "adownload_files_concurrently",
+    "aupload_files_concurrently",
+    "download_files_concurrently",
+    "upload_files_concurrently",
+]
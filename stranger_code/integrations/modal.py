@@ -2,24 +2,42 @@
 
 from __future__ import annotations
 
+import asyncio
+import uuid
 from typing import TYPE_CHECKING
 
-from deepagents.backends.protocol import (
-    ExecuteResponse,
-    FileDownloadResponse,
-    FileUploadResponse,
-)
 from deepagents.backends.sandbox import BaseSandbox
 
+from stranger_code.integrations.async_sandbox import (
+    AsyncSandboxMixin,
+    kill_command,
+    killable_command,
+)
+from stranger_code.integrations.file_transfer import (
+    TransferPolicy,
+    download_files_concurrently,
+    upload_files_concurrently,
+)
+from stranger_code.integrations.output_capture import OutputCapture
+
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterable
+
     import modal
+    from deepagents.backends.protocol import (
+        ExecuteResponse,
+        FileDownloadResponse,
+        FileOperationError,
+        FileUploadResponse,
+    )
 
 
-class ModalBackend(BaseSandbox):
+class ModalBackend(AsyncSandboxMixin, BaseSandbox):
     """Modal backend implementation conforming to SandboxBackendProtocol.
 
     This implementation inherits all file operation methods from BaseSandbox
-    and only implements the execute() method using Modal's API.
+    and only implements the execute() method using Modal's API; aexecute()
+    uses Modal's async (.aio) API. Output is streamed into a bounded capture.
     """
 
     def __init__(self, sandbox: modal.Sandbox) -> None:
@@ -51,29 +69,48 @@ class ModalBackend(BaseSandbox):
         # Execute command using Modal's exec API
         process = self._sandbox.exec("bash", "-c", command, timeout=self._timeout)
 
+        # Stream stdout and stderr into bounded captures instead of reading
+        # them whole; Modal buffers each stream, so reading them in turn is safe
+        capture = OutputCapture(self.max_output_bytes)
+        stderr = capture.sibling()
+        for chunk in process.stdout:
+            capture.write(chunk)
+        for chunk in process.stderr:
+            stderr.write(chunk)
+        capture.merge(stderr)
+
         # Wait for process to complete
         process.wait()
-
-        # Read stdout and stderr
-        stdout = process.stdout.read()
-        stderr = process.stderr.read()
-
-        # Combine stdout and stderr (matching Runloop's approach)
-        output = stdout or ""
-        if stderr:
-            output += "\n" + stderr if output else stderr
-
-        return ExecuteResponse(
-            output=output,
-            exit_code=process.returncode,
-            truncated=False,  # Modal doesn't provide truncation info
+        return capture.response(process.returncode)
+
+    async def _arun(self, command: str, capture: OutputCapture) -> int | None:
+        # Modal has no API to kill an exec'd process, so the command records
+        # its process group and cancellation kills that group
+        token = uuid.uuid4().hex
+        process = await self._sandbox.exec.aio(
+            "bash", "-c", killable_command(command, token), timeout=self._timeout
         )
+        stderr = capture.sibling()
+        try:
+            # Drain both pipes while waiting, so a chatty command cannot stall
+            await asyncio.gather(_drain(process.stdout, capture), _drain(process.stderr, stderr))
+            exit_code = await process.wait.aio()
+        except asyncio.CancelledError:
+            await asyncio.shield(self._akill(token))
+            raise
+        capture.merge(stderr)
+        return exit_code
+
+    async def _akill(self, token: str) -> None:
+        killer = await self._sandbox.exec.aio("bash", "-c", kill_command(token), timeout=30)
+        await killer.wait.aio()
 
     def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """Download multiple files from the Modal sandbox.
 
         Supports partial success - individual downloads may fail without
-        affecting others.
+        affecting others. Files are downloaded concurrently; transient API
+        failures are retried.
 
         Args:
             paths: List of file paths to download.
@@ -81,27 +118,19 @@ class ModalBackend(BaseSandbox):
         Returns:
             List of FileDownloadResponse objects, one per input path.
             Response order matches input order.
-
-        TODO: Implement proper error handling with standardized FileOperationError codes.
-        Need to determine what exceptions Modal's sandbox.open() actually raises.
-        Currently only implements happy path.
         """
         # This implementation relies on the Modal sandbox file API.
         # https://modal.com/doc/guide/sandbox-files
         # The API is currently in alpha and is not recommended for production use.
         # We're OK using it here as it's targeting the CLI application.
-        responses = []
-        for path in paths:
-            with self._sandbox.open(path, "rb") as f:
-                content = f.read()
-            responses.append(FileDownloadResponse(path=path, content=content, error=None))
-        return responses
+        return download_files_concurrently(paths, self._read_file, _TRANSFER_POLICY)
 
     def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
         """Upload multiple files to the Modal sandbox.
 
         Supports partial success - individual uploads may fail without
-        affecting others.
+        affecting others. Files are uploaded concurrently, largest first;
+        transient API failures are retried.
 
         Args:
             files: List of (path, content) tuples to upload.
@@ -109,18 +138,50 @@ class ModalBackend(BaseSandbox):
         Returns:
             List of FileUploadResponse objects, one per input file.
             Response order matches input order.
-
-        TODO: Implement proper error handling with standardized FileOperationError codes.
-        Need to determine what exceptions Modal's sandbox.open() actually raises.
-        Currently only implements happy path.
         """
-        # This implementation relies on the Modal sandbox file API.
-        # https://modal.com/doc/guide/sandbox-files
-        # The API is currently in alpha and is not recommended for production use.
-        # We're OK using it here as it's targeting the CLI application.
-        responses = []
-        for path, content in files:
-            with self._sandbox.open(path, "wb") as f:
-                f.write(content)
-            responses.append(FileUploadResponse(path=path, error=None))
-        return responses
+        return upload_files_concurrently(files, self._write_file, _TRANSFER_POLICY)
+
+    def _read_file(self, path: str) -> bytes:
+        with self._sandbox.open(path, "rb") as f:
+            return f.read()
+
+    def _write_file(self, path: str, content: bytes) -> None:
+        # Modal splits large writes into 16 MiB requests
+        with self._sandbox.open(path, "wb") as f:
+            f.write(content)
+
+
+def _file_error(exc: Exception) -> FileOperationError | None:
+    """Standardized error for Modal's file API exceptions (errno-style OSErrors)."""
+    if isinstance(exc, FileNotFoundError):
+        return "file_not_found"
+    if isinstance(exc, IsADirectoryError):
+        return "is_directory"
+    if isinstance(exc, PermissionError):
+        return "permission_denied"
+    if isinstance(exc, (NotADirectoryError, FileExistsError)):
+        return "invalid_path"
+    return None
+
+
+def _is_transient(exc: Exception) -> bool:
+    from modal import exception as modal_exception
+
+    transient = (
+        modal_exception.ConnectionError,
+        modal_exception.TimeoutError,
+        modal_exception.InternalError,
+        modal_exception.ResourceExhaustedError,
+        modal_exception.ServiceError,
+        ConnectionError,
+        TimeoutError,
+    )
+    return isinstance(exc, transient)
+
+
+_TRANSFER_POLICY = TransferPolicy(file_error=_file_error, is_transient=_is_transient)
+
+
+async def _drain(stream: AsyncIterable[str], capture: OutputCapture) -> None:
+    async for chunk in stream:
+        capture.write(chunk)
@@ -0,0 +1,127 @@
+"""Bounded capture of a sandbox command's output.
+
+A runaway build log must not pull hundreds of MB into the CLI or the model's
+context. `OutputCapture` consumes output as it streams in and keeps only the
+first and last `max_bytes / 2` bytes; what falls in between is counted and
+replaced by a marker, and `truncated` reports whether anything was dropped.
+Every chunk can also be handed to an `on_output` callback while the command
+runs, e.g. to show live output in the UI.
+"""
+
+from __future__ import annotations
+
+import codecs
+from typing import TYPE_CHECKING
+
+from deepagents.backends.protocol import ExecuteResponse
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Output bytes kept per command (half from the start, half from the end).
+# The filesystem middleware already moves tool results over 80k characters
+# out of the context, so this only bounds memory and the evicted file.
+DEFAULT_MAX_OUTPUT_BYTES = 256 * 1024
+
+
+class OutputCapture:
+    """Head and tail of a command's output within a byte budget."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        on_output: Callable[[str], None] | None = None,
+    ) -> None:
+        """Initialize the capture.
+
+        Args:
+            max_bytes: Bytes of output to keep
+            on_output: Called with each chunk as it is written
+        """
+        self.max_bytes = max_bytes
+        self.on_output = on_output
+        self.total_bytes = 0
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._truncated = False
+        # Characters can be split across chunks; hold partial bytes until completed
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    @property
+    def truncated(self) -> bool:
+        """Whether any output was dropped (here or by the provider)."""
+        return self._truncated or self.total_bytes > len(self._head) + len(self._tail)
+
+    def write(self, data: str | bytes) -> None:
+        """Add a chunk of output and pass it on to `on_output`."""
+        if not data:
+            return
+        text = self._decoder.decode(data) if isinstance(data, bytes) else data
+        self._emit(text)
+
+    def flush(self) -> None:
+        """Emit the bytes of an incomplete trailing character (as U+FFFD)."""
+        self._emit(self._decoder.decode(b"", final=True))
+
+    def sibling(self) -> OutputCapture:
+        """A capture with the same budget and callback, for a second stream (stderr)."""
+        return OutputCapture(self.max_bytes, self.on_output)
+
+    def merge(self, other: OutputCapture) -> None:
+        """Append another stream's capture after this one's output, on a new line.
+
+        `other`'s chunks already went to `on_output` as they were written.
+        """
+        other.flush()
+        if other.total_bytes == 0:
+            self._truncated = self._truncated or other.truncated
+            return
+        if self.total_bytes:
+            self._append(b"\n")
+        self._append(other.text().encode())
+        self._truncated = self._truncated or other.truncated
+
+    def mark_truncated(self) -> None:
+        """Record that the provider dropped output before it got here."""
+        self._truncated = True
+
+    def text(self) -> str:
+        """The kept output, with a marker where output was dropped."""
+        self.flush()
+        # Cuts can fall inside a multi-byte character; drop the partial bytes
+        head = self._head.decode("utf-8", errors="ignore")
+        omitted = self.total_bytes - len(self._head) - len(self._tail)
+        if omitted <= 0:
+            return head + self._tail.decode("utf-8", errors="ignore")
+        tail = self._tail.decode("utf-8", errors="ignore")
+        return f"{head}\n\n... [{omitted} bytes of output omitted] ...\n\n{tail}"
+
+    def response(self, exit_code: int | None) -> ExecuteResponse:
+        """ExecuteResponse with the kept output and an accurate truncation flag."""
+        return ExecuteResponse(output=self.text(), exit_code=exit_code, truncated=self.truncated)
+
+    def _emit(self, text: str) -> None:
+        if not text:
+            return
+        if self.on_output is not None:
+            self.on_output(text)
+        self._append(text.encode())
+
+    def _append(self, data: bytes) -> None:
+        self.total_bytes += len(data)
+        head_room = self.max_bytes // 2 - len(self._head)
+        if head_room > 0:
+            self._head += data[:head_room]
+            data = data[head_room:]
+        if not data:
+            return
+        tail_size = self.max_bytes - self.max_bytes // 2
+        if len(data) >= tail_size:
+            self._tail[:] = data[len(data) - tail_size :]
+            return
+        self._tail += data
+        if len(self._tail) > tail_size:
+            del self._tail[: len(self._tail) - tail_size]
+
+
+__all__ = ["DEFAULT_MAX_OUTPUT_BYTES", "OutputCapture"]
@@ -9,18 +9,51 @@ except ImportError:
     )
     raise ImportError(msg)
 
+import asyncio
+import contextlib
 import os
-
-from deepagents.backends.protocol import ExecuteResponse, FileDownloadResponse, FileUploadResponse
+from collections.abc import AsyncIterable, Awaitable, Callable
+from typing import Any
+
+from deepagents.backends.protocol import (
+    ExecuteResponse,
+    FileDownloadResponse,
+    FileOperationError,
+    FileUploadResponse,
+)
 from deepagents.backends.sandbox import BaseSandbox
-from runloop_api_client import Runloop
-
-
-class RunloopBackend(BaseSandbox):
+from runloop_api_client import (
+    AsyncRunloop,
+    BadRequestError,
+    NotFoundError,
+    PermissionDeniedError,
+    Runloop,
+    UnprocessableEntityError,
+)
+from runloop_api_client.lib.polling import PollingConfig
+from runloop_api_client.types import DevboxAsyncExecutionDetailView
+
+from stranger_code.integrations.async_sandbox import AsyncSandboxMixin
+from stranger_code.integrations.file_transfer import (
+    TransferPolicy,
+    adownload_files_concurrently,
+    aupload_files_concurrently,
+    download_files_concurrently,
+    upload_files_concurrently,
+)
+from stranger_code.integrations.output_capture import OutputCapture
+
+# Seconds between status checks while awaiting an async execution
+_POLL_INTERVAL = 0.5
+
+
+class RunloopBackend(AsyncSandboxMixin, BaseSandbox):
     """Backend that operates on files in a Runloop devbox.
 
     This implementation uses the Runloop API client to execute commands
-    and manipulate files within a remote devbox environment.
+    and manipulate files within a remote devbox environment. The async
+    methods use Runloop's async client and async executions, which can be
+    killed on cancellation.
     """
 
     def __init__(
@@ -68,57 +101,137 @@ class RunloopBackend(BaseSandbox):
             timeout: Maximum execution time in seconds (default: 30 minutes).
 
         Returns:
-            ExecuteResponse with combined output, exit code, optional signal, and truncation flag.
+            ExecuteResponse with combined output (bounded), exit code, and truncation flag.
         """
         result = self._client.devboxes.execute_and_await_completion(
             devbox_id=self._devbox_id,
             command=command,
             timeout=self._timeout,
         )
-        # Combine stdout and stderr
-        output = result.stdout or ""
-        if result.stderr:
-            output += "\n" + result.stderr if output else result.stderr
-
-        return ExecuteResponse(
-            output=output,
-            exit_code=result.exit_status,
-            truncated=False,  # Runloop doesn't provide truncation info
+        capture = OutputCapture(self.max_output_bytes)
+        _capture_result(capture, result)
+        return capture.response(result.exit_status)
+
+    async def _arun(self, command: str, capture: OutputCapture) -> int | None:
+        client = self._async_client()
+        execution = await client.devboxes.execute_async(self._devbox_id, command=command)
+        # Runloop returns the (size-capped) output with the result; the log
+        # streams only feed live output while the command runs
+        on_output, capture.on_output = capture.on_output, None
+        live = None
+        if on_output is not None:
+            live = asyncio.create_task(self._stream_output(execution.execution_id, on_output))
+        try:
+            result = await client.devboxes.executions.await_completed(
+                execution.execution_id,
+                devbox_id=self._devbox_id,
+                polling_config=PollingConfig(
+                    interval_seconds=_POLL_INTERVAL,
+                    max_attempts=int(self._timeout / _POLL_INTERVAL) + 1,
+                ),
+            )
+        except asyncio.CancelledError:
+            await asyncio.shield(
+                client.devboxes.executions.kill(
+                    execution.execution_id, devbox_id=self._devbox_id, kill_process_group=True
+                )
+            )
+            raise
+        finally:
+            if live is not None:
+                live.cancel()
+        _capture_result(capture, result)
+        return result.exit_status
+
+    async def _stream_output(self, execution_id: str, on_output: Callable[[str], None]) -> None:
+        executions = self._async_client().devboxes.executions
+
+        async def tail(updates: Callable[..., Awaitable[AsyncIterable[Any]]]) -> None:
+            async for chunk in await updates(execution_id, devbox_id=self._devbox_id):
+                on_output(chunk.output)
+
+        # Live output is best effort: the result carries the output either way
+        with contextlib.suppress(runloop_api_client.APIError):
+            await asyncio.gather(
+                tail(executions.stream_stdout_updates), tail(executions.stream_stderr_updates)
+            )
+
+    async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Download files concurrently with Runloop's async client (order matches `paths`)."""
+        client = self._async_client()
+
+        async def read(path: str) -> bytes:
+            resp = await client.devboxes.download_file(self._devbox_id, path=path)
+            return await resp.read()
+
+        return await adownload_files_concurrently(paths, read, _TRANSFER_POLICY)
+
+    async def aupload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Upload files concurrently with Runloop's async client (order matches `files`)."""
+        client = self._async_client()
+
+        async def write(path: str, content: bytes) -> None:
+            await client.devboxes.upload_file(self._devbox_id, path=path, file=content)
+
+        return await aupload_files_concurrently(files, write, _TRANSFER_POLICY)
+
+    def _async_client(self) -> AsyncRunloop:
+        # Same credentials and endpoint as the sync client
+        return self._per_loop(
+            "client",
+            lambda: AsyncRunloop(
+                bearer_token=self._client.bearer_token, base_url=self._client.base_url
+            ),
         )
 
     def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """Download multiple files from the Runloop devbox.
 
-        Downloads files individually using the Runloop API. Returns a list of
-        FileDownloadResponse objects preserving order and reporting per-file
-        errors rather than raising exceptions.
-
-        TODO: Implement proper error handling with standardized FileOperationError codes.
-        Currently only implements happy path.
+        Downloads files concurrently, one Runloop API request each. Returns a
+        list of FileDownloadResponse objects preserving order and reporting
+        per-file errors rather than raising exceptions.
         """
-        responses: list[FileDownloadResponse] = []
-        for path in paths:
-            # devboxes.download_file returns a BinaryAPIResponse which exposes .read()
-            resp = self._client.devboxes.download_file(self._devbox_id, path=path)
-            content = resp.read()
-            responses.append(FileDownloadResponse(path=path, content=content, error=None))
-
-        return responses
+        return download_files_concurrently(paths, self._read_file, _TRANSFER_POLICY)
 
     def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
         """Upload multiple files to the Runloop devbox.
 
-        Uploads files individually using the Runloop API. Returns a list of
-        FileUploadResponse objects preserving order and reporting per-file
-        errors rather than raising exceptions.
-
-        TODO: Implement proper error handling with standardized FileOperationError codes.
-        Currently only implements happy path.
+        Uploads files concurrently (largest first), one Runloop API request
+        each. Returns a list of FileUploadResponse objects preserving order and
+        reporting per-file errors rather than raising exceptions.
         """
-        responses: list[FileUploadResponse] = []
-        for path, content in files:
-            # The Runloop client expects 'file' as bytes or a file-like object
-            self._client.devboxes.upload_file(self._devbox_id, path=path, file=content)
-            responses.append(FileUploadResponse(path=path, error=None))
+        return upload_files_concurrently(files, self._write_file, _TRANSFER_POLICY)
+
+    def _read_file(self, path: str) -> bytes:
+        # devboxes.download_file returns a BinaryAPIResponse which exposes .read()
+        return self._client.devboxes.download_file(self._devbox_id, path=path).read()
+
+    def _write_file(self, path: str, content: bytes) -> None:
+        # The Runloop client expects 'file' as bytes or a file-like object
+        self._client.devboxes.upload_file(self._devbox_id, path=path, file=content)
+
+
+def _file_error(exc: Exception) -> FileOperationError | None:
+    """Standardized error for a Runloop API error about one file."""
+    if isinstance(exc, NotFoundError):
+        return "file_not_found"
+    if isinstance(exc, PermissionDeniedError):
+        return "permission_denied"
+    if isinstance(exc, (BadRequestError, UnprocessableEntityError)):
+        return "invalid_path"
+    return None
+
+
+def _capture_result(capture: OutputCapture, result: DevboxAsyncExecutionDetailView) -> None:
+    """Write an execution's stdout, then stderr, into `capture`."""
+    capture.write(result.stdout or "")
+    stderr = capture.sibling()
+    stderr.write(result.stderr or "")
+    capture.merge(stderr)
+    if result.stdout_truncated or result.stderr_truncated:
+        capture.mark_truncated()
+
 
-        return responses
+# The Runloop client already retries connection errors, 429s and 5xx with
+# backoff (max_retries), so failures that reach here are not retried again
+_TRANSFER_POLICY = TransferPolicy(file_error=_file_error, is_transient=lambda _: False, retries=0)
@@ -1,49 +1,82 @@
 """Sandbox lifecycle management with context managers."""
 
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fcntl
+import json
 import os
-import shlex
 import string
+import subprocess
+import sys
 import time
-from collections.abc import Generator
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from deepagents.backends.protocol import SandboxBackendProtocol
+from stranger_code.config import COLORS, console, settings
 
-from stranger_code.config import console
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
 
+    from deepagents.backends.protocol import SandboxBackendProtocol
 
-def _run_sandbox_setup(backend: SandboxBackendProtocol, setup_script_path: str) -> None:
-    """Run users setup script in sandbox with env var expansion.
+    from stranger_code.integrations.workspace_sync import WorkspaceSync
 
-    Args:
-        backend: Sandbox backend instance
-        setup_script_path: Path to setup script file
+
+def _expand_setup_script(setup_script_path: str) -> str:
+    """Read a setup script and expand ${VAR} references from the local environment.
+
+    Raises:
+        FileNotFoundError: Setup script not found
     """
     script_path = Path(setup_script_path)
     if not script_path.exists():
         msg = f"Setup script not found: {setup_script_path}"
         raise FileNotFoundError(msg)
+    template = string.Template(script_path.read_text())
+    return template.safe_substitute(os.environ)
 
-    console.print(f"[dim]Running setup script: {setup_script_path}...[/dim]")
 
-    # Read script content
-    script_content = script_path.read_text()
+def _run_sandbox_setup(backend: SandboxBackendProtocol, setup_script_path: str) -> None:
+    """Run users setup script in sandbox with env var expansion.
 
-    # Expand ${VAR} syntax using local environment
-    template = string.Template(script_content)
-    expanded_script = template.safe_substitute(os.environ)
+    Steps already applied to this sandbox are skipped (see sandbox_setup).
 
-    # Execute in sandbox with 5-minute timeout
-    result = backend.execute(f"bash -c {shlex.quote(expanded_script)}")
+    Args:
+        backend: Sandbox backend instance
+        setup_script_path: Path to setup script file
+    """
+    from stranger_code.integrations.sandbox_setup import run_sandbox_setup
+
+    expanded_script = _expand_setup_script(setup_script_path)
+    run_sandbox_setup(backend, expanded_script, label=f"setup script {setup_script_path}")
 
-    if result.exit_code != 0:
-        console.print(f"[red]❌ Setup script failed (exit {result.exit_code}):[/red]")
-        console.print(f"[dim]{result.output}[/dim]")
-        msg = "Setup failed - aborting"
-        raise RuntimeError(msg)
 
-    console.print("[green]✓ Setup complete[/green]")
+def _wait_modal_ready(sandbox: Any) -> None:  # noqa: ANN401
+    """Poll a new Modal sandbox until it runs commands (terminates it on timeout)."""
+    # Poll until running (Modal requires this)
+    for _ in range(90):  # 180s timeout (90 * 2s)
+        if sandbox.poll() is not None:  # Sandbox terminated unexpectedly
+            msg = "Modal sandbox terminated unexpectedly during startup"
+            raise RuntimeError(msg)
+        # Check if sandbox is ready by attempting a simple command
+        try:
+            process = sandbox.exec("echo", "ready", timeout=5)
+            process.wait()
+            if process.returncode == 0:
+                return
+        except Exception:
+            pass
+        time.sleep(2)
+    # Timeout - cleanup and fail
+    sandbox.terminate()
+    msg = "Modal sandbox failed to start within 180 seconds"
+    raise RuntimeError(msg)
 
 
 @contextmanager
@@ -76,31 +109,12 @@ def create_modal_sandbox(
 
     with app.run():
         if sandbox_id:
-            sandbox = modal.Sandbox.from_id(sandbox_id=sandbox_id, app=app)
+            sandbox = modal.Sandbox.from_id(sandbox_id=sandbox_id)
             should_cleanup = False
         else:
             sandbox = modal.Sandbox.create(app=app, workdir="/workspace")
             should_cleanup = True
-
-            # Poll until running (Modal requires this)
-            for _ in range(90):  # 180s timeout (90 * 2s)
-                if sandbox.poll() is not None:  # Sandbox terminated unexpectedly
-                    msg = "Modal sandbox terminated unexpectedly during startup"
-                    raise RuntimeError(msg)
-                # Check if sandbox is ready by attempting a simple command
-                try:
-                    process = sandbox.exec("echo", "ready", timeout=5)
-                    process.wait()
-                    if process.returncode == 0:
-                        break
-                except Exception:
-                    pass
-                time.sleep(2)
-            else:
-                # Timeout - cleanup and fail
-                sandbox.terminate()
-                msg = "Modal sandbox failed to start within 180 seconds"
-                raise RuntimeError(msg)
+            _wait_modal_ready(sandbox)
 
         backend = ModalBackend(sandbox)
         console.print(f"[green]✓ Modal sandbox ready: {backend.id}[/green]")
@@ -120,6 +134,35 @@ def create_modal_sandbox(
                     console.print(f"[yellow]⚠ Cleanup failed: {e}[/yellow]")
 
 
+def _runloop_client() -> Any:  # noqa: ANN401
+    """Runloop API client from RUNLOOP_API_KEY.
+
+    Raises:
+        ValueError: RUNLOOP_API_KEY not set
+    """
+    from runloop_api_client import Runloop
+
+    bearer_token = os.environ.get("RUNLOOP_API_KEY")
+    if not bearer_token:
+        msg = "RUNLOOP_API_KEY environment variable not set"
+        raise ValueError(msg)
+    return Runloop(bearer_token=bearer_token)
+
+
+def _wait_runloop_running(client: Any, devbox_id: str) -> None:  # noqa: ANN401
+    """Poll a new devbox until it is running (shuts it down on timeout)."""
+    # Poll until running (Runloop requires this)
+    for _ in range(90):  # 180s timeout (90 * 2s)
+        status = client.devboxes.retrieve(id=devbox_id)
+        if status.status == "running":
+            return
+        time.sleep(2)
+    # Timeout - cleanup and fail
+    client.devboxes.shutdown(id=devbox_id)
+    msg = "Devbox failed to start within 180 seconds"
+    raise RuntimeError(msg)
+
+
 @contextmanager
 def create_runloop_sandbox(
     *, sandbox_id: str | None = None, setup_script_path: str | None = None
@@ -140,16 +183,9 @@ def create_runloop_sandbox(
         FileNotFoundError: Setup script not found
         RuntimeError: Setup script failed
     """
-    from runloop_api_client import Runloop
-
     from stranger_code.integrations.runloop import RunloopBackend
 
-    bearer_token = os.environ.get("RUNLOOP_API_KEY")
-    if not bearer_token:
-        msg = "RUNLOOP_API_KEY environment variable not set"
-        raise ValueError(msg)
-
-    client = Runloop(bearer_token=bearer_token)
+    client = _runloop_client()
 
     console.print("[yellow]Starting Runloop devbox...[/yellow]")
 
@@ -160,18 +196,7 @@ def create_runloop_sandbox(
         devbox = client.devboxes.create()
         sandbox_id = devbox.id
         should_cleanup = True
-
-        # Poll until running (Runloop requires this)
-        for _ in range(90):  # 180s timeout (90 * 2s)
-            status = client.devboxes.retrieve(id=devbox.id)
-            if status.status == "running":
-                break
-            time.sleep(2)
-        else:
-            # Timeout - cleanup and fail
-            client.devboxes.shutdown(id=devbox.id)
-            msg = "Devbox failed to start within 180 seconds"
-            raise RuntimeError(msg)
+        _wait_runloop_running(client, devbox.id)
 
     console.print(f"[green]✓ Runloop devbox ready: {sandbox_id}[/green]")
 
@@ -192,62 +217,73 @@ def create_runloop_sandbox(
                 console.print(f"[yellow]⚠ Cleanup failed: {e}[/yellow]")
 
 
-@contextmanager
-def create_daytona_sandbox(
-    *, sandbox_id: str | None = None, setup_script_path: str | None = None
-) -> Generator[SandboxBackendProtocol, None, None]:
-    """Create Daytona sandbox.
-
-    Args:
-        sandbox_id: Optional existing sandbox ID to reuse
-        setup_script_path: Optional path to setup script to run after sandbox starts
+def _daytona_client() -> Any:  # noqa: ANN401
+    """Daytona client from DAYTONA_API_KEY.
 
-    Yields:
-        (DaytonaBackend, sandbox_id)
-
-    Note:
-        Connecting to existing Daytona sandbox by ID may not be supported yet.
-        If sandbox_id is provided, this will raise NotImplementedError.
+    Raises:
+        ValueError: DAYTONA_API_KEY not set
     """
     from daytona import Daytona, DaytonaConfig
 
-    from stranger_code.integrations.daytona import DaytonaBackend
-
     api_key = os.environ.get("DAYTONA_API_KEY")
     if not api_key:
         msg = "DAYTONA_API_KEY environment variable not set"
         raise ValueError(msg)
+    return Daytona(DaytonaConfig(api_key=api_key))
 
-    if sandbox_id:
-        msg = (
-            "Connecting to existing Daytona sandbox by ID not yet supported. "
-            "Create a new sandbox by omitting --sandbox-id."
-        )
-        raise NotImplementedError(msg)
-
-    console.print("[yellow]Starting Daytona sandbox...[/yellow]")
-
-    daytona = Daytona(DaytonaConfig(api_key=api_key))
-    sandbox = daytona.create()
-    sandbox_id = sandbox.id
 
+def _wait_daytona_ready(sandbox: Any) -> None:  # noqa: ANN401
+    """Poll a new Daytona sandbox until it runs commands (deletes it on timeout)."""
     # Poll until running (Daytona requires this)
     for _ in range(90):  # 180s timeout (90 * 2s)
         # Check if sandbox is ready by attempting a simple command
         try:
             result = sandbox.process.exec("echo ready", timeout=5)
             if result.exit_code == 0:
-                break
+                return
         except Exception:
             pass
         time.sleep(2)
+    try:
+        # Clean up if possible
+        sandbox.delete()
+    finally:
+        msg = "Daytona sandbox failed to start within 180 seconds"
+        raise RuntimeError(msg)
+
+
+@contextmanager
+def create_daytona_sandbox(
+    *, sandbox_id: str | None = None, setup_script_path: str | None = None
+) -> Generator[SandboxBackendProtocol, None, None]:
+    """Create or connect to Daytona sandbox.
+
+    Args:
+        sandbox_id: Optional existing sandbox ID to reuse
+        setup_script_path: Optional path to setup script to run after sandbox starts
+
+    Yields:
+        (DaytonaBackend, sandbox_id)
+
+    Raises:
+        ImportError: Daytona SDK not installed
+        ValueError: DAYTONA_API_KEY not set
+        RuntimeError: Sandbox failed to start within timeout
+    """
+    from stranger_code.integrations.daytona import DaytonaBackend
+
+    daytona = _daytona_client()
+
+    console.print("[yellow]Starting Daytona sandbox...[/yellow]")
+
+    if sandbox_id:
+        sandbox = daytona.get(sandbox_id)
+        should_cleanup = False
     else:
-        try:
-            # Clean up if possible
-            sandbox.delete()
-        finally:
-            msg = "Daytona sandbox failed to start within 180 seconds"
-            raise RuntimeError(msg)
+        sandbox = daytona.create()
+        sandbox_id = sandbox.id
+        should_cleanup = True
+        _wait_daytona_ready(sandbox)
 
     backend = DaytonaBackend(sandbox)
     console.print(f"[green]✓ Daytona sandbox ready: {backend.id}[/green]")
@@ -258,12 +294,13 @@ def create_daytona_sandbox(
     try:
         yield backend
     finally:
-        console.print(f"[dim]Deleting Daytona sandbox {sandbox_id}...[/dim]")
-        try:
-            sandbox.delete()
-            console.print(f"[dim]✓ Daytona sandbox {sandbox_id} terminated[/dim]")
-        except Exception as e:
-            console.print(f"[yellow]⚠ Cleanup failed: {e}[/yellow]")
+        if should_cleanup:
+            console.print(f"[dim]Deleting Daytona sandbox {sandbox_id}...[/dim]")
+            try:
+                sandbox.delete()
+                console.print(f"[dim]✓ Daytona sandbox {sandbox_id} terminated[/dim]")
+            except Exception as e:
+                console.print(f"[yellow]⚠ Cleanup failed: {e}[/yellow]")
 
 
 _PROVIDER_TO_WORKING_DIR = {
@@ -281,12 +318,371 @@ _SANDBOX_PROVIDERS = {
 }
 
 
+# Sandbox pool: warm sandboxes provisioned ahead of time (with the setup script
+# already applied) and leased to sessions, so a session skips the provider's
+# start-up polling. The pool lives in a JSON file guarded by a lock file, so
+# every CLI process on the machine shares it; a detached `fill` process tops
+# it back up after each lease.
+
+POOL_STATE_NAME = "sandbox_pool.json"
+DEFAULT_POOL_TTL = 30 * 60  # seconds a warm sandbox may wait for a session
+# Placeholders of a filler that has been provisioning longer than this are dropped
+_POOL_PROVISION_TIMEOUT = 15 * 60
+# Modal's own limit for pooled sandboxes, so orphans die even if nobody reaps them
+_MODAL_POOL_TIMEOUT = 24 * 60 * 60
+_MODAL_POOL_APP = "deepagents-sandbox-pool"
+
+
+@dataclass
+class PooledSandbox:
+    """One pool entry: a warm sandbox, or a slot a filler is provisioning."""
+
+    provider: str
+    setup_key: str
+    created_at: float
+    sandbox_id: str | None = None  # None while provisioning
+    pid: int | None = None  # Filler process while provisioning
+    slot: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @property
+    def warm(self) -> bool:
+        """Whether the sandbox is ready to lease."""
+        return self.sandbox_id is not None
+
+
+@dataclass(frozen=True)
+class PoolProvider:
+    """How the pool creates and destroys sandboxes that outlive one process."""
+
+    # setup_script_path -> id of a running sandbox with the script applied
+    provision: Callable[[str | None], str]
+    terminate: Callable[[str], None]
+
+
+def _setup_key(setup_script_path: str | None) -> str:
+    """Identify the setup a sandbox needs, so leases only match warm sandboxes built for it."""
+    if not setup_script_path:
+        return ""
+    from stranger_code.integrations.sandbox_setup import split_setup_steps
+
+    # The last step's key covers the whole script
+    return split_setup_steps(_expand_setup_script(setup_script_path))[-1].key
+
+
+def _pid_alive(pid: int | None) -> bool:
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SandboxPool:
+    """Warm sandboxes of one provider, shared by all CLI processes through a state file."""
+
+    def __init__(
+        self,
+        provider: str,
+        *,
+        size: int = 1,
+        ttl: float = DEFAULT_POOL_TTL,
+        path: Path | None = None,
+        hooks: PoolProvider | None = None,
+    ) -> None:
+        """Initialize the pool (the state file is created on first use).
+
+        Args:
+            provider: Sandbox provider with a PoolProvider entry
+            size: Warm sandboxes to keep per setup script
+            ttl: Seconds a warm sandbox may wait for a lease before it is reaped
+            path: State file (default: ~/.deepagents/sandbox_pool.json)
+            hooks: Provision/terminate hooks (default: the provider's built-in ones)
+        """
+        if hooks is None and provider not in _POOL_PROVIDERS:
+            msg = f"Sandbox provider {provider!r} does not support pooling"
+            raise ValueError(msg)
+        self.provider = provider
+        self.size = size
+        self.ttl = ttl
+        self.path = path or settings.user_deepagents_dir / POOL_STATE_NAME
+        self._hooks = hooks or _POOL_PROVIDERS[provider]
+
+    def lease(self, setup_key: str = "") -> str | None:
+        """Take the oldest warm sandbox built for `setup_key`; the caller now owns it.
+
+        Returns:
+            Sandbox ID, or None when no warm sandbox is available
+        """
+        with self._state() as entries:
+            expired = self._expire(entries)
+            candidates = [
+                entry
+                for entry in entries
+                if entry.provider == self.provider and entry.warm and entry.setup_key == setup_key
+            ]
+            leased = min(candidates, key=lambda entry: entry.created_at, default=None)
+            if leased is not None:
+                entries.remove(leased)
+        self._terminate(expired)
+        return leased.sandbox_id if leased else None
+
+    def replenish(self, setup_script_path: str | None = None) -> int:
+        """Provision sandboxes (concurrently) until `size` are warm or in flight.
+
+        Slots are reserved in the state file before provisioning, so concurrent
+        fillers never overshoot. Blocks until provisioning finishes.
+
+        Returns:
+            Number of sandboxes added to the pool
+        """
+        setup_key = _setup_key(setup_script_path)
+        with self._state() as entries:
+            expired = self._expire(entries)
+            have = sum(
+                1
+                for entry in entries
+                if entry.provider == self.provider and entry.setup_key == setup_key
+            )
+            slots = [
+                PooledSandbox(self.provider, setup_key, time.time(), pid=os.getpid())
+                for _ in range(max(self.size - have, 0))
+            ]
+            entries.extend(slots)
+        self._terminate(expired)
+        if not slots:
+            return 0
+
+        added = 0
+        with ThreadPoolExecutor(max_workers=len(slots)) as executor:
+            futures = {
+                executor.submit(self._hooks.provision, setup_script_path): slot for slot in slots
+            }
+            for future in as_completed(futures):
+                slot = futures[future]
+                try:
+                    sandbox_id = future.result()
+                except Exception as e:  # noqa: BLE001
+                    console.print(f"[yellow]⚠ Pool provisioning failed: {e}[/yellow]")
+                    sandbox_id = None
+                added += self._fill_slot(slot, sandbox_id)
+        return added
+
+    def reap(self) -> int:
+        """Terminate warm sandboxes older than the TTL and drop dead fillers' slots.
+
+        Returns:
+            Number of sandboxes terminated
+        """
+        with self._state() as entries:
+            expired = self._expire(entries)
+        self._terminate(expired)
+        return len(expired)
+
+    def drain(self) -> int:
+        """Terminate every warm sandbox of this provider and cancel pending slots.
+
+        Returns:
+            Number of sandboxes terminated
+        """
+        with self._state() as entries:
+            mine = [entry for entry in entries if entry.provider == self.provider]
+            entries[:] = [entry for entry in entries if entry.provider != self.provider]
+        warm = [entry.sandbox_id for entry in mine if entry.warm]
+        self._terminate(warm)
+        return len(warm)
+
+    def entries(self) -> list[PooledSandbox]:
+        """Current entries of this provider (warm and provisioning)."""
+        with self._state() as entries:
+            return [entry for entry in entries if entry.provider == self.provider]
+
+    def spawn_replenish(self, setup_script_path: str | None = None) -> None:
+        """Top the pool up from a detached process that outlives this one."""
+        command = [
+            sys.executable,
+            "-m",
+            "stranger_code.integrations.sandbox_factory",
+            self.provider,
+            "--size",
+            str(self.size),
+            "--ttl",
+            str(self.ttl),
+            "--state",
+            str(self.path),
+        ]
+        if setup_script_path:
+            command += ["--setup", str(Path(setup_script_path).resolve())]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.with_suffix(".log").open("a") as log:
+            subprocess.Popen(  # noqa: S603
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+
+    def _fill_slot(self, slot: PooledSandbox, sandbox_id: str | None) -> int:
+        """Record a provisioned sandbox in its reserved slot (or release the slot)."""
+        with self._state() as entries:
+            reserved = next((entry for entry in entries if entry.slot == slot.slot), None)
+            if reserved is not None:
+                entries.remove(reserved)
+                if sandbox_id is not None:
+                    # The TTL counts from when the sandbox became ready
+                    slot.sandbox_id, slot.created_at, slot.pid = sandbox_id, time.time(), None
+                    entries.append(slot)
+                    return 1
+        if sandbox_id is not None:
+            # The slot was drained while we were provisioning
+            self._terminate([sandbox_id])
+        return 0
+
+    def _expire(self, entries: list[PooledSandbox]) -> list[str]:
+        """Remove stale entries of this provider in place; returns sandbox IDs to terminate."""
+        now = time.time()
+        expired = []
+        keep = []
+        for entry in entries:
+            if entry.provider != self.provider:
+                keep.append(entry)
+            elif entry.warm:
+                if now - entry.created_at > self.ttl:
+                    expired.append(entry.sandbox_id)
+                else:
+                    keep.append(entry)
+            elif _pid_alive(entry.pid) and now - entry.created_at < _POOL_PROVISION_TIMEOUT:
+                keep.append(entry)
+        entries[:] = keep
+        return expired
+
+    def _terminate(self, sandbox_ids: list[str]) -> None:
+        for sandbox_id in sandbox_ids:
+            try:
+                self._hooks.terminate(sandbox_id)
+            except Exception as e:  # noqa: BLE001
+                console.print(f"[yellow]⚠ Could not terminate sandbox {sandbox_id}: {e}[/yellow]")
+
+    @contextmanager
+    def _state(self) -> Generator[list[PooledSandbox], None, None]:
+        """Lock the state file and yield its entries; changes are written back atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.with_suffix(".lock").open("w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                raw = json.loads(self.path.read_text())
+            except (FileNotFoundError, ValueError):
+                raw = []
+            entries = [PooledSandbox(**entry) for entry in raw]
+            yield entries
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps([asdict(entry) for entry in entries], indent=2))
+            tmp.replace(self.path)
+
+
+def _provision_modal(setup_script_path: str | None) -> str:
+    import modal
+
+    from stranger_code.integrations.modal import ModalBackend
+
+    # A deployed (not ephemeral) app: pooled sandboxes outlive the process that made them
+    app = modal.App.lookup(_MODAL_POOL_APP, create_if_missing=True)
+    sandbox = modal.Sandbox.create(app=app, workdir="/workspace", timeout=_MODAL_POOL_TIMEOUT)
+    _wait_modal_ready(sandbox)
+    if setup_script_path:
+        try:
+            _run_sandbox_setup(ModalBackend(sandbox), setup_script_path)
+        except Exception:
+            sandbox.terminate()
+            raise
+    return sandbox.object_id
+
+
+def _terminate_modal(sandbox_id: str) -> None:
+    import modal
+
+    modal.Sandbox.from_id(sandbox_id).terminate()
+
+
+def _provision_runloop(setup_script_path: str | None) -> str:
+    from stranger_code.integrations.runloop import RunloopBackend
+
+    client = _runloop_client()
+    devbox = client.devboxes.create()
+    _wait_runloop_running(client, devbox.id)
+    if setup_script_path:
+        backend = RunloopBackend(devbox_id=devbox.id, client=client)
+        try:
+            _run_sandbox_setup(backend, setup_script_path)
+        except Exception:
+            client.devboxes.shutdown(id=devbox.id)
+            raise
+    return devbox.id
+
+
+def _terminate_runloop(sandbox_id: str) -> None:
+    _runloop_client().devboxes.shutdown(id=sandbox_id)
+
+
+def _provision_daytona(setup_script_path: str | None) -> str:
+    from stranger_code.integrations.daytona import DaytonaBackend
+
+    sandbox = _daytona_client().create()
+    _wait_daytona_ready(sandbox)
+    if setup_script_path:
+        try:
+            _run_sandbox_setup(DaytonaBackend(sandbox), setup_script_path)
+        except Exception:
+            sandbox.delete()
+            raise
+    return sandbox.id
+
+
+def _terminate_daytona(sandbox_id: str) -> None:
+    daytona = _daytona_client()
+    daytona.delete(daytona.get(sandbox_id))
+
+
+# Providers whose sandboxes can be pooled
+_POOL_PROVIDERS = {
+    "modal": PoolProvider(_provision_modal, _terminate_modal),
+    "runloop": PoolProvider(_provision_runloop, _terminate_runloop),
+    "daytona": PoolProvider(_provision_daytona, _terminate_daytona),
+}
+
+
+def _pull_workspace(sync: WorkspaceSync) -> None:
+    console.print("[dim]Pulling the agent's changes from the sandbox...[/dim]")
+    try:
+        result = sync.pull()
+    except Exception as e:  # noqa: BLE001
+        console.print(f"[yellow]⚠ Workspace pull failed: {e}[/yellow]")
+        return
+    console.print(f"[green]✓ Workspace pulled: {result.summary()}[/green]")
+    for path in result.conflicts:
+        console.print(f"[yellow]⚠ Edited on both sides, kept the local copy: {path}[/yellow]")
+
+
+def _terminate_leased(provider: str, sandbox_id: str) -> None:
+    console.print(f"[dim]Terminating pooled {provider} sandbox {sandbox_id}...[/dim]")
+    try:
+        _POOL_PROVIDERS[provider].terminate(sandbox_id)
+    except Exception as e:  # noqa: BLE001
+        console.print(f"[yellow]⚠ Cleanup failed: {e}[/yellow]")
+
+
 @contextmanager
 def create_sandbox(
     provider: str,
     *,
     sandbox_id: str | None = None,
     setup_script_path: str | None = None,
+    pool_size: int = 0,
+    sync_dir: Path | None = None,
 ) -> Generator[SandboxBackendProtocol, None, None]:
     """Create or connect to a sandbox of the specified provider.
 
@@ -297,6 +693,10 @@ def create_sandbox(
         provider: Sandbox provider ("modal", "runloop", "daytona")
         sandbox_id: Optional existing sandbox ID to reuse
         setup_script_path: Optional path to setup script to run after sandbox starts
+        pool_size: Lease a warm sandbox from the shared pool and keep this many
+            warm for later sessions (0 disables pooling; ignored with sandbox_id)
+        sync_dir: Local project to mirror into the sandbox's working directory
+            on entry; the agent's changes are pulled back on exit
 
     Yields:
         (SandboxBackend, sandbox_id)
@@ -310,7 +710,37 @@ def create_sandbox(
 
     sandbox_provider = _SANDBOX_PROVIDERS[provider]
 
-    with sandbox_provider(sandbox_id=sandbox_id, setup_script_path=setup_script_path) as backend:
+    leased = None
+    if pool_size > 0 and sandbox_id is None:
+        pool = SandboxPool(provider, size=pool_size)
+        leased = pool.lease(_setup_key(setup_script_path))
+        # Refill the slot this session took (or warm the pool up after a miss)
+        pool.spawn_replenish(setup_script_path)
+
+    with contextlib.ExitStack() as stack:
+        backend = None
+        if leased is not None:
+            console.print(f"[green]✓ Leased warm {provider} sandbox {leased}[/green]")
+            try:
+                backend = stack.enter_context(sandbox_provider(sandbox_id=leased))
+            except Exception as e:  # noqa: BLE001
+                console.print(f"[yellow]⚠ Leased sandbox unusable ({e}), creating one[/yellow]")
+                _terminate_leased(provider, leased)
+            else:
+                # Leased sandboxes belong to this session
+                stack.callback(_terminate_leased, provider, leased)
+        if backend is None:
+            backend = stack.enter_context(
+                sandbox_provider(sandbox_id=sandbox_id, setup_script_path=setup_script_path)
+            )
+        if sync_dir is not None:
+            from stranger_code.integrations.workspace_sync import WorkspaceSync
+
+            sync = WorkspaceSync(backend, sync_dir, get_default_working_dir(provider))
+            console.print(f"[dim]Syncing {sync_dir} into the sandbox...[/dim]")
+            console.print(f"[green]✓ Workspace synced: {sync.push().summary()}[/green]")
+            # Runs before the sandbox is torn down
+            stack.callback(_pull_workspace, sync)
         yield backend
 
 
@@ -323,6 +753,48 @@ def get_available_sandbox_types() -> list[str]:
     return list(_SANDBOX_PROVIDERS.keys())
 
 
+def sandbox_pool_command(action: str, provider: str | None = None, *, size: int = 1) -> None:
+    """CLI handler for: stranger-code sandbox-pool <status|fill|drain> [provider]."""
+    providers = [provider] if provider else list(_POOL_PROVIDERS)
+    if action == "fill":
+        if provider is None:
+            console.print("[red]❌ sandbox-pool fill needs a provider[/red]")
+            sys.exit(1)
+        added = SandboxPool(provider, size=size).replenish()
+        console.print(f"[green]✓ Added {added} warm {provider} sandbox(es)[/green]")
+        return
+    if action == "drain":
+        for name in providers:
+            drained = SandboxPool(name).drain()
+            console.print(f"[dim]Terminated {drained} pooled {name} sandbox(es)[/dim]")
+        return
+
+    from rich.table import Table
+
+    table = Table(show_header=True, header_style=f"bold {COLORS['primary']}")
+    table.add_column("Provider", style="bold")
+    table.add_column("Sandbox")
+    table.add_column("State")
+    table.add_column("Age", justify="right")
+    table.add_column("Setup")
+    now = time.time()
+    for name in providers:
+        pool = SandboxPool(name)
+        pool.reap()
+        for entry in pool.entries():
+            table.add_row(
+                name,
+                entry.sandbox_id or "-",
+                "warm" if entry.warm else f"provisioning (pid {entry.pid})",
+                f"{now - entry.created_at:.0f}s",
+                entry.setup_key or "-",
+            )
+    if table.row_count == 0:
+        console.print("[dim]The sandbox pool is empty[/dim]")
+        return
+    console.print(table)
+
+
 def get_default_working_dir(provider: str) -> str:
     """Get the default working directory for a given sandbox provider.
 
@@ -342,7 +814,24 @@ def get_default_working_dir(provider: str) -> str:
 
 
 __all__ = [
+    "DEFAULT_POOL_TTL",
+    "PoolProvider",
+    "PooledSandbox",
+    "SandboxPool",
     "create_sandbox",
     "get_available_sandbox_types",
     "get_default_working_dir",
+    "sandbox_pool_command",
 ]
+
+
+if __name__ == "__main__":
+    # Detached pool filler started by SandboxPool.spawn_replenish
+    parser = argparse.ArgumentParser(description="Top up the shared sandbox pool")
+    parser.add_argument("provider", choices=list(_POOL_PROVIDERS))
+    parser.add_argument("--size", type=int, default=1)
+    parser.add_argument("--ttl", type=float, default=DEFAULT_POOL_TTL)
+    parser.add_argument("--state", type=Path, default=None)
+    parser.add_argument("--setup", default=None)
+    args = parser.parse_args()
+    SandboxPool(args.provider, size=args.size, ttl=args.ttl, path=args.state).replenish(args.setup)
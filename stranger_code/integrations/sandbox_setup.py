@@ -0,0 +1,167 @@
+"""Content-addressed, resumable sandbox setup scripts (`--sandbox-setup`).
+
+A setup script is split into steps at `# step: <name>` comment lines; text
+before the first marker (exports, `set -e`) is a prelude that runs at the start
+of every step, and a script without markers is a single step:
+
+    set -euo pipefail
+    export PIP_DISABLE_PIP_VERSION_CHECK=1
+
+    # step: system packages
+    apt-get update && apt-get install -y ripgrep
+
+    # step: python deps
+    pip install -r requirements.txt
+
+Each step is keyed by a hash of its content chained with the previous step's
+key (like image layers), so editing a step re-runs it and every step after
+it. A step that succeeds leaves a marker file named after its key in the
+sandbox. The whole setup is sent as one command that skips steps whose marker
+exists, so re-attaching to a prepared sandbox costs a single round trip, and
+a run that failed part-way resumes at the failed step. Output is streamed to
+the console while the steps run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from stranger_code.config import console
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from deepagents.backends.protocol import ExecuteResponse, SandboxBackendProtocol
+
+# Where step markers are kept in the sandbox (expanded by the sandbox's shell)
+DEFAULT_MARKER_DIR = "${HOME:-/tmp}/.stranger-setup"
+
+_STEP_MARKER = re.compile(r"^#\s*step:\s*(?P<name>.+?)\s*$", re.MULTILINE)
+# Prefix of the runner's own progress lines
+_PROGRESS = "[setup]"
+
+
+@dataclass(frozen=True)
+class SetupStep:
+    """One cacheable step of a setup script."""
+
+    name: str
+    script: str
+    key: str
+
+
+def split_setup_steps(script: str) -> list[SetupStep]:
+    """Split an (expanded) setup script into steps with chained content keys."""
+    markers = list(_STEP_MARKER.finditer(script))
+    if not markers:
+        bodies = [("setup", script)]
+        prelude = ""
+    else:
+        prelude = script[: markers[0].start()]
+        bodies = [
+            (
+                marker.group("name"),
+                script[marker.end() : next_marker.start() if next_marker else len(script)],
+            )
+            for marker, next_marker in zip(markers, [*markers[1:], None], strict=True)
+        ]
+    steps: list[SetupStep] = []
+    key = ""
+    for name, body in bodies:
+        step_script = prelude + body
+        key = hashlib.sha256(f"{key}\0{step_script}".encode()).hexdigest()[:16]
+        steps.append(SetupStep(name, step_script, key))
+    return steps
+
+
+def setup_command(steps: list[SetupStep], marker_dir: str = DEFAULT_MARKER_DIR) -> str:
+    """One shell command that runs the steps without a marker, stopping at the first failure."""
+    lines = [
+        f'markers="{marker_dir}"',
+        'mkdir -p "$markers"',
+        "cached=0; ran=0",
+    ]
+    total = len(steps)
+    for index, step in enumerate(steps, 1):
+        label = shlex.quote(f"{index}/{total} {step.name}")
+        lines.append(
+            f'if [ -f "$markers/{step.key}" ]; then\n'
+            f"  echo {_PROGRESS} cached {label}; cached=$((cached + 1))\n"
+            "else\n"
+            f"  echo {_PROGRESS} running {label}\n"
+            f"  bash -c {shlex.quote(step.script)} || {{\n"
+            f"    status=$?; echo {_PROGRESS} failed {label} exit $status; exit $status\n"
+            "  }\n"
+            f'  touch "$markers/{step.key}"; ran=$((ran + 1))\n'
+            "fi"
+        )
+    lines.append(f'echo "{_PROGRESS} done $cached cached, $ran ran"')
+    return "\n".join(lines)
+
+
+def run_sandbox_setup(
+    backend: SandboxBackendProtocol,
+    script: str,
+    *,
+    label: str = "setup script",
+    marker_dir: str = DEFAULT_MARKER_DIR,
+) -> ExecuteResponse:
+    """Run the steps of `script` that have not completed in this sandbox yet.
+
+    Args:
+        backend: Sandbox backend
+        script: Expanded setup script
+        label: How to refer to the script in console messages
+        marker_dir: Directory for step markers in the sandbox
+
+    Returns:
+        The runner's response (its output ends with a "done" summary line).
+
+    Raises:
+        RuntimeError: A step failed; its output was already streamed
+    """
+    steps = split_setup_steps(script)
+    console.print(f"[dim]Running {label} ({len(steps)} step{'s' * (len(steps) != 1)})...[/dim]")
+    result = _execute_streaming(backend, setup_command(steps, marker_dir), _print_output)
+    if result.exit_code != 0:
+        console.print(f"[red]❌ Setup script failed (exit {result.exit_code})[/red]")
+        msg = "Setup failed - aborting"
+        raise RuntimeError(msg)
+    summary = result.output.rstrip().rsplit(f"{_PROGRESS} done ", 1)[-1]
+    console.print(f"[green]✓ Setup complete ({summary})[/green]")
+    return result
+
+
+def _print_output(text: str) -> None:
+    console.print(text, style="dim", markup=False, highlight=False, end="", soft_wrap=True)
+
+
+def _execute_streaming(
+    backend: SandboxBackendProtocol, command: str, on_output: Callable[[str], None]
+) -> ExecuteResponse:
+    """Execute `command`, streaming its output when the backend supports it."""
+    from stranger_code.integrations.async_sandbox import AsyncSandboxMixin
+
+    if not isinstance(backend, AsyncSandboxMixin):
+        result = backend.execute(command)
+        on_output(result.output)
+        return result
+    # Setup runs from sync code, sometimes on a thread whose event loop is
+    # busy waiting for it, so the command gets a loop of its own
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="sandbox-setup") as pool:
+        return pool.submit(asyncio.run, backend.aexecute(command, on_output=on_output)).result()
+
+
+__all__ = [
+    "DEFAULT_MARKER_DIR",
+    "SetupStep",
+    "run_sandbox_setup",
+    "setup_command",
+    "split_setup_steps",
+]
@@ -0,0 +1,357 @@
+"""Delta sync between a local checkout and a sandbox's working directory.
+
+`WorkspaceSync.push` mirrors the local project (files git would consider:
+tracked plus untracked-but-not-ignored) into the sandbox, and
+`WorkspaceSync.pull` brings back the files the agent changed there.
+
+Both directions are deltas against a manifest (path -> sha256) of the last
+sync, kept in the sandbox under `.stranger-sync/`:
+
+- push hashes the local tree, reusing a local cache keyed by size and mtime so
+  only edited files are re-read, and sends changed files plus the list of
+  deletions as one gzipped tar (one upload, one execute);
+- pull asks the sandbox for the files modified since the manifest was written
+  (`find -newer`, hashed remotely into a listing it downloads), compares them
+  with the manifest and downloads the changes as one gzipped tar. Paths git
+  ignores locally are skipped, and files that changed on both sides since the
+  last sync are reported as conflicts and left alone.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import shlex
+import stat
+import subprocess
+import tarfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from stranger_code.config import settings
+
+if TYPE_CHECKING:
+    from deepagents.backends.protocol import SandboxBackendProtocol
+
+# Sync metadata directory inside the sandbox's working directory
+SYNC_DIR = ".stranger-sync"
+_MANIFEST = f"{SYNC_DIR}/manifest.json.gz"
+# Sorted path list of the manifest, for detecting remote deletions with comm(1)
+_PATHS = f"{SYNC_DIR}/paths"
+_DELETED = f"{SYNC_DIR}/deleted"
+_DELETED_MARKER = "@@deleted"
+
+
+@dataclass
+class SyncResult:
+    """What one push or pull transferred."""
+
+    sent: list[str] = field(default_factory=list)
+    received: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    # Changed on both sides since the last sync; left untouched
+    conflicts: list[str] = field(default_factory=list)
+    transferred_bytes: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        """One line for the console, e.g. "3 sent, 1 deleted (12.0 KB, 0.4s)"."""
+        parts = [
+            f"{len(files)} {label}"
+            for files, label in (
+                (self.sent, "sent"),
+                (self.received, "received"),
+                (self.deleted, "deleted"),
+                (self.conflicts, "conflicted"),
+            )
+            if files
+        ]
+        size = f"{self.transferred_bytes / 1024:.1f} KB"
+        return f"{', '.join(parts) or 'up to date'} ({size}, {self.seconds:.1f}s)"
+
+
+def list_project_files(root: Path) -> list[str]:
+    """Relative paths of the files to sync: what git tracks or would add.
+
+    Falls back to every file outside `.git` when `root` is not in a git work tree.
+    """
+    try:
+        output = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],  # noqa: S607
+            cwd=root,
+            capture_output=True,
+            check=True,
+        ).stdout
+        paths = {path for path in output.decode().split("\0") if path}
+    except (OSError, subprocess.CalledProcessError):
+        paths = set()
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = [name for name in dirnames if name not in (".git", SYNC_DIR)]
+            relative = Path(directory).relative_to(root)
+            paths.update((relative / name).as_posix() for name in filenames)
+    # Newlines would break the line-based remote listings
+    return sorted(path for path in paths if "\n" not in path and not path.startswith(SYNC_DIR))
+
+
+def _ignored_paths(root: Path, paths: list[str]) -> set[str]:
+    """The subset of `paths` that git ignores in `root` (tracked files never are).
+
+    Empty when `root` is not in a git work tree, matching `list_project_files`.
+    """
+    if not paths:
+        return set()
+    try:
+        output = subprocess.run(
+            ["git", "check-ignore", "--stdin", "-z"],  # noqa: S607
+            cwd=root,
+            input="".join(f"{path}\0" for path in paths).encode(),
+            capture_output=True,
+            check=False,
+        ).stdout
+    except OSError:
+        return set()
+    # Exit 1 means nothing is ignored and 128 that this is not a work tree;
+    # both print nothing
+    return {path for path in output.decode().split("\0") if path}
+
+
+class _HashCache:
+    """sha256 of local files keyed by (size, mtime), persisted between syncs."""
+
+    def __init__(self, root: Path) -> None:
+        key = hashlib.sha1(str(root).encode(), usedforsecurity=False).hexdigest()[:12]
+        self.path = settings.user_deepagents_dir / "workspace_sync" / f"{key}.json"
+        try:
+            self._entries: dict[str, list] = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            self._entries = {}
+
+    def manifest(self, root: Path, paths: list[str]) -> dict[str, str]:
+        """Hash every regular file in `paths`, re-reading only files whose stat changed."""
+        manifest = {}
+        entries = {}
+        for path in paths:
+            try:
+                info = os.lstat(root / path)
+            except FileNotFoundError:
+                continue  # Tracked but deleted from the work tree
+            if not stat.S_ISREG(info.st_mode):
+                continue
+            cached = self._entries.get(path)
+            if cached and cached[0] == info.st_size and cached[1] == info.st_mtime_ns:
+                digest = cached[2]
+            else:
+                with (root / path).open("rb") as file:
+                    digest = hashlib.file_digest(file, "sha256").hexdigest()
+            entries[path] = [info.st_size, info.st_mtime_ns, digest]
+            manifest[path] = digest
+        self._entries = entries
+        return manifest
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._entries, separators=(",", ":")))
+
+
+class WorkspaceSync:
+    """Pushes a local directory into a sandbox and pulls the agent's changes back."""
+
+    def __init__(self, backend: SandboxBackendProtocol, local_root: Path, remote_root: str) -> None:
+        """Initialize the sync (nothing is transferred until push or pull).
+
+        Args:
+            backend: Sandbox backend (execute, upload_files, download_files)
+            local_root: Local project directory
+            remote_root: Working directory in the sandbox
+        """
+        self.backend = backend
+        self.local_root = local_root.resolve()
+        self.remote_root = remote_root.rstrip("/") or "/"
+        self._cache = _HashCache(self.local_root)
+
+    def push(self) -> SyncResult:
+        """Send local changes since the last sync (everything on the first push)."""
+        start = time.perf_counter()
+        result = SyncResult()
+        local = self._cache.manifest(self.local_root, list_project_files(self.local_root))
+        self._cache.save()
+        remote = self._remote_manifest()
+        result.sent = [path for path, digest in local.items() if remote.get(path) != digest]
+        result.deleted = sorted(path for path in remote if path not in local)
+        if result.sent or result.deleted:
+            buffer = io.BytesIO()
+            with tarfile.open(fileobj=buffer, mode="w:gz", compresslevel=1) as tar:
+                for path in result.sent:
+                    tar.add(self.local_root / path, arcname=path, recursive=False)
+                _add_bytes(tar, _MANIFEST, _encode_manifest(local))
+                _add_bytes(tar, _PATHS, "".join(f"{path}\n" for path in sorted(local)).encode())
+                _add_bytes(tar, _DELETED, "".join(f"{path}\n" for path in result.deleted).encode())
+            archive = buffer.getvalue()
+            result.transferred_bytes = len(archive)
+            remote_archive = f"/tmp/.stranger-sync-{uuid.uuid4().hex}.tar.gz"  # noqa: S108
+            self._upload(remote_archive, archive)
+            root = shlex.quote(self.remote_root)
+            self._run(
+                f"mkdir -p {root} && cd {root} && tar -xzf {remote_archive} && "
+                f"rm -f {remote_archive} && "
+                f"tr '\\n' '\\0' < {_DELETED} | xargs -0 -r rm -f -- && "
+                # Stamp with the sandbox's clock: pull looks for files newer than this
+                f"touch {_MANIFEST}"
+            )
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def pull(self) -> SyncResult:
+        """Fetch files the agent created, changed or deleted since the last sync."""
+        start = time.perf_counter()
+        result = SyncResult()
+        synced = self._remote_manifest()
+        changed, deleted = self._remote_changes(synced)
+        # Build output, caches and the like stay in the sandbox, as on push
+        ignored = _ignored_paths(self.local_root, [*changed, *deleted])
+        changed = {path: digest for path, digest in changed.items() if path not in ignored}
+        deleted = [path for path in deleted if path not in ignored]
+        local = self._cache.manifest(self.local_root, list_project_files(self.local_root))
+
+        def changed_locally(path: str) -> bool:
+            return local.get(path) != synced.get(path)
+
+        fetch = {path: digest for path, digest in changed.items() if local.get(path) != digest}
+        result.conflicts = sorted(path for path in [*fetch, *deleted] if changed_locally(path))
+        fetch = {path: digest for path, digest in fetch.items() if path not in result.conflicts}
+        result.deleted = [path for path in deleted if path not in result.conflicts]
+
+        if fetch:
+            archive = self._fetch_archive(sorted(fetch))
+            result.transferred_bytes = len(archive)
+            with tarfile.open(fileobj=io.BytesIO(archive), mode="r:gz") as tar:
+                members = [member for member in tar.getmembers() if member.name in fetch]
+                tar.extractall(self.local_root, members=members, filter="data")
+            result.received = sorted(fetch)
+        for path in result.deleted:
+            (self.local_root / path).unlink(missing_ok=True)
+
+        # Everything fetched or already identical is in sync again; conflicts
+        # keep their old entry, so the next push sends the local version
+        manifest = {path: digest for path, digest in synced.items() if path not in result.deleted}
+        manifest.update(
+            {path: digest for path, digest in changed.items() if path not in result.conflicts}
+        )
+        if changed or deleted:
+            self._write_remote_manifest(manifest)
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def _remote_manifest(self) -> dict[str, str]:
+        path = f"{self.remote_root}/{_MANIFEST}"
+        try:
+            [response] = self.backend.download_files([path])
+        except Exception:  # noqa: BLE001
+            return {}  # Never synced (providers raise for missing files)
+        if response.error or not response.content:
+            return {}
+        return json.loads(gzip.decompress(response.content))
+
+    def _remote_changes(self, synced: dict[str, str]) -> tuple[dict[str, str], list[str]]:
+        """Hashes of files modified since the manifest was written, and deleted paths.
+
+        The listing goes through a file in the sandbox rather than the command's
+        output, which the backends truncate.
+        """
+        token = uuid.uuid4().hex
+        listing = f"/tmp/.stranger-sync-{token}.list"  # noqa: S108
+        changes = f"/tmp/.stranger-sync-{token}.changes.gz"  # noqa: S108
+        files = f"find . -type f ! -path './{SYNC_DIR}/*'"
+        newer = f"-newer {_MANIFEST}" if synced else ""
+        self._run(
+            f"{{ cd {shlex.quote(self.remote_root)} || exit 0; "
+            f"{files} {newer} -print0 | xargs -0 -r sha256sum; "
+            f"echo {_DELETED_MARKER}; "
+            f"[ -f {_PATHS} ] || exit 0; "
+            f"{files} | sed 's|^\\./||' | LC_ALL=C sort > {listing}; "
+            f"LC_ALL=C comm -23 {_PATHS} {listing}; rm -f {listing}; }} | gzip -1 > {changes}"
+        )
+        output = gzip.decompress(self._download(changes, "the list of changed files")).decode()
+        hashes, _, deletions = output.partition(f"{_DELETED_MARKER}\n")
+        changed = {}
+        for line in hashes.splitlines():
+            digest, _, path = line.partition("  ")
+            path = path.removeprefix("./")
+            if digest and path and synced.get(path) != digest:
+                changed[path] = digest
+        return changed, [path for path in deletions.splitlines() if path]
+
+    def _fetch_archive(self, paths: list[str]) -> bytes:
+        token = uuid.uuid4().hex
+        listing = f"/tmp/.stranger-pull-{token}.list"  # noqa: S108
+        archive = f"/tmp/.stranger-pull-{token}.tar.gz"  # noqa: S108
+        self._upload(listing, "".join(f"{path}\n" for path in paths).encode())
+        self._run(
+            f"cd {shlex.quote(self.remote_root)} && "
+            f"tar -czf {archive} -T {listing}; rm -f {listing}"
+        )
+        return self._download(archive, "changed files")
+
+    def _download(self, path: str, what: str) -> bytes:
+        """Download a temporary file from the sandbox and remove it there."""
+        try:
+            [response] = self.backend.download_files([path])
+        finally:
+            self.backend.execute(f"rm -f {path}")
+        if response.error:
+            msg = f"Could not download {what}: {response.error}"
+            raise RuntimeError(msg)
+        return response.content
+
+    def _write_remote_manifest(self, manifest: dict[str, str]) -> None:
+        paths = "".join(f"{path}\n" for path in sorted(manifest)).encode()
+        self.backend.upload_files(
+            [
+                (f"{self.remote_root}/{_MANIFEST}", _encode_manifest(manifest)),
+                (f"{self.remote_root}/{_PATHS}", paths),
+            ]
+        )
+        self._run(f"touch {shlex.quote(self.remote_root)}/{_MANIFEST}")
+
+    def _upload(self, path: str, content: bytes) -> None:
+        [response] = self.backend.upload_files([(path, content)])
+        if response.error:
+            msg = f"Upload of {path} failed: {response.error}"
+            raise RuntimeError(msg)
+
+    def _run(self, command: str) -> str:
+        result = self.backend.execute(command)
+        if result.exit_code:
+            msg = f"Workspace sync command failed (exit {result.exit_code}): {result.output}"
+            raise RuntimeError(msg)
+        if result.truncated:
+            # Parsing a cut listing would silently skip files
+            msg = "Workspace sync command output was truncated"
+            raise RuntimeError(msg)
+        return result.output
+
+
+def _encode_manifest(manifest: dict[str, str]) -> bytes:
+    return gzip.compress(json.dumps(manifest, separators=(",", ":")).encode(), compresslevel=6)
+
+
+def _add_bytes(tar: tarfile.TarFile, name: str, content: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(content)
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    tar.addfile(info, io.BytesIO(content))
+
+
+__all__ = [
+    "SYNC_DIR",
+    "SyncResult",
+    "WorkspaceSync",
+    "list_project_files",
+]
@@ -0,0 +1,214 @@
+"""Incremental parsing of streamed tool-call arguments.
+
+Models stream tool-call arguments as JSON fragments. Re-joining the fragments
+and calling `json.loads` on every chunk is quadratic - a `write_file` carrying a
+200 KB file costs gigabytes of scanning. `StreamingJSONParser` instead scans
+each fragment once, tracking just enough structure (nesting depth, string and
+escape state) to know when the document is complete, then decodes it with a
+single `json.loads`.
+
+While scanning it also decodes short top-level fields of the argument object
+as soon as they finish streaming, so `file_path` can be shown long before the
+file content behind it has arrived.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+# Retained argument text; larger payloads keep only their short top-level fields
+DEFAULT_MAX_CHARS = 16 * 1024 * 1024
+
+# Top-level fields longer than this are not decoded until the document completes
+MAX_PARTIAL_FIELD_CHARS = 4096
+
+# Characters that end a run of plain string content, and JSON structure outside strings
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURAL = re.compile(r'[{}\[\]",:]')
+
+
+class StreamingJSONParser:
+    """Incrementally scan a JSON document fed in arbitrary fragments.
+
+    Each character is examined once. Completion is detected when the top-level
+    object or array closes (tool arguments are always an object); the document
+    is then decoded with one `json.loads`.
+
+    Attributes:
+        partial: Top-level fields of an object decoded so far (short ones only)
+        truncated: Input exceeded `max_chars`; `value` falls back to `partial`
+        failed: The completed document was not valid JSON
+    """
+
+    def __init__(self, *, max_chars: int = DEFAULT_MAX_CHARS) -> None:
+        """Initialize the parser.
+
+        Args:
+            max_chars: Maximum argument text to retain for the final decode
+        """
+        self.partial: dict[str, Any] = {}
+        self.truncated = False
+        self.failed = False
+        self._max_chars = max_chars
+        self._parts: list[str] = []
+        self._size = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._complete = False
+        self._value: Any = None
+        # Raw text of the current top-level key or value (depth 1 of an object)
+        self._object = False
+        self._segment: list[str] | None = None
+        self._segment_size = 0
+        self._key: str | None = None
+
+    @property
+    def complete(self) -> bool:
+        """Whether the top-level value has closed and been decoded."""
+        return self._complete
+
+    @property
+    def size(self) -> int:
+        """Characters fed so far."""
+        return self._size
+
+    @property
+    def value(self) -> Any:  # noqa: ANN401
+        """The decoded document (or `partial` if the input was truncated)."""
+        if not self._complete:
+            msg = "JSON document is not complete yet"
+            raise ValueError(msg)
+        return self._value
+
+    def feed(self, chunk: str) -> bool:
+        """Scan the next fragment.
+
+        Returns:
+            True once the document is complete.
+
+        Raises:
+            json.JSONDecodeError: The document closed but is not valid JSON
+        """
+        if self._complete or self.failed or not chunk:
+            return self._complete
+        closed_at = self._scan(chunk)
+        if closed_at is not None:
+            chunk = chunk[:closed_at]
+        self._size += len(chunk)
+        if not self.truncated:
+            if self._size > self._max_chars:
+                self.truncated = True
+                self._parts.clear()
+            else:
+                self._parts.append(chunk)
+        return self._finish() if closed_at is not None else False
+
+    def _finish(self) -> bool:
+        if self.truncated:
+            self._value = dict(self.partial)
+        else:
+            try:
+                self._value = json.loads("".join(self._parts))
+            except json.JSONDecodeError:
+                self.failed = True
+                raise
+            finally:
+                self._parts.clear()
+        self._complete = True
+        return True
+
+    def _scan(self, chunk: str) -> int | None:  # noqa: PLR0912
+        """Advance the structural state over `chunk`.
+
+        Returns:
+            Offset just past the character that closed the top-level value, or
+            None if it is still open.
+        """
+        pos = 0
+        length = len(chunk)
+        segment_start = 0
+        while pos < length:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(chunk, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                continue
+
+            match = _STRUCTURAL.search(chunk, pos)
+            if match is None:
+                break
+            char = match.group()
+            index = match.start()
+            pos = match.end()
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._object = char == "{"
+                    self._start_segment()
+                    segment_start = pos
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end_segment(chunk[segment_start:index], value=True)
+                    return pos
+            elif self._depth == 1 and self._object:
+                # ':' ends a key and ',' ends a value of the top-level object
+                self._end_segment(chunk[segment_start:index], value=char == ",")
+                self._start_segment()
+                segment_start = pos
+
+        if self._segment is not None:
+            self._extend_segment(chunk[segment_start:])
+        return None
+
+    def _start_segment(self) -> None:
+        self._segment = [] if self._object else None
+        self._segment_size = 0
+
+    def _extend_segment(self, text: str) -> None:
+        if self._segment is None or not text:
+            return
+        self._segment_size += len(text)
+        if self._segment_size > MAX_PARTIAL_FIELD_CHARS:
+            self._segment = None
+        else:
+            self._segment.append(text)
+
+    def _end_segment(self, tail: str, *, value: bool) -> None:
+        """Decode the finished top-level key or value, if it was short enough."""
+        self._extend_segment(tail)
+        segment, self._segment = self._segment, None
+        key, self._key = self._key, None
+        if segment is None:
+            return
+        raw = "".join(segment).strip()
+        if not raw:
+            return
+        try:
+            decoded = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        if not value:
+            self._key = decoded if isinstance(decoded, str) else None
+        elif key is not None:
+            self.partial[key] = decoded
+
+
+__all__ = [
+    "DEFAULT_MAX_CHARS",
+    "StreamingJSONParser",
+]
@@ -1,60 +1,38 @@
 """Main entry point and CLI loop for Stranger Code."""
 # ruff: noqa: T201
 
+from __future__ import annotations
+
 import argparse
 import asyncio
-import contextlib
+import importlib.util
 import os
 import sys
 from pathlib import Path
-
-# Now safe to import agent (which imports LangChain modules)
-from stranger_code.agent import create_cli_agent, list_agents, reset_agent
+from typing import TYPE_CHECKING
 
 # CRITICAL: Import config FIRST to set LANGSMITH_PROJECT before LangChain loads
-from stranger_code.config import (
-    console,
-    create_model,
-    settings,
-)
-from stranger_code.integrations.sandbox_factory import create_sandbox
-from stranger_code.sessions import (
-    delete_thread_command,
-    generate_thread_id,
-    get_checkpointer,
-    get_most_recent,
-    get_thread_agent,
-    list_threads_command,
-    thread_exists,
-)
-from stranger_code.skills import execute_skills_command, setup_skills_parser
-from stranger_code.tools import fetch_url, http_request, web_search
+from stranger_code.config import DURABILITY_MODES, console
 from stranger_code.ui import show_help
 
+# Everything else is imported by the command that needs it, so `help`, `list` and
+# `threads` start without loading LangChain, deepagents or Textual
+if TYPE_CHECKING:
+    from datetime import timedelta
 
-def check_cli_dependencies() -> None:
-    """Check if CLI optional dependencies are installed."""
-    missing = []
-
-    try:
-        import requests  # noqa: F401
-    except ImportError:
-        missing.append("requests")
-
-    try:
-        import dotenv  # noqa: F401
-    except ImportError:
-        missing.append("python-dotenv")
+    from stranger_code.sessions import SessionRouter, SessionStore
 
-    try:
-        import tavily  # noqa: F401
-    except ImportError:
-        missing.append("tavily-python")
 
-    try:
-        import textual  # noqa: F401
-    except ImportError:
-        missing.append("textual")
+def check_cli_dependencies() -> None:
+    """Check if CLI optional dependencies are installed."""
+    # Probe without importing: most commands never load these
+    packages = {
+        "requests": "requests",
+        "dotenv": "python-dotenv",
+        "tavily": "tavily-python",
+        "textual": "textual",
+    }
+    missing = [name for module, name in packages.items() if not importlib.util.find_spec(module)]
 
     if missing:
         print("\n❌ Missing required CLI dependencies!")
@@ -68,6 +46,13 @@ def check_cli_dependencies() -> None:
         sys.exit(1)
 
 
+def _parse_duration(value: str) -> timedelta:
+    """Parse --older-than for argparse, importing sessions only when used."""
+    from stranger_code.sessions import parse_duration
+
+    return parse_duration(value)
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -91,7 +76,10 @@ def parse_args() -> argparse.Namespace:
         "--target", dest="source_agent", help="Copy prompt from another agent"
     )
 
-    # Skills command - setup delegated to skills module
+    # Skills command - setup delegated to skills module. The local parser is identical
+    # to deepagents-cli's and registering it does not import deepagents-cli
+    from stranger_code.skills.commands import setup_skills_parser
+
     setup_skills_parser(subparsers)
 
     # Threads command
@@ -109,6 +97,137 @@ def parse_args() -> argparse.Namespace:
     threads_delete = threads_sub.add_parser("delete", help="Delete a thread")
     threads_delete.add_argument("thread_id", help="Thread ID to delete")
 
+    # threads gc
+    threads_gc = threads_sub.add_parser("gc", help="Prune old checkpoints and reclaim space")
+    threads_gc.add_argument(
+        "--keep-last", type=int, default=None, help="Keep only the newest N checkpoints per thread"
+    )
+    threads_gc.add_argument(
+        "--older-than",
+        type=_parse_duration,
+        default=None,
+        help="Delete threads not used within this window (e.g. 30d, 12h, 2w)",
+    )
+    threads_gc.add_argument("--agent", default=None, help="Only apply retention to this agent")
+    threads_gc.add_argument(
+        "--dry-run", action="store_true", help="Report what would be removed without deleting"
+    )
+
+    # threads compress
+    threads_compress = threads_sub.add_parser(
+        "compress", help="Compress stored checkpoints and benchmark save/load"
+    )
+    threads_compress.add_argument(
+        "--thread", dest="thread_id", default=None, help="Thread to benchmark (default: latest)"
+    )
+    threads_compress.add_argument(
+        "--train-dict",
+        action="store_true",
+        help="Train a zstd dictionary on recent checkpoints before compressing",
+    )
+
+    # threads fork
+    threads_fork = threads_sub.add_parser("fork", help="Branch a thread into a new thread")
+    threads_fork.add_argument("thread_id", help="Thread ID to fork")
+    threads_fork.add_argument(
+        "--at",
+        dest="checkpoint_id",
+        default=None,
+        help="Checkpoint to branch from (default: latest)",
+    )
+
+    # threads search
+    threads_search = threads_sub.add_parser("search", help="Full-text search across threads")
+    threads_search.add_argument("query", help="Words to find (all must match; word* for prefix)")
+    threads_search.add_argument("--agent", default=None, help="Only search this agent's threads")
+    threads_search.add_argument("--limit", type=int, default=10, help="Max threads (default: 10)")
+
+    # threads stats
+    threads_stats = threads_sub.add_parser("stats", help="Show storage used per thread and agent")
+    threads_stats.add_argument("--agent", default=None, help="Only show this agent's threads")
+    threads_stats.add_argument(
+        "--limit", type=int, default=20, help="Largest threads to list (default: 20)"
+    )
+
+    # Exec command - headless run with a JSONL event stream
+    exec_parser = subparsers.add_parser(
+        "exec", help="Run one prompt without the UI, streaming JSONL events to stdout"
+    )
+    exec_parser.add_argument(
+        "prompt", nargs="?", default=None, help="Prompt text, or - to read it from stdin"
+    )
+    exec_parser.add_argument("-f", "--file", dest="prompt_file", help="Read the prompt from a file")
+    exec_parser.add_argument(
+        "--approve",
+        choices=["all", "none", "readonly"],
+        default="none",
+        help="Tool approval policy: all, none (reject gated tools) or readonly (default: none)",
+    )
+    exec_parser.add_argument(
+        "--thread", dest="thread_id", default=None, help="Continue an existing thread"
+    )
+    # Also accepted after the subcommand; SUPPRESS keeps the top-level defaults
+    exec_parser.add_argument("--agent", default=argparse.SUPPRESS, help="Agent identifier")
+    exec_parser.add_argument("--model", default=argparse.SUPPRESS, help="Model to use")
+
+    # Batch command - many headless runs sharing one agent graph
+    batch_parser = subparsers.add_parser(
+        "batch", help="Run every prompt in a JSONL file concurrently, each on its own thread"
+    )
+    batch_parser.add_argument("tasks", help="JSONL file with one {id, prompt} object per line")
+    batch_parser.add_argument(
+        "--concurrency", type=int, default=4, help="Tasks run at once (default: 4)"
+    )
+    batch_parser.add_argument(
+        "--timeout", type=float, default=600.0, help="Seconds per attempt (default: 600)"
+    )
+    batch_parser.add_argument(
+        "--retries", type=int, default=1, help="Retries for failed or timed-out tasks (default: 1)"
+    )
+    batch_parser.add_argument(
+        "--results", default=None, help="Results JSONL (default: <tasks>.results.jsonl)"
+    )
+    batch_parser.add_argument("--events", default=None, help="Also write every task's events here")
+    batch_parser.add_argument(
+        "--approve",
+        choices=["all", "none", "readonly"],
+        default="none",
+        help="Tool approval policy, as for exec (default: none)",
+    )
+    batch_parser.add_argument("--agent", default=argparse.SUPPRESS, help="Agent identifier")
+    batch_parser.add_argument("--model", default=argparse.SUPPRESS, help="Model to use")
+
+    # Serve command - local HTTP/SSE server shared by editors and scripts
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve the agent over local HTTP with SSE streaming"
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=8765, help="Port on 127.0.0.1 (default: 8765)"
+    )
+    serve_parser.add_argument(
+        "--socket", dest="socket_path", default=None, help="Listen on a Unix socket instead"
+    )
+    serve_parser.add_argument("--agent", default=argparse.SUPPRESS, help="Default agent")
+    serve_parser.add_argument("--model", default=argparse.SUPPRESS, help="Model to use")
+
+    # Daemon command - inspect or stop the warm background daemon
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Show or stop the warm background daemon for this directory"
+    )
+    daemon_parser.add_argument("action", choices=["status", "stop"], help="Daemon action")
+
+    # Sandbox pool command - inspect, pre-warm or empty the shared pool of warm sandboxes
+    pool_parser = subparsers.add_parser(
+        "sandbox-pool", help="Show, pre-warm or drain the shared pool of warm sandboxes"
+    )
+    pool_parser.add_argument("action", choices=["status", "fill", "drain"], help="Pool action")
+    pool_parser.add_argument(
+        "provider", nargs="?", choices=["modal", "daytona", "runloop"], help="Sandbox provider"
+    )
+    pool_parser.add_argument(
+        "--size", type=int, default=1, help="Warm sandboxes to keep for fill (default: 1)"
+    )
+
     # Default interactive mode
     parser.add_argument(
         "--agent",
@@ -149,13 +268,37 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--sandbox-setup",
-        help="Path to setup script to run in sandbox after creation",
+        help="Setup script to run in the sandbox (steps already applied there are skipped)",
+    )
+    parser.add_argument(
+        "--sandbox-pool",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Lease a pre-warmed sandbox and keep N warm for later sessions (default: 0, off)",
+    )
+    parser.add_argument(
+        "--sandbox-sync",
+        action="store_true",
+        help="Mirror the current directory into the sandbox and pull the agent's changes back",
     )
     parser.add_argument(
         "--no-splash",
         action="store_true",
         help="Skip the Stranger Things intro sequence",
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run the agent in a warm background daemon (spawned on first use) for fast startup",
+    )
+    parser.add_argument(
+        "--durability",
+        choices=DURABILITY_MODES,
+        default="exit",
+        help="When to persist checkpoints: exit (end of turn), async-batched "
+        "(every step, committed in background batches) or sync (every step)",
+    )
     return parser.parse_args()
 
 
@@ -165,10 +308,16 @@ async def run_textual_cli_async(
     auto_approve: bool = False,
     sandbox_type: str = "none",
     sandbox_id: str | None = None,
+    sandbox_setup: str | None = None,
+    sandbox_pool: int = 0,
+    sandbox_sync: bool = False,
     model_name: str | None = None,
     thread_id: str | None = None,
     is_resumed: bool = False,
     no_splash: bool = False,
+    store: SessionStore | None = None,
+    durability: str = "exit",
+    use_daemon: bool = False,
 ) -> None:
     """Run the Stranger Code Textual CLI interface (async version).
 
@@ -177,14 +326,19 @@ async def run_textual_cli_async(
         auto_approve: Whether to auto-approve tool usage
         sandbox_type: Type of sandbox ("none", "modal", "runloop", "daytona")
         sandbox_id: Optional existing sandbox ID to reuse
+        sandbox_setup: Optional setup script to run in the sandbox
+        sandbox_pool: Warm sandboxes to keep in the shared pool (0 disables pooling)
+        sandbox_sync: Mirror the current directory into the sandbox and pull changes back
         model_name: Optional model name to use
         thread_id: Thread ID to use (new or resumed)
         is_resumed: Whether this is a resumed session
         no_splash: Skip the Stranger Things intro sequence
+        store: Open session store to share with the checkpointer (opens one if None)
+        durability: Checkpoint durability mode (one of DURABILITY_MODES)
+        use_daemon: Run the agent in the warm background daemon for this directory
     """
     from stranger_code.app import run_textual_app
-
-    model = create_model(model_name)
+    from stranger_code.bootstrap import AgentBootstrap
 
     # Show thread info
     if is_resumed:
@@ -192,57 +346,145 @@ async def run_textual_cli_async(
     else:
         console.print(f"[dim]Thread: {thread_id}[/dim]")
 
-    # Use async context manager for checkpointer
-    async with get_checkpointer() as checkpointer:
-        # Create agent with conditional tools
-        tools = [http_request, fetch_url]
-        if settings.has_tavily:
-            tools.append(web_search)
-
-        # Handle sandbox mode
-        sandbox_backend = None
-        sandbox_cm = None
+    if use_daemon:
+        from stranger_code.daemon import attach_daemon
 
         if sandbox_type != "none":
-            try:
-                # Create sandbox context manager but keep it open
-                sandbox_cm = create_sandbox(sandbox_type, sandbox_id=sandbox_id)
-                sandbox_backend = sandbox_cm.__enter__()
-            except (ImportError, ValueError, RuntimeError, NotImplementedError) as e:
-                console.print()
-                console.print("[red]❌ Sandbox creation failed[/red]")
-                console.print(f"[dim]{e}[/dim]")
-                sys.exit(1)
-
+            console.print("[red]❌ --daemon runs tools locally and cannot use --sandbox[/red]")
+            sys.exit(1)
         try:
-            agent, composite_backend = create_cli_agent(
-                model=model,
-                assistant_id=assistant_id,
-                tools=tools,
-                sandbox=sandbox_backend,
-                sandbox_type=sandbox_type if sandbox_type != "none" else None,
+            agent = await attach_daemon(
+                assistant_id,
+                model_name=model_name,
                 auto_approve=auto_approve,
-                checkpointer=checkpointer,
+                durability=durability,
             )
+        except RuntimeError as e:
+            console.print(f"[red]❌ {e}[/red]")
+            sys.exit(1)
+        await run_textual_app(
+            agent=agent,
+            assistant_id=assistant_id,
+            backend=None,
+            auto_approve=auto_approve,
+            cwd=Path.cwd(),
+            thread_id=thread_id,
+            no_splash=no_splash,
+            durability=durability,
+            store=store,
+        )
+        return
+
+    # The app starts right away and builds the agent in the background
+    bootstrap = AgentBootstrap(
+        assistant_id,
+        model_name=model_name,
+        auto_approve=auto_approve,
+        sandbox_type=sandbox_type,
+        sandbox_id=sandbox_id,
+        sandbox_setup=sandbox_setup,
+        sandbox_pool=sandbox_pool,
+        sync_dir=Path.cwd() if sandbox_sync else None,
+        store=store,
+    )
+    try:
+        await run_textual_app(
+            assistant_id=assistant_id,
+            auto_approve=auto_approve,
+            cwd=Path.cwd(),
+            thread_id=thread_id,
+            no_splash=no_splash,
+            durability=durability,
+            store=store,
+            bootstrap=bootstrap,
+        )
+    finally:
+        # Closes the checkpointer and tears down the sandbox (if we created one)
+        await bootstrap.aclose()
+
+    if bootstrap.error:
+        for line in bootstrap.log:
+            console.print(f"[dim]{line}[/dim]")
+        console.print(f"[red]❌ {bootstrap.error}[/red]")
+        sys.exit(1)
 
-            # Run Textual app
-            await run_textual_app(
-                agent=agent,
-                assistant_id=assistant_id,
-                backend=composite_backend,
-                auto_approve=auto_approve,
-                cwd=Path.cwd(),
-                thread_id=thread_id,
-                no_splash=no_splash,
+
+async def _resolve_thread(args: argparse.Namespace, store: SessionRouter) -> tuple[str, bool]:
+    """Resolve the thread to use from the -r/--resume argument.
+
+    Updates `args.agent` to the thread's agent when resuming.
+
+    Returns:
+        (thread_id, is_resumed)
+    """
+    thread_id = None
+    is_resumed = False
+
+    if args.resume_thread == "__MOST_RECENT__":
+        # -r (no ID): Get most recent thread
+        # If --agent specified, filter by that agent; otherwise get most recent overall
+        agent_filter = args.agent if args.agent != "agent" else None
+        thread_id = await store.get_most_recent(agent_filter)
+        if thread_id:
+            is_resumed = True
+            agent_name = await store.get_thread_agent(thread_id)
+            if agent_name:
+                args.agent = agent_name
+        else:
+            msg = (
+                f"No previous thread for '{args.agent}'" if agent_filter else "No previous threads"
             )
-        except Exception as e:
-            console.print(f"[red]❌ Failed to create agent: {e}[/red]")
+            console.print(f"[yellow]{msg}, starting new.[/yellow]")
+
+    elif args.resume_thread:
+        # -r <ID>: Resume specific thread
+        if await store.thread_exists(args.resume_thread):
+            thread_id = args.resume_thread
+            is_resumed = True
+            if args.agent == "agent":
+                agent_name = await store.get_thread_agent(thread_id)
+                if agent_name:
+                    args.agent = agent_name
+        else:
+            console.print(f"[red]Thread '{args.resume_thread}' not found.[/red]")
+            console.print("[dim]Use 'deepagents threads list' to see available threads.[/dim]")
             sys.exit(1)
-        finally:
-            # Clean up sandbox if we created one
-            if sandbox_cm is not None:
-                with contextlib.suppress(Exception):
-                    sandbox_cm.__exit__(None, None, None)
+
+    # Generate new thread ID if not resuming
+    if thread_id is None:
+        from stranger_code.sessions import generate_thread_id
+
+        thread_id = generate_thread_id()
+
+    return thread_id, is_resumed
+
+
+async def run_interactive_async(args: argparse.Namespace) -> None:
+    """Resolve the session thread and run the Textual CLI on one shared store."""
+    from stranger_code.sessions import SessionRouter
+
+    async with SessionRouter(durability=args.durability) as router:
+        thread_id, is_resumed = await _resolve_thread(args, router)
+        # Resumed threads stay in the shard they were written to
+        store = await router.find_store(thread_id) if is_resumed else None
+        store = store or await router.store_for(args.agent)
+
+        await run_textual_cli_async(
+            assistant_id=args.agent,
+            auto_approve=args.auto_approve,
+            sandbox_type=args.sandbox,
+            sandbox_id=args.sandbox_id,
+            sandbox_setup=args.sandbox_setup,
+            sandbox_pool=args.sandbox_pool,
+            sandbox_sync=args.sandbox_sync,
+            model_name=getattr(args, "model", None),
+            thread_id=thread_id,
+            is_resumed=is_resumed,
+            no_splash=args.no_splash,
+            store=store,
+            durability=args.durability,
+            use_daemon=args.daemon,
+        )
 
 
 def cli_main() -> None:
@@ -265,12 +507,88 @@ def cli_main() -> None:
         if args.command == "help":
             show_help()
         elif args.command == "list":
+            from stranger_code.agent import list_agents
+
             list_agents()
         elif args.command == "reset":
+            from stranger_code.agent import reset_agent
+
             reset_agent(args.agent, args.source_agent)
         elif args.command == "skills":
+            from stranger_code.skills import execute_skills_command
+
             execute_skills_command(args)
+        elif args.command == "exec":
+            from stranger_code.headless import exec_command
+
+            sys.exit(
+                asyncio.run(
+                    exec_command(
+                        prompt=args.prompt,
+                        prompt_file=args.prompt_file,
+                        assistant_id=args.agent,
+                        approve=args.approve,
+                        model_name=args.model,
+                        thread_id=args.thread_id,
+                        sandbox_type=args.sandbox,
+                        sandbox_id=args.sandbox_id,
+                        sandbox_setup=args.sandbox_setup,
+                        sandbox_pool=args.sandbox_pool,
+                        sync_dir=Path.cwd() if args.sandbox_sync else None,
+                        durability=args.durability,
+                    )
+                )
+            )
+        elif args.command == "batch":
+            from stranger_code.batch import batch_command
+
+            sys.exit(
+                asyncio.run(
+                    batch_command(
+                        args.tasks,
+                        results_path=args.results,
+                        events_path=args.events,
+                        concurrency=args.concurrency,
+                        task_timeout=args.timeout,
+                        retries=args.retries,
+                        approve=args.approve,
+                        assistant_id=args.agent,
+                        model_name=args.model,
+                        durability=args.durability,
+                    )
+                )
+            )
+        elif args.command == "serve":
+            from stranger_code.server import serve_command
+
+            asyncio.run(
+                serve_command(
+                    port=args.port,
+                    socket_path=args.socket_path,
+                    assistant_id=args.agent,
+                    model_name=args.model,
+                    durability=args.durability,
+                )
+            )
+        elif args.command == "daemon":
+            from stranger_code.daemon import daemon_command
+
+            asyncio.run(daemon_command(args.action))
+        elif args.command == "sandbox-pool":
+            from stranger_code.integrations.sandbox_factory import sandbox_pool_command
+
+            sandbox_pool_command(args.action, args.provider, size=args.size)
         elif args.command == "threads":
+            from stranger_code.sessions import (
+                compress_threads_command,
+                delete_thread_command,
+                fork_thread_command,
+                gc_threads_command,
+                list_threads_command,
+                search_threads_command,
+                stats_threads_command,
+            )
+
             if args.threads_command == "list":
                 asyncio.run(
                     list_threads_command(
@@ -280,64 +598,37 @@ def cli_main() -> None:
                 )
             elif args.threads_command == "delete":
                 asyncio.run(delete_thread_command(args.thread_id))
-            else:
-                console.print("[yellow]Usage: deepagents threads <list|delete>[/yellow]")
-        else:
-            # Interactive mode - handle thread resume
-            thread_id = None
-            is_resumed = False
-
-            if args.resume_thread == "__MOST_RECENT__":
-                # -r (no ID): Get most recent thread
-                # If --agent specified, filter by that agent; otherwise get most recent overall
-                agent_filter = args.agent if args.agent != "agent" else None
-                thread_id = asyncio.run(get_most_recent(agent_filter))
-                if thread_id:
-                    is_resumed = True
-                    agent_name = asyncio.run(get_thread_agent(thread_id))
-                    if agent_name:
-                        args.agent = agent_name
-                else:
-                    msg = (
-                        f"No previous thread for '{args.agent}'"
-                        if agent_filter
-                        else "No previous threads"
+            elif args.threads_command == "gc":
+                asyncio.run(
+                    gc_threads_command(
+                        keep_last=args.keep_last,
+                        older_than=args.older_than,
+                        agent_name=args.agent,
+                        dry_run=args.dry_run,
                     )
-                    console.print(f"[yellow]{msg}, starting new.[/yellow]")
-
-            elif args.resume_thread:
-                # -r <ID>: Resume specific thread
-                if asyncio.run(thread_exists(args.resume_thread)):
-                    thread_id = args.resume_thread
-                    is_resumed = True
-                    if args.agent == "agent":
-                        agent_name = asyncio.run(get_thread_agent(thread_id))
-                        if agent_name:
-                            args.agent = agent_name
-                else:
-                    console.print(f"[red]Thread '{args.resume_thread}' not found.[/red]")
-                    console.print(
-                        "[dim]Use 'deepagents threads list' to see available threads.[/dim]"
+                )
+            elif args.threads_command == "compress":
+                asyncio.run(
+                    compress_threads_command(
+                        thread_id=args.thread_id, train_dictionary=args.train_dict
                     )
-                    sys.exit(1)
-
-            # Generate new thread ID if not resuming
-            if thread_id is None:
-                thread_id = generate_thread_id()
-
-            # Run Textual CLI
-            asyncio.run(
-                run_textual_cli_async(
-                    assistant_id=args.agent,
-                    auto_approve=args.auto_approve,
-                    sandbox_type=args.sandbox,
-                    sandbox_id=args.sandbox_id,
-                    model_name=getattr(args, "model", None),
-                    thread_id=thread_id,
-                    is_resumed=is_resumed,
-                    no_splash=args.no_splash,
                 )
-            )
+            elif args.threads_command == "fork":
+                asyncio.run(fork_thread_command(args.thread_id, checkpoint_id=args.checkpoint_id))
+            elif args.threads_command == "search":
+                asyncio.run(
+                    search_threads_command(args.query, agent_name=args.agent, limit=args.limit)
+                )
+            elif args.threads_command == "stats":
+                asyncio.run(stats_threads_command(agent_name=args.agent, limit=args.limit))
+            else:
+                console.print(
+                    "[yellow]Usage: deepagents threads "
+                    "<list|delete|gc|compress|fork|search|stats>[/yellow]"
+                )
+        else:
+            # Interactive mode - resolve the thread and run the app in one event loop
+            asyncio.run(run_interactive_async(args))
     except KeyboardInterrupt:
         # Clean exit on Ctrl+C - suppress ugly traceback
         console.print("\n\n[yellow]Interrupted[/yellow]")
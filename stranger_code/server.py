@@ -0,0 +1,574 @@
+"""Local HTTP/SSE server: `stranger-code serve`.
+
+Hosts the agent once per machine so editors and scripts can drive it without
+each starting their own Python/LangChain process. One SessionRouter (one
+shared connection per sessions database) and one compiled agent graph per
+agent serve every request; each message runs as its own asyncio task.
+
+Endpoints (JSON bodies, one request per connection):
+    GET  /health                              status and running threads
+    GET  /threads?agent=NAME&limit=N          list threads, most recent first
+    POST /threads            {"agent"}        create a thread -> {"thread_id"}
+    POST /threads/ID/messages {"message", "approve"}
+                                              run one turn, streamed as SSE
+    POST /threads/ID/approvals/APPROVAL_ID {"decision": "approve" | "reject"}
+                                              answer a pending approval
+
+Message streams carry the events of `stranger-code exec` (see
+stranger_code.headless) as `event: <type>` / `data: <json>` pairs. With
+`"approve": "ask"` (the default) each gated tool call emits an
+`approval_request` event with an `id` and waits for the approvals endpoint;
+the other policies (all, none, readonly) decide on their own. Closing the
+stream cancels the turn.
+
+Requests carrying an `Origin` header are refused, and POST bodies must be
+sent as `Content-Type: application/json`, so a web page can't drive the
+server from the browser. On TCP (127.0.0.1 only) the `Host` header must name
+the listener, which defeats DNS rebinding, and every request needs the bearer
+token stored in ~/.deepagents/serve-token (created with owner-only
+permissions on first start). A Unix socket is readable only by the current
+user and needs no token.
+
+Usage:
+    stranger-code serve --port 8765
+    curl -H "Authorization: Bearer $(cat ~/.deepagents/serve-token)" \
+        http://127.0.0.1:8765/health
+    stranger-code serve --socket ~/.deepagents/agent.sock
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hmac
+import json
+import os
+import secrets
+import time
+import uuid
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlsplit
+
+from stranger_code.headless import APPROVAL_POLICIES, JSONLAdapter, JSONLWriter, run_exec
+from stranger_code.sessions import generate_thread_id
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Collection
+
+    from stranger_code.sessions import SessionRouter, SessionStore
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Pending connections queued by the listener (many editors may connect at once)
+_BACKLOG = 512
+
+# Largest request body accepted
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+# "ask" waits for the approvals endpoint instead of deciding by policy
+SERVE_APPROVAL_POLICIES = ("ask", *APPROVAL_POLICIES)
+
+_SSE_HEADERS = (
+    "HTTP/1.1 200 OK\r\n"
+    "Content-Type: text/event-stream\r\n"
+    "Cache-Control: no-cache\r\n"
+    "Connection: close\r\n\r\n"
+)
+
+# Queued SSE bytes beyond which the turn waits for the client to catch up
+_SSE_HIGH_WATER = 1024 * 1024
+
+
+class HTTPError(Exception):
+    """Request failed with an HTTP status."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        """Initialize the error with the status to send and a message for the body."""
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request."""
+
+    method: str
+    path: str
+    query: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def json(self) -> dict:
+        """Decode the body as a JSON object (empty body -> {})."""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except json.JSONDecodeError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON body: {e.msg}") from e
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Expected a JSON object")
+        return data
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request | None:
+    """Read one HTTP/1.1 request, or None if the client closed the connection."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _version = line.decode("latin-1").split()
+    except ValueError as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line") from e
+    headers = {}
+    while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    url = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    return Request(method.upper(), url.path.rstrip("/") or "/", query, body, headers)
+
+
+def json_response(status: HTTPStatus, payload: Any) -> bytes:  # noqa: ANN401
+    """Serialize a complete JSON response (the connection closes after it)."""
+    body = json.dumps(payload, default=str).encode()
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+def default_token_path() -> Path:
+    """Where `serve` keeps the bearer token for TCP clients."""
+    return Path.home() / ".deepagents" / "serve-token"
+
+
+def load_or_create_token(path: Path) -> str:
+    """Read the bearer token at `path`, creating it (owner-only) on first use."""
+    with contextlib.suppress(FileNotFoundError):
+        token = path.read_text().strip()
+        if token:
+            return token
+    path.parent.mkdir(parents=True, exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as file:
+        file.write(token + "\n")
+    return token
+
+
+def local_hosts(port: int) -> frozenset[str]:
+    """Host header values that name a loopback listener on `port`."""
+    return frozenset(f"{host}:{port}" for host in ("localhost", "127.0.0.1"))
+
+
+class SSEWriter(JSONLWriter):
+    """Writes events to an HTTP response as server-sent events.
+
+    Events are queued and written by a task that waits for the socket to drain,
+    so a slow client holds back the turn (see `wait_writable`) instead of the
+    server buffering its whole output.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        """Initialize the writer on an open connection."""
+        super().__init__()
+        self._writer = writer
+        self._queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._buffered = 0
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._pump_task = asyncio.create_task(self._pump())
+
+    def emit(self, event_type: str, **fields: Any) -> None:
+        """Queue one event (dropped once the client has gone away)."""
+        if self._pump_task.done() or self._writer.is_closing():
+            return
+        event = {"type": event_type, "t": round(self.elapsed, 4), **fields}
+        data = json.dumps(event, ensure_ascii=False, default=str)
+        chunk = f"event: {event_type}\ndata: {data}\n\n".encode()
+        self._queue.put_nowait(chunk)
+        self._buffered += len(chunk)
+        if self._buffered > _SSE_HIGH_WATER:
+            self._writable.clear()
+
+    async def wait_writable(self) -> None:
+        """Wait until the client has caught up with the queued events."""
+        await self._writable.wait()
+
+    async def aclose(self) -> None:
+        """Write the events still queued, then stop the writer task."""
+        if not self._pump_task.done():
+            self._queue.put_nowait(None)
+        await self._pump_task
+
+    async def _pump(self) -> None:
+        try:
+            while (chunk := await self._queue.get()) is not None:
+                self._writer.write(chunk)
+                await self._writer.drain()
+                self._buffered -= len(chunk)
+                if self._buffered <= _SSE_HIGH_WATER:
+                    self._writable.set()
+        except ConnectionError:
+            pass
+        finally:
+            # Never leave a producer waiting on a client that is gone
+            self._writable.set()
+
+
+class _ServeAdapter(JSONLAdapter):
+    """JSONLAdapter whose "ask" policy defers approvals to the approvals endpoint."""
+
+    policies = SERVE_APPROVAL_POLICIES
+
+    def __init__(
+        self, writer: JSONLWriter, *, approve: str, approvals: dict[str, asyncio.Future]
+    ) -> None:
+        super().__init__(writer, approve=approve)
+        self._approvals = approvals
+        self._pending: list[str] = []
+
+    async def _decide(self, action_request: dict, assistant_id: str | None) -> asyncio.Future:
+        if self._approve != "ask":
+            return await super()._decide(action_request, assistant_id)
+        approval_id = uuid.uuid4().hex[:12]
+        future = asyncio.get_running_loop().create_future()
+        self._approvals[approval_id] = future
+        self._pending.append(approval_id)
+        future.add_done_callback(self._on_decided)
+        self._writer.emit(
+            "approval_request",
+            id=approval_id,
+            tool=action_request.get("name", ""),
+            args=action_request.get("args", {}),
+            description=action_request.get("description"),
+        )
+        return future
+
+    def _on_decided(self, future: asyncio.Future) -> None:
+        if not future.cancelled() and future.result().get("type") == "reject":
+            self.rejected = True
+
+    def cancel_pending(self) -> None:
+        """Drop approvals still waiting when the turn ends or the client leaves."""
+        for approval_id in self._pending:
+            future = self._approvals.pop(approval_id, None)
+            if future is not None and not future.done():
+                future.cancel()
+
+
+class AgentServer:
+    """Routes HTTP requests to shared agent graphs and session stores."""
+
+    def __init__(
+        self,
+        router: SessionRouter,
+        agent_factory: Callable[[str, SessionStore], Awaitable[tuple[Any, Any]]],
+        *,
+        default_agent: str = "agent",
+        token: str | None = None,
+        hosts: Collection[str] | None = None,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            router: Open session router shared by every request
+            agent_factory: Builds (agent graph, backend) for an agent on a store;
+                called once per agent and database
+            default_agent: Agent used when a request does not name one
+            token: Bearer token every request must present (None: no token)
+            hosts: Accepted `Host` header values (None: any, for Unix sockets)
+        """
+        self._router = router
+        self._agent_factory = agent_factory
+        self._default_agent = default_agent
+        self._token = token
+        self._hosts = {host.lower() for host in hosts} if hosts is not None else None
+        self._agents: dict[tuple[str, Path], tuple[Any, Any]] = {}
+        self._agent_locks: dict[tuple[str, Path], asyncio.Lock] = {}
+        # Threads created over the API that have no checkpoint yet
+        self._new_threads: dict[str, str] = {}
+        self._running: dict[str, asyncio.Task] = {}
+        self._approvals: dict[str, asyncio.Future] = {}
+        self._started = time.monotonic()
+
+    async def agent_for(self, assistant_id: str, store: SessionStore) -> tuple[Any, Any]:
+        """The (agent graph, backend) for an agent on a store, built on first use.
+
+        Call it before listening to have the first request skip the build.
+        """
+        key = (assistant_id, store.db_path)
+        if key not in self._agents:
+            async with self._agent_locks.setdefault(key, asyncio.Lock()):
+                if key not in self._agents:
+                    self._agents[key] = await self._agent_factory(assistant_id, store)
+        return self._agents[key]
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one request on a new connection."""
+        try:
+            request = await read_request(reader)
+            if request is not None:
+                self._authorize(request)
+                await self._dispatch(request, reader, writer)
+        except HTTPError as e:
+            writer.write(json_response(e.status, {"error": str(e)}))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:  # noqa: BLE001
+            error = {"error": f"{type(e).__name__}: {e}"}
+            writer.write(json_response(HTTPStatus.INTERNAL_SERVER_ERROR, error))
+        finally:
+            with contextlib.suppress(ConnectionError):
+                await writer.drain()
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    def _authorize(self, request: Request) -> None:
+        """Refuse requests a web page could forge, and unauthenticated TCP clients."""
+        headers = request.headers
+        if self._hosts is not None and headers.get("host", "").lower() not in self._hosts:
+            raise HTTPError(HTTPStatus.FORBIDDEN, "Host not allowed")
+        if "origin" in headers:
+            raise HTTPError(HTTPStatus.FORBIDDEN, "Cross-origin requests are not allowed")
+        if self._token is not None:
+            scheme, _, credentials = headers.get("authorization", "").partition(" ")
+            if scheme.lower() != "bearer" or not hmac.compare_digest(
+                credentials.strip().encode(), self._token.encode()
+            ):
+                raise HTTPError(HTTPStatus.UNAUTHORIZED, "Missing or invalid bearer token")
+        content_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        if request.method == "POST" and content_type != "application/json":
+            raise HTTPError(
+                HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Content-Type must be application/json"
+            )
+
+    async def _dispatch(
+        self, request: Request, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        parts = request.path.strip("/").split("/")
+        match request.method, parts:
+            case "GET", ["health"]:
+                payload = {
+                    "status": "ok",
+                    "uptime_s": round(time.monotonic() - self._started, 1),
+                    "running": sorted(self._running),
+                    "agents": sorted({assistant_id for assistant_id, _ in self._agents}),
+                }
+                writer.write(json_response(HTTPStatus.OK, payload))
+            case "GET", ["threads"]:
+                limit = request.query.get("limit", "20")
+                if not limit.isdigit():
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "limit must be a positive integer")
+                threads = await self._router.list_threads(request.query.get("agent"), int(limit))
+                writer.write(json_response(HTTPStatus.OK, {"threads": threads}))
+            case "POST", ["threads"]:
+                assistant_id = request.json().get("agent") or self._default_agent
+                thread_id = generate_thread_id()
+                self._new_threads[thread_id] = assistant_id
+                writer.write(
+                    json_response(
+                        HTTPStatus.CREATED, {"thread_id": thread_id, "agent": assistant_id}
+                    )
+                )
+            case "POST", ["threads", thread_id, "messages"]:
+                await self._send_message(thread_id, request.json(), reader, writer)
+            case "POST", ["threads", _thread_id, "approvals", approval_id]:
+                self._answer_approval(approval_id, request.json())
+                writer.write(json_response(HTTPStatus.OK, {"id": approval_id}))
+            case _:
+                msg = f"No route for {request.method} {request.path}"
+                raise HTTPError(HTTPStatus.NOT_FOUND, msg)
+
+    def _answer_approval(self, approval_id: str, body: dict) -> None:
+        decision = body.get("decision")
+        if decision not in ("approve", "reject", "auto_approve_all"):
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, "decision must be approve, reject or auto_approve_all"
+            )
+        future = self._approvals.pop(approval_id, None)
+        if future is None or future.done():
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No pending approval {approval_id}")
+        future.set_result({"type": decision})
+
+    async def _resolve_thread(self, thread_id: str) -> tuple[str, SessionStore]:
+        if thread_id in self._new_threads:
+            assistant_id = self._new_threads[thread_id]
+            return assistant_id, await self._router.store_for(assistant_id)
+        store = await self._router.find_store(thread_id)
+        if store is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Thread {thread_id} not found")
+        assistant_id = await store.get_thread_agent(thread_id) or self._default_agent
+        return assistant_id, store
+
+    async def _send_message(
+        self,
+        thread_id: str,
+        body: dict,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        message = body.get("message")
+        if not isinstance(message, str) or not message.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "message must be a non-empty string")
+        approve = body.get("approve", "ask")
+        if approve not in SERVE_APPROVAL_POLICIES:
+            policies = ", ".join(SERVE_APPROVAL_POLICIES)
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"approve must be one of {policies}")
+        if thread_id in self._running:
+            raise HTTPError(HTTPStatus.CONFLICT, f"Thread {thread_id} is already running")
+        assistant_id, store = await self._resolve_thread(thread_id)
+        agent, backend = await self.agent_for(assistant_id, store)
+
+        writer.write(_SSE_HEADERS.encode())
+        events = SSEWriter(writer)
+        try:
+            adapter = _ServeAdapter(events, approve=approve, approvals=self._approvals)
+            events.emit("start", thread_id=thread_id, agent=assistant_id, approve=approve)
+            run = asyncio.create_task(
+                run_exec(
+                    message,
+                    agent=agent,
+                    assistant_id=assistant_id,
+                    thread_id=thread_id,
+                    approve=approve,
+                    durability=store.durability,
+                    backend=backend,
+                    adapter=adapter,
+                )
+            )
+            self._running[thread_id] = run
+            # The client sends nothing more; EOF means it closed the stream
+            hangup = asyncio.create_task(reader.read())
+            status = "error"
+            try:
+                done, _ = await asyncio.wait({run, hangup}, return_when=asyncio.FIRST_COMPLETED)
+                if run not in done:
+                    run.cancel()
+                    await asyncio.wait({run})
+                status = "interrupted" if run.cancelled() else run.result()
+            except Exception as e:  # noqa: BLE001
+                events.emit("error", message=f"{type(e).__name__}: {e}")
+            finally:
+                hangup.cancel()
+                adapter.cancel_pending()
+                self._running.pop(thread_id, None)
+                self._new_threads.pop(thread_id, None)
+            events.emit("end", status=status, elapsed=round(events.elapsed, 4))
+        finally:
+            # Flush what is queued; on cancellation this also stops the writer task
+            await events.aclose()
+
+    async def shutdown(self) -> None:
+        """Cancel running turns (their streams end with status interrupted)."""
+        for task in list(self._running.values()):
+            task.cancel()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+
+async def start_server(
+    server: AgentServer,
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: str | None = None,
+) -> asyncio.Server:
+    """Listen on `socket_path` (owner-only permissions) or on host:port."""
+    if socket_path:
+        path = Path(socket_path).expanduser()  # noqa: ASYNC240
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        # Create the socket owner-only rather than restricting it after bind
+        umask = os.umask(0o077)
+        try:
+            return await asyncio.start_unix_server(
+                server.handle_connection, path=str(path), backlog=_BACKLOG
+            )
+        finally:
+            os.umask(umask)
+    return await asyncio.start_server(
+        server.handle_connection, host=host, port=port, backlog=_BACKLOG
+    )
+
+
+async def serve_command(
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: str | None = None,
+    assistant_id: str = "agent",
+    model_name: str | None = None,
+    durability: str = "exit",
+) -> None:
+    """CLI handler for: stranger-code serve."""
+    from stranger_code.agent import create_cli_agent
+    from stranger_code.config import console, create_model, settings
+    from stranger_code.sessions import SessionRouter
+    from stranger_code.tools import fetch_url, http_request, web_search
+
+    model = create_model(model_name)
+    tools = [http_request, fetch_url]
+    if settings.has_tavily:
+        tools.append(web_search)
+
+    async def agent_factory(name: str, store: SessionStore) -> tuple[Any, Any]:
+        # HITL stays enabled; the per-message policy decides each interrupt
+        return create_cli_agent(
+            model=model, assistant_id=name, tools=tools, checkpointer=store.checkpointer
+        )
+
+    token_path = None if socket_path else default_token_path()
+    socket = Path(socket_path).expanduser() if socket_path else None  # noqa: ASYNC240
+    async with SessionRouter(durability=durability) as router:
+        server = AgentServer(
+            router,
+            agent_factory,
+            default_agent=assistant_id,
+            token=load_or_create_token(token_path) if token_path else None,
+            hosts=None if socket_path else local_hosts(port),
+        )
+        await server.agent_for(assistant_id, await router.store_for(assistant_id))
+        listener = await start_server(server, host=host, port=port, socket_path=socket_path)
+        where = socket or f"http://{host}:{port}"
+        console.print(f"[green]Serving agent '{assistant_id}' on {where}[/green]")
+        if token_path:
+            console.print(f"[dim]Bearer token: {token_path}[/dim]")
+        console.print("[dim]Press Ctrl+C to stop[/dim]")
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            await server.shutdown()
+            if socket:
+                socket.unlink(missing_ok=True)
+
+
+__all__ = [
+    "DEFAULT_PORT",
+    "SERVE_APPROVAL_POLICIES",
+    "AgentServer",
+    "HTTPError",
+    "SSEWriter",
+    "default_token_path",
+    "json_response",
+    "load_or_create_token",
+    "local_hosts",
+    "read_request",
+    "serve_command",
+    "start_server",
+]
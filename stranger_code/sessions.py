@@ -1,16 +1,38 @@
 """Thread management using LangGraph's built-in checkpoint persistence."""
 
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import time
 import uuid
-from collections.abc import AsyncIterator
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
 from contextlib import asynccontextmanager
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any, Self, TypeVar
 
 import aiosqlite
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_metadata,
+)
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from rich.markup import escape
 from rich.table import Table
 
-from stranger_code.config import COLORS, console
+from stranger_code.checkpoint_serde import CompressedSerializer, train_dictionary
+from stranger_code.config import COLORS, DURABILITY_MODES, console
 
 # Patch aiosqlite.Connection to add is_alive() method required by langgraph-checkpoint>=2.1.0
 # See: https://github.com/langchain-ai/langgraph/issues/6583
@@ -34,11 +56,52 @@ def _format_timestamp(iso_timestamp: str | None) -> str:
         return ""
 
 
-def get_db_path() -> Path:
-    """Get path to global database."""
+_BYTES_PER_UNIT = 1024
+
+
+def _format_bytes(num_bytes: int | None) -> str:
+    """Format a byte count for display (e.g., '1.2 MB')."""
+    size = float(num_bytes or 0)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < _BYTES_PER_UNIT or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= _BYTES_PER_UNIT
+    return f"{size:.1f} GB"
+
+
+# Set to "agent" to give every agent its own sessions-<agent>.db, so processes
+# running different agents never contend for the same write lock.
+SHARDING_ENV_VAR = "DEEPAGENTS_SESSIONS_SHARDING"
+
+
+def _sessions_dir() -> Path:
     db_dir = Path.home() / ".deepagents"
     db_dir.mkdir(parents=True, exist_ok=True)
-    return db_dir / "sessions.db"
+    return db_dir
+
+
+def sharding_enabled() -> bool:
+    """Whether sessions are sharded into one database per agent."""
+    return os.environ.get(SHARDING_ENV_VAR, "").strip().lower() == "agent"
+
+
+def get_db_path(agent_name: str | None = None) -> Path:
+    """Get path to the database holding `agent_name`'s threads.
+
+    Without sharding (the default) every agent shares the global database.
+    """
+    if agent_name and sharding_enabled():
+        return _sessions_dir() / f"sessions-{re.sub(r'[^A-Za-z0-9_.-]', '_', agent_name)}.db"
+    return _sessions_dir() / "sessions.db"
+
+
+def get_shard_paths() -> list[Path]:
+    """All session databases: the global one plus any per-agent shards on disk."""
+    db_dir = _sessions_dir()
+    paths = [db_dir / "sessions.db"]
+    if sharding_enabled():
+        paths.extend(sorted(db_dir.glob("sessions-*.db")))
+    return paths
 
 
 def generate_thread_id() -> str:
@@ -46,128 +109,1893 @@ def generate_thread_id() -> str:
     return uuid.uuid4().hex[:8]
 
 
-async def _table_exists(conn: aiosqlite.Connection, table: str) -> bool:
-    """Check if a table exists in the database."""
-    query = "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?"
-    async with conn.execute(query, (table,)) as cursor:
-        return await cursor.fetchone() is not None
+# Many CLI processes may share one database. SQLite's own busy handler sleeps on
+# the connection's worker thread (stalling every query queued behind it), so it
+# only gets a short wait; beyond that, writers back off on the event loop with
+# exponential delays and full jitter, which also keeps waiters from retrying in
+# lockstep.
+_BUSY_TIMEOUT = 0.05
+_BUSY_BACKOFF_INITIAL = 0.005
+_BUSY_BACKOFF_MAX = 0.5
+_BUSY_DEADLINE = 30.0
 
+_T = TypeVar("_T")
 
-async def list_threads(
-    agent_name: str | None = None,
-    limit: int = 20,
-) -> list[dict]:
-    """List threads from checkpoints table."""
-    db_path = str(get_db_path())
-    async with aiosqlite.connect(db_path, timeout=30.0) as conn:
-        # Return empty if table doesn't exist yet (fresh install)
-        if not await _table_exists(conn, "checkpoints"):
-            return []
 
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+async def _retry_busy(operation: Callable[[], Awaitable[_T]]) -> _T:
+    """Run `operation`, retrying with jittered exponential backoff while the DB is busy."""
+    deadline = time.monotonic() + _BUSY_DEADLINE
+    delay = _BUSY_BACKOFF_INITIAL
+    while True:
+        try:
+            return await operation()
+        except sqlite3.OperationalError as e:
+            if not _is_busy(e) or time.monotonic() >= deadline:
+                raise
+        await asyncio.sleep(random.uniform(0, delay))  # noqa: S311
+        delay = min(delay * 2, _BUSY_BACKOFF_MAX)
+
+
+async def _begin_immediate(conn: aiosqlite.Connection) -> None:
+    """Start a write transaction, taking the write lock up front.
+
+    A deferred transaction that reads first can fail to upgrade to a writer
+    without ever calling the busy handler; IMMEDIATE waits (and backs off) instead.
+    """
+    await _retry_busy(lambda: conn.execute("BEGIN IMMEDIATE"))
+
+
+# Expressions used by the triggers/backfill to pull fields out of checkpoint metadata.
+# AsyncSqliteSaver stores metadata as a JSON-encoded BLOB, so cast before json_extract.
+_AGENT_NAME_SQL = "json_extract(CAST({row}.metadata AS TEXT), '$.agent_name')"
+_UPDATED_AT_SQL = (
+    "COALESCE(json_extract(CAST({row}.metadata AS TEXT), '$.updated_at'), "
+    "strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))"
+)
+_SIZE_SQL = "(IFNULL(length({row}.checkpoint), 0) + IFNULL(length({row}.metadata), 0))"
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version.
+# Each migration is a sequence of statements run inside one write transaction.
+_MIGRATIONS: list[tuple[str, ...]] = [
+    # 1: maintained thread catalog so listing/resume never scans checkpoints
+    (
+        """
+        CREATE TABLE IF NOT EXISTS threads (
+            thread_id TEXT PRIMARY KEY,
+            agent_name TEXT,
+            created_at TEXT,
+            updated_at TEXT,
+            checkpoint_count INTEGER NOT NULL DEFAULT 0,
+            size_bytes INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS threads_updated_at_idx ON threads (updated_at DESC)",
+        """
+        CREATE INDEX IF NOT EXISTS threads_agent_updated_at_idx
+        ON threads (agent_name, updated_at DESC)
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS threads_checkpoint_insert
+        AFTER INSERT ON checkpoints
+        BEGIN
+            INSERT INTO threads (
+                thread_id, agent_name, created_at, updated_at, checkpoint_count, size_bytes
+            )
+            VALUES (
+                NEW.thread_id,
+                {_AGENT_NAME_SQL.format(row="NEW")},
+                {_UPDATED_AT_SQL.format(row="NEW")},
+                {_UPDATED_AT_SQL.format(row="NEW")},
+                1,
+                {_SIZE_SQL.format(row="NEW")}
+            )
+            ON CONFLICT (thread_id) DO UPDATE SET
+                agent_name = COALESCE(excluded.agent_name, threads.agent_name),
+                updated_at = MAX(IFNULL(threads.updated_at, ''), excluded.updated_at),
+                checkpoint_count = threads.checkpoint_count + 1,
+                size_bytes = threads.size_bytes + excluded.size_bytes;
+        END
+        """,  # noqa: S608
+        f"""
+        CREATE TRIGGER IF NOT EXISTS threads_checkpoint_delete
+        AFTER DELETE ON checkpoints
+        BEGIN
+            UPDATE threads SET
+                checkpoint_count = checkpoint_count - 1,
+                size_bytes = MAX(size_bytes - {_SIZE_SQL.format(row="OLD")}, 0)
+            WHERE thread_id = OLD.thread_id;
+            DELETE FROM threads WHERE thread_id = OLD.thread_id AND checkpoint_count <= 0;
+        END
+        """,  # noqa: S608
+        # One-time backfill for databases written before the catalog existed
+        f"""
+        INSERT OR IGNORE INTO threads (
+            thread_id, agent_name, created_at, updated_at, checkpoint_count, size_bytes
+        )
+        SELECT thread_id,
+               MAX({_AGENT_NAME_SQL.format(row="c")}),
+               MIN({_UPDATED_AT_SQL.format(row="c")}),
+               MAX({_UPDATED_AT_SQL.format(row="c")}),
+               COUNT(*),
+               SUM({_SIZE_SQL.format(row="c")})
+        FROM checkpoints AS c
+        GROUP BY thread_id
+        """,  # noqa: S608
+    ),
+    # 2: trained zstd dictionaries referenced by compressed checkpoint types
+    (
+        """
+        CREATE TABLE IF NOT EXISTS compression_dicts (
+            dict_id INTEGER PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            data BLOB NOT NULL
+        )
+        """,
+    ),
+    # 3: content-addressed message store for delta-encoded checkpoints
+    (
+        """
+        CREATE TABLE IF NOT EXISTS messages (
+            hash TEXT PRIMARY KEY,
+            type TEXT NOT NULL,
+            data BLOB NOT NULL
+        )
+        """,
+        # Which threads reference each message, so deletes can sweep unshared rows
+        """
+        CREATE TABLE IF NOT EXISTS message_refs (
+            thread_id TEXT NOT NULL,
+            hash TEXT NOT NULL,
+            PRIMARY KEY (thread_id, hash)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS message_refs_hash_idx ON message_refs (hash)",
+    ),
+    # 4: full-text search over message text, tool names and file paths
+    (
+        # Searchable text per stored message (INTEGER PRIMARY KEY survives VACUUM)
+        """
+        CREATE TABLE IF NOT EXISTS message_text (
+            id INTEGER PRIMARY KEY,
+            hash TEXT NOT NULL UNIQUE,
+            role TEXT NOT NULL,
+            body TEXT NOT NULL,
+            tools TEXT NOT NULL,
+            paths TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS message_search USING fts5(
+            body, tools, paths,
+            content='message_text', content_rowid='id', tokenize='porter unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS message_text_insert AFTER INSERT ON message_text
+        BEGIN
+            INSERT INTO message_search (rowid, body, tools, paths)
+            VALUES (new.id, new.body, new.tools, new.paths);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS message_text_delete AFTER DELETE ON message_text
+        BEGIN
+            INSERT INTO message_search (message_search, rowid, body, tools, paths)
+            VALUES ('delete', old.id, old.body, old.tools, old.paths);
+        END
+        """,
+        # Swept messages take their search text with them
+        """
+        CREATE TRIGGER IF NOT EXISTS messages_delete_text AFTER DELETE ON messages
+        BEGIN
+            DELETE FROM message_text WHERE hash = old.hash;
+        END
+        """,
+    ),
+    # 5: copy-on-write forks - a fork borrows its parent's message refs until the
+    # parent is deleted, at which point the refs are handed down to the fork
+    (
+        """
+        CREATE TABLE IF NOT EXISTS thread_forks (
+            thread_id TEXT PRIMARY KEY,
+            parent_thread_id TEXT NOT NULL,
+            checkpoint_id TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS thread_forks_parent_idx ON thread_forks (parent_thread_id)",
+    ),
+    # 6: the savers write checkpoints with INSERT OR REPLACE, whose implicit delete
+    # fires no trigger, so re-putting a checkpoint must not count it twice. The
+    # totals are recomputed from the thread's rows (a primary-key range scan).
+    (
+        "DROP TRIGGER IF EXISTS threads_checkpoint_insert",
+        f"""
+        CREATE TRIGGER threads_checkpoint_insert
+        AFTER INSERT ON checkpoints
+        BEGIN
+            INSERT INTO threads (
+                thread_id, agent_name, created_at, updated_at, checkpoint_count, size_bytes
+            )
+            VALUES (
+                NEW.thread_id,
+                {_AGENT_NAME_SQL.format(row="NEW")},
+                {_UPDATED_AT_SQL.format(row="NEW")},
+                {_UPDATED_AT_SQL.format(row="NEW")},
+                1,
+                {_SIZE_SQL.format(row="NEW")}
+            )
+            ON CONFLICT (thread_id) DO UPDATE SET
+                agent_name = COALESCE(excluded.agent_name, threads.agent_name),
+                updated_at = MAX(IFNULL(threads.updated_at, ''), excluded.updated_at),
+                checkpoint_count = (
+                    SELECT COUNT(*) FROM checkpoints AS c WHERE c.thread_id = NEW.thread_id
+                ),
+                size_bytes = (
+                    SELECT SUM({_SIZE_SQL.format(row="c")})
+                    FROM checkpoints AS c
+                    WHERE c.thread_id = NEW.thread_id
+                );
+        END
+        """,  # noqa: S608
+        # Repair totals already inflated by replaced checkpoints
+        f"""
+        UPDATE threads SET
+            checkpoint_count = (
+                SELECT COUNT(*) FROM checkpoints AS c WHERE c.thread_id = threads.thread_id
+            ),
+            size_bytes = IFNULL(
+                (
+                    SELECT SUM({_SIZE_SQL.format(row="c")})
+                    FROM checkpoints AS c
+                    WHERE c.thread_id = threads.thread_id
+                ),
+                0
+            )
+        """,  # noqa: S608
+    ),
+]
+
+
+async def _migrate(conn: aiosqlite.Connection) -> None:
+    """Bring the sessions schema up to date.
+
+    Must be called once the checkpoint tables exist. Cheap when already current
+    (a single PRAGMA read); otherwise applies pending migrations in one write
+    transaction so concurrent CLI processes can't run them twice.
+    """
+    async with conn.execute("PRAGMA user_version") as cursor:
+        (version,) = await cursor.fetchone()
+    if version >= len(_MIGRATIONS):
+        return
+
+    await _begin_immediate(conn)
+    try:
+        # Re-read under the write lock - another process may have migrated meanwhile
+        async with conn.execute("PRAGMA user_version") as cursor:
+            (version,) = await cursor.fetchone()
+        for statements in _MIGRATIONS[version:]:
+            for statement in statements:
+                await conn.execute(statement)
+        await conn.execute(f"PRAGMA user_version = {len(_MIGRATIONS)}")
+        await conn.commit()
+    except BaseException:
+        await conn.rollback()
+        raise
+
+
+# Connection tuning applied to every SessionStore connection. WAL lets readers
+# (threads list, other CLI windows) proceed while a session is writing, NORMAL
+# sync is durable across app crashes in WAL mode, and the larger cache/mmap keep
+# hot checkpoint pages out of the read() path.
+_CONNECTION_PRAGMAS = (
+    # Only takes effect on a brand-new file; existing files are converted by `threads gc`
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-65536",  # 64 MB
+)
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+_STATEMENT_CACHE_SIZE = 256
+
+# Garbage collection tuning: threads per delete transaction, writes rows scanned
+# per orphan-purge transaction, and pages released per incremental_vacuum slice.
+_GC_THREAD_BATCH = 50
+_GC_WRITES_BATCH = 5000
+_GC_VACUUM_PAGES = 1024
+
+# `PRAGMA auto_vacuum` value for INCREMENTAL
+_AUTO_VACUUM_INCREMENTAL = 2
+
+# Rows re-encoded per transaction by `threads compress`, and how many recent
+# checkpoints feed dictionary training / benchmark iterations.
+_COMPRESS_BATCH = 200
+_DICTIONARY_SAMPLES = 1000
+_BENCHMARK_ROUNDS = 20
+
+_DURATION_PATTERN = re.compile(r"^\s*(\d+)\s*([smhdw])\s*$")
+_DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse a duration like '30d', '12h' or '2w' (argparse `type=` compatible)."""
+    match = _DURATION_PATTERN.match(value)
+    if not match:
+        msg = f"invalid duration {value!r} (expected e.g. 45m, 12h, 30d, 2w)"
+        raise argparse.ArgumentTypeError(msg)
+    amount, unit = match.groups()
+    return timedelta(**{_DURATION_UNITS[unit]: int(amount)})
+
+
+@dataclass
+class GcReport:
+    """What a `threads gc` run removed (or would remove, for a dry run)."""
+
+    dry_run: bool
+    expired_threads: int = 0
+    expired_bytes: int = 0
+    pruned_checkpoints: int = 0
+    pruned_bytes: int = 0
+    orphaned_writes: int = 0
+    orphaned_bytes: int = 0
+    db_bytes_before: int = 0
+    db_bytes_after: int = 0
+    vacuum_complete: bool = True
+
+    def add(self, other: "GcReport") -> None:
+        """Accumulate another shard's report into this one."""
+        for name in (
+            "expired_threads",
+            "expired_bytes",
+            "pruned_checkpoints",
+            "pruned_bytes",
+            "orphaned_writes",
+            "orphaned_bytes",
+            "db_bytes_before",
+            "db_bytes_after",
+        ):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.vacuum_complete = self.vacuum_complete and other.vacuum_complete
+
+
+# Per-agent totals reported by `threads stats`
+_AGENT_STAT_KEYS = (
+    "thread_count",
+    "checkpoint_count",
+    "checkpoint_bytes",
+    "largest_checkpoint",
+    "writes_count",
+    "writes_bytes",
+    "message_bytes",
+    "tool_bytes",
+)
+
+# Channel holding the conversation, and the marker that replaces it in stored blobs
+_MESSAGES_CHANNEL = "messages"
+_MESSAGE_REFS_KEY = "__message_refs__"
+
+# Threads whose message->hash mapping is kept in memory (LRU)
+_MESSAGE_CACHE_THREADS = 64
+
+# SQLite bound-parameter ceiling is 999 on older builds; stay well below it
+_SQL_IN_CHUNK = 500
+
+# async-batched flushes after this many queued writes or this many seconds
+_WRITE_BEHIND_STEPS = 8
+_WRITE_BEHIND_INTERVAL = 0.25
+# Producers wait once this many writes are pending (backpressure)
+_WRITE_BEHIND_QUEUE = 64
+
+_INSERT_CHECKPOINT_SQL = (
+    "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, "
+    "parent_checkpoint_id, type, checkpoint, metadata) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_WRITES_SQL = (
+    "INSERT OR {conflict} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, "
+    "idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_MESSAGE_SQL = "INSERT OR IGNORE INTO messages (hash, type, data) VALUES (?, ?, ?)"
+_INSERT_MESSAGE_REF_SQL = "INSERT OR IGNORE INTO message_refs (thread_id, hash) VALUES (?, ?)"
+_INSERT_MESSAGE_TEXT_SQL = (
+    "INSERT OR IGNORE INTO message_text (hash, role, body, tools, paths) VALUES (?, ?, ?, ?, ?)"
+)
+
+# Message roles worth searching, and how much of each body to index
+_SEARCH_ROLES = ("human", "ai", "tool")
+_SEARCH_BODY_CHARS = 64 * 1024
+# Tool-call arguments that name files
+_PATH_ARGS = ("file_path", "path")
+
+# Queue markers for the write-behind task
+_FLUSH = object()
+_STOP = object()
+
+# A unit of work: statements (with their parameter rows) committed together
+_WriteOps = list[tuple[str, list[tuple]]]
+
+
+class MessageStoreSaver(AsyncSqliteSaver):
+    """AsyncSqliteSaver that stores each message once, by content hash.
+
+    Every checkpoint snapshot repeats the entire conversation, which makes storage
+    and write latency quadratic in thread length. This saver moves the `messages`
+    channel into a content-addressed `messages` table and keeps only the ordered
+    list of hashes in the checkpoint blob, alongside the (small) remaining state.
+
+    Message objects already hashed for a thread are remembered by identity, so each
+    step only serializes and inserts the messages it added. Checkpoints written by
+    the plain saver (no hash list) load unchanged.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the saver (same arguments as AsyncSqliteSaver)."""
+        super().__init__(*args, **kwargs)
+        # thread_id -> {id(message): (message, hash)}; holding the message keeps id() stable
+        self._message_hashes: OrderedDict[str, dict[int, tuple[Any, str]]] = OrderedDict()
+        # Write-behind state (async-batched durability), see start_write_behind()
+        self._write_queue: asyncio.Queue | None = None
+        self._write_task: asyncio.Task | None = None
+        self._write_error: BaseException | None = None
+        # Cumulative time spent committing checkpoint writes (incl. waiting for the lock)
+        self.write_seconds = 0.0
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,  # noqa: ARG002
+    ) -> RunnableConfig:
+        """Store new messages by hash, then save the checkpoint with hash references."""
+        await self.setup()
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        ops: _WriteOps = []
+
+        channel_values = checkpoint.get("channel_values") or {}
+        messages = channel_values.get(_MESSAGES_CHANNEL)
+        if isinstance(messages, list) and messages:
+            hashes, new_rows = self._hash_messages(thread_id, messages)
+            if new_rows:
+                ops.extend(_message_ops(thread_id, new_rows))
+            checkpoint = {
+                **checkpoint,
+                "channel_values": {
+                    **channel_values,
+                    _MESSAGES_CHANNEL: {_MESSAGE_REFS_KEY: hashes},
+                },
+            }
+
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        serialized_metadata = self.jsonplus_serde.dumps(get_checkpoint_metadata(config, metadata))
+        row = (
+            thread_id,
+            checkpoint_ns,
+            checkpoint["id"],
+            config["configurable"].get("checkpoint_id"),
+            type_,
+            serialized_checkpoint,
+            serialized_metadata,
+        )
+        ops.append((_INSERT_CHECKPOINT_SQL, [row]))
+        await self._write(ops)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",  # noqa: ARG002
+    ) -> None:
+        """Store intermediate writes linked to a checkpoint."""
+        await self.setup()
+        conflict = "REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "IGNORE"
+        rows = [
+            (
+                str(config["configurable"]["thread_id"]),
+                str(config["configurable"]["checkpoint_ns"]),
+                str(config["configurable"]["checkpoint_id"]),
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value),
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        await self._write([(_INSERT_WRITES_SQL.format(conflict=conflict), rows)])
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Load a checkpoint and rebuild its message list from the store."""
+        await self.flush()
+        checkpoint_tuple = await super().aget_tuple(config)
+        if checkpoint_tuple is not None:
+            await self._hydrate(checkpoint_tuple, remember=True)
+        return checkpoint_tuple
+
+    async def alist(self, config: RunnableConfig | None, **kwargs: Any) -> Any:  # noqa: ANN401
+        """List checkpoints, rebuilding each message list from the store."""
+        await self.flush()
+        async for checkpoint_tuple in super().alist(config, **kwargs):
+            await self._hydrate(checkpoint_tuple, remember=False)
+            yield checkpoint_tuple
+
+    def _hash_messages(
+        self, thread_id: str, messages: list
+    ) -> tuple[list[str], list[tuple[str, str, bytes, Any]]]:
+        """Hash a message list, serializing only messages not seen before.
+
+        Returns:
+            (ordered hashes, (hash, type, data, message) for messages to insert)
+        """
+        known = self._message_hashes.get(thread_id, {})
+        current: dict[int, tuple[Any, str]] = {}
+        hashes = []
+        new_rows = []
+        for message in messages:
+            entry = known.get(id(message))
+            if entry is None or entry[0] is not message:
+                digest, type_, data = self._dump_message(message)
+                new_rows.append((digest, type_, data, message))
+                entry = (message, digest)
+            current[id(message)] = entry
+            hashes.append(entry[1])
+        self._remember(thread_id, current)
+        return hashes, new_rows
+
+    def _dump_message(self, message: Any) -> tuple[str, str, bytes]:  # noqa: ANN401
+        """Serialize a message and hash its uncompressed form.
+
+        Returns:
+            (hash, stored type, stored bytes)
+        """
+        serde = self.serde
+        if isinstance(serde, CompressedSerializer):
+            # Hash before compression so a new dictionary doesn't fork identities
+            type_, data = serde.serde.dumps_typed(message)
+            stored = serde.compress_typed(type_, data)
+        else:
+            type_, data = stored = serde.dumps_typed(message)
+        digest = hashlib.blake2b(type_.encode() + b"\0" + data, digest_size=16).hexdigest()
+        return digest, *stored
+
+    async def _hydrate(self, checkpoint_tuple: CheckpointTuple, *, remember: bool) -> None:
+        """Replace a hash-reference marker with the referenced messages, in place."""
+        channel_values = checkpoint_tuple.checkpoint.get("channel_values") or {}
+        refs = channel_values.get(_MESSAGES_CHANNEL)
+        if not isinstance(refs, dict) or _MESSAGE_REFS_KEY not in refs:
+            return
+        hashes: list[str] = refs[_MESSAGE_REFS_KEY]
+
+        decoded: dict[str, Any] = {}
+        unique = list(dict.fromkeys(hashes))
+        # No lock: alist() holds it while suspended at each yield, and reads don't need it
+        for i in range(0, len(unique), _SQL_IN_CHUNK):
+            chunk = unique[i : i + _SQL_IN_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            async with self.conn.execute(
+                "SELECT hash, type, data FROM messages "  # noqa: S608
+                f"WHERE hash IN ({placeholders})",
+                chunk,
+            ) as cursor:
+                async for digest, type_, data in cursor:
+                    decoded[digest] = self.serde.loads_typed((type_, data))
+
+        missing = [h for h in unique if h not in decoded]
+        if missing:
+            msg = f"Checkpoint references {len(missing)} missing message(s)"
+            raise RuntimeError(msg)
+
+        messages = [decoded[h] for h in hashes]
+        channel_values[_MESSAGES_CHANNEL] = messages
+        if remember:
+            thread_id = str(checkpoint_tuple.config["configurable"]["thread_id"])
+            self._remember(
+                thread_id, {id(m): (m, h) for m, h in zip(messages, hashes, strict=True)}
+            )
+
+    def _remember(self, thread_id: str, entries: dict[int, tuple[Any, str]]) -> None:
+        self._message_hashes[thread_id] = entries
+        self._message_hashes.move_to_end(thread_id)
+        while len(self._message_hashes) > _MESSAGE_CACHE_THREADS:
+            self._message_hashes.popitem(last=False)
+
+    def forget_thread(self, thread_id: str) -> None:
+        """Drop cached hashes for a deleted thread."""
+        self._message_hashes.pop(thread_id, None)
+
+    async def index_thread(self, thread_id: str) -> int:
+        """Move a thread's latest messages into the message store and search index.
+
+        Used for threads written before the message store existed. Returns the
+        number of messages indexed.
+        """
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        checkpoint_tuple = await self.aget_tuple(config)
+        if checkpoint_tuple is None:
+            return 0
+        messages = checkpoint_tuple.checkpoint["channel_values"].get(_MESSAGES_CHANNEL)
+        if not isinstance(messages, list) or not messages:
+            return 0
+        rows = [(*self._dump_message(message), message) for message in messages]
+        await self._write(_message_ops(thread_id, rows))
+        return len(rows)
+
+    def start_write_behind(
+        self,
+        *,
+        max_steps: int = _WRITE_BEHIND_STEPS,
+        max_interval: float = _WRITE_BEHIND_INTERVAL,
+        max_queue: int = _WRITE_BEHIND_QUEUE,
+    ) -> None:
+        """Queue writes and commit them in grouped transactions from a background task.
+
+        Used for `async-batched` durability: the agent stream never waits on SQLite
+        unless `max_queue` writes are already pending. Reads flush first, so the
+        saver always observes its own writes.
+
+        Args:
+            max_steps: Commit once this many writes are queued
+            max_interval: Commit at most this many seconds after the first queued write
+            max_queue: Pending writes allowed before producers wait
+        """
+        if self._write_task is not None:
+            return
+        self._write_queue = asyncio.Queue(maxsize=max_queue)
+        self._write_task = asyncio.create_task(
+            self._write_behind_loop(self._write_queue, max_steps, max_interval)
+        )
+
+    async def flush(self) -> None:
+        """Wait until every queued write is committed (no-op without write-behind)."""
+        if self._write_queue is not None:
+            await self._write_queue.put(_FLUSH)
+            await self._write_queue.join()
+        self._raise_write_error()
+
+    async def stop_write_behind(self) -> None:
+        """Flush pending writes and stop the background task."""
+        if self._write_task is None:
+            return
+        queue, task = self._write_queue, self._write_task
+        try:
+            if not task.done():
+                await queue.put(_STOP)
+            await task
+        finally:
+            self._write_queue = self._write_task = None
+        self._raise_write_error()
+
+    async def _write(self, ops: _WriteOps) -> None:
+        """Commit `ops` now, or queue them when write-behind is active."""
+        if self._write_queue is not None:
+            self._raise_write_error()
+            await self._write_queue.put(ops)
+            return
+        await self._commit_ops(ops)
+
+    @asynccontextmanager
+    async def write_transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Hold the saver lock and an IMMEDIATE transaction; commit on success.
+
+        Callers should prepare everything (serialization, reads) beforehand so the
+        database write lock is held only for the statements themselves.
+        """
+        async with self.lock:
+            await _begin_immediate(self.conn)
+            try:
+                yield self.conn
+                await self.conn.commit()
+            except BaseException:
+                await self.conn.rollback()
+                raise
+
+    async def _commit_ops(self, ops: _WriteOps) -> None:
+        start = time.perf_counter()
+        try:
+            async with self.write_transaction() as conn:
+                for sql, rows in ops:
+                    await conn.executemany(sql, rows)
+        finally:
+            self.write_seconds += time.perf_counter() - start
+
+    async def _write_behind_loop(
+        self, queue: asyncio.Queue, max_steps: int, max_interval: float
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        batch: list = []
+        try:
+            while True:
+                item = await queue.get()
+                batch.append(item)
+                deadline = loop.time() + max_interval
+                # Gather more writes until the batch is full, the deadline passes,
+                # or a flush/stop marker asks for an immediate commit
+                while item is not _FLUSH and item is not _STOP and len(batch) < max_steps:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except TimeoutError:
+                        break
+                    batch.append(item)
+                await self._commit_batch(batch)
+                for _ in batch:
+                    queue.task_done()
+                batch = []
+                if item is _STOP:
+                    return
+        except asyncio.CancelledError:
+            # Event loop teardown: don't drop what was already accepted
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            await self._commit_batch(batch)
+            raise
+
+    async def _commit_batch(self, batch: list) -> None:
+        ops = [op for item in batch if isinstance(item, list) for op in item]
+        if not ops:
+            return
+        try:
+            await self._commit_ops(ops)
+        except Exception as e:  # noqa: BLE001
+            # Surface on the next put/flush; forget hashes so lost messages get re-inserted
+            self._write_error = e
+            self._message_hashes.clear()
+
+    def _raise_write_error(self) -> None:
+        if self._write_error is not None:
+            error, self._write_error = self._write_error, None
+            msg = f"Background checkpoint write failed: {error}"
+            raise RuntimeError(msg) from error
+
+
+def _message_ops(thread_id: str, new_rows: list[tuple[str, str, bytes, Any]]) -> _WriteOps:
+    """Statements storing new messages, their thread refs and their search text."""
+    ops: _WriteOps = [
+        (_INSERT_MESSAGE_SQL, [(digest, type_, data) for digest, type_, data, _ in new_rows]),
+        (_INSERT_MESSAGE_REF_SQL, [(thread_id, digest) for digest, *_ in new_rows]),
+    ]
+    text_rows = [
+        (digest, *text)
+        for digest, _, _, message in new_rows
+        if (text := _search_text(message)) is not None
+    ]
+    if text_rows:
+        ops.append((_INSERT_MESSAGE_TEXT_SQL, text_rows))
+    return ops
+
+
+def _search_text(message: Any) -> tuple[str, str, str, str] | None:  # noqa: ANN401
+    """Extract (role, body, tool names, file paths) to index for a message.
+
+    Tool results contribute their tool name only; their output is not indexed.
+    """
+    role = getattr(message, "type", None)
+    if role not in _SEARCH_ROLES:
+        return None
+    tools: list[str] = []
+    paths: list[str] = []
+    if role == "tool":
+        body = ""
+        if getattr(message, "name", None):
+            tools.append(message.name)
+    else:
+        body = message.text[:_SEARCH_BODY_CHARS]
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            tools.append(tool_call["name"])
+            args = tool_call.get("args") or {}
+            paths.extend(str(args[key]) for key in _PATH_ARGS if args.get(key))
+    if not (body or tools):
+        return None
+    return role, body, " ".join(tools), " ".join(paths)
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every term must match, `term*` is a prefix."""
+    terms = []
+    for term in query.split():
+        prefix = term.endswith("*")
+        word = term.rstrip("*")
+        if word:
+            quoted = '"' + word.replace('"', '""') + '"'
+            terms.append(quoted + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class SessionStore:
+    """Long-lived connection to a sessions database (global, or one agent's shard).
+
+    A single store is opened per process and shared by the thread helpers and the
+    AsyncSqliteSaver used by the agent, so resolving `-r` and running the session
+    costs one connection, one schema check and one set of pragmas.
+
+    Usage:
+        async with SessionStore() as store:
+            thread_id = await store.get_most_recent()
+            agent = create_cli_agent(..., checkpointer=store.checkpointer)
+    """
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        *,
+        durability: str = "exit",
+        agent_name: str | None = None,
+    ) -> None:
+        """Initialize the store (the connection is opened by `open()`).
+
+        Args:
+            db_path: Database file to use. Defaults to `get_db_path(agent_name)`.
+            durability: One of DURABILITY_MODES; `async-batched` enables write-behind
+            agent_name: Agent whose shard to open when per-agent sharding is enabled
+        """
+        if durability not in DURABILITY_MODES:
+            msg = f"Unknown durability mode: {durability}"
+            raise ValueError(msg)
+        self._db_path = db_path or get_db_path(agent_name)
+        self._durability = durability
+        self._conn: aiosqlite.Connection | None = None
+        self._checkpointer: MessageStoreSaver | None = None
+
+    async def open(self) -> "SessionStore":
+        """Open the connection, apply pragmas and bring the schema up to date."""
+        if self._conn is not None:
+            return self
+        conn = await aiosqlite.connect(
+            str(self._db_path), timeout=_BUSY_TIMEOUT, cached_statements=_STATEMENT_CACHE_SIZE
+        )
+        try:
+            checkpointer = MessageStoreSaver(conn)
+            # Processes starting together race to create the schema; every step is idempotent
+            await _retry_busy(lambda: _initialize(conn, checkpointer))
+            if self._durability == "async-batched":
+                checkpointer.start_write_behind()
+        except BaseException:
+            await conn.close()
+            raise
+        self._conn = conn
+        self._checkpointer = checkpointer
+        return self
+
+    async def close(self) -> None:
+        """Flush queued checkpoint writes and close the underlying connection."""
+        if self._conn is not None:
+            conn, checkpointer = self._conn, self._checkpointer
+            self._conn = self._checkpointer = None
+            try:
+                await checkpointer.stop_write_behind()
+            finally:
+                await conn.close()
+
+    @property
+    def db_path(self) -> Path:
+        """Database file backing this store."""
+        return self._db_path
+
+    @property
+    def durability(self) -> str:
+        """Checkpoint durability mode (one of DURABILITY_MODES)."""
+        return self._durability
+
+    async def __aenter__(self) -> Self:
+        """Open the store on context entry."""
+        return await self.open()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the store on context exit."""
+        await self.close()
+
+    @property
+    def conn(self) -> aiosqlite.Connection:
+        """The shared database connection."""
+        if self._conn is None:
+            msg = "SessionStore is not open"
+            raise RuntimeError(msg)
+        return self._conn
+
+    @property
+    def checkpointer(self) -> MessageStoreSaver:
+        """The checkpointer bound to the shared connection."""
+        if self._checkpointer is None:
+            msg = "SessionStore is not open"
+            raise RuntimeError(msg)
+        return self._checkpointer
+
+    async def list_threads(
+        self,
+        agent_name: str | None = None,
+        limit: int = 20,
+    ) -> list[dict]:
+        """List threads from the thread catalog, most recently used first."""
         if agent_name:
             query = """
-                SELECT thread_id,
-                       json_extract(metadata, '$.agent_name') as agent_name,
-                       MAX(json_extract(metadata, '$.updated_at')) as updated_at
-                FROM checkpoints
-                WHERE json_extract(metadata, '$.agent_name') = ?
-                GROUP BY thread_id
+                SELECT thread_id, agent_name, updated_at, checkpoint_count, size_bytes
+                FROM threads
+                WHERE agent_name = ?
                 ORDER BY updated_at DESC
                 LIMIT ?
             """
             params: tuple = (agent_name, limit)
         else:
             query = """
-                SELECT thread_id,
-                       json_extract(metadata, '$.agent_name') as agent_name,
-                       MAX(json_extract(metadata, '$.updated_at')) as updated_at
-                FROM checkpoints
-                GROUP BY thread_id
+                SELECT thread_id, agent_name, updated_at, checkpoint_count, size_bytes
+                FROM threads
                 ORDER BY updated_at DESC
                 LIMIT ?
             """
             params = (limit,)
 
-        async with conn.execute(query, params) as cursor:
+        async with self.conn.execute(query, params) as cursor:
             rows = await cursor.fetchall()
-            return [{"thread_id": r[0], "agent_name": r[1], "updated_at": r[2]} for r in rows]
-
-
-async def get_most_recent(agent_name: str | None = None) -> str | None:
-    """Get most recent thread_id, optionally filtered by agent."""
-    db_path = str(get_db_path())
-    async with aiosqlite.connect(db_path, timeout=30.0) as conn:
-        if not await _table_exists(conn, "checkpoints"):
-            return None
+            return [
+                {
+                    "thread_id": r[0],
+                    "agent_name": r[1],
+                    "updated_at": r[2],
+                    "checkpoint_count": r[3],
+                    "size_bytes": r[4],
+                }
+                for r in rows
+            ]
 
+    async def get_most_recent(self, agent_name: str | None = None) -> str | None:
+        """Get most recent thread_id, optionally filtered by agent."""
         if agent_name:
             query = """
-                SELECT thread_id FROM checkpoints
-                WHERE json_extract(metadata, '$.agent_name') = ?
-                ORDER BY checkpoint_id DESC
+                SELECT thread_id FROM threads
+                WHERE agent_name = ?
+                ORDER BY updated_at DESC
                 LIMIT 1
             """
             params: tuple = (agent_name,)
         else:
-            query = "SELECT thread_id FROM checkpoints ORDER BY checkpoint_id DESC LIMIT 1"
+            query = "SELECT thread_id FROM threads ORDER BY updated_at DESC LIMIT 1"
             params = ()
 
-        async with conn.execute(query, params) as cursor:
+        async with self.conn.execute(query, params) as cursor:
             row = await cursor.fetchone()
             return row[0] if row else None
 
+    async def get_thread_agent(self, thread_id: str) -> str | None:
+        """Get agent_name for a thread."""
+        query = "SELECT agent_name FROM threads WHERE thread_id = ?"
+        async with self.conn.execute(query, (thread_id,)) as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else None
 
-async def get_thread_agent(thread_id: str) -> str | None:
-    """Get agent_name for a thread."""
-    db_path = str(get_db_path())
-    async with aiosqlite.connect(db_path, timeout=30.0) as conn:
-        if not await _table_exists(conn, "checkpoints"):
-            return None
+    async def thread_exists(self, thread_id: str) -> bool:
+        """Check if a thread exists in the thread catalog."""
+        query = "SELECT 1 FROM threads WHERE thread_id = ?"
+        async with self.conn.execute(query, (thread_id,)) as cursor:
+            row = await cursor.fetchone()
+            return row is not None
 
-        query = """
-            SELECT json_extract(metadata, '$.agent_name')
-            FROM checkpoints
-            WHERE thread_id = ?
-            LIMIT 1
+    async def delete_thread(self, thread_id: str) -> bool:
+        """Delete thread checkpoints. Returns True if deleted."""
+        return await self._delete_threads([thread_id]) > 0
+
+    async def fork_thread(self, thread_id: str, checkpoint_id: str | None = None) -> str | None:
+        """Branch a thread into a new thread, starting from one of its checkpoints.
+
+        The fork gets a copy of a single checkpoint row. Messages are stored by
+        hash, so that row is small whatever the thread's length, and the fork
+        borrows the parent's message refs instead of copying them.
+
+        Args:
+            thread_id: Thread to fork
+            checkpoint_id: Checkpoint to branch from (default: the latest)
+
+        Returns:
+            The new thread ID, or None if the thread or checkpoint doesn't exist.
         """
-        async with conn.execute(query, (thread_id,)) as cursor:
+        await self.checkpointer.flush()
+        checkpoint_clause = "AND checkpoint_id = ?" if checkpoint_id else ""
+        params: tuple = (thread_id, checkpoint_id) if checkpoint_id else (thread_id,)
+        async with self.conn.execute(
+            f"""
+            SELECT checkpoint_id FROM checkpoints
+            WHERE thread_id = ? AND checkpoint_ns = '' {checkpoint_clause}
+            ORDER BY checkpoint_id DESC
+            LIMIT 1
+            """,  # noqa: S608
+            params,
+        ) as cursor:
             row = await cursor.fetchone()
-            return row[0] if row else None
+        if row is None:
+            return None
+        source_checkpoint = row[0]
 
+        fork_id = generate_thread_id()
+        now = datetime.now(UTC).isoformat()
+        async with self.checkpointer.write_transaction():
+            await self.conn.execute(
+                """
+                INSERT INTO thread_forks (thread_id, parent_thread_id, checkpoint_id, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (fork_id, thread_id, source_checkpoint, now),
+            )
+            # The catalog trigger creates the fork's `threads` row from this insert
+            await self.conn.execute(
+                """
+                INSERT INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id,
+                    parent_checkpoint_id, type, checkpoint, metadata)
+                SELECT ?, checkpoint_ns, checkpoint_id, NULL, type, checkpoint,
+                    CAST(json_set(CAST(metadata AS TEXT),
+                        '$.updated_at', ?, '$.forked_from', ?) AS BLOB)
+                FROM checkpoints
+                WHERE thread_id = ? AND checkpoint_ns = '' AND checkpoint_id = ?
+                """,
+                (fork_id, now, thread_id, thread_id, source_checkpoint),
+            )
+            # Pending writes carry interrupts and tool results not yet applied
+            await self.conn.execute(
+                """
+                INSERT INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id,
+                    idx, channel, type, value)
+                SELECT ?, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value
+                FROM writes
+                WHERE thread_id = ? AND checkpoint_ns = '' AND checkpoint_id = ?
+                """,
+                (fork_id, thread_id, source_checkpoint),
+            )
+        return fork_id
 
-async def thread_exists(thread_id: str) -> bool:
-    """Check if a thread exists in checkpoints."""
-    db_path = str(get_db_path())
-    async with aiosqlite.connect(db_path, timeout=30.0) as conn:
-        if not await _table_exists(conn, "checkpoints"):
-            return False
+    async def thread_stats(self, thread_ids: list[str]) -> dict[str, dict]:
+        """Storage breakdown for specific threads.
 
-        query = "SELECT 1 FROM checkpoints WHERE thread_id = ? LIMIT 1"
-        async with conn.execute(query, (thread_id,)) as cursor:
-            row = await cursor.fetchone()
-            return row is not None
+        Every figure comes from aggregate SQL over `length()`, which SQLite answers
+        from record headers without reading blob payloads or their overflow pages,
+        so the cost is bounded by rows and leaf pages, not by stored bytes.
 
+        Returns:
+            {thread_id: {agent_name, checkpoint_count, checkpoint_bytes,
+            largest_checkpoint, writes_count, writes_bytes, message_bytes,
+            tool_bytes}} for the threads that exist.
+        """
+        await self.checkpointer.flush()
+        if not thread_ids:
+            return {}
+        placeholders = ",".join("?" * len(thread_ids))
+        stats: dict[str, dict] = {}
+        async with self.conn.execute(
+            f"""
+            SELECT thread_id, agent_name, checkpoint_count, size_bytes
+            FROM threads WHERE thread_id IN ({placeholders})
+            """,  # noqa: S608
+            thread_ids,
+        ) as cursor:
+            async for thread_id, agent, count, size in cursor:
+                stats[thread_id] = {
+                    "thread_id": thread_id,
+                    "agent_name": agent,
+                    "checkpoint_count": count,
+                    "checkpoint_bytes": size,
+                    "largest_checkpoint": 0,
+                    "writes_count": 0,
+                    "writes_bytes": 0,
+                    "message_bytes": 0,
+                    "tool_bytes": 0,
+                }
 
-async def delete_thread(thread_id: str) -> bool:
-    """Delete thread checkpoints. Returns True if deleted."""
-    db_path = str(get_db_path())
-    async with aiosqlite.connect(db_path, timeout=30.0) as conn:
-        if not await _table_exists(conn, "checkpoints"):
-            return False
-
-        cursor = await conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
-        deleted = cursor.rowcount > 0
-        if await _table_exists(conn, "writes"):
-            await conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
-        await conn.commit()
+        queries = (
+            (
+                ("largest_checkpoint",),
+                f"""
+                SELECT thread_id, MAX(IFNULL(length(checkpoint), 0))
+                FROM checkpoints WHERE thread_id IN ({placeholders})
+                GROUP BY thread_id
+                """,  # noqa: S608
+            ),
+            (
+                ("writes_count", "writes_bytes"),
+                f"""
+                SELECT thread_id, COUNT(*), IFNULL(SUM(length(value)), 0)
+                FROM writes WHERE thread_id IN ({placeholders})
+                GROUP BY thread_id
+                """,  # noqa: S608
+            ),
+            # Message store bytes this thread references, split by producer
+            (
+                ("message_bytes", "tool_bytes"),
+                f"""
+                SELECT r.thread_id,
+                       IFNULL(SUM(CASE WHEN mt.role = 'tool' THEN 0 ELSE length(m.data) END), 0),
+                       IFNULL(SUM(CASE WHEN mt.role = 'tool' THEN length(m.data) ELSE 0 END), 0)
+                FROM message_refs AS r
+                JOIN messages AS m ON m.hash = r.hash
+                LEFT JOIN message_text AS mt ON mt.hash = r.hash
+                WHERE r.thread_id IN ({placeholders})
+                GROUP BY r.thread_id
+                """,  # noqa: S608
+            ),
+        )
+        for columns, sql in queries:
+            async with self.conn.execute(sql, thread_ids) as cursor:
+                async for thread_id, *values in cursor:
+                    if thread_id in stats:
+                        stats[thread_id].update(zip(columns, values, strict=True))
+        return stats
+
+    async def storage_stats(self, *, agent_name: str | None = None, limit: int = 20) -> dict:
+        """Storage breakdown of the whole database, per agent and for the largest threads.
+
+        Returns:
+            {"threads": [thread stats, largest first], "agents": [agent stats],
+            "db_bytes": int, "free_bytes": int}
+        """
+        agent_clause = "WHERE agent_name = ?" if agent_name else ""
+        agent_params: tuple = (agent_name,) if agent_name else ()
+        async with self.conn.execute(
+            f"""
+            SELECT thread_id FROM threads {agent_clause}
+            ORDER BY size_bytes DESC LIMIT ?
+            """,  # noqa: S608
+            (*agent_params, limit),
+        ) as cursor:
+            largest = [row[0] for row in await cursor.fetchall()]
+        per_thread = await self.thread_stats(largest)
+
+        agents: dict[str | None, dict] = {}
+        t_clause = "WHERE t.agent_name = ?" if agent_name else ""
+        queries = (
+            (
+                ("thread_count", "checkpoint_count", "checkpoint_bytes"),
+                f"""
+                SELECT agent_name, COUNT(*), SUM(checkpoint_count), SUM(size_bytes)
+                FROM threads {agent_clause} GROUP BY agent_name
+                """,  # noqa: S608
+            ),
+            (
+                ("largest_checkpoint",),
+                f"""
+                SELECT t.agent_name, MAX(IFNULL(length(c.checkpoint), 0))
+                FROM checkpoints AS c JOIN threads AS t ON t.thread_id = c.thread_id
+                {t_clause} GROUP BY t.agent_name
+                """,  # noqa: S608
+            ),
+            (
+                ("writes_count", "writes_bytes"),
+                f"""
+                SELECT t.agent_name, COUNT(*), IFNULL(SUM(length(w.value)), 0)
+                FROM writes AS w JOIN threads AS t ON t.thread_id = w.thread_id
+                {t_clause} GROUP BY t.agent_name
+                """,  # noqa: S608
+            ),
+            (
+                ("message_bytes", "tool_bytes"),
+                f"""
+                SELECT t.agent_name,
+                       IFNULL(SUM(CASE WHEN mt.role = 'tool' THEN 0 ELSE length(m.data) END), 0),
+                       IFNULL(SUM(CASE WHEN mt.role = 'tool' THEN length(m.data) ELSE 0 END), 0)
+                FROM message_refs AS r
+                JOIN threads AS t ON t.thread_id = r.thread_id
+                JOIN messages AS m ON m.hash = r.hash
+                LEFT JOIN message_text AS mt ON mt.hash = r.hash
+                {t_clause} GROUP BY t.agent_name
+                """,  # noqa: S608
+            ),
+        )
+        for columns, sql in queries:
+            async with self.conn.execute(sql, agent_params) as cursor:
+                async for agent, *values in cursor:
+                    entry = agents.setdefault(agent, dict.fromkeys(_AGENT_STAT_KEYS, 0))
+                    entry["agent_name"] = agent
+                    entry.update(zip(columns, values, strict=True))
+
+        db_bytes, free_bytes = await self._db_size()
+        return {
+            "threads": sorted(
+                per_thread.values(), key=lambda t: t["checkpoint_bytes"], reverse=True
+            ),
+            "agents": sorted(agents.values(), key=lambda a: a["checkpoint_bytes"], reverse=True),
+            "db_bytes": db_bytes,
+            "free_bytes": free_bytes,
+        }
+
+    async def _db_size(self) -> tuple[int, int]:
+        """Return (file bytes, free-list bytes) from the page counters."""
+        values = []
+        for pragma in ("page_size", "page_count", "freelist_count"):
+            async with self.conn.execute(f"PRAGMA {pragma}") as cursor:
+                (value,) = await cursor.fetchone()
+                values.append(value)
+        page_size, page_count, freelist_count = values
+        return page_size * page_count, page_size * freelist_count
+
+    async def gc(
+        self,
+        *,
+        keep_last: int | None = None,
+        older_than: timedelta | None = None,
+        agent_name: str | None = None,
+        dry_run: bool = False,
+        vacuum_seconds: float = 2.0,
+    ) -> GcReport:
+        """Apply retention rules and reclaim space.
+
+        Deletes are issued in batches of threads, each batch in its own short write
+        transaction, so a running session is never blocked for long.
+
+        Args:
+            keep_last: Keep only the newest N checkpoints per thread (and namespace)
+            older_than: Delete whole threads not updated within this window
+            agent_name: Restrict retention and the orphaned-writes purge to one agent
+            dry_run: Only measure what would be removed
+            vacuum_seconds: Time budget for returning free pages to the filesystem
+
+        Returns:
+            GcReport describing removed (or removable) rows and bytes.
+        """
+        await self.checkpointer.flush()
+        report = GcReport(dry_run=dry_run)
+        report.db_bytes_before, _ = await self._db_size()
+        agent_clause = " AND agent_name = ?" if agent_name else ""
+        agent_params: tuple = (agent_name,) if agent_name else ()
+
+        # 1. Age out whole threads
+        expired: list[str] = []
+        if older_than is not None:
+            cutoff = (datetime.now(UTC) - older_than).isoformat()
+            query = f"""
+                SELECT thread_id, size_bytes FROM threads WHERE updated_at < ?{agent_clause}
+            """  # noqa: S608
+            async with self.conn.execute(query, (cutoff, *agent_params)) as cursor:
+                for thread_id, size_bytes in await cursor.fetchall():
+                    expired.append(thread_id)
+                    report.expired_bytes += size_bytes or 0
+            report.expired_threads = len(expired)
+            if not dry_run:
+                for i in range(0, len(expired), _GC_THREAD_BATCH):
+                    await self._delete_threads(expired[i : i + _GC_THREAD_BATCH])
+
+        # 2. Trim each remaining thread to its newest checkpoints
+        if keep_last is not None:
+            query = f"""
+                SELECT thread_id FROM threads WHERE checkpoint_count > ?{agent_clause}
+            """  # noqa: S608
+            async with self.conn.execute(query, (keep_last, *agent_params)) as cursor:
+                expired_set = set(expired)
+                candidates = [r[0] for r in await cursor.fetchall() if r[0] not in expired_set]
+            for i in range(0, len(candidates), _GC_THREAD_BATCH):
+                count, size = await self._prune_checkpoints(
+                    candidates[i : i + _GC_THREAD_BATCH], keep_last, dry_run=dry_run
+                )
+                report.pruned_checkpoints += count
+                report.pruned_bytes += size
+
+        # 3. Purge pending writes whose checkpoint no longer exists
+        count, size = await self._purge_orphaned_writes(agent_name=agent_name, dry_run=dry_run)
+        report.orphaned_writes, report.orphaned_bytes = count, size
+
+        # 4. Hand free pages back to the filesystem
+        if not dry_run:
+            report.vacuum_complete = await self._incremental_vacuum(vacuum_seconds)
+        report.db_bytes_after, _ = await self._db_size()
+        return report
+
+    async def _delete_threads(self, thread_ids: list[str]) -> int:
+        """Delete whole threads in one write transaction.
+
+        Messages referenced only by these threads are swept from the message store.
+
+        Returns:
+            Number of threads that existed in the catalog.
+        """
+        await self.checkpointer.flush()
+        placeholders = ",".join("?" * len(thread_ids))
+        # Share the saver's lock so we never interleave with an in-flight checkpoint write
+        async with self.checkpointer.write_transaction():
+            await self._detach_forks(thread_ids)
+            # Drop catalog rows first so the per-row delete trigger has nothing to update
+            cursor = await self.conn.execute(
+                f"DELETE FROM threads WHERE thread_id IN ({placeholders})",  # noqa: S608
+                thread_ids,
+            )
+            deleted = cursor.rowcount
+            for table in ("checkpoints", "writes"):
+                await self.conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id IN ({placeholders})",  # noqa: S608
+                    thread_ids,
+                )
+            await self.conn.execute(
+                f"""
+                DELETE FROM messages
+                WHERE hash IN (
+                    SELECT hash FROM message_refs WHERE thread_id IN ({placeholders})
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM message_refs AS r
+                    WHERE r.hash = messages.hash AND r.thread_id NOT IN ({placeholders})
+                )
+                """,  # noqa: S608
+                (*thread_ids, *thread_ids),
+            )
+            await self.conn.execute(
+                f"DELETE FROM message_refs WHERE thread_id IN ({placeholders})",  # noqa: S608
+                thread_ids,
+            )
+        for thread_id in thread_ids:
+            self.checkpointer.forget_thread(thread_id)
         return deleted
 
+    async def _detach_forks(self, thread_ids: list[str]) -> None:
+        """Hand the message refs of threads being deleted down to their forks.
+
+        Runs inside the delete transaction. Forks are re-parented to the deleted
+        thread's own parent, one thread at a time, so chains of forks that are
+        deleted together still pass every ref down to the surviving descendants.
+        """
+        placeholders = ",".join("?" * len(thread_ids))
+        async with self.conn.execute(
+            f"""
+            SELECT DISTINCT parent_thread_id FROM thread_forks
+            WHERE parent_thread_id IN ({placeholders})
+            """,  # noqa: S608
+            thread_ids,
+        ) as cursor:
+            parents = [row[0] for row in await cursor.fetchall()]
+        for parent in parents:
+            await self.conn.execute(
+                """
+                INSERT OR IGNORE INTO message_refs (thread_id, hash)
+                SELECT f.thread_id, r.hash
+                FROM thread_forks AS f
+                JOIN message_refs AS r ON r.thread_id = f.parent_thread_id
+                WHERE f.parent_thread_id = ?
+                """,
+                (parent,),
+            )
+            await self.conn.execute(
+                """
+                UPDATE thread_forks
+                SET parent_thread_id = (
+                    SELECT g.parent_thread_id FROM thread_forks AS g WHERE g.thread_id = ?
+                )
+                WHERE parent_thread_id = ?
+                  AND EXISTS (SELECT 1 FROM thread_forks AS g WHERE g.thread_id = ?)
+                """,
+                (parent, parent, parent),
+            )
+            # Forks of a root thread now hold every ref themselves
+            await self.conn.execute(
+                "DELETE FROM thread_forks WHERE parent_thread_id = ?", (parent,)
+            )
+        await self.conn.execute(
+            f"DELETE FROM thread_forks WHERE thread_id IN ({placeholders})",  # noqa: S608
+            thread_ids,
+        )
+
+    async def _prune_checkpoints(
+        self, thread_ids: list[str], keep_last: int, *, dry_run: bool
+    ) -> tuple[int, int]:
+        """Delete all but the newest `keep_last` checkpoints of each thread.
+
+        Returns:
+            (checkpoints removed, bytes removed)
+        """
+        placeholders = ",".join("?" * len(thread_ids))
+        ranked = f"""
+            WITH ranked AS (
+                SELECT rowid AS rid,
+                       {_SIZE_SQL.format(row="checkpoints")} AS size,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+                       ) AS rn
+                FROM checkpoints
+                WHERE thread_id IN ({placeholders})
+            )
+        """  # noqa: S608
+        params = (*thread_ids, keep_last)
+        async with self.conn.execute(
+            ranked + "SELECT COUNT(*), IFNULL(SUM(size), 0) FROM ranked WHERE rn > ?",  # noqa: S608
+            params,
+        ) as cursor:
+            count, size = await cursor.fetchone()
+        if dry_run or not count:
+            return count, size
+        async with self.checkpointer.write_transaction():
+            await self.conn.execute(
+                ranked  # noqa: S608
+                + "DELETE FROM checkpoints "
+                "WHERE rowid IN (SELECT rid FROM ranked WHERE rn > ?)",
+                params,
+            )
+        return count, size
+
+    async def _purge_orphaned_writes(
+        self, *, agent_name: str | None = None, dry_run: bool
+    ) -> tuple[int, int]:
+        """Remove `writes` rows whose checkpoint was deleted, in rowid windows.
+
+        With `agent_name`, only writes of that agent's catalogued threads are purged.
+
+        Returns:
+            (rows removed, bytes removed)
+        """
+        agent_clause = (
+            " AND w.thread_id IN (SELECT thread_id FROM threads WHERE agent_name = ?)"
+            if agent_name
+            else ""
+        )
+        agent_params: tuple = (agent_name,) if agent_name else ()
+        orphan = f"""
+            FROM writes AS w
+            WHERE w.rowid > ? AND w.rowid <= ?{agent_clause}
+              AND NOT EXISTS (
+                SELECT 1 FROM checkpoints AS c
+                WHERE c.thread_id = w.thread_id
+                  AND c.checkpoint_ns = w.checkpoint_ns
+                  AND c.checkpoint_id = w.checkpoint_id
+              )
+        """  # noqa: S608
+        purge = f"DELETE FROM writes WHERE rowid IN (SELECT w.rowid {orphan})"  # noqa: S608
+        async with self.conn.execute("SELECT IFNULL(MAX(rowid), 0) FROM writes") as cursor:
+            (max_rowid,) = await cursor.fetchone()
+
+        total_count = total_size = 0
+        for low in range(0, max_rowid, _GC_WRITES_BATCH):
+            window = (low, low + _GC_WRITES_BATCH, *agent_params)
+            async with self.conn.execute(
+                "SELECT COUNT(*), IFNULL(SUM(IFNULL(length(w.value), 0)), 0) " + orphan,
+                window,
+            ) as cursor:
+                count, size = await cursor.fetchone()
+            if count and not dry_run:
+                async with self.checkpointer.write_transaction():
+                    await self.conn.execute(purge, window)
+            total_count += count
+            total_size += size
+        return total_count, total_size
+
+    async def _incremental_vacuum(self, budget_seconds: float) -> bool:
+        """Release free pages in bounded slices until done or out of time.
+
+        Databases created before auto_vacuum was enabled are converted once with a
+        full VACUUM (unbounded, but only ever needed a single time).
+
+        Returns:
+            True if the free list was fully drained.
+        """
+        async with self.conn.execute("PRAGMA auto_vacuum") as cursor:
+            (mode,) = await cursor.fetchone()
+        async with self.checkpointer.lock:
+            if mode != _AUTO_VACUUM_INCREMENTAL:
+                console.print("[dim]Enabling incremental vacuum (one-time full VACUUM)...[/dim]")
+                await self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                await _retry_busy(lambda: self.conn.execute("VACUUM"))
+                return True
+
+        deadline = time.monotonic() + budget_seconds
+        while True:
+            _, free_bytes = await self._db_size()
+            if free_bytes == 0:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            # incremental_vacuum frees pages as the statement is stepped
+            async with (
+                self.checkpointer.write_transaction(),
+                self.conn.execute(f"PRAGMA incremental_vacuum({_GC_VACUUM_PAGES})") as cursor,
+            ):
+                await cursor.fetchall()
+
+    async def compress_existing(self, *, train: bool = False) -> int:
+        """Re-encode stored checkpoints and writes with the current codec.
+
+        Args:
+            train: First train a zstd dictionary on recent checkpoints and make it
+                the active codec for new and re-encoded rows.
+
+        Returns:
+            Number of rows rewritten.
+        """
+        await self.checkpointer.flush()
+        serde = self.serializer
+        if train:
+            samples = []
+            async with self.conn.execute(
+                "SELECT type, checkpoint FROM checkpoints ORDER BY rowid DESC LIMIT ?",
+                (_DICTIONARY_SAMPLES,),
+            ) as cursor:
+                async for type_, blob in cursor:
+                    if blob:
+                        samples.append(serde.decompress_typed(type_, blob)[1])
+            dictionary = train_dictionary(samples)
+            if dictionary is None:
+                console.print("[yellow]Not enough data to train a dictionary, skipping.[/yellow]")
+            else:
+                async with self.checkpointer.write_transaction():
+                    await self.conn.execute(
+                        "INSERT INTO compression_dicts (created_at, data) VALUES (?, ?)",
+                        (datetime.now(UTC).isoformat(), dictionary),
+                    )
+                serde = self.checkpointer.serde = await _load_serializer(self.conn)
+
+        rewritten = 0
+        for table, column in (
+            ("checkpoints", "checkpoint"),
+            ("writes", "value"),
+            ("messages", "data"),
+        ):
+            last_rowid = 0
+            while True:
+                async with self.conn.execute(
+                    f"SELECT rowid, type, {column} FROM {table} "  # noqa: S608
+                    "WHERE rowid > ? AND type IS NOT NULL AND type NOT LIKE ? "
+                    "ORDER BY rowid LIMIT ?",
+                    (last_rowid, f"%+{serde.codec}", _COMPRESS_BATCH),
+                ) as cursor:
+                    rows = await cursor.fetchall()
+                if not rows:
+                    break
+                last_rowid = rows[-1][0]
+                updates = []
+                for rowid, type_, blob in rows:
+                    if blob is None:
+                        continue
+                    new_type, new_blob = serde.compress_typed(*serde.decompress_typed(type_, blob))
+                    if new_type != type_:
+                        updates.append((new_type, new_blob, rowid))
+                if updates:
+                    async with self.checkpointer.write_transaction():
+                        await self.conn.executemany(
+                            f"UPDATE {table} "  # noqa: S608
+                            f"SET type = ?, {column} = ? WHERE rowid = ?",
+                            updates,
+                        )
+                    rewritten += len(updates)
+
+        # Updates don't fire the catalog triggers, so refresh thread sizes in one pass
+        async with self.checkpointer.write_transaction():
+            await self.conn.execute(
+                f"""
+                UPDATE threads SET size_bytes = (
+                    SELECT IFNULL(SUM({_SIZE_SQL.format(row="c")}), 0)
+                    FROM checkpoints AS c WHERE c.thread_id = threads.thread_id
+                )
+                """  # noqa: S608
+            )
+        return rewritten
+
+    async def benchmark_serializer(self, thread_id: str) -> dict[str, dict[str, float]] | None:
+        """Time save/load of a thread's latest checkpoint, plain vs compressed.
+
+        Returns:
+            {"plain"|"compressed": {"bytes", "save_ms", "load_ms"}}, or None if the
+            thread has no checkpoint.
+        """
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        checkpoint_tuple = await self.checkpointer.aget_tuple(config)
+        if checkpoint_tuple is None:
+            return None
+        checkpoint = checkpoint_tuple.checkpoint
+
+        results = {}
+        for name, serde in (("plain", self.serializer.serde), ("compressed", self.serializer)):
+            start = time.perf_counter()
+            for _ in range(_BENCHMARK_ROUNDS):
+                stored = serde.dumps_typed(checkpoint)
+            save_ms = (time.perf_counter() - start) * 1000 / _BENCHMARK_ROUNDS
+            start = time.perf_counter()
+            for _ in range(_BENCHMARK_ROUNDS):
+                serde.loads_typed(stored)
+            load_ms = (time.perf_counter() - start) * 1000 / _BENCHMARK_ROUNDS
+            results[name] = {"bytes": len(stored[1]), "save_ms": save_ms, "load_ms": load_ms}
+        return results
+
+    @property
+    def serializer(self) -> CompressedSerializer:
+        """The checkpoint serializer in use."""
+        return self.checkpointer.serde
+
+    async def index_pending_threads(self) -> int:
+        """Add threads missing from the search index. Returns threads indexed.
+
+        New checkpoints are indexed as they are written; this only catches up on
+        threads stored before search existed (no message refs at all), or on a
+        message store that predates the text index.
+        """
+        async with self.conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM messages) AND NOT EXISTS (SELECT 1 FROM message_text)"
+        ) as cursor:
+            (reindex_all,) = await cursor.fetchone()
+        query = "SELECT thread_id FROM threads"
+        if not reindex_all:
+            # Forks borrow their parent's refs, so having none is expected for them
+            query += """
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM message_refs AS r WHERE r.thread_id = threads.thread_id
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM thread_forks AS f WHERE f.thread_id = threads.thread_id
+                )
+            """
+        async with self.conn.execute(query) as cursor:
+            thread_ids = [row[0] for row in await cursor.fetchall()]
+        for thread_id in thread_ids:
+            await self.checkpointer.index_thread(thread_id)
+        await self.checkpointer.flush()
+        return len(thread_ids)
+
+    async def search(
+        self,
+        query: str,
+        *,
+        agent_name: str | None = None,
+        limit: int = 10,
+    ) -> list[dict]:
+        """Full-text search over past threads, best match first.
+
+        Matches message text, tool names and file paths. Each thread appears once,
+        with a snippet from its best-ranked message.
+
+        Returns:
+            Dicts with thread_id, agent_name, updated_at, role, snippet and rank
+            (bm25, lower is better). Matched
+            terms in the snippet are wrapped in STX ... ETX control characters.
+        """
+        match = _fts_query(query)
+        if not match:
+            return []
+        agent_clause = " AND t.agent_name = ?" if agent_name else ""
+        agent_params: tuple = (agent_name,) if agent_name else ()
+        # Several messages of one thread can match; over-fetch, then keep each thread's best
+        sql = f"""
+            SELECT r.thread_id, t.agent_name, t.updated_at, mt.role,
+                   snippet(message_search, -1, char(2), char(3), '…', 16),
+                   message_search.rank
+            FROM message_search
+            JOIN message_text AS mt ON mt.id = message_search.rowid
+            JOIN message_refs AS r ON r.hash = mt.hash
+            JOIN threads AS t ON t.thread_id = r.thread_id
+            WHERE message_search MATCH ?{agent_clause}
+            ORDER BY message_search.rank
+            LIMIT ?
+        """  # noqa: S608
+        results: dict[str, dict] = {}
+        async with self.conn.execute(sql, (match, *agent_params, limit * 20)) as cursor:
+            async for thread_id, agent, updated_at, role, snippet, rank in cursor:
+                if thread_id not in results:
+                    results[thread_id] = {
+                        "thread_id": thread_id,
+                        "agent_name": agent,
+                        "updated_at": updated_at,
+                        "role": role,
+                        "snippet": snippet,
+                        "rank": rank,
+                    }
+                    if len(results) >= limit:
+                        break
+        return list(results.values())
+
+
+class SessionRouter:
+    """Routes thread operations across session database shards.
+
+    With per-agent sharding (see SHARDING_ENV_VAR) each agent's threads live in
+    `sessions-<agent>.db`; catalog queries fan out over every shard and merge, and
+    per-thread operations go to the shard that holds the thread. Without sharding
+    there is exactly one shard, so the router is a thin wrapper over one store and
+    one connection.
+    """
+
+    def __init__(self, *, durability: str = "exit") -> None:
+        """Initialize the router (shards are opened on first use).
+
+        Args:
+            durability: Durability mode for every shard store opened
+        """
+        self._durability = durability
+        self._stores: dict[Path, SessionStore] = {}
+        # Concurrent first uses of a shard must share one connection
+        self._open_lock = asyncio.Lock()
+
+    async def close(self) -> None:
+        """Close every shard store that was opened."""
+        stores, self._stores = list(self._stores.values()), {}
+        for store in stores:
+            await store.close()
+
+    async def __aenter__(self) -> Self:
+        """Enter the router context."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the router on context exit."""
+        await self.close()
+
+    async def _open(self, path: Path) -> SessionStore:
+        store = self._stores.get(path)
+        if store is None:
+            async with self._open_lock:
+                store = self._stores.get(path)
+                if store is None:
+                    store = await SessionStore(path, durability=self._durability).open()
+                    self._stores[path] = store
+        return store
+
+    async def store_for(self, agent_name: str | None = None) -> SessionStore:
+        """Store holding (new) threads of `agent_name`."""
+        return await self._open(get_db_path(agent_name))
+
+    async def stores(self, agent_name: str | None = None) -> list[SessionStore]:
+        """Stores that may hold threads of `agent_name` (every shard if None).
+
+        The global database is always included: it holds threads written before
+        sharding was enabled.
+        """
+        if agent_name and sharding_enabled():
+            paths = [get_db_path(agent_name), get_db_path()]
+        else:
+            paths = get_shard_paths()
+        global_path = get_db_path()
+        return [
+            await self._open(path)
+            for path in dict.fromkeys(paths)
+            if path == global_path or path.exists()
+        ]
+
+    async def find_store(self, thread_id: str) -> SessionStore | None:
+        """Store that holds `thread_id`, if any."""
+        for store in await self.stores():
+            if await store.thread_exists(thread_id):
+                return store
+        return None
+
+    async def list_threads(self, agent_name: str | None = None, limit: int = 20) -> list[dict]:
+        """List threads across shards, most recently used first."""
+        threads = [
+            thread
+            for store in await self.stores(agent_name)
+            for thread in await store.list_threads(agent_name, limit=limit)
+        ]
+        threads.sort(key=lambda t: t.get("updated_at") or "", reverse=True)
+        return threads[:limit]
+
+    async def get_most_recent(self, agent_name: str | None = None) -> str | None:
+        """Get most recent thread_id across shards, optionally filtered by agent."""
+        threads = await self.list_threads(agent_name, limit=1)
+        return threads[0]["thread_id"] if threads else None
+
+    async def get_thread_agent(self, thread_id: str) -> str | None:
+        """Get agent_name for a thread."""
+        store = await self.find_store(thread_id)
+        return await store.get_thread_agent(thread_id) if store else None
+
+    async def thread_exists(self, thread_id: str) -> bool:
+        """Check if a thread exists in any shard."""
+        return await self.find_store(thread_id) is not None
+
+    async def delete_thread(self, thread_id: str) -> bool:
+        """Delete a thread from whichever shard holds it."""
+        store = await self.find_store(thread_id)
+        return await store.delete_thread(thread_id) if store else False
+
+    async def fork_thread(self, thread_id: str, checkpoint_id: str | None = None) -> str | None:
+        """Fork a thread; the fork lives in the same shard as its parent."""
+        store = await self.find_store(thread_id)
+        return await store.fork_thread(thread_id, checkpoint_id) if store else None
+
+    async def search(
+        self, query: str, *, agent_name: str | None = None, limit: int = 10
+    ) -> list[dict]:
+        """Full-text search across shards, best match first."""
+        results = [
+            result
+            for store in await self.stores(agent_name)
+            for result in await store.search(query, agent_name=agent_name, limit=limit)
+        ]
+        results.sort(key=lambda r: r["rank"])
+        return results[:limit]
+
+
+async def _initialize(conn: aiosqlite.Connection, checkpointer: MessageStoreSaver) -> None:
+    """Apply connection pragmas, create the checkpoint tables and migrate."""
+    for pragma in _CONNECTION_PRAGMAS:
+        await conn.execute(pragma)
+    # Create tables eagerly so the catalog triggers exist before the first write
+    await checkpointer.setup()
+    await _migrate(conn)
+    checkpointer.serde = await _load_serializer(conn)
+
+
+async def _load_serializer(conn: aiosqlite.Connection) -> CompressedSerializer:
+    """Build the checkpoint serializer with every trained dictionary available."""
+    async with conn.execute("SELECT dict_id, data FROM compression_dicts") as cursor:
+        dictionaries = dict(await cursor.fetchall())
+    return CompressedSerializer(
+        dictionaries=dictionaries,
+        active_dictionary=max(dictionaries, default=None),
+    )
+
 
 @asynccontextmanager
-async def get_checkpointer() -> AsyncIterator[AsyncSqliteSaver]:
-    """Get AsyncSqliteSaver for the global database."""
-    async with AsyncSqliteSaver.from_conn_string(str(get_db_path())) as checkpointer:
-        yield checkpointer
+async def _use_store(
+    store: SessionStore | SessionRouter | None,
+) -> AsyncIterator[SessionStore | SessionRouter]:
+    """Yield the given store, or open a temporary router for a single call."""
+    if store is not None:
+        yield store
+        return
+    async with SessionRouter() as router:
+        yield router
+
+
+async def list_threads(
+    agent_name: str | None = None,
+    limit: int = 20,
+    *,
+    store: SessionStore | SessionRouter | None = None,
+) -> list[dict]:
+    """List threads from the thread catalog, most recently used first."""
+    async with _use_store(store) as s:
+        return await s.list_threads(agent_name, limit=limit)
+
+
+async def get_most_recent(
+    agent_name: str | None = None, *, store: SessionStore | SessionRouter | None = None
+) -> str | None:
+    """Get most recent thread_id, optionally filtered by agent."""
+    async with _use_store(store) as s:
+        return await s.get_most_recent(agent_name)
+
+
+async def get_thread_agent(
+    thread_id: str, *, store: SessionStore | SessionRouter | None = None
+) -> str | None:
+    """Get agent_name for a thread."""
+    async with _use_store(store) as s:
+        return await s.get_thread_agent(thread_id)
+
+
+async def thread_exists(
+    thread_id: str, *, store: SessionStore | SessionRouter | None = None
+) -> bool:
+    """Check if a thread exists in the thread catalog."""
+    async with _use_store(store) as s:
+        return await s.thread_exists(thread_id)
+
+
+async def delete_thread(
+    thread_id: str, *, store: SessionStore | SessionRouter | None = None
+) -> bool:
+    """Delete thread checkpoints. Returns True if deleted."""
+    async with _use_store(store) as s:
+        return await s.delete_thread(thread_id)
+
+
+@asynccontextmanager
+async def get_checkpointer(
+    store: SessionStore | None = None,
+) -> AsyncIterator[MessageStoreSaver]:
+    """Get AsyncSqliteSaver for the global database.
+
+    Args:
+        store: Open store whose connection should be shared. If None, a
+            dedicated store is opened for the lifetime of the context.
+    """
+    if store is not None:
+        yield store.checkpointer
+        return
+    async with SessionStore() as temp_store:
+        yield temp_store.checkpointer
 
 
 async def list_threads_command(
@@ -191,12 +2019,16 @@ async def list_threads_command(
     table.add_column("Thread ID", style="bold")
     table.add_column("Agent")
     table.add_column("Last Used", style="dim")
+    table.add_column("Checkpoints", justify="right", style="dim")
+    table.add_column("Size", justify="right", style="dim")
 
     for t in threads:
         table.add_row(
             t["thread_id"],
             t["agent_name"] or "unknown",
             _format_timestamp(t.get("updated_at")),
+            str(t.get("checkpoint_count") or 0),
+            _format_bytes(t.get("size_bytes")),
         )
 
     console.print()
@@ -204,6 +2036,102 @@ async def list_threads_command(
     console.print()
 
 
+def _format_share(part: int, total: int) -> str:
+    return f"{_format_bytes(part)} ({part / total:.0%})" if total else "—"
+
+
+def describe_thread_stats(stats: dict) -> str:
+    """One-line summary of a `thread_stats` entry for the /stats slash command."""
+    message_bytes = stats["message_bytes"] or 0
+    tool_bytes = stats["tool_bytes"] or 0
+    total = message_bytes + tool_bytes
+    return (
+        f"{stats['checkpoint_count'] or 0} checkpoints · "
+        f"{_format_bytes((stats['checkpoint_bytes'] or 0) + stats['writes_bytes'])} stored · "
+        f"largest {_format_bytes(stats['largest_checkpoint'])} · "
+        f"{stats['writes_count']} writes · "
+        f"messages {_format_share(message_bytes, total)}, "
+        f"tool outputs {_format_share(tool_bytes, total)}"
+    )
+
+
+def _stats_table(title: str, rows: list[dict], *, by_agent: bool = False) -> Table:
+    """Render `storage_stats`/`thread_stats` rows (per agent or per thread)."""
+    table = Table(title=title, show_header=True, header_style=f"bold {COLORS['primary']}")
+    table.add_column("Agent" if by_agent else "Thread ID", style="bold")
+    if by_agent:
+        table.add_column("Threads", justify="right")
+    table.add_column("Checkpoints", justify="right")
+    table.add_column("Blob bytes", justify="right")
+    table.add_column("Largest", justify="right", style="dim")
+    table.add_column("Writes", justify="right", style="dim")
+    table.add_column("Messages", justify="right")
+    table.add_column("Tool outputs", justify="right")
+    for row in rows:
+        message_bytes = row["message_bytes"] or 0
+        tool_bytes = row["tool_bytes"] or 0
+        writes_bytes = row["writes_bytes"] or 0
+        cells = [row["agent_name"] or "unknown"] if by_agent else [row["thread_id"]]
+        if by_agent:
+            cells.append(str(row["thread_count"]))
+        cells += [
+            str(row["checkpoint_count"] or 0),
+            _format_bytes((row["checkpoint_bytes"] or 0) + writes_bytes),
+            _format_bytes(row["largest_checkpoint"] or 0),
+            f"{row['writes_count'] or 0} ({_format_bytes(writes_bytes)})",
+            _format_share(message_bytes, message_bytes + tool_bytes),
+            _format_share(tool_bytes, message_bytes + tool_bytes),
+        ]
+        table.add_row(*cells)
+    return table
+
+
+async def stats_threads_command(*, agent_name: str | None = None, limit: int = 20) -> None:
+    """CLI handler for: deepagents threads stats."""
+    threads: list[dict] = []
+    agents: dict[str | None, dict] = {}
+    db_bytes = free_bytes = 0
+    start = time.perf_counter()
+    async with SessionRouter() as router:
+        for store in await router.stores(agent_name):
+            stats = await store.storage_stats(agent_name=agent_name, limit=limit)
+            threads.extend(stats["threads"])
+            for agent in stats["agents"]:
+                entry = agents.get(agent["agent_name"])
+                if entry is None:
+                    agents[agent["agent_name"]] = agent
+                    continue
+                for key in _AGENT_STAT_KEYS:
+                    merge = max if key == "largest_checkpoint" else sum
+                    entry[key] = merge((entry[key] or 0, agent[key] or 0))
+            db_bytes += stats["db_bytes"]
+            free_bytes += stats["free_bytes"]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if not threads:
+        console.print("[yellow]No threads found.[/yellow]")
+        return
+
+    def by_size(row: dict) -> int:
+        return -(row["checkpoint_bytes"] or 0)
+
+    console.print()
+    console.print(
+        _stats_table("Storage by agent", sorted(agents.values(), key=by_size), by_agent=True)
+    )
+    console.print()
+    console.print(_stats_table("Largest threads", sorted(threads, key=by_size)[:limit]))
+    console.print(
+        f"[dim]Database size: {_format_bytes(db_bytes)} ({_format_bytes(free_bytes)} free) · "
+        f"{elapsed_ms:.0f} ms[/dim]"
+    )
+    console.print(
+        "[dim]Messages/tool outputs cover the shared message store; threads saved "
+        "before it existed keep messages inside their checkpoint blobs.[/dim]"
+    )
+    console.print()
+
+
 async def delete_thread_command(thread_id: str) -> None:
     """CLI handler for: deepagents threads delete."""
     deleted = await delete_thread(thread_id)
@@ -212,3 +2140,163 @@ async def delete_thread_command(thread_id: str) -> None:
         console.print(f"[green]Thread '{thread_id}' deleted.[/green]")
     else:
         console.print(f"[red]Thread '{thread_id}' not found.[/red]")
+
+
+async def gc_threads_command(
+    *,
+    keep_last: int | None = None,
+    older_than: timedelta | None = None,
+    agent_name: str | None = None,
+    dry_run: bool = False,
+) -> None:
+    """CLI handler for: deepagents threads gc."""
+    if keep_last is not None and keep_last < 1:
+        console.print("[red]--keep-last must be at least 1.[/red]")
+        return
+
+    report = GcReport(dry_run=dry_run)
+    async with SessionRouter() as router:
+        for store in await router.stores(agent_name):
+            report.add(
+                await store.gc(
+                    keep_last=keep_last,
+                    older_than=older_than,
+                    agent_name=agent_name,
+                    dry_run=dry_run,
+                )
+            )
+
+    title = "Garbage collection (dry run)" if dry_run else "Garbage collection"
+    table = Table(title=title, show_header=True, header_style=f"bold {COLORS['primary']}")
+    table.add_column("Category", style="bold")
+    table.add_column("Rows", justify="right")
+    table.add_column("Size", justify="right", style="dim")
+    table.add_row(
+        "Expired threads", str(report.expired_threads), _format_bytes(report.expired_bytes)
+    )
+    table.add_row(
+        "Old checkpoints", str(report.pruned_checkpoints), _format_bytes(report.pruned_bytes)
+    )
+    table.add_row(
+        "Orphaned writes", str(report.orphaned_writes), _format_bytes(report.orphaned_bytes)
+    )
+
+    console.print()
+    console.print(table)
+    if dry_run:
+        console.print(f"[dim]Database size: {_format_bytes(report.db_bytes_before)}[/dim]")
+    else:
+        console.print(
+            f"[dim]Database size: {_format_bytes(report.db_bytes_before)} → "
+            f"{_format_bytes(report.db_bytes_after)}[/dim]"
+        )
+        if not report.vacuum_complete:
+            console.print("[dim]Free pages remain; run gc again to reclaim more space.[/dim]")
+    console.print()
+
+
+async def search_threads_command(
+    query: str, *, agent_name: str | None = None, limit: int = 10
+) -> None:
+    """CLI handler for: deepagents threads search."""
+    async with SessionRouter() as router:
+        indexed = 0
+        for store in await router.stores(agent_name):
+            indexed += await store.index_pending_threads()
+        if indexed:
+            console.print(f"[dim]Indexed {indexed} older thread(s) for search.[/dim]")
+        start = time.perf_counter()
+        results = await router.search(query, agent_name=agent_name, limit=limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if not results:
+        console.print(f"[yellow]No threads match '{escape(query)}'.[/yellow]")
+        return
+
+    table = Table(
+        title=f"Threads matching '{escape(query)}'",
+        show_header=True,
+        header_style=f"bold {COLORS['primary']}",
+    )
+    table.add_column("Thread ID", style="bold", no_wrap=True)
+    table.add_column("Agent")
+    table.add_column("Last Used", style="dim")
+    table.add_column("Match", ratio=1)
+
+    roles = {"human": "you", "ai": "agent", "tool": "tool"}
+    for result in results:
+        snippet = " ".join(escape(result["snippet"]).split())
+        snippet = snippet.replace("\x02", "[bold]").replace("\x03", "[/bold]")
+        table.add_row(
+            result["thread_id"],
+            result["agent_name"] or "unknown",
+            _format_timestamp(result.get("updated_at")),
+            f"[dim]{roles.get(result['role'], result['role'])}:[/dim] {snippet}",
+        )
+
+    console.print()
+    console.print(table)
+    console.print(f"[dim]{len(results)} thread(s) in {elapsed_ms:.1f} ms[/dim]")
+    console.print()
+
+
+async def fork_thread_command(thread_id: str, *, checkpoint_id: str | None = None) -> None:
+    """CLI handler for: deepagents threads fork."""
+    async with SessionRouter() as router:
+        fork_id = await router.fork_thread(thread_id, checkpoint_id)
+
+    if fork_id is None:
+        target = f"Checkpoint '{checkpoint_id}'" if checkpoint_id else f"Thread '{thread_id}'"
+        console.print(f"[red]{target} not found.[/red]")
+        return
+    console.print(f"[green]Forked '{thread_id}' → '{fork_id}'.[/green]")
+    console.print(f"[dim]Resume it with: stranger-code -r {fork_id}[/dim]")
+
+
+async def compress_threads_command(
+    *, thread_id: str | None = None, train_dictionary: bool = False
+) -> None:
+    """CLI handler for: deepagents threads compress."""
+    size_before = size_after = rewritten = 0
+    async with SessionRouter() as router:
+        for store in await router.stores():
+            before, _ = await store._db_size()
+            rewritten += await store.compress_existing(train=train_dictionary)
+            codec = store.serializer.codec
+            await store._incremental_vacuum(budget_seconds=30.0)
+            after, _ = await store._db_size()
+            size_before += before
+            size_after += after
+
+        thread_id = thread_id or await router.get_most_recent()
+        store = await router.find_store(thread_id) if thread_id else None
+        benchmark = await store.benchmark_serializer(thread_id) if store else None
+
+    console.print()
+    console.print(f"[green]Re-encoded {rewritten} rows with {codec}.[/green]")
+    console.print(
+        f"[dim]Database size: {_format_bytes(size_before)} → {_format_bytes(size_after)}[/dim]"
+    )
+    if benchmark is None:
+        console.print()
+        return
+
+    table = Table(
+        title=f"Latest checkpoint of '{thread_id}'",
+        show_header=True,
+        header_style=f"bold {COLORS['primary']}",
+    )
+    table.add_column("Encoding", style="bold")
+    table.add_column("Size", justify="right")
+    table.add_column("Save", justify="right", style="dim")
+    table.add_column("Load", justify="right", style="dim")
+    for name, result in benchmark.items():
+        table.add_row(
+            name,
+            _format_bytes(int(result["bytes"])),
+            f"{result['save_ms']:.2f} ms",
+            f"{result['load_ms']:.2f} ms",
+        )
+    console.print()
+    console.print(table)
+    console.print()
@@ -4,17 +4,26 @@ Public API:
 - SkillsMiddleware: Middleware for integrating skills into agent execution
 - execute_skills_command: Execute skills subcommands (list/create/info)
 - setup_skills_parser: Setup argparse configuration for skills commands
+
+Names are resolved on first access: importing deepagents-cli loads its whole
+CLI (LangChain included), which `stranger_code.skills.commands` must not pay
+for when it only registers the argument parser.
 """
 
-# Re-export everything from deepagents-cli's skills module
-from deepagents_cli.skills import (
-    SkillsMiddleware,
-    execute_skills_command,
-    setup_skills_parser,
-)
+from typing import Any
 
 __all__ = [
     "SkillsMiddleware",
     "execute_skills_command",
     "setup_skills_parser",
 ]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    if name in __all__:
+        # Re-export everything from deepagents-cli's skills module
+        import deepagents_cli.skills
+
+        return getattr(deepagents_cli.skills, name)
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -12,7 +12,6 @@ from pathlib import Path
 from typing import Any
 
 from stranger_code.config import COLORS, Settings, console
-from stranger_code.skills.load import list_skills
 
 MAX_SKILL_NAME_LENGTH = 64
 
@@ -97,6 +96,8 @@ def _list(agent: str, *, project: bool = False) -> None:
         project: If True, show only project skills.
             If False, show all skills (user + project).
     """
+    from stranger_code.skills.load import list_skills  # imports deepagents
+
     settings = Settings.from_environment()
     user_skills_dir = settings.get_user_skills_dir(agent)
     project_skills_dir = settings.get_project_skills_dir()
@@ -327,6 +328,8 @@ def _info(skill_name: str, *, agent: str = "agent", project: bool = False) -> No
         agent: Agent identifier for skills (default: agent).
         project: If True, only search in project skills. If False, search in both user and project skills.
     """
+    from stranger_code.skills.load import list_skills  # imports deepagents
+
     settings = Settings.from_environment()
     user_skills_dir = settings.get_user_skills_dir(agent)
     project_skills_dir = settings.get_project_skills_dir()
@@ -0,0 +1,271 @@
+"""Per-turn latency telemetry for agent runs.
+
+`TurnTimer` is fed events from `execute_task_textual` (stream start, model
+chunks, tool calls and results, approval waits) and produces a `TurnMetrics`
+record: time to first token, inter-chunk latency percentiles, output tokens
+per second, per-tool wall time, HITL wait and checkpoint write time.
+
+`PerfLog` keeps recent turns for `/perf` and appends every record to
+`~/.deepagents/perf.jsonl` (rotated at 5 MB, 3 backups) so models and
+providers can be compared offline.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from stranger_code.config import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+PERF_LOG_NAME = "perf.jsonl"
+_PERF_LOG_MAX_BYTES = 5 * 1024 * 1024
+_PERF_LOG_BACKUPS = 3
+
+# Turns kept in memory for /perf
+_PERF_HISTORY = 50
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def _format_ms(ms: float | None) -> str:
+    if ms is None:
+        return "—"
+    return f"{ms:.0f}ms" if ms < 1000 else f"{ms / 1000:.1f}s"  # noqa: PLR2004
+
+
+@dataclass
+class ToolTiming:
+    """Wall time of one tool call, from its tool_call to its ToolMessage."""
+
+    name: str
+    tool_call_id: str
+    ms: float
+    status: str
+
+
+@dataclass
+class TurnMetrics:
+    """Latency breakdown of one user turn."""
+
+    started_at: str
+    thread_id: str | None = None
+    agent: str | None = None
+    model: str | None = None
+    provider: str | None = None
+    total_ms: float = 0.0
+    ttft_ms: float | None = None
+    chunk_ms_p50: float | None = None
+    chunk_ms_p95: float | None = None
+    chunk_ms_p99: float | None = None
+    model_calls: int = 0
+    output_tokens: int = 0
+    tokens_per_second: float | None = None
+    tools: list[ToolTiming] = field(default_factory=list)
+    approval_wait_ms: float = 0.0
+    checkpoint_ms: float | None = None
+    interrupted: bool = False
+
+    def summary(self) -> str:
+        """Compact one-liner for the status bar."""
+        parts = [f"TTFT {_format_ms(self.ttft_ms)}"]
+        if self.tokens_per_second is not None:
+            parts.append(f"{self.tokens_per_second:.0f} tok/s")
+        if self.tools:
+            parts.append(f"tools {_format_ms(sum(tool.ms for tool in self.tools))}")
+        return "⏱ " + " · ".join(parts)
+
+    def breakdown(self) -> list[str]:
+        """Lines describing the turn in detail, for /perf."""
+        model = " / ".join(part for part in (self.provider, self.model) if part) or "unknown"
+        lines = [
+            f"Turn at {self.started_at[11:19]} · {model} · total {_format_ms(self.total_ms)}"
+            + (" (interrupted)" if self.interrupted else ""),
+            f"  time to first token  {_format_ms(self.ttft_ms)}",
+            (
+                f"  inter-chunk latency  p50 {_format_ms(self.chunk_ms_p50)} · "
+                f"p95 {_format_ms(self.chunk_ms_p95)} · p99 {_format_ms(self.chunk_ms_p99)}"
+            ),
+        ]
+        rate = f"{self.tokens_per_second:.1f} tok/s" if self.tokens_per_second else "—"
+        lines.append(
+            f"  output               {self.output_tokens} tokens · {rate} "
+            f"over {self.model_calls} model call(s)"
+        )
+        for tool in self.tools:
+            status = "" if tool.status == "success" else f" ({tool.status})"
+            lines.append(f"  tool {tool.name:<15} {_format_ms(tool.ms)}{status}")
+        if self.approval_wait_ms:
+            lines.append(f"  approval wait        {_format_ms(self.approval_wait_ms)}")
+        lines.append(f"  checkpoint writes    {_format_ms(self.checkpoint_ms)}")
+        return lines
+
+
+class TurnTimer:
+    """Collect timestamps for one turn and turn them into `TurnMetrics`."""
+
+    def __init__(
+        self,
+        *,
+        thread_id: str | None = None,
+        agent: str | None = None,
+        checkpointer: Any = None,  # noqa: ANN401
+    ) -> None:
+        """Start timing a turn.
+
+        Args:
+            thread_id: Thread the turn runs on
+            agent: Agent (assistant) name
+            checkpointer: Saver exposing cumulative `write_seconds`, if any
+        """
+        self._start = time.perf_counter()
+        self._metrics = TurnMetrics(
+            started_at=datetime.now(UTC).isoformat(),
+            thread_id=thread_id,
+            agent=agent,
+            model=settings.model_name,
+            provider=settings.model_provider,
+        )
+        self._checkpointer = checkpointer
+        self._write_seconds = getattr(checkpointer, "write_seconds", None)
+        self._first_chunk: float | None = None
+        self._last_chunk: float | None = None
+        self._response_start: float | None = None
+        self._generation_seconds = 0.0
+        self._gaps_ms: list[float] = []
+        self._tools: dict[str, tuple[str, float]] = {}
+
+    def on_chunk(self) -> None:
+        """Record a streamed model chunk (text or tool-call fragment)."""
+        now = time.perf_counter()
+        if self._first_chunk is None:
+            self._first_chunk = now
+        if self._last_chunk is None:
+            self._response_start = now
+            self._metrics.model_calls += 1
+        else:
+            self._gaps_ms.append((now - self._last_chunk) * 1000)
+        self._last_chunk = now
+
+    def on_usage(self, output_tokens: int) -> None:
+        """Add output tokens reported in a chunk's usage metadata."""
+        self._metrics.output_tokens += output_tokens
+
+    def end_response(self) -> None:
+        """Mark the end of a model response; gaps after this are not inter-token."""
+        if self._last_chunk is not None and self._response_start is not None:
+            self._generation_seconds += self._last_chunk - self._response_start
+        self._last_chunk = self._response_start = None
+
+    def tool_started(self, tool_call_id: str, name: str) -> None:
+        """Record a tool call being issued."""
+        self._tools[tool_call_id] = (name, time.perf_counter())
+
+    def tool_finished(self, tool_call_id: str | None, status: str) -> None:
+        """Record the ToolMessage answering a tool call."""
+        self.end_response()
+        if tool_call_id is None or tool_call_id not in self._tools:
+            return
+        name, start = self._tools.pop(tool_call_id)
+        self._metrics.tools.append(
+            ToolTiming(name, tool_call_id, (time.perf_counter() - start) * 1000, status)
+        )
+
+    def approval_waited(self, seconds: float) -> None:
+        """Add time spent waiting for a HITL decision.
+
+        The graph is paused while it waits, so the wait is also taken out of
+        every tool call still in flight.
+        """
+        self._metrics.approval_wait_ms += seconds * 1000
+        for tool_call_id, (name, start) in self._tools.items():
+            self._tools[tool_call_id] = (name, start + seconds)
+
+    def finish(self, *, interrupted: bool = False) -> TurnMetrics:
+        """Close the turn and compute the derived figures."""
+        self.end_response()
+        metrics = self._metrics
+        metrics.interrupted = interrupted
+        metrics.total_ms = (time.perf_counter() - self._start) * 1000
+        if self._first_chunk is not None:
+            metrics.ttft_ms = (self._first_chunk - self._start) * 1000
+        metrics.chunk_ms_p50 = _percentile(self._gaps_ms, 50)
+        metrics.chunk_ms_p95 = _percentile(self._gaps_ms, 95)
+        metrics.chunk_ms_p99 = _percentile(self._gaps_ms, 99)
+        if metrics.output_tokens and self._generation_seconds > 0:
+            metrics.tokens_per_second = metrics.output_tokens / self._generation_seconds
+        if self._write_seconds is not None:
+            elapsed = self._checkpointer.write_seconds - self._write_seconds
+            metrics.checkpoint_ms = elapsed * 1000
+        return metrics
+
+
+class PerfLog:
+    """Recent turn metrics plus an append-only, rotating JSONL log."""
+
+    def __init__(
+        self,
+        on_record: Callable[[TurnMetrics], None] | None = None,
+        *,
+        path: Path | None = None,
+    ) -> None:
+        """Initialize the log.
+
+        Args:
+            on_record: Called with each recorded turn (e.g. to update the status bar)
+            path: JSONL file (default: ~/.deepagents/perf.jsonl)
+        """
+        self._on_record = on_record
+        self._path = path or settings.user_deepagents_dir / PERF_LOG_NAME
+        self.turns: deque[TurnMetrics] = deque(maxlen=_PERF_HISTORY)
+
+    @property
+    def path(self) -> Path:
+        """Location of the JSONL log."""
+        return self._path
+
+    def record(self, metrics: TurnMetrics) -> None:
+        """Keep `metrics` for /perf, append it to the log and notify the listener."""
+        self.turns.append(metrics)
+        # Telemetry must never break a turn
+        with contextlib.suppress(OSError):
+            self._append(json.dumps(asdict(metrics)) + "\n")
+        if self._on_record:
+            self._on_record(metrics)
+
+    def _append(self, line: str) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        if self._path.exists() and self._path.stat().st_size + len(line) > _PERF_LOG_MAX_BYTES:
+            self._rotate()
+        with self._path.open("a", encoding="utf-8") as f:
+            f.write(line)
+
+    def _rotate(self) -> None:
+        """Shift perf.jsonl -> perf.jsonl.1 -> ... dropping the oldest backup."""
+        for index in range(_PERF_LOG_BACKUPS - 1, 0, -1):
+            backup = self._path.with_name(f"{self._path.name}.{index}")
+            if backup.exists():
+                backup.replace(self._path.with_name(f"{self._path.name}.{index + 1}"))
+        self._path.replace(self._path.with_name(f"{self._path.name}.1"))
+
+
+__all__ = [
+    "PERF_LOG_NAME",
+    "PerfLog",
+    "ToolTiming",
+    "TurnMetrics",
+    "TurnTimer",
+]
@@ -6,6 +6,9 @@ from __future__ import annotations
 
 import asyncio
 import json
+import time
+from collections import deque
+from contextlib import suppress
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
@@ -21,20 +24,122 @@ from pydantic import TypeAdapter, ValidationError
 from stranger_code.file_ops import FileOpTracker
 from stranger_code.image_utils import create_multimodal_content
 from stranger_code.input import ImageTracker, parse_file_mentions
+from stranger_code.json_stream import StreamingJSONParser
+from stranger_code.telemetry import TurnTimer
 from stranger_code.ui import format_tool_display, format_tool_message_content
-from stranger_code.widgets.messages import (
-    AssistantMessage,
-    DiffMessage,
-    ErrorMessage,
-    SystemMessage,
-    ToolCallMessage,
-)
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    from stranger_code.widgets.messages import (
+        AssistantMessage,
+        DiffMessage,
+        ErrorMessage,
+        SystemMessage,
+        ToolCallMessage,
+    )
+
 _HITL_REQUEST_ADAPTER = TypeAdapter(HITLRequest)
 
+# --durability mode -> LangGraph stream durability. async-batched lets LangGraph
+# persist each step in the background; the saver then groups those writes.
+_STREAM_DURABILITY = {"exit": "exit", "async-batched": "async", "sync": "sync"}
+
+# Frames per second for streamed assistant text. Fast models emit tokens far
+# quicker than a Markdown reflow, so text is coalesced and rendered once per frame.
+DEFAULT_RENDER_FPS = 30.0
+
+# Status-bar updates held between frames; only the newest is shown
+_STATUS_QUEUE_SIZE = 4
+
+
+class RenderBatcher:
+    """Coalesce streamed assistant text and status updates into frames.
+
+    Text is buffered per namespace and written to its AssistantMessage at most
+    once per frame, so Markdown reflows happen at the frame rate rather than
+    the token rate. Status updates go through a bounded queue: intermediate
+    statuses are dropped and each frame shows only the newest one.
+
+    The first update after an idle period renders immediately; later ones wait
+    for the next frame. With `fps=0` every update is rendered as it arrives.
+    """
+
+    def __init__(
+        self, update_status: Callable[[str], None], *, fps: float = DEFAULT_RENDER_FPS
+    ) -> None:
+        """Initialize the batcher.
+
+        Args:
+            update_status: Callable to update the status bar message
+            fps: Frames per second (0 disables batching)
+        """
+        self._update_status = update_status
+        self._interval = 1 / fps if fps > 0 else 0.0
+        self._text: dict[tuple, list[str]] = {}
+        self._targets: dict[tuple, AssistantMessage] = {}
+        self._status: deque[str] = deque(maxlen=_STATUS_QUEUE_SIZE)
+        self._dirty = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.dropped_status = 0
+
+    async def append(self, ns_key: tuple, target: AssistantMessage, text: str) -> None:
+        """Queue assistant text for `target`, the message streaming namespace `ns_key`."""
+        if not self._interval:
+            await target.append_content(text)
+            return
+        if self._text.get(ns_key) and self._targets[ns_key] is not target:
+            await self.flush()
+        self._targets[ns_key] = target
+        self._text.setdefault(ns_key, []).append(text)
+        self._schedule()
+
+    def set_status(self, message: str) -> None:
+        """Queue a status-bar update for the next frame."""
+        if not self._interval:
+            self._update_status(message)
+            return
+        if len(self._status) == self._status.maxlen:
+            self.dropped_status += 1
+        self._status.append(message)
+        self._schedule()
+
+    async def flush(self) -> None:
+        """Render everything queued so far, without waiting for the next frame."""
+        async with self._lock:
+            self._dirty.clear()
+            pending, self._text = self._text, {}
+            status = self._status[-1] if self._status else None
+            self._status.clear()
+            for ns_key, parts in pending.items():
+                await self._targets[ns_key].append_content("".join(parts))
+            if status is not None:
+                self._update_status(status)
+
+    async def aclose(self) -> None:
+        """Stop the frame loop and render anything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    def _schedule(self) -> None:
+        self._dirty.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self._dirty.wait()
+            start = time.perf_counter()
+            # Shielded so cancelling the loop never loses text already taken
+            # out of the buffers; aclose() then waits on the lock for it.
+            await asyncio.shield(self.flush())
+            await asyncio.sleep(max(0.0, self._interval - (time.perf_counter() - start)))
+
 
 class TextualUIAdapter:
     """Adapter for rendering agent output to Textual widgets.
@@ -50,6 +155,7 @@ class TextualUIAdapter:
         request_approval: Callable,  # async callable returning Future
         on_auto_approve_enabled: Callable[[], None] | None = None,
         scroll_to_bottom: Callable[[], None] | None = None,
+        render_fps: float = DEFAULT_RENDER_FPS,
     ) -> None:
         """Initialize the adapter.
 
@@ -59,23 +165,69 @@ class TextualUIAdapter:
             request_approval: Callable that returns a Future for HITL approval
             on_auto_approve_enabled: Callback when auto-approve is enabled
             scroll_to_bottom: Callback to scroll chat to bottom
+            render_fps: Frame rate for streamed text (0 renders every token)
         """
         self._mount_message = mount_message
         self._update_status = update_status
         self._request_approval = request_approval
         self._on_auto_approve_enabled = on_auto_approve_enabled
         self._scroll_to_bottom = scroll_to_bottom
+        self._render_fps = render_fps
 
         # State tracking
         self._current_assistant_message: AssistantMessage | None = None
         self._current_tool_messages: dict[str, ToolCallMessage] = {}
         self._pending_text = ""
         self._token_tracker: Any = None
+        self._perf_log: Any = None
 
     def set_token_tracker(self, tracker: Any) -> None:
         """Set the token tracker for usage tracking."""
         self._token_tracker = tracker
 
+    def set_perf_log(self, perf_log: Any) -> None:
+        """Set the PerfLog that receives per-turn latency metrics."""
+        self._perf_log = perf_log
+
+    # Message factories. Widgets are imported on use rather than at module level
+    # so headless runs (stranger_code.headless) can reuse execute_task_textual
+    # with their own message objects without ever loading Textual.
+
+    def assistant_message(self, content: str = "") -> AssistantMessage:
+        """Create the message that streamed assistant text is appended to."""
+        from stranger_code.widgets.messages import AssistantMessage
+
+        return AssistantMessage(content)
+
+    def tool_call_message(
+        self,
+        tool_name: str,
+        args: dict[str, Any],
+        tool_call_id: str | None = None,  # noqa: ARG002
+    ) -> ToolCallMessage:
+        """Create the message showing a tool call and, later, its result."""
+        from stranger_code.widgets.messages import ToolCallMessage
+
+        return ToolCallMessage(tool_name, args)
+
+    def diff_message(self, diff: str, file_path: str) -> DiffMessage:
+        """Create the message showing a file operation's diff."""
+        from stranger_code.widgets.messages import DiffMessage
+
+        return DiffMessage(diff, file_path)
+
+    def error_message(self, error: str) -> ErrorMessage:
+        """Create an error message."""
+        from stranger_code.widgets.messages import ErrorMessage
+
+        return ErrorMessage(error)
+
+    def system_message(self, message: str) -> SystemMessage:
+        """Create a system message."""
+        from stranger_code.widgets.messages import SystemMessage
+
+        return SystemMessage(message)
+
 
 async def execute_task_textual(
     user_input: str,
@@ -158,13 +310,21 @@ async def execute_task_textual(
     # Update status to show thinking
     adapter._update_status("Agent is thinking...")
 
+    # Latency telemetry: TTFT, inter-chunk gaps, tool and approval time
+    timer = TurnTimer(
+        thread_id=thread_id,
+        agent=assistant_id,
+        checkpointer=getattr(agent, "checkpointer", None),
+    )
+    interrupted = False
+
     file_op_tracker = FileOpTracker(assistant_id=assistant_id, backend=backend)
     displayed_tool_ids: set[str] = set()
     tool_call_buffers: dict[str | int, dict] = {}
 
     # Track pending text and assistant messages PER NAMESPACE to avoid interleaving
     # when multiple subagents stream in parallel
-    pending_text_by_namespace: dict[tuple, str] = {}
+    pending_text_by_namespace: dict[tuple, list[str]] = {}
     assistant_message_by_namespace: dict[tuple, Any] = {}
 
     # Clear images from tracker after creating the message
@@ -173,6 +333,9 @@ async def execute_task_textual(
 
     stream_input: dict | Command = {"messages": [{"role": "user", "content": message_content}]}
 
+    # Streamed text and status updates are rendered once per frame
+    batcher = RenderBatcher(adapter._update_status, fps=adapter._render_fps)
+
     try:
         while True:
             interrupt_occurred = False
@@ -182,10 +345,10 @@ async def execute_task_textual(
 
             async for chunk in agent.astream(
                 stream_input,
-                stream_mode=["messages", "updates"],
+                stream_mode=["messages", "updates", "custom"],
                 subgraphs=True,
                 config=config,
-                durability="exit",
+                durability=_STREAM_DURABILITY[session_state.durability],
             ):
                 if not isinstance(chunk, tuple) or len(chunk) != 3:
                     continue
@@ -223,6 +386,14 @@ async def execute_task_textual(
                     if chunk_data and isinstance(chunk_data, dict) and "todos" in chunk_data:
                         pass  # Future: render todo list widget
 
+                # Handle CUSTOM stream - live output of running sandbox commands
+                elif current_stream_mode == "custom":
+                    live = data.get("execute_output") if isinstance(data, dict) else None
+                    if live:
+                        tool_msg = adapter._current_tool_messages.get(live["tool_call_id"])
+                        if tool_msg is not None:
+                            tool_msg.append_output(live["text"])
+
                 # Handle MESSAGES stream - for content and tool calls
                 elif current_stream_mode == "messages":
                     # Skip subagent outputs - only render main agent content in chat
@@ -237,21 +408,24 @@ async def execute_task_textual(
                     if isinstance(message, HumanMessage):
                         content = message.text
                         # Flush pending text for this namespace
-                        pending_text = pending_text_by_namespace.get(ns_key, "")
-                        if content and pending_text:
+                        if content and pending_text_by_namespace.get(ns_key):
                             await _flush_assistant_text_ns(
-                                adapter, pending_text, ns_key, assistant_message_by_namespace
+                                adapter,
+                                batcher,
+                                pending_text_by_namespace.pop(ns_key),
+                                ns_key,
+                                assistant_message_by_namespace,
                             )
-                            pending_text_by_namespace[ns_key] = ""
                         continue
 
                     if isinstance(message, ToolMessage):
                         tool_name = getattr(message, "name", "")
                         tool_status = getattr(message, "status", "success")
+                        timer.tool_finished(getattr(message, "tool_call_id", None), tool_status)
                         tool_content = format_tool_message_content(message.content)
                         record = file_op_tracker.complete_with_message(message)
 
-                        adapter._update_status("Agent is thinking...")
+                        batcher.set_status("Agent is thinking...")
 
                         # Update tool call status with output
                         tool_id = getattr(message, "tool_call_id", None)
@@ -267,32 +441,41 @@ async def execute_task_textual(
 
                         # Show shell errors
                         if tool_name == "shell" and tool_status != "success":
-                            pending_text = pending_text_by_namespace.get(ns_key, "")
-                            if pending_text:
+                            if pending_text_by_namespace.get(ns_key):
                                 await _flush_assistant_text_ns(
-                                    adapter, pending_text, ns_key, assistant_message_by_namespace
+                                    adapter,
+                                    batcher,
+                                    pending_text_by_namespace.pop(ns_key),
+                                    ns_key,
+                                    assistant_message_by_namespace,
                                 )
-                                pending_text_by_namespace[ns_key] = ""
                             if tool_content:
-                                await adapter._mount_message(ErrorMessage(str(tool_content)))
+                                error = adapter.error_message(str(tool_content))
+                                await adapter._mount_message(error)
 
                         # Show file operation results - always show diffs in chat
                         if record:
-                            pending_text = pending_text_by_namespace.get(ns_key, "")
-                            if pending_text:
+                            if pending_text_by_namespace.get(ns_key):
                                 await _flush_assistant_text_ns(
-                                    adapter, pending_text, ns_key, assistant_message_by_namespace
+                                    adapter,
+                                    batcher,
+                                    pending_text_by_namespace.pop(ns_key),
+                                    ns_key,
+                                    assistant_message_by_namespace,
                                 )
-                                pending_text_by_namespace[ns_key] = ""
                             if record.diff:
                                 await adapter._mount_message(
-                                    DiffMessage(record.diff, record.display_path)
+                                    adapter.diff_message(record.diff, record.display_path)
                                 )
                         continue
 
                     # Check if this is an AIMessageChunk
                     if not hasattr(message, "content_blocks"):
                         continue
+                    timer.on_chunk()
+                    usage = getattr(message, "usage_metadata", None)
+                    if usage:
+                        timer.on_usage(usage.get("output_tokens", 0))
 
                     # Extract token usage
                     if adapter._token_tracker and hasattr(message, "usage_metadata"):
@@ -312,14 +495,12 @@ async def execute_task_textual(
                             text = block.get("text", "")
                             if text:
                                 # Track accumulated text for reference
-                                pending_text = pending_text_by_namespace.get(ns_key, "")
-                                pending_text += text
-                                pending_text_by_namespace[ns_key] = pending_text
+                                pending_text_by_namespace.setdefault(ns_key, []).append(text)
 
                                 # Get or create assistant message for this namespace
                                 current_msg = assistant_message_by_namespace.get(ns_key)
                                 if current_msg is None:
-                                    current_msg = AssistantMessage()
+                                    current_msg = adapter.assistant_message()
                                     await adapter._mount_message(current_msg)
                                     assistant_message_by_namespace[ns_key] = current_msg
                                     # Anchor scroll once when message is created
@@ -327,9 +508,8 @@ async def execute_task_textual(
                                     if adapter._scroll_to_bottom:
                                         adapter._scroll_to_bottom()
 
-                                # Append just the new text chunk for smoother streaming
-                                # (uses MarkdownStream internally for better performance)
-                                await current_msg.append_content(text)
+                                # Queue the chunk; the batcher appends it on the next frame
+                                await batcher.append(ns_key, current_msg, text)
 
                         elif block_type in ("tool_call_chunk", "tool_call"):
                             chunk_name = block.get("name")
@@ -347,7 +527,7 @@ async def execute_task_textual(
 
                             buffer = tool_call_buffers.setdefault(
                                 buffer_key,
-                                {"name": None, "id": None, "args": None, "args_parts": []},
+                                {"name": None, "id": None, "args": None, "last_chunk": None},
                             )
 
                             if chunk_name:
@@ -355,15 +535,20 @@ async def execute_task_textual(
                             if chunk_id:
                                 buffer["id"] = chunk_id
 
+                            # String args stream as JSON fragments: scan each one once
+                            # instead of re-parsing the joined prefix on every chunk
                             if isinstance(chunk_args, dict):
                                 buffer["args"] = chunk_args
-                                buffer["args_parts"] = []
+                                buffer.pop("parser", None)
                             elif isinstance(chunk_args, str):
-                                if chunk_args:
-                                    parts: list[str] = buffer.setdefault("args_parts", [])
-                                    if not parts or chunk_args != parts[-1]:
-                                        parts.append(chunk_args)
-                                    buffer["args"] = "".join(parts)
+                                if chunk_args and chunk_args != buffer["last_chunk"]:
+                                    buffer["last_chunk"] = chunk_args
+                                    parser = buffer.setdefault("parser", StreamingJSONParser())
+                                    try:
+                                        if parser.feed(chunk_args):
+                                            buffer["args"] = parser.value
+                                    except json.JSONDecodeError:
+                                        pass
                             elif chunk_args is not None:
                                 buffer["args"] = chunk_args
 
@@ -373,26 +558,27 @@ async def execute_task_textual(
                                 continue
 
                             parsed_args = buffer.get("args")
-                            if isinstance(parsed_args, str):
-                                if not parsed_args:
-                                    continue
-                                try:
-                                    parsed_args = json.loads(parsed_args)
-                                except json.JSONDecodeError:
-                                    continue
-                            elif parsed_args is None:
+                            if parsed_args is None:
+                                # Name the target (e.g. file_path) while the rest streams in
+                                parser = buffer.get("parser")
+                                if parser and len(parser.partial) != buffer.get("shown_fields"):
+                                    buffer["shown_fields"] = len(parser.partial)
+                                    display_str = format_tool_display(buffer_name, parser.partial)
+                                    batcher.set_status(f"Preparing {display_str}...")
                                 continue
 
                             if not isinstance(parsed_args, dict):
                                 parsed_args = {"value": parsed_args}
 
                             # Flush pending text before tool call
-                            pending_text = pending_text_by_namespace.get(ns_key, "")
-                            if pending_text:
+                            if pending_text_by_namespace.get(ns_key):
                                 await _flush_assistant_text_ns(
-                                    adapter, pending_text, ns_key, assistant_message_by_namespace
+                                    adapter,
+                                    batcher,
+                                    pending_text_by_namespace.pop(ns_key),
+                                    ns_key,
+                                    assistant_message_by_namespace,
                                 )
-                                pending_text_by_namespace[ns_key] = ""
                                 assistant_message_by_namespace.pop(ns_key, None)
 
                             if buffer_id is not None and buffer_id not in displayed_tool_ids:
@@ -400,31 +586,39 @@ async def execute_task_textual(
                                 file_op_tracker.start_operation(buffer_name, parsed_args, buffer_id)
 
                                 # Mount tool call message
-                                tool_msg = ToolCallMessage(buffer_name, parsed_args)
+                                tool_msg = adapter.tool_call_message(
+                                    buffer_name, parsed_args, buffer_id
+                                )
                                 await adapter._mount_message(tool_msg)
                                 adapter._current_tool_messages[buffer_id] = tool_msg
+                                timer.tool_started(buffer_id, buffer_name)
 
                             tool_call_buffers.pop(buffer_key, None)
                             display_str = format_tool_display(buffer_name, parsed_args)
-                            adapter._update_status(f"Executing {display_str}...")
+                            batcher.set_status(f"Executing {display_str}...")
 
                     if getattr(message, "chunk_position", None) == "last":
-                        pending_text = pending_text_by_namespace.get(ns_key, "")
-                        if pending_text:
+                        timer.end_response()
+                        if pending_text_by_namespace.get(ns_key):
                             await _flush_assistant_text_ns(
-                                adapter, pending_text, ns_key, assistant_message_by_namespace
+                                adapter,
+                                batcher,
+                                pending_text_by_namespace.pop(ns_key),
+                                ns_key,
+                                assistant_message_by_namespace,
                             )
-                            pending_text_by_namespace[ns_key] = ""
                             assistant_message_by_namespace.pop(ns_key, None)
 
             # Flush any remaining text from all namespaces
-            for ns_key, pending_text in list(pending_text_by_namespace.items()):
-                if pending_text:
+            for ns_key, pending_parts in list(pending_text_by_namespace.items()):
+                if pending_parts:
                     await _flush_assistant_text_ns(
-                        adapter, pending_text, ns_key, assistant_message_by_namespace
+                        adapter, batcher, pending_parts, ns_key, assistant_message_by_namespace
                     )
             pending_text_by_namespace.clear()
             assistant_message_by_namespace.clear()
+            # Render queued statuses now so they can't overwrite the approval prompt
+            await batcher.flush()
 
             # Handle HITL after stream completes
             if interrupt_occurred:
@@ -449,7 +643,9 @@ async def execute_task_textual(
 
                         for action_request in hitl_request["action_requests"]:
                             future = await adapter._request_approval(action_request, assistant_id)
+                            wait_start = time.perf_counter()
                             decision = await future
+                            timer.approval_waited(time.perf_counter() - wait_start)
 
                             # Check for auto-approve-all
                             if (
@@ -512,7 +708,9 @@ async def execute_task_textual(
             if interrupt_occurred and hitl_response:
                 if suppress_resumed_output:
                     await adapter._mount_message(
-                        SystemMessage("Command rejected. Tell the agent what you'd like instead.")
+                        adapter.system_message(
+                            "Command rejected. Tell the agent what you'd like instead."
+                        )
                     )
                     return
 
@@ -521,6 +719,8 @@ async def execute_task_textual(
                 break
 
     except asyncio.CancelledError:
+        interrupted = True
+        await batcher.aclose()
         adapter._update_status("Interrupted")
 
         # Mark any pending tools as rejected
@@ -528,7 +728,7 @@ async def execute_task_textual(
             tool_msg.set_rejected()
         adapter._current_tool_messages.clear()
 
-        await adapter._mount_message(SystemMessage("Interrupted by user"))
+        await adapter._mount_message(adapter.system_message("Interrupted by user"))
 
         # Append cancellation message to agent state so LLM knows what happened
         # This preserves context rather than rolling back
@@ -542,6 +742,8 @@ async def execute_task_textual(
         return
 
     except KeyboardInterrupt:
+        interrupted = True
+        await batcher.aclose()
         adapter._update_status("Interrupted")
 
         # Mark any pending tools as rejected
@@ -549,7 +751,7 @@ async def execute_task_textual(
             tool_msg.set_rejected()
         adapter._current_tool_messages.clear()
 
-        await adapter._mount_message(SystemMessage("Interrupted by user"))
+        await adapter._mount_message(adapter.system_message("Interrupted by user"))
 
         # Append cancellation message to agent state
         try:
@@ -561,6 +763,11 @@ async def execute_task_textual(
             pass  # State update is best-effort
         return
 
+    finally:
+        await batcher.aclose()
+        if adapter._perf_log:
+            adapter._perf_log.record(timer.finish(interrupted=interrupted))
+
     adapter._update_status("Ready")
 
     # Update token tracker
@@ -570,22 +777,26 @@ async def execute_task_textual(
 
 async def _flush_assistant_text_ns(
     adapter: TextualUIAdapter,
-    text: str,
+    batcher: RenderBatcher,
+    text_parts: list[str],
     ns_key: tuple,
     assistant_message_by_namespace: dict[tuple, Any],
 ) -> None:
     """Flush accumulated assistant text for a specific namespace.
 
-    Finalizes the streaming by stopping the MarkdownStream.
-    If no message exists yet, creates one with the full content.
+    Renders any text still queued in the batcher, then finalizes the streaming
+    by stopping the MarkdownStream. If no message exists yet, creates one with
+    the full content.
     """
+    await batcher.flush()
+    text = "".join(text_parts)
     if not text.strip():
         return
 
     current_msg = assistant_message_by_namespace.get(ns_key)
     if current_msg is None:
         # No message was created during streaming - create one with full content
-        current_msg = AssistantMessage(text)
+        current_msg = adapter.assistant_message(text)
         await adapter._mount_message(current_msg)
         await current_msg.write_initial_content()
         assistant_message_by_namespace[ns_key] = current_msg
@@ -1,15 +1,23 @@
-"""Custom tools for the CLI agent."""
+"""Custom tools for the CLI agent.
 
-from typing import Any, Literal
+HTTP, HTML and search clients are imported on first use so that importing the
+tool functions (e.g. to build the tool list) stays cheap.
+"""
 
-import requests
-from markdownify import markdownify
-from tavily import TavilyClient
+import functools
+from typing import Any, Literal
 
 from stranger_code.config import settings
 
-# Initialize Tavily client if API key is available
-tavily_client = TavilyClient(api_key=settings.tavily_api_key) if settings.has_tavily else None
+
+@functools.cache
+def _tavily_client() -> Any:  # noqa: ANN401
+    """Tavily client if an API key is available, created on first search."""
+    if not settings.has_tavily:
+        return None
+    from tavily import TavilyClient
+
+    return TavilyClient(api_key=settings.tavily_api_key)
 
 
 def http_request(
@@ -33,6 +41,8 @@ def http_request(
     Returns:
         Dictionary with response data including status, headers, and content
     """
+    import requests
+
     try:
         kwargs = {"url": url, "method": method.upper(), "timeout": timeout}
 
@@ -120,6 +130,7 @@ def web_search(
     4. Cite sources by mentioning the page titles or URLs
     5. NEVER show the raw JSON to the user - always provide a formatted response
     """
+    tavily_client = _tavily_client()
     if tavily_client is None:
         return {
             "error": "Tavily API key not configured. Please set TAVILY_API_KEY environment variable.",
@@ -162,6 +173,9 @@ def fetch_url(url: str, timeout: int = 30) -> dict[str, Any]:
     3. Synthesize this into a clear, natural language response
     4. NEVER show the raw markdown to the user unless specifically requested
     """
+    import requests
+    from markdownify import markdownify
+
     try:
         response = requests.get(
             url,
@@ -175,6 +175,11 @@ def show_help() -> None:
     console.print(
         "  stranger-code reset --agent AGENT --target SOURCE Copy another agent's powers"
     )
+    console.print("  stranger-code exec PROMPT [--approve POLICY]   Radio a mission (JSONL out)")
+    console.print("  stranger-code batch TASKS --concurrency N      Send the whole party")
+    console.print("  stranger-code serve [--port N | --socket PATH] Open a portal for editors")
+    console.print("  stranger-code daemon status|stop               Check on the warm daemon")
+    console.print("  stranger-code sandbox-pool status|fill|drain   Tend the warm portals")
     console.print("  stranger-code help                             Hawkins Lab manual")
     console.print()
 
@@ -188,9 +193,16 @@ def show_help() -> None:
         "  --sandbox TYPE                Upside Down sandbox (modal, runloop, daytona)"
     )
     console.print("  --sandbox-id ID               Reuse existing portal (skips creation)")
+    console.print("  --sandbox-setup PATH          Prepare the portal (cached per step)")
+    console.print("  --sandbox-pool N              Lease a pre-warmed portal, keep N open")
+    console.print("  --sandbox-sync                Mirror this directory into the portal and back")
     console.print(
         "  -r, --resume [ID]             Resume session: -r for last, -r <ID> for specific"
     )
+    console.print(
+        "  --durability MODE             Checkpoint saves (exit, async-batched, sync)"
+    )
+    console.print("  --daemon                      Keep the agent warm in a background daemon")
     console.print()
 
     console.print("[bold]Mission Examples:[/bold]", style=COLORS["primary"])
@@ -221,6 +233,10 @@ def show_help() -> None:
         "  stranger-code --sandbox runloop         # Execute in Upside Down sandbox",
         style=COLORS["dim"],
     )
+    console.print(
+        '  stranger-code exec "fix the test" --approve readonly  # Headless run for CI',
+        style=COLORS["dim"],
+    )
     console.print()
 
     console.print("[bold]Session Archives:[/bold]", style=COLORS["primary"])
@@ -230,6 +246,21 @@ def show_help() -> None:
     console.print(
         "  stranger-code threads delete <ID>       # Close a case", style=COLORS["dim"]
     )
+    console.print(
+        "  stranger-code threads gc --keep-last 20 --older-than 30d  # Bury cold cases",
+        style=COLORS["dim"],
+    )
+    console.print(
+        "  stranger-code threads fork <ID>         # Open an alternate timeline",
+        style=COLORS["dim"],
+    )
+    console.print(
+        '  stranger-code threads search "demogorgon"  # Search the case files',
+        style=COLORS["dim"],
+    )
+    console.print(
+        "  stranger-code threads stats             # Weigh the case files", style=COLORS["dim"]
+    )
     console.print()
 
     console.print("[bold]Communication Protocols:[/bold]", style=COLORS["primary"])
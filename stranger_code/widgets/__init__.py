@@ -1,18 +1,25 @@
-"""Textual widgets for deepagents-cli."""
+"""Textual widgets for deepagents-cli.
+
+Widgets are imported from their submodules on first access, so importing one
+widget module (e.g. the splash screen) does not load all of them.
+"""
 
 from __future__ import annotations
 
-from stranger_code.widgets.chat_input import ChatInput
-from stranger_code.widgets.messages import (
-    AssistantMessage,
-    DiffMessage,
-    ErrorMessage,
-    SystemMessage,
-    ToolCallMessage,
-    UserMessage,
-)
-from stranger_code.widgets.status import StatusBar
-from stranger_code.widgets.welcome import WelcomeBanner
+import importlib
+from typing import Any
+
+_WIDGET_MODULES = {
+    "AssistantMessage": "messages",
+    "ChatInput": "chat_input",
+    "DiffMessage": "messages",
+    "ErrorMessage": "messages",
+    "StatusBar": "status",
+    "SystemMessage": "messages",
+    "ToolCallMessage": "messages",
+    "UserMessage": "messages",
+    "WelcomeBanner": "welcome",
+}
 
 __all__ = [
     "AssistantMessage",
@@ -25,3 +32,11 @@ __all__ = [
     "UserMessage",
     "WelcomeBanner",
 ]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    if name in _WIDGET_MODULES:
+        module = importlib.import_module(f"{__name__}.{_WIDGET_MODULES[name]}")
+        return getattr(module, name)
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
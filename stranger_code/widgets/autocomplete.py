@@ -84,7 +84,10 @@ SLASH_COMMANDS: list[tuple[str, str]] = [
     ("/quit", "Exit app"),
     ("/exit", "Exit app"),
     ("/tokens", "Token usage"),
+    ("/perf", "Latency breakdown of recent turns"),
     ("/threads", "Show session info"),
+    ("/fork", "Branch this session into a new thread"),
+    ("/stats", "Storage used by this session"),
     ("/christmas", "Toggle Joyce's Christmas lights"),
 ]
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from rich.text import Text
 from textual.containers import Vertical
 from textual.css.query import NoMatches
 from textual.widgets import Markdown, Static
@@ -240,6 +241,8 @@ class ToolCallMessage(Vertical):
     # Max lines/chars to show in preview mode
     _PREVIEW_LINES = 3
     _PREVIEW_CHARS = 200
+    # Live output kept while a command runs (only its last lines are shown)
+    _LIVE_CHARS = 4000
 
     def __init__(
         self,
@@ -259,6 +262,7 @@ class ToolCallMessage(Vertical):
         self._args = args or {}
         self._status = "pending"
         self._output: str = ""
+        self._live_output: str = ""
         self._expanded: bool = False
 
     def compose(self) -> ComposeResult:
@@ -293,6 +297,24 @@ class ToolCallMessage(Vertical):
         except NoMatches:
             pass
 
+    def append_output(self, text: str) -> None:
+        """Show the latest output of a tool call that is still running.
+
+        Args:
+            text: New output; the final result replaces it when the tool finishes
+        """
+        if self._status != "pending" or not text:
+            return
+        self._live_output = (self._live_output + text)[-self._LIVE_CHARS :]
+        lines = self._live_output.rstrip("\n").split("\n")[-self._PREVIEW_LINES :]
+        try:
+            preview = self.query_one("#output-preview", Static)
+            # Plain Text: command output is not markup
+            preview.update(Text("\n".join(line[: self._PREVIEW_CHARS] for line in lines)))
+            preview.display = True
+        except NoMatches:
+            pass
+
     def set_success(self, result: str = "") -> None:
         """Mark the tool call as successful.
 
@@ -96,6 +96,20 @@ class StatusBar(Horizontal):
         padding: 0 1;
         color: #00ff41;
     }
+
+    /* Agent start-up progress - the lab warming up */
+    StatusBar .status-readiness {
+        width: auto;
+        padding: 0 1;
+        color: #ff6b35;
+    }
+
+    /* Last turn latency - faded VHS timecode */
+    StatusBar .status-perf {
+        width: auto;
+        padding: 0 1;
+        color: #4a4a4a;
+    }
     """
 
     mode: reactive[str] = reactive("normal", init=False)
@@ -103,6 +117,8 @@ class StatusBar(Horizontal):
     auto_approve: reactive[bool] = reactive(default=False, init=False)
     cwd: reactive[str] = reactive("", init=False)
     tokens: reactive[int] = reactive(0, init=False)
+    perf: reactive[str] = reactive("", init=False)
+    readiness: reactive[str] = reactive("", init=False)
 
     def __init__(self, cwd: str | Path | None = None, **kwargs: Any) -> None:
         """Initialize the status bar.
@@ -124,6 +140,8 @@ class StatusBar(Horizontal):
             id="auto-approve-indicator",
         )
         yield Static("", classes="status-message", id="status-message")
+        yield Static("", classes="status-readiness", id="readiness-display")
+        yield Static("", classes="status-perf", id="perf-display")
         yield Static("", classes="status-tokens", id="tokens-display")
         # CWD shown in welcome banner, not pinned in status bar
 
@@ -250,3 +268,36 @@ class StatusBar(Horizontal):
             count: Current context token count
         """
         self.tokens = count
+
+    def watch_perf(self, new_value: str) -> None:
+        """Update the latency summary display."""
+        try:
+            display = self.query_one("#perf-display", Static)
+        except NoMatches:
+            return
+        display.update(new_value)
+
+    def set_perf(self, summary: str) -> None:
+        """Set the latency summary of the last turn.
+
+        Args:
+            summary: Compact summary (e.g. "⏱ TTFT 820ms · 64 tok/s")
+        """
+        self.perf = summary
+
+    def watch_readiness(self, new_value: str) -> None:
+        """Update the start-up progress display."""
+        try:
+            display = self.query_one("#readiness-display", Static)
+        except NoMatches:
+            return
+        display.update(new_value)
+
+    def set_readiness(self, progress: str) -> None:
+        """Set the agent start-up progress.
+
+        Args:
+            progress: Step summary (e.g. "model ✓ · sandbox 12s… · agent ·"),
+                empty once the agent is ready
+        """
+        self.readiness = progress
@@ -0,0 +1,91 @@
+"""Shared fixtures: a local stand-in for a remote sandbox."""
+
+import asyncio
+import os
+import signal
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+from deepagents.backends.protocol import (
+    ExecuteResponse,
+    FileDownloadResponse,
+    FileUploadResponse,
+)
+from deepagents.backends.sandbox import BaseSandbox
+
+from stranger_code.integrations.async_sandbox import AsyncSandboxMixin
+from stranger_code.integrations.output_capture import OutputCapture
+
+_CHUNK = 64 * 1024
+
+
+class LocalSandbox(AsyncSandboxMixin, BaseSandbox):
+    """Runs commands with local bash and caps their output like the remote backends.
+
+    Uploads and downloads are plain file writes and reads. `round_trips` counts
+    commands and `first_output_at` records when output first arrived.
+    """
+
+    def __init__(self) -> None:
+        self._timeout = 60
+        self.round_trips = 0
+        self.first_output_at: float | None = None
+
+    @property
+    def id(self) -> str:
+        return "local"
+
+    def execute(self, command: str) -> ExecuteResponse:
+        self.round_trips += 1
+        capture = OutputCapture()
+        with subprocess.Popen(  # noqa: S603
+            ["bash", "-c", command],  # noqa: S607
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        ) as process:
+            while chunk := process.stdout.read(_CHUNK):
+                capture.write(chunk)
+        return capture.response(process.returncode)
+
+    async def _arun(self, command: str, capture: OutputCapture) -> int | None:
+        self.round_trips += 1
+        process = await asyncio.create_subprocess_exec(
+            "bash",
+            "-c",
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            start_new_session=True,
+        )
+        try:
+            while chunk := await process.stdout.read(_CHUNK):
+                self.first_output_at = self.first_output_at or time.perf_counter()
+                capture.write(chunk)
+            return await process.wait()
+        except asyncio.CancelledError:
+            # The whole session, so children holding the pipe die too
+            os.killpg(process.pid, signal.SIGKILL)
+            await process.wait()
+            raise
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        for path, content in files:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_bytes(content)
+        return [FileUploadResponse(path=path, error=None) for path, _ in files]
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        responses = []
+        for path in paths:
+            try:
+                responses.append(FileDownloadResponse(path, Path(path).read_bytes(), None))
+            except FileNotFoundError:
+                responses.append(FileDownloadResponse(path, None, "file_not_found"))
+        return responses
+
+
+@pytest.fixture
+def local_sandbox() -> LocalSandbox:
+    return LocalSandbox()
@@ -0,0 +1,92 @@
+"""Tests for async execution shared by the sandbox backends."""
+
+import asyncio
+import time
+
+import pytest
+from deepagents.backends.sandbox import BaseSandbox
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt.tool_node import ToolCallRequest
+
+from stranger_code.integrations import async_sandbox
+from stranger_code.integrations.async_sandbox import AsyncExecuteMiddleware, AsyncSandboxMixin
+
+
+def _request(call_id: str, name: str, args: dict) -> ToolCallRequest:
+    tool_call = {"name": name, "args": args, "id": call_id, "type": "tool_call"}
+    return ToolCallRequest(tool_call=tool_call, tool=None, state={}, runtime=None)
+
+
+async def _not_called(request: ToolCallRequest) -> ToolMessage:
+    msg = f"execute should not reach the blocking tool: {request.tool_call}"
+    raise AssertionError(msg)
+
+
+def test_backend_without_arun_cannot_be_instantiated() -> None:
+    class IncompleteBackend(AsyncSandboxMixin, BaseSandbox):
+        @property
+        def id(self) -> str:
+            return "incomplete"
+
+        def execute(self, command: str) -> None:
+            raise NotImplementedError(command)
+
+        def upload_files(self, files: list) -> list:
+            raise NotImplementedError(files)
+
+        def download_files(self, paths: list) -> list:
+            raise NotImplementedError(paths)
+
+    with pytest.raises(TypeError, match="_arun"):
+        IncompleteBackend()
+
+
+@pytest.mark.asyncio
+async def test_middleware_runs_execute_calls_concurrently(
+    local_sandbox: BaseSandbox, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    events: list[dict] = []
+    monkeypatch.setattr(async_sandbox, "get_stream_writer", lambda: events.append)
+    middleware = AsyncExecuteMiddleware(local_sandbox)
+    requests = [
+        _request(f"call-{index}", "execute", {"command": f"echo start {index}; sleep 1"})
+        for index in range(2)
+    ]
+    start = time.perf_counter()
+
+    results = await asyncio.gather(
+        *(middleware.awrap_tool_call(request, _not_called) for request in requests)
+    )
+
+    assert time.perf_counter() - start < 1.5
+    assert [result.tool_call_id for result in results] == ["call-0", "call-1"]
+    assert results[0].content == "start 0\n\n[Command succeeded with exit code 0]"
+    # Output of the running commands was relayed as it arrived
+    assert {event["execute_output"]["tool_call_id"] for event in events} == {"call-0", "call-1"}
+
+
+@pytest.mark.asyncio
+async def test_middleware_passes_other_tools_through(local_sandbox: BaseSandbox) -> None:
+    async def handler(request: ToolCallRequest) -> ToolMessage:
+        return ToolMessage("read", tool_call_id=request.tool_call["id"])
+
+    middleware = AsyncExecuteMiddleware(local_sandbox)
+    result = await middleware.awrap_tool_call(_request("call-1", "read_file", {}), handler)
+
+    assert result.content == "read"
+    assert local_sandbox.round_trips == 0
+
+
+@pytest.mark.asyncio
+async def test_commands_beyond_max_concurrency_wait_for_a_slot(
+    local_sandbox: BaseSandbox,
+) -> None:
+    local_sandbox.max_concurrency = 2
+    start = time.perf_counter()
+
+    results = await asyncio.gather(*(local_sandbox.aexecute("sleep 0.5") for _ in range(4)))
+
+    elapsed = time.perf_counter() - start
+    assert [result.exit_code for result in results] == [0] * 4
+    # Two waves of two commands
+    assert 1.0 <= elapsed < 1.5
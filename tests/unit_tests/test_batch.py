@@ -0,0 +1,117 @@
+"""Tests for concurrent batch runs."""
+
+import asyncio
+import io
+import json
+from typing import Any
+
+import pytest
+
+from stranger_code import batch
+from stranger_code.batch import BatchTask, run_batch
+from stranger_code.headless import JSONLWriter
+
+
+@pytest.mark.asyncio
+async def test_tasks_run_with_the_store_durability(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[dict[str, Any]] = []
+
+    async def fake_run_exec(prompt: str, **kwargs: Any) -> str:
+        calls.append({"prompt": prompt, **kwargs})
+        return "completed"
+
+    monkeypatch.setattr(batch, "run_exec", fake_run_exec)
+    report = await run_batch(
+        [BatchTask(id="1", prompt="one"), BatchTask(id="2", prompt="two")],
+        agent=object(),
+        assistant_id="agent",
+        durability="async-batched",
+    )
+
+    assert [result.status for result in report.results] == ["completed", "completed"]
+    assert [call["durability"] for call in calls] == ["async-batched", "async-batched"]
+
+
+@pytest.mark.asyncio
+async def test_failed_task_is_retried_on_a_fresh_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    threads: list[str] = []
+
+    async def flaky_run_exec(_prompt: str, *, thread_id: str, **_kwargs: Any) -> str:
+        threads.append(thread_id)
+        if len(threads) == 1:
+            msg = "rate limited"
+            raise RuntimeError(msg)
+        return "completed"
+
+    monkeypatch.setattr(batch, "run_exec", flaky_run_exec)
+    monkeypatch.setattr(batch, "_RETRY_BACKOFF", 0.0)
+    report = await run_batch([BatchTask(id="1", prompt="one")], agent=object(), assistant_id="a")
+
+    [result] = report.results
+    assert (result.status, result.attempts, result.error) == ("completed", 2, None)
+    assert len(set(threads)) == 2
+    assert result.thread_id == threads[-1]
+
+
+@pytest.mark.asyncio
+async def test_task_timeout_is_reported_even_when_the_run_absorbs_cancellation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def slow_run_exec(_prompt: str, **_kwargs: Any) -> str:
+        # Like execute_task_textual: swallow the cancellation, report an interrupt
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            return "interrupted"
+        return "completed"
+
+    monkeypatch.setattr(batch, "run_exec", slow_run_exec)
+    report = await run_batch(
+        [BatchTask(id="slow", prompt="one", timeout=0.05)],
+        agent=object(),
+        assistant_id="a",
+        retries=0,
+    )
+
+    [result] = report.results
+    assert result.status == "timeout"
+    assert result.error == "Timed out after 0.05s"
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped(monkeypatch: pytest.MonkeyPatch) -> None:
+    running = peak = 0
+
+    async def counting_run_exec(_prompt: str, **_kwargs: Any) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "completed"
+
+    monkeypatch.setattr(batch, "run_exec", counting_run_exec)
+    tasks = [BatchTask(id=str(index), prompt="p") for index in range(12)]
+    report = await run_batch(tasks, agent=object(), assistant_id="a", concurrency=3)
+
+    assert report.succeeded == 12
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_results_are_written_as_jsonl(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def fake_run_exec(prompt: str, *, writer: JSONLWriter, **_kwargs: Any) -> str:
+        writer.emit("text_delta", text=f"done {prompt}")
+        writer.emit("usage", input_tokens=10, output_tokens=3)
+        return "completed"
+
+    monkeypatch.setattr(batch, "run_exec", fake_run_exec)
+    results = io.StringIO()
+    tasks = [BatchTask(id="a", prompt="one"), BatchTask(id="b", prompt="two")]
+    await run_batch(tasks, agent=object(), assistant_id="a", results_file=results)
+
+    rows = {row["id"]: row for row in map(json.loads, results.getvalue().splitlines())}
+    assert set(rows) == {"a", "b"}
+    assert rows["a"]["output"] == "done one"
+    assert (rows["b"]["status"], rows["b"]["attempts"]) == ("completed", 1)
+    assert (rows["b"]["input_tokens"], rows["b"]["output_tokens"]) == (10, 3)
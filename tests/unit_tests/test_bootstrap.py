@@ -0,0 +1,157 @@
+"""Tests for the background agent bootstrap, with fake model, store, sandbox and agent."""
+
+import asyncio
+import contextlib
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import pytest
+
+from stranger_code import agent as agent_module
+from stranger_code import config, sessions
+from stranger_code.bootstrap import STEP_FAILED, STEP_READY, AgentBootstrap, BootstrapError
+from stranger_code.integrations import sandbox_factory
+
+STEP_SECONDS = 0.3
+
+
+class FakeAgent:
+    """Records the user messages it is asked to stream and produces no output."""
+
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    async def astream(self, stream_input: dict, **_kwargs: Any) -> AsyncIterator[tuple]:
+        self.prompts.append(stream_input["messages"][0]["content"])
+        return
+        yield
+
+
+class Fakes:
+    """Patches the bootstrap's factories; each one takes STEP_SECONDS."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.agent = FakeAgent()
+        self.agent_kwargs: dict[str, Any] = {}
+        self.sandbox_error: Exception | None = None
+        self.sandbox_closed = False
+        # Set to hold create_cli_agent until the test releases it
+        self.agent_gate: threading.Event | None = None
+        monkeypatch.setattr(config, "create_model", self.create_model)
+        monkeypatch.setattr(sessions, "get_checkpointer", self.get_checkpointer)
+        monkeypatch.setattr(sandbox_factory, "create_sandbox", self.create_sandbox)
+        monkeypatch.setattr(agent_module, "create_cli_agent", self.create_cli_agent)
+
+    def create_model(self, _model_name: str | None) -> str:
+        time.sleep(STEP_SECONDS)
+        return "model"
+
+    @contextlib.asynccontextmanager
+    async def get_checkpointer(self, _store: object) -> AsyncIterator[str]:
+        await asyncio.sleep(STEP_SECONDS)
+        yield "checkpointer"
+
+    @contextlib.contextmanager
+    def create_sandbox(self, _provider: str, **_kwargs: Any) -> Iterator[str]:
+        time.sleep(STEP_SECONDS)
+        config.console.print("Sandbox ready: sb-1")
+        if self.sandbox_error:
+            raise self.sandbox_error
+        try:
+            yield "sandbox"
+        finally:
+            self.sandbox_closed = True
+
+    def create_cli_agent(self, **kwargs: Any) -> tuple[FakeAgent, None]:
+        if self.agent_gate is not None:
+            self.agent_gate.wait(timeout=5)
+        self.agent_kwargs = kwargs
+        return self.agent, None
+
+
+@pytest.fixture
+def fakes(monkeypatch: pytest.MonkeyPatch) -> Fakes:
+    return Fakes(monkeypatch)
+
+
+@pytest.mark.asyncio
+async def test_steps_run_concurrently_and_the_agent_is_built_last(fakes: Fakes) -> None:
+    bootstrap = AgentBootstrap("agent", sandbox_type="modal")
+    start = time.perf_counter()
+
+    agent, _backend = await bootstrap.run()
+    await bootstrap.aclose()
+
+    assert agent is fakes.agent
+    assert time.perf_counter() - start < 2 * STEP_SECONDS
+    assert (fakes.agent_kwargs["model"], fakes.agent_kwargs["sandbox"]) == ("model", "sandbox")
+    assert fakes.agent_kwargs["checkpointer"] == "checkpointer"
+    assert (
+        max(bootstrap.timings[step] for step in ("model", "sessions", "sandbox"))
+        <= (bootstrap.timings["agent"])
+    )
+    assert fakes.sandbox_closed
+
+
+@pytest.mark.asyncio
+async def test_progress_is_reported_until_ready(fakes: Fakes) -> None:
+    seen: list[tuple[str, bool]] = []
+    bootstrap = AgentBootstrap("agent", sandbox_type="modal")
+
+    await bootstrap.run(lambda b: seen.append((b.describe(), b.ready)))
+    await bootstrap.aclose()
+
+    assert seen[0] == ("model … · sessions · · sandbox · · agent ·", False)
+    assert seen[-1] == ("model ✓ · sessions ✓ · sandbox ✓ · agent ✓", True)
+    assert [ready for _, ready in seen].count(True) == 1
+    # Console output from a step is relayed instead of hitting the terminal
+    assert bootstrap.log == ["Sandbox ready: sb-1"]
+    assert bootstrap.waiting_for == []
+    assert fakes.agent.prompts == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(5)
+async def test_failed_sandbox_is_an_error_not_a_hang(fakes: Fakes) -> None:
+    fakes.sandbox_error = RuntimeError("quota exceeded")
+    bootstrap = AgentBootstrap("agent", sandbox_type="modal")
+
+    with pytest.raises(BootstrapError, match="quota exceeded"):
+        await bootstrap.run()
+    await bootstrap.aclose()
+
+    assert bootstrap.error == "Sandbox creation failed: quota exceeded"
+    assert bootstrap.steps["sandbox"] == STEP_FAILED
+    assert bootstrap.steps["agent"] != STEP_READY
+    assert bootstrap.log == ["Sandbox ready: sb-1"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_first_message_waits_for_the_agent(fakes: Fakes) -> None:
+    from stranger_code.app import DeepAgentsApp
+    from stranger_code.widgets.messages import SystemMessage
+
+    fakes.agent_gate = threading.Event()
+    bootstrap = AgentBootstrap("agent")
+    app = DeepAgentsApp(assistant_id="agent", thread_id="t1", no_splash=True, bootstrap=bootstrap)
+
+    async with app.run_test() as pilot:
+        await app._handle_user_message("hello")
+        await pilot.pause()
+
+        assert fakes.agent.prompts == []
+        notes = [str(widget.render()) for widget in app.query(SystemMessage)]
+        assert any("Queued until the agent is ready" in note for note in notes)
+
+        fakes.agent_gate.set()
+        for _ in range(100):
+            if fakes.agent.prompts:
+                break
+            await asyncio.sleep(0.05)
+
+        assert fakes.agent.prompts == ["hello"]
+        assert bootstrap.ready
+    await bootstrap.aclose()
@@ -0,0 +1,113 @@
+"""Tests for compressed checkpoint serialization."""
+
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from stranger_code import checkpoint_serde
+from stranger_code.checkpoint_serde import CompressedSerializer, train_dictionary
+from stranger_code.sessions import SessionStore
+
+# Large and repetitive, like a checkpoint carrying tool output
+PAYLOAD = {"messages": [f"tool output line {i}: ok" for i in range(200)], "step": 3}
+
+
+def _samples(count: int) -> list[bytes]:
+    serde = JsonPlusSerializer()
+    return [
+        serde.dumps_typed({"role": "tool", "content": f"ran test_{i}.py: {i % 7} passed " * 20})[1]
+        for i in range(count)
+    ]
+
+
+def test_plain_msgpack_rows_load_unchanged() -> None:
+    stored = JsonPlusSerializer().dumps_typed(PAYLOAD)
+
+    assert stored[0] == "msgpack"
+    assert CompressedSerializer().loads_typed(stored) == PAYLOAD
+
+
+def test_zstd_round_trip() -> None:
+    serde = CompressedSerializer()
+
+    type_, data = serde.dumps_typed(PAYLOAD)
+
+    assert type_ == "msgpack+zstd"
+    assert len(data) < len(JsonPlusSerializer().dumps_typed(PAYLOAD)[1]) / 4
+    assert serde.loads_typed((type_, data)) == PAYLOAD
+
+
+def test_trained_dictionary_round_trip() -> None:
+    dictionary = train_dictionary(_samples(400))
+    assert dictionary is not None
+    serde = CompressedSerializer(dictionaries={7: dictionary}, active_dictionary=7)
+
+    stored = serde.dumps_typed(PAYLOAD)
+
+    assert stored[0] == "msgpack+zstd:7"
+    assert serde.loads_typed(stored) == PAYLOAD
+    # Readers only need the dictionary, not to have it active
+    assert CompressedSerializer(dictionaries={7: dictionary}).loads_typed(stored) == PAYLOAD
+
+
+def test_unknown_dictionary_raises() -> None:
+    dictionary = train_dictionary(_samples(400))
+    stored = CompressedSerializer(dictionaries={7: dictionary}, active_dictionary=7).dumps_typed(
+        PAYLOAD
+    )
+
+    with pytest.raises(ValueError, match="unknown dictionary 7"):
+        CompressedSerializer().loads_typed(stored)
+
+
+def test_zlib_fallback_without_zstandard(monkeypatch: pytest.MonkeyPatch) -> None:
+    zstd_stored = CompressedSerializer().dumps_typed(PAYLOAD)
+    monkeypatch.setattr(checkpoint_serde, "zstandard", None)
+    serde = CompressedSerializer()
+
+    stored = serde.dumps_typed(PAYLOAD)
+
+    assert stored[0] == "msgpack+zlib"
+    assert serde.loads_typed(stored) == PAYLOAD
+    with pytest.raises(ImportError, match="zstandard"):
+        serde.loads_typed(zstd_stored)
+
+
+def test_small_payloads_are_stored_uncompressed() -> None:
+    stored = CompressedSerializer().dumps_typed({"step": 1})
+
+    assert stored == JsonPlusSerializer().dumps_typed({"step": 1})
+    assert len(stored[1]) < checkpoint_serde._MIN_COMPRESS_BYTES
+
+
+@pytest.mark.asyncio
+async def test_compress_existing_leaves_rows_readable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config = {"configurable": {"thread_id": "t1", "checkpoint_ns": ""}}
+    messages = [
+        HumanMessage(content="run the tests " * 20, id="h"),
+        AIMessage(content="ok", id="a"),
+    ]
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": messages, "notes": ["note " * 100]}
+    metadata = {"agent_name": "agent", "source": "loop", "step": 1}
+    # Rows written by an install without zstandard
+    with monkeypatch.context() as patch:
+        patch.setattr(checkpoint_serde, "zstandard", None)
+        async with SessionStore(tmp_path / "sessions.db") as store:
+            await store.checkpointer.aput(config, checkpoint, metadata, {})
+
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        rewritten = await store.compress_existing()
+        async with store.conn.execute("SELECT DISTINCT type FROM checkpoints") as cursor:
+            types = {row[0] for row in await cursor.fetchall()}
+        loaded = await store.checkpointer.aget_tuple(config)
+
+    assert rewritten > 0
+    assert types == {"msgpack+zstd"}
+    assert loaded.checkpoint["channel_values"]["messages"] == messages
+    assert loaded.checkpoint["channel_values"]["notes"] == ["note " * 100]
@@ -0,0 +1,120 @@
+"""Tests for the warm daemon: staleness checks, and a real daemon process with a fake graph."""
+
+import os
+import subprocess
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from stranger_code import daemon
+
+# Daemon entry point with the model and agent graph replaced by an echo graph
+FAKE_DAEMON = """
+import asyncio
+
+from langchain_core.messages import AIMessageChunk
+
+from stranger_code import agent, config, daemon
+
+
+class EchoGraph:
+    async def astream(self, stream_input, **_kwargs):
+        text = stream_input["messages"][0]["content"]
+        yield (), "messages", (AIMessageChunk(f"echo: {text}"), {})
+        yield (), "updates", {"agent": {}}
+
+
+def create_model(_model_name):
+    config.settings.model_name = "fake"
+    config.settings.model_provider = "test"
+    return object()
+
+
+config.create_model = create_model
+agent.create_cli_agent = lambda **_kwargs: (EchoGraph(), None)
+asyncio.run(daemon.run_daemon(preload_agent=None, idle_timeout=120))
+"""
+
+
+def test_env_fingerprint_covers_subpackages(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    package = tmp_path / "stranger_code"
+    (package / "integrations").mkdir(parents=True)
+    (package / "daemon.py").write_text("")
+    module = package / "integrations" / "modal.py"
+    module.write_text("")
+    monkeypatch.setattr(daemon, "__file__", str(package / "daemon.py"))
+
+    before = daemon.env_fingerprint()
+    stat = module.stat()
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert daemon.env_fingerprint() != before
+
+
+@pytest.fixture
+def spawned(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[list[subprocess.Popen]]:
+    """Run daemons from FAKE_DAEMON in an isolated HOME and project directory."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.chdir(project)
+    script = tmp_path / "fake_daemon.py"
+    script.write_text(FAKE_DAEMON)
+    processes: list[subprocess.Popen] = []
+
+    def spawn(_durability: str) -> None:
+        log = (tmp_path / "daemon.log").open("a")
+        processes.append(
+            subprocess.Popen(  # noqa: S603
+                [sys.executable, str(script)], stdout=log, stderr=subprocess.STDOUT
+            )
+        )
+        log.close()
+
+    monkeypatch.setattr(daemon, "_spawn", spawn)
+    yield processes
+    for process in processes:
+        process.kill()
+        process.wait()
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(60)
+async def test_daemon_streams_a_turn_and_restarts_when_stale(
+    spawned: list[subprocess.Popen], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    remote = await daemon.attach_daemon("agent")
+    config = {"configurable": {"thread_id": "t1"}}
+    chunks = [
+        chunk
+        async for chunk in remote.astream(
+            {"messages": [{"role": "user", "content": "hi"}]}, config=config
+        )
+    ]
+    assert [(mode, data[0].content) for _ns, mode, data in chunks] == [("messages", "echo: hi")]
+    assert daemon.settings.model_name == "fake"
+
+    # A changed model environment makes the running daemon stale
+    monkeypatch.setenv("OPENAI_MODEL", "another-model")
+    remote = await daemon.attach_daemon("agent")
+
+    first, second = spawned
+    assert first.poll() is not None  # stopped and exited before the replacement started
+    assert second.poll() is None
+    socket_path, _log, _lock = daemon.daemon_paths()
+    status = await daemon._status(socket_path)
+    assert (status["pid"], status["env"]) == (second.pid, daemon.env_fingerprint())
+    chunks = [
+        chunk
+        async for chunk in remote.astream(
+            {"messages": [{"role": "user", "content": "again"}]}, config=config
+        )
+    ]
+    assert chunks[0][2][0].content == "echo: again"
+
+    assert await daemon._stop(socket_path)
+    assert second.wait(timeout=5) == 0
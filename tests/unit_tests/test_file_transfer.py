@@ -0,0 +1,157 @@
+"""Tests for concurrent file transfer in the Modal and Runloop backends, with fake clients."""
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Self
+
+import httpx
+import pytest
+from modal.exception import ServiceError
+from runloop_api_client import NotFoundError
+
+from stranger_code.integrations.file_transfer import MAX_BYTES_IN_FLIGHT
+from stranger_code.integrations.modal import ModalBackend
+from stranger_code.integrations.runloop import RunloopBackend
+
+
+class FakeStore:
+    """Files of the fake sandbox; records the requests and bytes in flight."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.files: dict[str, bytes] = {}
+        self.latency = latency
+        self.flaky: set[str] = set()  # paths whose next request fails transiently
+        self.peak_bytes = 0
+        self.peak_requests = 0
+        self._in_flight_bytes = 0
+        self._in_flight_requests = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def request(self, path: str, size: int = 0) -> Iterator[None]:
+        with self._lock:
+            self._in_flight_bytes += size
+            self._in_flight_requests += 1
+            self.peak_bytes = max(self.peak_bytes, self._in_flight_bytes)
+            self.peak_requests = max(self.peak_requests, self._in_flight_requests)
+            fail = path in self.flaky
+            self.flaky.discard(path)
+        try:
+            time.sleep(self.latency)
+            if fail:
+                msg = "service unavailable"
+                raise ServiceError(msg)
+            yield
+        finally:
+            with self._lock:
+                self._in_flight_bytes -= size
+                self._in_flight_requests -= 1
+
+
+class FakeModalFile:
+    def __init__(self, store: FakeStore, path: str) -> None:
+        self._store, self._path = store, path
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        pass
+
+    def read(self) -> bytes:
+        with self._store.request(self._path):
+            if self._path not in self._store.files:
+                raise FileNotFoundError(self._path)
+            return self._store.files[self._path]
+
+    def write(self, content: bytes) -> None:
+        with self._store.request(self._path, len(content)):
+            self._store.files[self._path] = content
+
+
+class FakeModalSandbox:
+    object_id = "sb-fake"
+
+    def __init__(self, store: FakeStore) -> None:
+        self._store = store
+
+    def open(self, path: str, _mode: str) -> FakeModalFile:
+        return FakeModalFile(self._store, path)
+
+
+class FakeRunloopDevboxes:
+    def __init__(self, store: FakeStore) -> None:
+        self._store = store
+
+    def download_file(self, devbox_id: str, *, path: str) -> httpx.Response:
+        with self._store.request(path):
+            if path not in self._store.files:
+                request = httpx.Request("POST", f"https://fake/devboxes/{devbox_id}/download_file")
+                response = httpx.Response(404, request=request)
+                msg = f"{path} not found"
+                raise NotFoundError(msg, response=response, body=None)
+            return httpx.Response(200, content=self._store.files[path])
+
+    def upload_file(self, _devbox_id: str, *, path: str, file: bytes) -> None:
+        with self._store.request(path, len(file)):
+            self._store.files[path] = file
+
+
+class FakeRunloopClient:
+    def __init__(self, store: FakeStore) -> None:
+        self.devboxes = FakeRunloopDevboxes(store)
+
+
+def make_backend(name: str, store: FakeStore) -> ModalBackend | RunloopBackend:
+    if name == "modal":
+        return ModalBackend(FakeModalSandbox(store))  # type: ignore[arg-type]
+    return RunloopBackend("dbx-fake", client=FakeRunloopClient(store))  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("name", ["modal", "runloop"])
+def test_missing_file_is_reported_per_file(name: str) -> None:
+    store = FakeStore()
+    backend = make_backend(name, store)
+    backend.upload_files([("/workspace/a.py", b"a"), ("/workspace/b.py", b"b")])
+
+    responses = backend.download_files(["/workspace/a.py", "/missing.py", "/workspace/b.py"])
+
+    assert [response.content for response in responses] == [b"a", None, b"b"]
+    assert [response.error for response in responses] == [None, "file_not_found", None]
+
+
+@pytest.mark.parametrize("name", ["modal", "runloop"])
+def test_batch_runs_concurrently(name: str) -> None:
+    store = FakeStore(latency=0.02)
+    backend = make_backend(name, store)
+    files = [(f"/workspace/file{index}.py", b"x") for index in range(16)]
+
+    backend.upload_files(files)
+    backend.download_files([path for path, _ in files])
+
+    assert store.peak_requests > 1
+
+
+def test_transient_errors_are_retried() -> None:
+    store = FakeStore()
+    backend = make_backend("modal", store)
+    files = [(f"/workspace/flaky{index}.py", b"x") for index in range(8)]
+    store.flaky = {path for path, _ in files[::2]}
+
+    responses = backend.upload_files(files)
+
+    assert [response.error for response in responses] == [None] * 8
+    assert all(path in store.files for path, _ in files)
+
+
+def test_uploads_stay_under_the_in_flight_byte_cap() -> None:
+    store = FakeStore(latency=0.01)
+    backend = make_backend("runloop", store)
+    big = [(f"/workspace/big{index}.bin", b"\0" * (24 * 1024 * 1024)) for index in range(6)]
+
+    backend.upload_files([*big, ("/workspace/small.txt", b"s")])
+
+    assert 0 < store.peak_bytes <= MAX_BYTES_IN_FLIGHT
+    assert len(store.files) == len(big) + 1
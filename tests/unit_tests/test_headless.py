@@ -0,0 +1,133 @@
+"""Tests for headless `exec` runs, with a scripted fake agent."""
+
+import asyncio
+import io
+import json
+import subprocess
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessageChunk, ToolMessage
+from langgraph.types import Command, Interrupt
+
+from stranger_code.headless import JSONLWriter, run_exec
+
+
+class FakeAgent:
+    """Streams text, one gated tool call, then the tool result if it was approved."""
+
+    def __init__(self, tool_name: str) -> None:
+        self.tool_name = tool_name
+        self.resumed_with: dict | None = None
+
+    async def astream(self, stream_input: dict | Command, **_kwargs: Any) -> AsyncIterator[tuple]:
+        if isinstance(stream_input, Command):
+            self.resumed_with = stream_input.resume
+            yield (), "messages", (ToolMessage("tool ran", tool_call_id="call-1"), {})
+            yield (), "messages", (AIMessageChunk("Done.", chunk_position="last"), {})
+            return
+        yield (), "messages", (AIMessageChunk("Let me "), {})
+        yield (), "messages", (AIMessageChunk("look."), {})
+        tool_call = {"name": self.tool_name, "args": '{"query": "docs"}', "id": "call-1"}
+        chunk = AIMessageChunk(
+            "", tool_call_chunks=[{**tool_call, "index": 0}], chunk_position="last"
+        )
+        yield (), "messages", (chunk, {})
+        request = {
+            "action_requests": [{"name": self.tool_name, "args": {"query": "docs"}}],
+            "review_configs": [
+                {"action_name": self.tool_name, "allowed_decisions": ["approve", "reject"]}
+            ],
+        }
+        yield (), "updates", {"__interrupt__": [Interrupt(value=request, id="interrupt-1")]}
+
+
+async def _exec(approve: str, tool_name: str = "web_search") -> tuple[str, list[dict], FakeAgent]:
+    stream = io.StringIO()
+    agent = FakeAgent(tool_name)
+    status = await run_exec(
+        "find the docs",
+        agent=agent,
+        assistant_id="agent",
+        thread_id="thread-1",
+        approve=approve,
+        writer=JSONLWriter(stream),
+    )
+    return status, [json.loads(line) for line in stream.getvalue().splitlines()], agent
+
+
+@pytest.mark.asyncio
+async def test_events_follow_the_schema() -> None:
+    status, events, _agent = await _exec("readonly")
+
+    assert status == "completed"
+    assert all(isinstance(event["t"], float) for event in events)
+    # Text is emitted per chunk, without frame batching
+    assert [event["type"] for event in events] == [
+        "text_delta",
+        "text_delta",
+        "tool_call",
+        "approval",
+        "tool_result",
+        "text_delta",
+        "timing",
+    ]
+    assert "".join(e["text"] for e in events if e["type"] == "text_delta") == "Let me look.Done."
+    tool_call, approval, tool_result = events[2:5]
+    assert (tool_call["id"], tool_call["name"]) == ("call-1", "web_search")
+    assert tool_call["args"] == {"query": "docs"}
+    assert (approval["tool"], approval["decision"]) == ("web_search", "approve")
+    assert (tool_result["status"], tool_result["output"]) == ("success", "tool ran")
+    assert events[-1]["interrupted"] is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("approve", "tool_name", "expected"),
+    [
+        ("all", "write_file", "completed"),
+        ("none", "web_search", "rejected"),
+        ("readonly", "web_search", "completed"),
+        ("readonly", "write_file", "rejected"),
+    ],
+)
+async def test_approval_policies(approve: str, tool_name: str, expected: str) -> None:
+    status, events, agent = await _exec(approve, tool_name)
+
+    decision = "approve" if expected == "completed" else "reject"
+    assert status == expected
+    assert agent.resumed_with == (
+        {"interrupt-1": {"decisions": [{"type": decision}]}} if decision == "approve" else None
+    )
+    # `all` approves up front, without an approval event per tool
+    approvals = [event["decision"] for event in events if event["type"] == "approval"]
+    assert approvals == ([] if approve == "all" else [decision])
+    if expected == "rejected":
+        assert [e["status"] for e in events if e["type"] == "tool_result"] == ["rejected"]
+        assert events[-2]["type"] == "system"
+
+
+def test_unknown_policy_is_refused() -> None:
+    with pytest.raises(ValueError, match="Unknown approval policy"):
+        asyncio.run(_exec("some"))
+
+
+def test_exec_does_not_import_textual() -> None:
+    script = (
+        "import asyncio, sys\n"
+        "from test_headless import _exec\n"
+        "status, _events, _agent = asyncio.run(_exec('all'))\n"
+        "print(status, 'textual' in sys.modules)\n"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.split() == ["completed", "False"]
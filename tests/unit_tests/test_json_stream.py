@@ -0,0 +1,92 @@
+"""Tests for incremental parsing of streamed tool-call arguments."""
+
+import json
+
+import pytest
+
+from stranger_code.json_stream import MAX_PARTIAL_FIELD_CHARS, StreamingJSONParser
+
+
+def _feed(parser: StreamingJSONParser, text: str, size: int) -> list[bool]:
+    return [parser.feed(text[pos : pos + size]) for pos in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+def test_escapes_split_across_chunks(size: int) -> None:
+    value = {"content": 'quote " backslash \\ brace } é 😀 \n end', "n": [1, {}]}
+    raw = json.dumps(value)  # ASCII, so \u sequences and \" get split too
+    parser = StreamingJSONParser()
+
+    done = _feed(parser, raw, size)
+
+    assert done[-1]
+    assert not any(done[:-1])
+    assert parser.value == value
+
+
+def test_file_path_is_exposed_before_the_content_arrives() -> None:
+    parser = StreamingJSONParser()
+    parser.feed('{"file_path": "/src/app.py", "content": "')
+    parser.feed("x" * 10_000)
+
+    assert parser.partial == {"file_path": "/src/app.py"}
+    assert not parser.complete
+
+
+def test_long_fields_are_not_decoded_early() -> None:
+    parser = StreamingJSONParser()
+    raw = json.dumps({"content": "x" * (MAX_PARTIAL_FIELD_CHARS + 1), "mode": "w", "n": 1})
+    parser.feed(raw[:-1])
+
+    assert parser.partial == {"mode": "w"}
+
+
+def test_completion_decodes_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    loads = json.loads
+
+    def counting_loads(text: str) -> object:
+        calls.append(len(text))
+        return loads(text)
+
+    parser = StreamingJSONParser()
+    parser.feed('{"file_path": "a.py", "content": "')
+    monkeypatch.setattr(json, "loads", counting_loads)
+    # Longer than a partial field, so only the final decode parses it
+    for _ in range(MAX_PARTIAL_FIELD_CHARS // 6 + 1):
+        parser.feed("line\\n")
+
+    assert calls == []
+    assert parser.feed('"}')
+    assert len(calls) == 1
+    assert parser.value["file_path"] == "a.py"
+
+
+def test_text_after_the_closing_brace_is_ignored() -> None:
+    parser = StreamingJSONParser()
+    assert parser.feed('{"a": 1}  trailing')
+    assert parser.value == {"a": 1}
+    assert parser.size == len('{"a": 1}')
+    assert parser.feed("more")
+
+
+def test_input_over_the_limit_keeps_only_short_fields() -> None:
+    parser = StreamingJSONParser(max_chars=1000)
+
+    _feed(parser, json.dumps({"file_path": "big.txt", "content": "x" * 5000}), 64)
+
+    assert parser.truncated
+    assert parser.value == {"file_path": "big.txt"}
+    assert parser._parts == []
+
+
+def test_malformed_document_fails_and_stops() -> None:
+    parser = StreamingJSONParser()
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed('{"a": 1,}')
+
+    assert parser.failed
+    assert not parser.complete
+    assert not parser.feed('{"a": 1}')
+    with pytest.raises(ValueError, match="not complete"):
+        _ = parser.value
@@ -0,0 +1,82 @@
+"""Tests for bounded output capture, through a local stand-in sandbox."""
+
+import pytest
+from deepagents.backends.sandbox import BaseSandbox
+
+from stranger_code.integrations.async_sandbox import TIMEOUT_EXIT_CODE
+from stranger_code.integrations.output_capture import DEFAULT_MAX_OUTPUT_BYTES, OutputCapture
+
+# 64-byte numbered lines, so the kept head and tail are recognizable
+LINES = 64 * 1024
+RUNAWAY = f"seq -f 'log line %054.0f' 1 {LINES}"
+
+
+@pytest.mark.asyncio
+async def test_runaway_output_keeps_head_and_tail(local_sandbox: BaseSandbox) -> None:
+    chunks: list[str] = []
+
+    result = await local_sandbox.aexecute(RUNAWAY, on_output=chunks.append)
+
+    assert result.truncated
+    assert result.output.startswith(f"log line {1:054d}\n")
+    assert result.output.rstrip().endswith(f"log line {LINES:054d}")
+    assert "bytes of output omitted" in result.output
+    assert len(result.output.encode()) < DEFAULT_MAX_OUTPUT_BYTES + 100
+    # The callback sees everything, including what the capture dropped
+    assert sum(len(chunk) for chunk in chunks) == LINES * 64
+
+
+@pytest.mark.asyncio
+async def test_small_output_is_returned_untouched(local_sandbox: BaseSandbox) -> None:
+    result = await local_sandbox.aexecute("echo out; echo err >&2; exit 3")
+
+    assert result.output == "out\nerr\n"
+    assert result.exit_code == 3
+    assert not result.truncated
+
+
+@pytest.mark.asyncio
+async def test_timeout_keeps_output_so_far(local_sandbox: BaseSandbox) -> None:
+    result = await local_sandbox.aexecute("echo started; sleep 10; echo never", timeout=0.5)
+
+    assert result.output.startswith("started\n")
+    assert "never" not in result.output
+    assert result.exit_code == TIMEOUT_EXIT_CODE
+
+
+def test_capture_cut_inside_a_character_drops_the_partial_bytes() -> None:
+    capture = OutputCapture(max_bytes=7)
+    capture.write("ééééééééé")
+
+    assert capture.truncated
+    assert "�" not in capture.text()
+    assert capture.text().startswith("é\n")
+    assert capture.text().endswith("éé")
+
+
+def test_provider_truncation_is_reported() -> None:
+    capture = OutputCapture()
+    capture.write("partial")
+    capture.mark_truncated()
+
+    assert capture.response(0).truncated
+
+
+def test_character_split_across_chunks_is_decoded_whole() -> None:
+    chunks: list[str] = []
+    capture = OutputCapture(on_output=chunks.append)
+
+    capture.write(b"caf\xc3")
+    capture.write(b"\xa9 \xf0\x9f")
+    capture.write(b"\x98\x80")
+
+    assert "".join(chunks) == "café 😀"
+    assert capture.response(0).output == "café 😀"
+
+
+def test_incomplete_trailing_character_is_replaced_once() -> None:
+    capture = OutputCapture()
+    capture.write(b"ok \xc3")
+
+    assert capture.text() == "ok �"
+    assert capture.text() == "ok �"
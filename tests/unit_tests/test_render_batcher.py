@@ -0,0 +1,86 @@
+"""Tests for coalescing streamed assistant text into render frames."""
+
+import asyncio
+
+import pytest
+
+from stranger_code.textual_adapter import RenderBatcher
+
+
+class FakeMessage:
+    """Stands in for AssistantMessage, recording each render."""
+
+    def __init__(self) -> None:
+        self.renders: list[str] = []
+
+    async def append_content(self, text: str) -> None:
+        self.renders.append(text)
+
+    @property
+    def content(self) -> str:
+        return "".join(self.renders)
+
+
+@pytest.mark.asyncio
+async def test_fps_zero_renders_every_token() -> None:
+    message = FakeMessage()
+    batcher = RenderBatcher(lambda _status: None, fps=0)
+    for token in ("a", "b", "c"):
+        await batcher.append((), message, token)
+    await batcher.aclose()
+
+    assert message.renders == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_coalesced_into_frames() -> None:
+    message = FakeMessage()
+    batcher = RenderBatcher(lambda _status: None, fps=20)
+    tokens = [f" word{i}" for i in range(1000)]
+    for index, token in enumerate(tokens):
+        await batcher.append((), message, token)
+        if index % 100 == 0:
+            await asyncio.sleep(0.01)
+    await batcher.aclose()
+
+    assert message.content == "".join(tokens)
+    assert 1 < len(message.renders) < 20
+
+
+@pytest.mark.asyncio
+async def test_first_update_after_idle_renders_immediately() -> None:
+    message = FakeMessage()
+    batcher = RenderBatcher(lambda _status: None, fps=1)
+    await batcher.append((), message, "hello")
+    await asyncio.sleep(0.01)
+
+    assert message.renders == ["hello"]
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_only_the_newest_status_is_shown() -> None:
+    statuses: list[str] = []
+    batcher = RenderBatcher(statuses.append, fps=1)
+    batcher.set_status("first")
+    await asyncio.sleep(0.01)
+    for index in range(10):
+        batcher.set_status(f"status {index}")
+    await batcher.aclose()
+
+    assert statuses == ["first", "status 9"]
+    assert batcher.dropped_status == 6
+
+
+@pytest.mark.asyncio
+async def test_new_target_flushes_text_of_the_previous_one() -> None:
+    first, second = FakeMessage(), FakeMessage()
+    batcher = RenderBatcher(lambda _status: None, fps=1)
+    await batcher.append((), first, "one")
+    await asyncio.sleep(0.01)
+    await batcher.append((), first, " more")
+    await batcher.append((), second, "two")
+    await batcher.aclose()
+
+    assert first.content == "one more"
+    assert second.content == "two"
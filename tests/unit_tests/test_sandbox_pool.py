@@ -0,0 +1,95 @@
+"""Tests for the shared pool of pre-warmed sandboxes, with a local fake provider."""
+
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from stranger_code.integrations.sandbox_factory import PoolProvider, SandboxPool
+
+SIZE = 4
+
+
+@dataclass(frozen=True)
+class FakeProvider:
+    """Sandboxes are directories under `root` that take `latency` seconds to create."""
+
+    root: Path
+    latency: float = 0.05
+
+    def provision(self, setup_script_path: str | None) -> str:
+        time.sleep(self.latency)
+        sandbox = Path(tempfile.mkdtemp(prefix="sandbox-", dir=self.root))
+        if setup_script_path:
+            shutil.copy(setup_script_path, sandbox / "setup.sh")
+        return str(sandbox)
+
+    def terminate(self, sandbox_id: str) -> None:
+        shutil.rmtree(sandbox_id)
+
+    def sandboxes(self) -> list[Path]:
+        return sorted(self.root.glob("sandbox-*"))
+
+
+def _pool(fake: FakeProvider, *, size: int = SIZE, ttl: float = 600) -> SandboxPool:
+    hooks = PoolProvider(fake.provision, fake.terminate)
+    return SandboxPool("fake", size=size, ttl=ttl, path=fake.root / "pool.json", hooks=hooks)
+
+
+def _lease_in_process(fake: FakeProvider, results: multiprocessing.Queue) -> None:
+    results.put(_pool(fake).lease())
+
+
+def test_lease_misses_when_the_pool_is_empty(tmp_path: Path) -> None:
+    assert _pool(FakeProvider(tmp_path)).lease() is None
+
+
+@pytest.mark.timeout(60)
+def test_concurrent_processes_lease_distinct_sandboxes(tmp_path: Path) -> None:
+    fake = FakeProvider(tmp_path)
+    assert _pool(fake).replenish() == SIZE
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    workers = [
+        context.Process(target=_lease_in_process, args=(fake, results)) for _ in range(SIZE + 1)
+    ]
+    for worker in workers:
+        worker.start()
+    leases = [results.get(timeout=30) for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    leased = [sandbox_id for sandbox_id in leases if sandbox_id]
+    assert leases.count(None) == 1
+    assert sorted(leased) == [str(path) for path in fake.sandboxes()]
+    assert _pool(fake).entries() == []
+
+
+def test_concurrent_fillers_never_overshoot(tmp_path: Path) -> None:
+    fake = FakeProvider(tmp_path)
+    pool = _pool(fake)
+    added: list[int] = []
+    fillers = [threading.Thread(target=lambda: added.append(pool.replenish())) for _ in range(3)]
+    for filler in fillers:
+        filler.start()
+    for filler in fillers:
+        filler.join()
+
+    assert sum(added) == SIZE
+    assert len(fake.sandboxes()) == SIZE
+    assert sum(entry.warm for entry in pool.entries()) == SIZE
+
+
+def test_stale_sandboxes_are_reaped(tmp_path: Path) -> None:
+    fake = FakeProvider(tmp_path)
+    _pool(fake).replenish()
+
+    assert _pool(fake, ttl=0).reap() == SIZE
+    assert fake.sandboxes() == []
+    assert _pool(fake).entries() == []
@@ -0,0 +1,91 @@
+"""Tests for cached, resumable setup scripts, against a local stand-in sandbox."""
+
+import time
+from pathlib import Path
+
+import pytest
+from deepagents.backends.sandbox import BaseSandbox
+
+from stranger_code.integrations.sandbox_setup import run_sandbox_setup
+
+STEP_SECONDS = 0.3
+
+
+def _script(scratch: Path, last: str = "echo built", *, fail_once: bool = False) -> str:
+    """Three steps; with `fail_once`, the second fails on its first run."""
+    flag = scratch / "fail-once"
+    if fail_once:
+        flag.touch()
+    return "\n".join(
+        [
+            "set -e",
+            f"cd {scratch}",
+            "",
+            "# step: system packages",
+            f"sleep {STEP_SECONDS}; echo packages > packages.txt",
+            "",
+            "# step: dependencies",
+            f"if [ -f {flag} ]; then rm {flag}; echo 'network error' >&2; exit 7; fi",
+            "echo deps > deps.txt",
+            "",
+            "# step: build",
+            last,
+            "",
+        ]
+    )
+
+
+@pytest.fixture
+def markers(tmp_path: Path) -> str:
+    return str(tmp_path / "markers")
+
+
+def test_first_run_streams_output_while_steps_run(
+    tmp_path: Path, markers: str, local_sandbox: BaseSandbox
+) -> None:
+    start = time.perf_counter()
+
+    result = run_sandbox_setup(local_sandbox, _script(tmp_path), marker_dir=markers)
+
+    assert "0 cached, 3 ran" in result.output
+    assert local_sandbox.round_trips == 1
+    assert local_sandbox.first_output_at is not None
+    assert local_sandbox.first_output_at - start < STEP_SECONDS
+
+
+def test_reattach_is_one_round_trip(
+    tmp_path: Path, markers: str, local_sandbox: BaseSandbox
+) -> None:
+    run_sandbox_setup(local_sandbox, _script(tmp_path), marker_dir=markers)
+    round_trips = local_sandbox.round_trips
+
+    result = run_sandbox_setup(local_sandbox, _script(tmp_path), marker_dir=markers)
+
+    assert "3 cached, 0 ran" in result.output
+    assert local_sandbox.round_trips == round_trips + 1
+
+
+def test_editing_the_last_step_reruns_only_that_step(
+    tmp_path: Path, markers: str, local_sandbox: BaseSandbox
+) -> None:
+    run_sandbox_setup(local_sandbox, _script(tmp_path), marker_dir=markers)
+
+    result = run_sandbox_setup(
+        local_sandbox, _script(tmp_path, last="echo rebuilt"), marker_dir=markers
+    )
+
+    assert "2 cached, 1 ran" in result.output
+    assert "rebuilt" in result.output
+
+
+def test_retry_resumes_at_the_failed_step(
+    tmp_path: Path, markers: str, local_sandbox: BaseSandbox
+) -> None:
+    script = _script(tmp_path, fail_once=True)
+    with pytest.raises(RuntimeError, match="Setup failed"):
+        run_sandbox_setup(local_sandbox, script, marker_dir=markers)
+
+    result = run_sandbox_setup(local_sandbox, script, marker_dir=markers)
+
+    assert "1 cached, 2 ran" in result.output
+    assert (tmp_path / "deps.txt").read_text() == "deps\n"
@@ -0,0 +1,261 @@
+"""Tests for `stranger-code serve`, over a Unix socket with a fake agent graph."""
+
+import asyncio
+import json
+import stat
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from langchain_core.messages import AIMessageChunk, ToolMessage
+from langgraph.types import Interrupt
+
+from stranger_code.server import (
+    AgentServer,
+    SSEWriter,
+    load_or_create_token,
+    local_hosts,
+    start_server,
+)
+from stranger_code.sessions import SessionRouter
+
+SESSIONS = 40
+CHUNKS = 50
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class FakeGraph:
+    """Streams CHUNKS numbered words per thread; `gated` threads interrupt for approval."""
+
+    def __init__(self) -> None:
+        self.gated: set[str] = set()
+
+    async def astream(
+        self, stream_input: dict | object, *, config: dict, **_kwargs: Any
+    ) -> AsyncIterator[tuple]:
+        thread_id = config["configurable"]["thread_id"]
+        if isinstance(stream_input, dict):
+            for index in range(CHUNKS):
+                yield ((), "messages", (AIMessageChunk(content=f"{thread_id}:{index} "), {}))
+                await asyncio.sleep(0.001)
+            if thread_id in self.gated:
+                chunk = AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {"name": "shell", "args": '{"command": "ls"}', "id": "c1", "index": 0}
+                    ],
+                )
+                yield ((), "messages", (chunk, {}))
+                yield ((), "messages", (AIMessageChunk(content="", chunk_position="last"), {}))
+                request = {
+                    "action_requests": [{"name": "shell", "args": {"command": "ls"}}],
+                    "review_configs": [
+                        {"action_name": "shell", "allowed_decisions": ["approve", "reject"]}
+                    ],
+                }
+                yield ((), "updates", {"__interrupt__": [Interrupt(value=request, id="i1")]})
+                return
+        else:
+            yield ((), "messages", (ToolMessage(content="ok", tool_call_id="c1", name="shell"), {}))
+        yield ((), "messages", (AIMessageChunk(content="", chunk_position="last"), {}))
+
+    async def aupdate_state(self, *_args: Any, **_kwargs: Any) -> None:
+        pass
+
+
+def _http(method: str, path: str, body: dict | None, headers: dict[str, str]) -> bytes:
+    data = json.dumps(body).encode() if body is not None else b""
+    lines = [f"{method} {path} HTTP/1.1", f"Content-Length: {len(data)}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + data
+
+
+async def _request(
+    socket: str,
+    method: str,
+    path: str,
+    body: dict | None = None,
+    headers: dict[str, str] | None = None,
+) -> tuple[int, dict]:
+    reader, writer = await asyncio.open_unix_connection(socket)
+    writer.write(_http(method, path, body, JSON_HEADERS if headers is None else headers))
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+async def _stream(socket: str, thread_id: str) -> list[dict]:
+    reader, writer = await asyncio.open_unix_connection(socket)
+    body = {"message": "go", "approve": "ask"}
+    writer.write(_http("POST", f"/threads/{thread_id}/messages", body, JSON_HEADERS))
+    await reader.readuntil(b"\r\n\r\n")
+    events = []
+    while block := await reader.readuntil(b"\n\n"):
+        event = json.loads(block.split(b"data: ", 1)[1])
+        events.append(event)
+        if event["type"] == "approval_request":
+            path = f"/threads/{thread_id}/approvals/{event['id']}"
+            await _request(socket, "POST", path, {"decision": "approve"})
+        elif event["type"] == "end":
+            break
+    writer.close()
+    return events
+
+
+@pytest_asyncio.fixture
+async def router(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[SessionRouter]:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    async with SessionRouter() as router:
+        yield router
+
+
+async def _serve(server: AgentServer, socket: str) -> asyncio.Server:
+    return await start_server(server, socket_path=socket)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(60)
+async def test_concurrent_sessions_each_get_their_own_stream(
+    router: SessionRouter, tmp_path: Path
+) -> None:
+    graph = FakeGraph()
+
+    async def agent_factory(_name: str, _store: object) -> tuple[FakeGraph, None]:
+        return graph, None
+
+    socket = str(tmp_path / "serve.sock")
+    async with await _serve(AgentServer(router, agent_factory), socket):
+        thread_ids = []
+        for index in range(SESSIONS):
+            status, created = await _request(socket, "POST", "/threads", {})
+            assert status == 201
+            thread_ids.append(created["thread_id"])
+            # Route every other session through the approvals endpoint
+            if index % 2:
+                graph.gated.add(created["thread_id"])
+        streams = await asyncio.gather(*(_stream(socket, thread_id) for thread_id in thread_ids))
+
+    for thread_id, events in zip(thread_ids, streams, strict=True):
+        text = "".join(event["text"] for event in events if event["type"] == "text_delta")
+        assert text == "".join(f"{thread_id}:{i} " for i in range(CHUNKS))
+        assert events[0]["type"] == "start"
+        assert events[0]["thread_id"] == thread_id
+        assert events[-1] == {**events[-1], "type": "end", "status": "completed"}
+        approvals = [event for event in events if event["type"] == "approval_request"]
+        assert len(approvals) == (1 if thread_id in graph.gated else 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("method", "headers", "expected"),
+    [
+        ("GET", {"Host": "127.0.0.1:8765", "Authorization": "Bearer secret"}, 200),
+        ("GET", {"Host": "localhost:8765", "Authorization": "Bearer secret"}, 200),
+        ("GET", {"Host": "127.0.0.1:8765"}, 401),
+        ("GET", {"Host": "127.0.0.1:8765", "Authorization": "Bearer wrong"}, 401),
+        ("GET", {"Host": "evil.example:8765", "Authorization": "Bearer secret"}, 403),
+        ("GET", {"Authorization": "Bearer secret"}, 403),
+        (
+            "GET",
+            {
+                "Host": "127.0.0.1:8765",
+                "Authorization": "Bearer secret",
+                "Origin": "http://evil.example",
+            },
+            403,
+        ),
+        ("POST", {"Host": "127.0.0.1:8765", "Authorization": "Bearer secret"}, 415),
+        (
+            "POST",
+            {
+                "Host": "127.0.0.1:8765",
+                "Authorization": "Bearer secret",
+                "Content-Type": "text/plain",
+            },
+            415,
+        ),
+        (
+            "POST",
+            {
+                "Host": "127.0.0.1:8765",
+                "Authorization": "Bearer secret",
+                "Content-Type": "application/json; charset=utf-8",
+            },
+            201,
+        ),
+    ],
+)
+async def test_tcp_mode_rejects_forgeable_and_unauthenticated_requests(
+    router: SessionRouter,
+    tmp_path: Path,
+    method: str,
+    headers: dict[str, str],
+    expected: int,
+) -> None:
+    async def agent_factory(_name: str, _store: object) -> tuple[FakeGraph, None]:
+        return FakeGraph(), None
+
+    token = "secret"  # noqa: S105
+    server = AgentServer(router, agent_factory, token=token, hosts=local_hosts(8765))
+    socket = str(tmp_path / "serve.sock")
+    async with await _serve(server, socket):
+        status, _ = await _request(socket, method, "/threads", {}, headers)
+
+    assert status == expected
+
+
+def test_token_is_created_owner_only_and_reused(tmp_path: Path) -> None:
+    path = tmp_path / ".deepagents" / "serve-token"
+    token = load_or_create_token(path)
+
+    assert len(token) >= 32
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert load_or_create_token(path) == token
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_is_owner_only(router: SessionRouter, tmp_path: Path) -> None:
+    async def agent_factory(_name: str, _store: object) -> tuple[FakeGraph, None]:
+        return FakeGraph(), None
+
+    socket = tmp_path / "serve.sock"
+    async with await _serve(AgentServer(router, agent_factory), str(socket)):
+        assert stat.S_IMODE(socket.stat().st_mode) & 0o077 == 0
+
+
+class StalledTransport:
+    """StreamWriter stand-in whose drain() waits until `resume` is set."""
+
+    def __init__(self) -> None:
+        self.written = 0
+        self.resume = asyncio.Event()
+
+    def write(self, data: bytes) -> None:
+        self.written += len(data)
+
+    async def drain(self) -> None:
+        await self.resume.wait()
+
+    def is_closing(self) -> bool:
+        return False
+
+
+@pytest.mark.asyncio
+async def test_sse_writer_holds_back_the_turn_for_a_slow_client() -> None:
+    transport = StalledTransport()
+    events = SSEWriter(transport)  # type: ignore[arg-type]
+    for _ in range(64):
+        events.emit("text_delta", text="x" * 32 * 1024)
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(events.wait_writable(), 0.1)
+    # Only the event being drained has reached the socket
+    assert transport.written < 64 * 1024
+
+    transport.resume.set()
+    await asyncio.wait_for(events.wait_writable(), 1)
+    await events.aclose()
+    assert transport.written > 64 * 32 * 1024
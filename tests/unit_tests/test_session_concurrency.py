@@ -0,0 +1,89 @@
+"""Many CLI processes writing checkpoints to one sessions database at once."""
+
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+
+from stranger_code.sessions import SessionStore
+
+PROCESSES = 6
+WRITES = 60
+# Threads each worker rotates through, and text per simulated model reply
+THREADS_PER_WORKER = 4
+REPLY_WORDS = 200
+
+
+def _worker(db_path: str, worker_id: int, start_at: float) -> tuple[list[float], list[str]]:
+    """Process entry point: write checkpoints, return (latencies in ms, errors)."""
+    return asyncio.run(_write_checkpoints(Path(db_path), worker_id, start_at))
+
+
+async def _write_checkpoints(
+    db_path: Path, worker_id: int, start_at: float
+) -> tuple[list[float], list[str]]:
+    latencies: list[float] = []
+    errors: list[str] = []
+    histories: dict[str, list] = {}
+    async with SessionStore(db_path) as store:
+        # Line every process up so the writes genuinely overlap
+        await asyncio.sleep(max(0.0, start_at - time.time()))
+        for step in range(WRITES):
+            thread_id = f"w{worker_id}-t{step % THREADS_PER_WORKER}"
+            messages = histories.setdefault(thread_id, [])
+            messages.append(HumanMessage(content=f"step {step} from worker {worker_id}"))
+            messages.append(AIMessage(content=" ".join(["lorem"] * REPLY_WORDS)))
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": list(messages)}
+            config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+            metadata = {
+                "agent_name": f"stress-{worker_id}",
+                "updated_at": datetime.now(UTC).isoformat(),
+                "step": step,
+            }
+            start = time.perf_counter()
+            try:
+                await store.checkpointer.aput(config, checkpoint, metadata, {})
+            except Exception as e:  # noqa: BLE001
+                errors.append(f"{type(e).__name__}: {e}")
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, errors
+
+
+@pytest.mark.timeout(120)
+def test_concurrent_processes_never_see_database_locked(
+    tmp_path: Path, record_property: Callable[[str, object], None]
+) -> None:
+    db_path = tmp_path / "sessions.db"
+    # Give every process time to start and open its connection before writing
+    start_at = time.time() + 3.0 + PROCESSES * 0.2
+    with ProcessPoolExecutor(
+        max_workers=PROCESSES, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = [pool.submit(_worker, str(db_path), i, start_at) for i in range(PROCESSES)]
+        results = [future.result() for future in futures]
+
+    latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+    errors = [error for _, worker_errors in results for error in worker_errors]
+    p99 = latencies[min(len(latencies) - 1, round(0.99 * (len(latencies) - 1)))]
+    record_property("p99_ms", round(p99, 1))
+    print(f"\n{len(latencies)} writes from {PROCESSES} processes, p99 {p99:.1f} ms")  # noqa: T201
+
+    assert errors == []
+    assert len(latencies) == PROCESSES * WRITES
+
+    async def catalog() -> list[dict]:
+        async with SessionStore(db_path) as store:
+            return await store.list_threads(limit=100)
+
+    threads = asyncio.run(catalog())
+    assert len(threads) == PROCESSES * THREADS_PER_WORKER
+    assert sum(thread["checkpoint_count"] for thread in threads) == PROCESSES * WRITES
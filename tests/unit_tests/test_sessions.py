@@ -0,0 +1,256 @@
+"""Tests for the sessions database and its thread catalog."""
+
+from pathlib import Path
+
+import aiosqlite
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from stranger_code.sessions import SessionStore
+
+
+def _config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+def _checkpoint(messages: list) -> dict:
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": messages, "todos": ["keep me"]}
+    return checkpoint
+
+
+def _conversation(turns: int) -> list:
+    messages = []
+    for turn in range(turns):
+        messages.append(HumanMessage(content=f"question {turn}", id=f"h{turn}"))
+        messages.append(AIMessage(content=f"answer {turn}", id=f"a{turn}"))
+    return messages
+
+
+async def _count(store: SessionStore, table: str) -> int:
+    async with store.conn.execute(f"SELECT COUNT(*) FROM {table}") as cursor:  # noqa: S608
+        (count,) = await cursor.fetchone()
+    return count
+
+
+METADATA = {"agent_name": "agent", "source": "loop", "step": 1}
+
+
+@pytest.mark.asyncio
+async def test_replaced_checkpoint_is_counted_once(tmp_path: Path) -> None:
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        saver = store.checkpointer
+        metadata = {"agent_name": "agent", "source": "loop", "step": 1}
+        first = empty_checkpoint()
+        await saver.aput(_config("t1"), first, metadata, {})
+        await saver.aput(_config("t1"), first, metadata, {})
+        await saver.aput(_config("t1"), empty_checkpoint(), metadata, {})
+
+        (thread,) = await store.list_threads()
+        async with store.conn.execute(
+            "SELECT SUM(IFNULL(length(checkpoint), 0) + IFNULL(length(metadata), 0)) "
+            "FROM checkpoints"
+        ) as cursor:
+            (size,) = await cursor.fetchone()
+
+    assert thread["checkpoint_count"] == 2
+    assert thread["size_bytes"] == size
+
+
+@pytest.mark.asyncio
+async def test_gc_agent_filter_scopes_orphaned_writes(tmp_path: Path) -> None:
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        saver = store.checkpointer
+        for thread_id, agent in (("mine", "a"), ("theirs", "b")):
+            metadata = {"agent_name": agent, "source": "loop", "step": 1}
+            config = await saver.aput(_config(thread_id), empty_checkpoint(), metadata, {})
+            await saver.aput_writes(config, [("notes", "pending")], task_id="task")
+        # Orphan every pending write
+        await store.conn.execute("UPDATE writes SET checkpoint_id = 'gone'")
+        await store.conn.commit()
+
+        report = await store.gc(agent_name="a", vacuum_seconds=0)
+        async with store.conn.execute("SELECT thread_id FROM writes") as cursor:
+            remaining = [row[0] for row in await cursor.fetchall()]
+
+    assert report.orphaned_writes == 1
+    assert remaining == ["theirs"]
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_round_trip_through_the_message_store(tmp_path: Path) -> None:
+    conversation = _conversation(3)
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        saver = store.checkpointer
+        await saver.aput(_config("t1"), _checkpoint(conversation[:2]), METADATA, {})
+        await saver.aput(_config("t1"), _checkpoint(conversation), METADATA, {})
+
+        latest = await saver.aget_tuple(_config("t1"))
+        listed = [item async for item in saver.alist(_config("t1"))]
+        async with store.conn.execute("SELECT checkpoint FROM checkpoints") as cursor:
+            blobs = b"".join(row[0] for row in await cursor.fetchall())
+
+    assert latest.checkpoint["channel_values"]["messages"] == conversation
+    assert latest.checkpoint["channel_values"]["todos"] == ["keep me"]
+    assert [item.checkpoint["channel_values"]["messages"] for item in listed] == [
+        conversation,
+        conversation[:2],
+    ]
+    # Checkpoint rows hold hash references, not the messages themselves
+    assert b"question 0" not in blobs
+
+
+@pytest.mark.asyncio
+async def test_messages_are_stored_once_across_steps(tmp_path: Path) -> None:
+    conversation = _conversation(5)
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        saver = store.checkpointer
+        for step in range(1, 6):
+            checkpoint = _checkpoint(conversation[: step * 2])
+            await saver.aput(_config("t1"), checkpoint, METADATA, {})
+        # A fresh process has no in-memory hashes, and must not duplicate rows either
+        saver.forget_thread("t1")
+        await saver.aput(_config("t1"), _checkpoint(conversation), METADATA, {})
+
+        assert await _count(store, "checkpoints") == 6
+        assert await _count(store, "messages") == 10
+        assert await _count(store, "message_refs") == 10
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_from_before_the_message_store_still_load(tmp_path: Path) -> None:
+    path = tmp_path / "sessions.db"
+    conversation = _conversation(2)
+    # A database written by the plain saver, with no sessions migrations applied
+    async with aiosqlite.connect(str(path)) as conn:
+        plain = AsyncSqliteSaver(conn)
+        await plain.setup()
+        await plain.aput(_config("old"), _checkpoint(conversation), METADATA, {})
+
+    async with SessionStore(path) as store:
+        loaded = await store.checkpointer.aget_tuple(_config("old"))
+        threads = await store.list_threads()
+        indexed = await store.index_pending_threads()
+        found = await store.search("answer")
+
+    assert loaded.checkpoint["channel_values"]["messages"] == conversation
+    assert [thread["thread_id"] for thread in threads] == ["old"]
+    assert indexed == 1
+    assert [result["thread_id"] for result in found] == ["old"]
+
+
+async def _put(store: SessionStore, thread_id: str, texts: list[str], agent: str = "agent") -> None:
+    messages = [HumanMessage(content=text, id=f"{thread_id}-{i}") for i, text in enumerate(texts)]
+    metadata = {**METADATA, "agent_name": agent}
+    await store.checkpointer.aput(_config(thread_id), _checkpoint(messages), metadata, {})
+
+
+@pytest.mark.asyncio
+async def test_new_messages_are_searchable_as_they_are_written(tmp_path: Path) -> None:
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        await _put(store, "t1", ["fix the parser"])
+        assert [r["thread_id"] for r in await store.search("parser")] == ["t1"]
+        assert await store.search("tokenizer") == []
+
+        await _put(store, "t1", ["fix the parser", "now the tokenizer"])
+
+        assert [r["thread_id"] for r in await store.search("tokenizer")] == ["t1"]
+        assert await store.index_pending_threads() == 0
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_returns_each_thread_once(tmp_path: Path) -> None:
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        await _put(store, "weak", ["a long note that mentions caching once among many words"])
+        await _put(store, "strong", ["caching caching", "caching layer", "more caching"])
+
+        results = await store.search("caching")
+
+    assert [r["thread_id"] for r in results] == ["strong", "weak"]
+    assert results[0]["rank"] <= results[1]["rank"]
+    assert "\x02caching\x03" in results[0]["snippet"]
+
+
+@pytest.mark.asyncio
+async def test_search_filters_by_agent(tmp_path: Path) -> None:
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        await _put(store, "mine", ["deploy script"], agent="ops")
+        await _put(store, "theirs", ["deploy script"], agent="web")
+
+        results = await store.search("deploy", agent_name="ops")
+
+    assert [(r["thread_id"], r["agent_name"]) for r in results] == [("mine", "ops")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ('say "hello', ["t1"]),
+        ("hel*", ["t1"]),
+        ("hel", []),
+        ("* **", []),
+        ("NEAR(say hello) OR", []),
+    ],
+)
+async def test_search_quotes_user_input(tmp_path: Path, query: str, expected: list) -> None:
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        await _put(store, "t1", ['they say "hello" to everyone'])
+
+        results = await store.search(query)
+
+    assert [r["thread_id"] for r in results] == expected
+
+
+async def _messages(store: SessionStore, thread_id: str) -> list:
+    checkpoint_tuple = await store.checkpointer.aget_tuple(_config(thread_id))
+    return checkpoint_tuple.checkpoint["channel_values"]["messages"]
+
+
+@pytest.mark.asyncio
+async def test_fork_loads_the_parent_messages_and_pending_writes(tmp_path: Path) -> None:
+    conversation = _conversation(2)
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        saver = store.checkpointer
+        config = await saver.aput(_config("parent"), _checkpoint(conversation), METADATA, {})
+        await saver.aput_writes(config, [("todos", ["pending"])], "task-1")
+
+        fork_id = await store.fork_thread("parent")
+        forked = await saver.aget_tuple(_config(fork_id))
+
+    assert forked.checkpoint["channel_values"]["messages"] == conversation
+    assert forked.metadata["forked_from"] == "parent"
+    assert forked.pending_writes == [("task-1", "todos", ["pending"])]
+
+
+@pytest.mark.asyncio
+async def test_fork_and_parent_diverge_independently(tmp_path: Path) -> None:
+    conversation = _conversation(3)
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        saver = store.checkpointer
+        await saver.aput(_config("parent"), _checkpoint(conversation[:2]), METADATA, {})
+        fork_id = await store.fork_thread("parent")
+
+        parent_turn = [*conversation[:2], HumanMessage(content="parent only", id="p")]
+        fork_turn = [*conversation[:2], HumanMessage(content="fork only", id="f")]
+        await saver.aput(_config(fork_id), _checkpoint(fork_turn), METADATA, {})
+        await saver.aput(_config("parent"), _checkpoint(parent_turn), METADATA, {})
+
+        assert await _messages(store, "parent") == parent_turn
+        assert await _messages(store, fork_id) == fork_turn
+
+
+@pytest.mark.asyncio
+async def test_fork_survives_deleting_the_parent(tmp_path: Path) -> None:
+    conversation = _conversation(2)
+    async with SessionStore(tmp_path / "sessions.db") as store:
+        await store.checkpointer.aput(_config("parent"), _checkpoint(conversation), METADATA, {})
+        fork_id = await store.fork_thread("parent")
+
+        assert await store.delete_thread("parent")
+        await store.gc(vacuum_seconds=0)
+
+        assert await _messages(store, fork_id) == conversation
+        assert [r["thread_id"] for r in await store.search("question")] == [fork_id]
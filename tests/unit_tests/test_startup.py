@@ -0,0 +1,125 @@
+"""Startup regression test: import cost of each subcommand against a budget.
+
+Runs each subcommand in a fresh interpreter with `python -X importtime`
+(isolated HOME and working directory), sums the import time spent after
+interpreter startup and fails if it exceeds the command's budget or if the
+command loads a package it should not need (e.g. LangChain for `help`).
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+
+# Packages that only agent runs (and the TUI) need
+AGENT_PACKAGES = ("deepagents", "langchain", "langchain_anthropic", "textual")
+# Runs per command; the median is compared with the budget
+REPEAT = 3
+
+
+@dataclass(frozen=True)
+class StartupBudget:
+    """Import-time budget for one subcommand."""
+
+    argv: tuple[str, ...]
+    import_ms: float
+    forbidden: tuple[str, ...] = ()
+
+
+# Budgets leave roughly 2x headroom over a warm-cache run on a dev laptop
+BUDGETS = (
+    StartupBudget(("help",), 300, (*AGENT_PACKAGES, "langchain_core", "langgraph", "aiosqlite")),
+    StartupBudget(("list",), 300, (*AGENT_PACKAGES, "langchain_core", "langgraph", "aiosqlite")),
+    StartupBudget(("threads", "list"), 1500, AGENT_PACKAGES),
+    StartupBudget(("threads", "stats"), 1500, AGENT_PACKAGES),
+    StartupBudget(("daemon", "status"), 2000, ("deepagents", "textual")),
+)
+
+
+@dataclass
+class StartupRun:
+    """Measurements of one subcommand (median over repeats)."""
+
+    budget: StartupBudget
+    import_ms: float = 0.0
+    loaded: set[str] = field(default_factory=set)
+    returncode: int = 0
+    stderr: str = ""
+
+    @property
+    def violations(self) -> list[str]:
+        """Forbidden top-level packages the command imported."""
+        return sorted(name for name in self.budget.forbidden if name in self.loaded)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the command ran within budget and without forbidden imports."""
+        return (
+            self.returncode == 0 and self.import_ms <= self.budget.import_ms and not self.violations
+        )
+
+
+def parse_importtime(stderr: str) -> tuple[float, set[str]]:
+    """Sum top-level import time after interpreter startup.
+
+    Returns:
+        (milliseconds, names of all imported modules)
+    """
+    total_us = 0
+    counting = False
+    loaded = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, raw_name = line[len("import time:") :].split("|")
+        name = raw_name.strip()
+        loaded.add(name)
+        # Everything before the first stranger_code import is interpreter startup
+        counting = counting or name.startswith("stranger_code")
+        # Top-level entries are indented by exactly one space
+        if counting and raw_name.startswith(" ") and not raw_name.startswith("  "):
+            total_us += int(cumulative_us)
+    return total_us / 1000, loaded
+
+
+def measure(budget: StartupBudget, scratch: Path) -> StartupRun:
+    """Run one subcommand REPEAT times in an isolated HOME and working directory."""
+    code = (
+        f"import sys; sys.argv = ['stranger-code', *{list(budget.argv)!r}]; "
+        "from stranger_code.main import cli_main; cli_main()"
+    )
+    run = StartupRun(budget)
+    imports = []
+    env = {**os.environ, "HOME": str(scratch)}
+    for _ in range(REPEAT):
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=scratch,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        import_ms, loaded = parse_importtime(result.stderr)
+        imports.append(import_ms)
+        run.loaded |= {name.split(".")[0] for name in loaded}
+        run.returncode = run.returncode or result.returncode
+        if result.returncode:
+            run.stderr = result.stderr[-2000:]
+    run.import_ms = statistics.median(imports)
+    return run
+
+
+@pytest.mark.timeout(120)
+@pytest.mark.parametrize("budget", BUDGETS, ids=lambda budget: " ".join(budget.argv))
+def test_subcommand_startup_within_budget(budget: StartupBudget, tmp_path: Path) -> None:
+    run = measure(budget, tmp_path)
+
+    assert run.ok, (
+        f"exit {run.returncode}, imports {run.import_ms:.0f} ms "
+        f"(budget {budget.import_ms:.0f} ms), loads {run.violations}\n{run.stderr}"
+    )
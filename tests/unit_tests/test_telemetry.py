@@ -0,0 +1,138 @@
+"""Tests for per-turn latency telemetry, on a fake clock."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from stranger_code import telemetry
+from stranger_code.telemetry import PerfLog, TurnMetrics, TurnTimer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, ms: float) -> None:
+        self.now += ms / 1000
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(telemetry.time, "perf_counter", clock)
+    return clock
+
+
+def test_ttft_and_inter_chunk_percentiles(clock: FakeClock) -> None:
+    timer = TurnTimer(thread_id="t1", agent="agent")
+    clock.advance(400)
+    timer.on_chunk()
+    for gap in [10] * 97 + [50, 80, 500]:
+        clock.advance(gap)
+        timer.on_chunk()
+    timer.on_usage(100)
+
+    metrics = timer.finish()
+
+    assert metrics.ttft_ms == pytest.approx(400)
+    assert metrics.chunk_ms_p50 == pytest.approx(10)
+    assert metrics.chunk_ms_p95 == pytest.approx(10)
+    assert metrics.chunk_ms_p99 == pytest.approx(80)
+    assert metrics.model_calls == 1
+    # 100 tokens over the 1.6 s between the first and last chunk
+    assert metrics.tokens_per_second == pytest.approx(100 / 1.6)
+
+
+def test_gaps_between_responses_are_not_inter_token(clock: FakeClock) -> None:
+    timer = TurnTimer()
+    timer.on_chunk()
+    clock.advance(20)
+    timer.on_chunk()
+    timer.end_response()
+    clock.advance(3000)
+    timer.on_chunk()
+
+    metrics = timer.finish()
+
+    assert metrics.model_calls == 2
+    assert metrics.chunk_ms_p99 == pytest.approx(20)
+
+
+def test_tool_wall_time_excludes_the_approval_wait(clock: FakeClock) -> None:
+    timer = TurnTimer()
+    timer.on_chunk()
+    timer.tool_started("call-1", "shell")
+    timer.tool_started("call-2", "read_file")
+    clock.advance(2000)
+    timer.approval_waited(2.0)
+    clock.advance(300)
+    timer.tool_finished("call-1", "success")
+    clock.advance(100)
+    timer.tool_finished("call-2", "error")
+    timer.tool_finished("unknown", "success")
+
+    metrics = timer.finish()
+
+    assert [(t.name, t.status) for t in metrics.tools] == [
+        ("shell", "success"),
+        ("read_file", "error"),
+    ]
+    assert [t.ms for t in metrics.tools] == [pytest.approx(300), pytest.approx(400)]
+    assert metrics.approval_wait_ms == pytest.approx(2000)
+    assert metrics.total_ms == pytest.approx(2400)
+
+
+@pytest.mark.usefixtures("clock")
+def test_checkpoint_time_is_the_delta_over_the_turn() -> None:
+    class Saver:
+        write_seconds = 1.5
+
+    saver = Saver()
+    timer = TurnTimer(checkpointer=saver)
+    saver.write_seconds += 0.25
+
+    assert timer.finish(interrupted=True).checkpoint_ms == pytest.approx(250)
+    assert TurnTimer().finish().checkpoint_ms is None
+
+
+def test_perf_log_records_turns_and_notifies(tmp_path: Path) -> None:
+    seen: list[TurnMetrics] = []
+    log = PerfLog(seen.append, path=tmp_path / "perf.jsonl")
+    metrics = TurnMetrics(started_at="2026-01-01T00:00:00+00:00", ttft_ms=12.5)
+
+    log.record(metrics)
+
+    assert seen == [metrics]
+    assert list(log.turns) == [metrics]
+    [row] = map(json.loads, log.path.read_text().splitlines())
+    assert row["ttft_ms"] == 12.5
+
+
+def test_perf_log_rotates_at_5_mb(tmp_path: Path) -> None:
+    log = PerfLog(path=tmp_path / "perf.jsonl")
+    metrics = TurnMetrics(started_at="2026-01-01T00:00:00+00:00")
+    for generation in range(4):
+        log.path.write_text(f"{generation}\n".ljust(5 * 1024 * 1024 - 10))
+        log.record(metrics)
+
+    assert json.loads(log.path.read_text())["started_at"] == metrics.started_at
+    backups = sorted(path.name for path in tmp_path.iterdir())
+    assert backups == ["perf.jsonl", "perf.jsonl.1", "perf.jsonl.2", "perf.jsonl.3"]
+    # The newest backup is the file just rotated out; the oldest one was dropped
+    assert (tmp_path / "perf.jsonl.1").read_text()[0] == "3"
+    assert (tmp_path / "perf.jsonl.3").read_text()[0] == "1"
+
+
+def test_perf_log_write_errors_do_not_break_the_turn(tmp_path: Path) -> None:
+    blocker = tmp_path / "file"
+    blocker.touch()
+    seen: list[TurnMetrics] = []
+    log = PerfLog(seen.append, path=blocker / "perf.jsonl")
+
+    log.record(TurnMetrics(started_at="2026-01-01T00:00:00+00:00"))
+
+    assert len(seen) == 1
@@ -0,0 +1,137 @@
+"""Tests for workspace sync, against a local stand-in sandbox."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+from deepagents.backends.sandbox import BaseSandbox
+
+from stranger_code.integrations.workspace_sync import WorkspaceSync
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the local hash cache out of the real home directory."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    return tmp_path / "home"
+
+
+@pytest.fixture
+def local(tmp_path: Path) -> Path:
+    root = tmp_path / "local"
+    subprocess.run(["git", "init", "-q", str(root)], check=True)  # noqa: S603, S607
+    (root / "README.md").write_text("# Project\n")
+    return root
+
+
+@pytest.mark.timeout(60)
+def test_pull_receives_more_changes_than_fit_in_command_output(
+    local: Path, tmp_path: Path, local_sandbox: BaseSandbox
+) -> None:
+    remote = tmp_path / "remote"
+    sync = WorkspaceSync(local_sandbox, local, str(remote))
+    sync.push()
+    # Enough sha256sum lines to overflow the 256 KiB cap on command output
+    for index in range(4000):
+        directory = remote / "generated" / f"batch{index // 100:02d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"generated_module_{index:05d}.py").write_text(f"VALUE = {index}\n")
+
+    result = sync.pull()
+
+    assert len(result.received) == 4000
+    assert (local / "generated/batch39/generated_module_03999.py").read_text() == "VALUE = 3999\n"
+    assert sync.pull().received == []
+
+
+@pytest.fixture
+def synced(local: Path, tmp_path: Path, local_sandbox: BaseSandbox) -> WorkspaceSync:
+    """A project with ignored build output, pushed once."""
+    (local / ".gitignore").write_text("build/\n*.log\n")
+    for index in range(300):
+        directory = local / "pkg" / f"mod{index // 100}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file{index}.py").write_text(f"VALUE = {index}\n")
+    (local / "build").mkdir()
+    (local / "build/artifact.bin").write_bytes(b"\0" * 4096)
+    (local / "debug.log").write_text("ignored\n")
+    sync = WorkspaceSync(local_sandbox, local, str(tmp_path / "remote"))
+    sync.push()
+    return sync
+
+
+def _tree(root: Path) -> dict[str, bytes]:
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+        and not {".git", ".stranger-sync", "build"} & set(path.parts)
+        and path.suffix != ".log"
+    }
+
+
+def test_first_push_mirrors_the_project_without_ignored_files(
+    synced: WorkspaceSync, local: Path
+) -> None:
+    remote = Path(synced.remote_root)
+    assert _tree(remote) == _tree(local)
+    assert not (remote / "build").exists()
+    assert not (remote / "debug.log").exists()
+
+
+def test_push_without_changes_sends_nothing(synced: WorkspaceSync) -> None:
+    result = synced.push()
+    assert (result.sent, result.deleted) == ([], [])
+
+
+def test_push_sends_only_edits_and_deletions(synced: WorkspaceSync, local: Path) -> None:
+    (local / "pkg/mod0/file1.py").write_text("VALUE = 'edited'\n")
+    (local / "pkg/new_module.py").write_text("NEW = True\n")
+    (local / "pkg/mod2/file200.py").unlink()
+
+    result = synced.push()
+
+    assert sorted(result.sent) == ["pkg/mod0/file1.py", "pkg/new_module.py"]
+    assert result.deleted == ["pkg/mod2/file200.py"]
+    assert _tree(Path(synced.remote_root)) == _tree(local)
+
+
+def test_pull_fetches_the_agents_changes(synced: WorkspaceSync, local: Path) -> None:
+    remote = Path(synced.remote_root)
+    (remote / "pkg/mod0/file3.py").write_text("VALUE = 'agent'\n")
+    (remote / "pkg/agent_notes.md").write_text("# Notes\n")
+    (remote / "pkg/mod1/file100.py").unlink()
+
+    result = synced.pull()
+
+    assert result.received == ["pkg/agent_notes.md", "pkg/mod0/file3.py"]
+    assert result.deleted == ["pkg/mod1/file100.py"]
+    assert _tree(remote) == _tree(local)
+    assert synced.pull().received == []
+
+
+def test_pull_leaves_a_file_changed_on_both_sides(synced: WorkspaceSync, local: Path) -> None:
+    (local / "pkg/mod0/file5.py").write_text("VALUE = 'mine'\n")
+    (Path(synced.remote_root) / "pkg/mod0/file5.py").write_text("VALUE = 'theirs'\n")
+
+    result = synced.pull()
+
+    assert result.conflicts == ["pkg/mod0/file5.py"]
+    assert result.received == []
+    assert (local / "pkg/mod0/file5.py").read_text() == "VALUE = 'mine'\n"
+
+
+def test_pull_skips_paths_git_ignores(synced: WorkspaceSync, local: Path) -> None:
+    (local / ".gitignore").write_text("build/\n*.log\n__pycache__/\nnode_modules/\n")
+    remote = Path(synced.remote_root)
+    for path in ("__pycache__/a.cpython-311.pyc", "node_modules/pkg/index.js", "build/out.bin"):
+        (remote / path).parent.mkdir(parents=True, exist_ok=True)
+        (remote / path).write_bytes(b"generated")
+    (remote / "pkg/kept.py").write_text("KEPT = True\n")
+
+    result = synced.pull()
+
+    assert result.received == ["pkg/kept.py"]
+    assert not (local / "__pycache__").exists()
+    assert not (local / "node_modules").exists()
+    assert not (local / "build/out.bin").exists()